@@ -0,0 +1,26 @@
+"""
+EA Stress Test Benchmarks
+
+Performance baseline for the Python side of the workflow: report parsing,
+Monte Carlo, cost overlays, forward windows and dashboard generation, run on
+synthetic inputs at several scales. Run with scripts/run_benchmarks.py.
+
+fake_terminal provides a terminal64.exe stand-in for end-to-end runs of the
+real backtest/optimization paths without MT5 (scripts/fake_terminals.py).
+"""
+from .suite import BENCHMARKS, SCALES, Benchmark, get_benchmarks
+from .harness import compare, format_comparison, load_results, run_benchmarks, save_results
+from .fake_terminal import install_fake_terminal
+
+__all__ = [
+    'BENCHMARKS',
+    'SCALES',
+    'Benchmark',
+    'get_benchmarks',
+    'run_benchmarks',
+    'save_results',
+    'load_results',
+    'compare',
+    'format_comparison',
+    'install_fake_terminal',
+]
@@ -0,0 +1,222 @@
+"""
+Fake MT5 Terminal
+
+A stand-in for terminal64.exe, so the real subprocess, INI, report-discovery
+and parsing paths of modules/backtest.py and modules/optimizer.py (and the
+Step 12 scenarios built on them) run on Linux without MT5.
+
+install_fake_terminal() writes an executable terminal64.exe shim into an
+install dir. Started as `terminal64.exe /config:<ini>`, it reads the [Tester]
+and [TesterInputs] sections, sleeps for the simulated duration and writes
+reports where MT5 would:
+
+- single test (Optimization=0): <data_path>/<Report>.htm
+- optimization: <data_path>/<Report>.xml, plus <Report>.forward.xml when
+  ForwardMode is set
+
+Reports depend only on the tester settings and inputs, so the same INI gives
+the same report. Options live in fake_terminal.json next to the shim and
+every run is appended to calls.jsonl there.
+"""
+
+import configparser
+import json
+import os
+import stat
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks import generators
+
+TERMINAL_EXE = 'terminal64.exe'
+OPTIONS_FILE = 'fake_terminal.json'
+CALLS_FILE = 'calls.jsonl'
+
+DEFAULT_OPTIONS = {
+    'backtest_s': 0.5,       # Simulated duration of a single test
+    'optimization_s': 2.0,   # Simulated duration of an optimization
+    'trades': 300,           # Positions per single test
+    'passes': 500,           # Passes per optimization (capped by the input grid)
+}
+
+# Settings that name the output rather than the test; they do not change results
+_NON_RESULT_KEYS = {'Report', 'ReplaceReport', 'ShutdownTerminal', 'Visual', 'UseLocal'}
+
+SHIM = '''#!{python}
+import sys
+from pathlib import Path
+sys.path.insert(0, {repo})
+from benchmarks.fake_terminal import main
+sys.exit(main(sys.argv[1:], Path(__file__).resolve().parent))
+'''
+
+
+def install_fake_terminal(install_dir: Path, data_path: Optional[Path] = None, **options) -> dict:
+    """
+    Install a fake terminal.
+
+    Args:
+        install_dir: Where terminal64.exe, its options and call log go
+        data_path: Terminal data folder (default: <install_dir>/data)
+        **options: Overrides of DEFAULT_OPTIONS
+
+    Returns:
+        Terminal config dict (path, data_path) for run_backtest/run_optimization
+        or terminals.json
+
+    Raises:
+        ValueError: For an unknown option
+    """
+    unknown = sorted(set(options) - set(DEFAULT_OPTIONS))
+    if unknown:
+        raise ValueError(f"Unknown fake terminal option(s): {', '.join(unknown)}")
+
+    install_dir = Path(install_dir).resolve()
+    data_path = Path(data_path).resolve() if data_path else install_dir / 'data'
+    install_dir.mkdir(parents=True, exist_ok=True)
+    for sub in ('Files', 'Experts'):
+        (data_path / 'MQL5' / sub).mkdir(parents=True, exist_ok=True)
+
+    exe = install_dir / TERMINAL_EXE
+    exe.write_text(
+        SHIM.replace('{python}', sys.executable).replace('{repo}', repr(str(Path(__file__).parent.parent))),
+        encoding='utf-8',
+    )
+    exe.chmod(exe.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+    config = {**DEFAULT_OPTIONS, **options, 'data_path': str(data_path)}
+    (install_dir / OPTIONS_FILE).write_text(json.dumps(config, indent=2), encoding='utf-8')
+    return {'path': str(exe), 'data_path': str(data_path)}
+
+
+def read_ini(path: Path) -> tuple[dict, dict]:
+    """[Tester] and [TesterInputs] of a tester INI (UTF-8 or UTF-16)."""
+    raw = Path(path).read_bytes()
+    text = raw.decode('utf-16') if raw[:2] in (b'\xff\xfe', b'\xfe\xff') else raw.decode('utf-8-sig')
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str
+    parser.read_string(text)
+    tester = dict(parser['Tester']) if parser.has_section('Tester') else {}
+    inputs = dict(parser['TesterInputs']) if parser.has_section('TesterInputs') else {}
+    return tester, inputs
+
+
+def _seed(tester: dict, inputs: dict) -> int:
+    key = {k: v for k, v in tester.items() if k not in _NON_RESULT_KEYS}
+    return zlib.crc32(json.dumps([key, inputs], sort_keys=True).encode('utf-8'))
+
+
+def _number(value: str):
+    v = float(value)
+    return int(v) if v.is_integer() and '.' not in value else v
+
+
+def _optimized_inputs(inputs: dict) -> dict:
+    """{name: (start, stop, step)} of inputs marked for optimization (value||start||step||stop||Y)."""
+    ranges = {}
+    for name, value in inputs.items():
+        parts = value.split('||')
+        if len(parts) != 5 or parts[4].strip().upper() != 'Y':
+            continue
+        try:
+            start, step, stop = (_number(p.strip()) for p in parts[1:4])
+        except ValueError:
+            continue
+        if step > 0 and stop >= start:
+            ranges[name] = (start, stop, step)
+    return ranges
+
+
+def _date(value: Optional[str], default: Optional[datetime]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(str(value).strip(), '%Y.%m.%d')
+    except (TypeError, ValueError):
+        return default
+
+
+def run_tester(tester: dict, inputs: dict, data_path: Path, options: dict) -> list[Path]:
+    """
+    Simulate one tester run and write its reports.
+
+    Returns:
+        Paths of the written reports
+    """
+    report = tester.get('Report') or f"{Path(tester.get('Expert', 'Expert')).stem}_BT"
+    seed = _seed(tester, inputs)
+    data_path.mkdir(parents=True, exist_ok=True)
+
+    if str(tester.get('Optimization', '0')).strip() in ('', '0'):
+        time.sleep(float(options['backtest_s']))
+        start = _date(tester.get('FromDate'), generators.DEFAULT_START)
+        info = generators.write_html_report(
+            data_path / f'{report}.htm',
+            int(options['trades']),
+            seed=seed,
+            symbol=tester.get('Symbol', 'EURUSD'),
+            start=start,
+            end=_date(tester.get('ToDate'), None),
+            initial_balance=float(tester.get('Deposit') or 10000),
+            title=Path(tester.get('Expert', 'SyntheticEA')).stem,
+        )
+        return [Path(info['path'])]
+
+    time.sleep(float(options['optimization_s']))
+    ranges = _optimized_inputs(inputs) or generators.DEFAULT_PARAMS
+    grid = 1
+    for lo, hi, step in ranges.values():
+        grid *= int(round((hi - lo) / step)) + 1
+    forward = str(tester.get('ForwardMode', '0')).strip() not in ('', '0')
+    info = generators.write_optimization_reports(
+        data_path / report, min(int(options['passes']), grid), seed=seed, forward=forward, params=ranges,
+    )
+    return [Path(p) for p in (info['xml_path'], info['forward_xml_path']) if p]
+
+
+def main(argv: list[str], home: Path) -> int:
+    """
+    Entry point of the terminal64.exe shim.
+
+    Args:
+        argv: Command line (MT5 style, e.g. ['/config:C:/path/tester.ini'])
+        home: Install dir (options and call log)
+
+    Returns:
+        Exit code (0 = ran, 1 = bad command line or INI)
+    """
+    ini = next((a[len('/config:'):] for a in argv if a.lower().startswith('/config:')), None)
+    if not ini or not Path(ini).exists():
+        print(f'fake terminal: missing or unreadable /config: {ini}', file=sys.stderr)
+        return 1
+
+    options_path = Path(home) / OPTIONS_FILE
+    options = dict(DEFAULT_OPTIONS)
+    if options_path.exists():
+        options.update(json.loads(options_path.read_text(encoding='utf-8')))
+    # Without a configured data path, MT5 reads INIs from <data_path>/MQL5/Files
+    data_path = Path(options.get('data_path') or Path(ini).resolve().parents[2])
+
+    tester, inputs = read_ini(Path(ini))
+    if not tester:
+        print(f'fake terminal: no [Tester] section in {ini}', file=sys.stderr)
+        return 1
+
+    started = time.time()
+    reports = run_tester(tester, inputs, data_path, options)
+    call = {
+        'pid': os.getpid(),
+        'ini': str(ini),
+        'report': tester.get('Report'),
+        'optimization': str(tester.get('Optimization', '0')).strip() not in ('', '0'),
+        'started': round(started, 3),
+        'finished': round(time.time(), 3),
+        'reports': [str(p) for p in reports],
+    }
+    with open(Path(home) / CALLS_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(call) + '\n')
+    return 0
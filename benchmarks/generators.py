@@ -0,0 +1,540 @@
+"""
+Synthetic Benchmark Inputs
+
+Deterministic (seeded) generators for realistic inputs of the Python side of
+the workflow, so benchmarks run without MT5:
+
+- MT5 HTML backtest reports (UTF-16-LE, Results table plus Deals table with
+  entry commissions and partial closes)
+- SpreadsheetML optimization reports (<name>.xml) and their forward
+  segment (<name>.forward.xml)
+- trade lists (Trade objects or plain profits)
+- workflow state trees (Steps 7, 9 and 10) for dashboard generation
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+from xml.sax.saxutils import escape
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules.trade_extractor import Trade
+
+CONTRACT_SIZE = 100000
+COMMISSION_PER_LOT = 7.0
+DEFAULT_START = datetime(2021, 1, 4)
+
+
+def _fmt_money(value: float) -> str:
+    """MT5 style number: space thousands separator, two decimals."""
+    text = f'{abs(value):,.2f}'.replace(',', ' ')
+    return f'-{text}' if value < 0 else text
+
+
+def _fmt_time(value: datetime) -> str:
+    return value.strftime('%Y.%m.%d %H:%M:%S')
+
+
+def make_deals(
+    n_trades: int,
+    seed: int = 0,
+    symbol: str = 'EURUSD',
+    initial_balance: float = 10000.0,
+    partial_ratio: float = 0.25,
+    start: datetime = DEFAULT_START,
+    end: Optional[datetime] = None,
+) -> dict:
+    """
+    Deal rows of a backtest with n_trades positions.
+
+    Each position opens with one 'in' deal (carrying the commission) and is
+    closed by one 'out' deal, or by 2-3 partial 'out' deals with probability
+    partial_ratio. The first row is the balance deposit. Positions open every
+    30-600 minutes, or spread evenly over start..end when end is given.
+
+    Returns:
+        dict with deals (list of row dicts), closed_trades (number of 'out'
+        deals, i.e. trades extract_trades reports), net_profit,
+        initial_balance and final_balance
+    """
+    rng = random.Random(seed)
+    t = start
+    price = 1.1000
+    balance = float(initial_balance)
+    ticket = 1
+    deals = [{
+        'time': t, 'deal': ticket, 'symbol': '', 'type': 'balance', 'direction': '', 'volume': None,
+        'price': None, 'order': None, 'commission': 0.0, 'swap': 0.0, 'profit': balance, 'balance': balance,
+        'comment': 'deposit',
+    }]
+    closed = 0
+    net_profit = 0.0
+
+    open_gap = (30, 600)
+    if end is not None and n_trades > 0:
+        # Holding times add ~150 minutes per position; spread the opens over the rest
+        gap = max(10.0, (end - start).total_seconds() / 60 / n_trades - 150)
+        open_gap = (max(1, int(gap * 0.1)), max(2, int(gap * 1.9)))
+
+    for _ in range(max(0, int(n_trades))):
+        t += timedelta(minutes=rng.randint(*open_gap))
+        side = 'buy' if rng.random() < 0.5 else 'sell'
+        sign = 1 if side == 'buy' else -1
+        volume = round(rng.choice((0.1, 0.2, 0.3, 0.5, 1.0)), 2)
+        price = max(0.5, price + rng.gauss(0, 0.0015))
+        open_price = round(price, 5)
+        commission = -round(COMMISSION_PER_LOT * volume / 2, 2)
+
+        ticket += 1
+        balance += commission
+        net_profit += commission
+        deals.append({
+            'time': t, 'deal': ticket, 'symbol': symbol, 'type': side, 'direction': 'in', 'volume': volume,
+            'price': open_price, 'order': ticket, 'commission': commission, 'swap': 0.0, 'profit': 0.0,
+            'balance': balance, 'comment': '',
+        })
+
+        parts = 1
+        if rng.random() < partial_ratio and volume >= 0.2:
+            parts = rng.choice((2, 3))
+        remaining = volume
+        for k in range(parts):
+            t += timedelta(minutes=rng.randint(5, 240))
+            close_volume = remaining if k == parts - 1 else round(volume / parts, 2)
+            remaining = round(remaining - close_volume, 2)
+            close_price = round(open_price + rng.gauss(0.0002 * sign, 0.002), 5)
+            profit = round((close_price - open_price) * sign * close_volume * CONTRACT_SIZE, 2)
+            close_commission = -round(COMMISSION_PER_LOT * close_volume / 2, 2)
+            swap = -round(rng.random() * 0.5, 2) if rng.random() < 0.2 else 0.0
+
+            ticket += 1
+            balance += profit + close_commission + swap
+            net_profit += profit + close_commission + swap
+            closed += 1
+            deals.append({
+                'time': t, 'deal': ticket, 'symbol': symbol, 'type': 'sell' if side == 'buy' else 'buy',
+                'direction': 'out', 'volume': close_volume, 'price': close_price, 'order': ticket,
+                'commission': close_commission, 'swap': swap, 'profit': profit, 'balance': balance,
+                'comment': 'tp' if profit > 0 else 'sl',
+            })
+        price = close_price
+
+    return {
+        'deals': deals,
+        'closed_trades': closed,
+        'net_profit': net_profit,
+        'initial_balance': float(initial_balance),
+        'final_balance': balance,
+    }
+
+
+def _results_rows(deals: dict, n_positions: int) -> list[tuple[str, str]]:
+    """Results table labels and values (consistent with the deals)."""
+    outs = [d for d in deals['deals'] if d['direction'] == 'out']
+    profits = [d['profit'] + d['commission'] + d['swap'] for d in outs]
+    wins = [p for p in profits if p > 0]
+    losses = [p for p in profits if p <= 0]
+    gross_profit = sum(wins)
+    gross_loss = sum(losses)
+    total = len(profits) or 1
+
+    balance = peak = deals['initial_balance']
+    max_dd = max_dd_pct = 0.0
+    for p in profits:
+        balance += p
+        peak = max(peak, balance)
+        if peak - balance > max_dd:
+            max_dd = peak - balance
+            max_dd_pct = 100.0 * max_dd / peak if peak else 0.0
+
+    net = deals['net_profit']
+    pf = gross_profit / abs(gross_loss) if gross_loss else 99.0
+    long_n = sum(1 for d in outs if d['type'] == 'sell')
+    short_n = len(outs) - long_n
+    return [
+        ('History Quality', '100%'),
+        ('Bars', str(25000 + n_positions)),
+        ('Ticks', str(2500000 + 97 * n_positions)),
+        ('Symbols', '1'),
+        ('Total Net Profit', _fmt_money(net)),
+        ('Gross Profit', _fmt_money(gross_profit)),
+        ('Gross Loss', _fmt_money(gross_loss)),
+        ('Balance Drawdown Absolute', _fmt_money(max(0.0, deals['initial_balance'] - min(
+            [deals['initial_balance']] + [d['balance'] for d in outs])))),
+        ('Balance Drawdown Maximal', f'{_fmt_money(max_dd)} ({max_dd_pct:.2f}%)'),
+        ('Equity Drawdown Absolute', _fmt_money(max_dd * 0.8)),
+        ('Equity Drawdown Maximal', f'{_fmt_money(max_dd * 1.1)} ({max_dd_pct * 1.1:.2f}%)'),
+        ('Profit Factor', f'{pf:.2f}'),
+        ('Expected Payoff', f'{net / total:.2f}'),
+        ('Recovery Factor', f'{net / max_dd if max_dd else 0:.2f}'),
+        ('Sharpe Ratio', '1.27'),
+        ('Z-Score', '-1.65 (90.11%)'),
+        ('AHPR', '1.0004 (0.04%)'),
+        ('GHPR', '1.0003 (0.03%)'),
+        ('LR Correlation', '0.91'),
+        ('LR Standard Error', _fmt_money(max_dd / 3)),
+        ('Total Trades', str(len(outs))),
+        ('Short Trades (won %)', f'{short_n} ({55.0:.2f}%)'),
+        ('Long Trades (won %)', f'{long_n} ({52.0:.2f}%)'),
+        ('Profit Trades (% of total)', f'{len(wins)} ({100.0 * len(wins) / total:.2f}%)'),
+        ('Loss Trades (% of total)', f'{len(losses)} ({100.0 * len(losses) / total:.2f}%)'),
+        ('Largest profit trade', _fmt_money(max(wins, default=0.0))),
+        ('Largest loss trade', _fmt_money(min(losses, default=0.0))),
+        ('Average profit trade', _fmt_money(gross_profit / len(wins) if wins else 0.0)),
+        ('Average loss trade', _fmt_money(gross_loss / len(losses) if losses else 0.0)),
+        ('Maximum consecutive wins ($)', f'10 ({_fmt_money(112.55)})'),
+        ('Maximum consecutive losses ($)', f'7 ({_fmt_money(-98.10)})'),
+        ('Maximal consecutive profit (count)', f'{_fmt_money(275.28)} (3)'),
+        ('Maximal consecutive loss (count)', f'{_fmt_money(-140.02)} (4)'),
+        ('Average consecutive wins', '2'),
+        ('Average consecutive losses', '2'),
+        ('Total commission', _fmt_money(sum(d['commission'] for d in deals['deals']))),
+        ('Total swap', _fmt_money(sum(d['swap'] for d in deals['deals']))),
+        ('Minimal position holding time', '0:05:00'),
+        ('Maximal position holding time', '14:12:00'),
+        ('Average position holding time', '3:21:47'),
+    ]
+
+
+def render_html_report(deals: dict, n_positions: int = 0, title: str = 'SyntheticEA') -> str:
+    """MT5 Strategy Tester HTML report for the given deals."""
+    cell = '<td nowrap colspan="3">{label}:</td>\n<td nowrap><b>{value}</b></td>'
+    parts = [
+        '<!DOCTYPE html PUBLIC "-//W3C//DTD HTML 4.01//EN">\n<html>\n<head>\n'
+        f'<title>{escape(title)}: Strategy Tester Report</title>\n'
+        '<meta http-equiv="Content-Type" content="text/html; charset=utf-16">\n</head>\n'
+        '<body topmargin="1" marginheight="1">\n<center>\n'
+        '<table cellspacing="1" cellpadding="3" border="0" width="1200">\n'
+        '<tr align="left"><th colspan="13"><div style="font: 14pt Tahoma"><b>Strategy Tester Report</b>'
+        '</div></th></tr>\n',
+        f'<tr align="right"><td nowrap colspan="3">Initial Deposit:</td>'
+        f'<td nowrap><b>{_fmt_money(deals["initial_balance"])}</b></td></tr>\n',
+    ]
+    for label, value in _results_rows(deals, n_positions or deals['closed_trades']):
+        parts.append('<tr align="right">' + cell.format(label=escape(label), value=escape(value)) + '</tr>\n')
+
+    parts.append(
+        '<tr align="center"><th colspan="13"><div style="font: 10pt Tahoma"><b>Deals</b></div></th></tr>\n'
+        '<tr bgcolor="#E5F0FC" align="center">'
+        + ''.join(f'<td nowrap><b>{h}</b></td>' for h in (
+            'Time', 'Deal', 'Symbol', 'Type', 'Direction', 'Volume', 'Price', 'Order',
+            'Commission', 'Swap', 'Profit', 'Balance', 'Comment'))
+        + '</tr>\n'
+    )
+    for i, d in enumerate(deals['deals']):
+        bg = '#FFFFFF' if i % 2 == 0 else '#F7F7F7'
+        values = (
+            _fmt_time(d['time']), str(d['deal']), d['symbol'], d['type'], d['direction'],
+            f"{d['volume']:.2f}" if d['volume'] is not None else '',
+            f"{d['price']:.5f}" if d['price'] is not None else '',
+            str(d['order']) if d['order'] is not None else '',
+            _fmt_money(d['commission']), _fmt_money(d['swap']), _fmt_money(d['profit']),
+            _fmt_money(d['balance']), d['comment'],
+        )
+        parts.append(f'<tr bgcolor="{bg}" align="right">' + ''.join(f'<td>{v}</td>' for v in values) + '</tr>\n')
+    parts.append('</table>\n</center>\n</body>\n</html>\n')
+    return ''.join(parts)
+
+
+def write_html_report(
+    path: Path,
+    n_trades: int,
+    seed: int = 0,
+    symbol: str = 'EURUSD',
+    partial_ratio: float = 0.25,
+    start: datetime = DEFAULT_START,
+    end: Optional[datetime] = None,
+    initial_balance: float = 10000.0,
+    title: str = 'SyntheticEA',
+) -> dict:
+    """
+    Write a UTF-16-LE MT5 HTML backtest report with n_trades positions.
+
+    Returns:
+        make_deals() summary plus path and size_bytes
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deals = make_deals(
+        n_trades, seed=seed, symbol=symbol, initial_balance=initial_balance,
+        partial_ratio=partial_ratio, start=start, end=end,
+    )
+    data = '\ufeff' + render_html_report(deals, n_trades, title=title)
+    path.write_bytes(data.encode('utf-16-le'))
+    summary = {k: v for k, v in deals.items() if k != 'deals'}
+    return {**summary, 'path': str(path), 'size_bytes': path.stat().st_size}
+
+
+# =============================================================================
+# Optimization reports
+# =============================================================================
+
+OPT_COLUMNS = (
+    'Pass', 'Result', 'Profit', 'Expected Payoff', 'Profit Factor', 'Recovery Factor',
+    'Sharpe Ratio', 'Custom', 'Equity DD %', 'Trades',
+)
+FORWARD_COLUMNS = (
+    'Pass', 'Forward Result', 'Back Result', 'Profit', 'Expected Payoff', 'Profit Factor',
+    'Recovery Factor', 'Sharpe Ratio', 'Custom', 'Equity DD %', 'Trades',
+)
+DEFAULT_PARAMS = {
+    'FastPeriod': (5, 50, 1),
+    'SlowPeriod': (20, 200, 5),
+    'StopLossPips': (10, 100, 5),
+    'TakeProfitPips': (10, 200, 10),
+    'RiskPercent': (0.5, 3.0, 0.5),
+}
+
+
+def _spreadsheet(rows: list[list], worksheet: str) -> str:
+    def data(value) -> str:
+        if isinstance(value, (int, float)):
+            return f'<Cell><Data ss:Type="Number">{value}</Data></Cell>'
+        return f'<Cell><Data ss:Type="String">{escape(str(value))}</Data></Cell>'
+
+    body = '\n'.join('<Row>' + ''.join(data(v) for v in row) + '</Row>' for row in rows)
+    return (
+        '<?xml version="1.0"?>\n<?mso-application progid="Excel.Sheet"?>\n'
+        '<Workbook xmlns="urn:schemas-microsoft-com:office:spreadsheet" '
+        'xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:x="urn:schemas-microsoft-com:office:excel" '
+        'xmlns:ss="urn:schemas-microsoft-com:office:spreadsheet" xmlns:html="http://www.w3.org/TR/REC-html40">\n'
+        '<DocumentProperties xmlns="urn:schemas-microsoft-com:office:office">'
+        '<Title>SyntheticEA EURUSD,H1 2021.01.04-2024.12.31</Title><Author>MetaQuotes Ltd.</Author>'
+        '</DocumentProperties>\n'
+        '<Styles><Style ss:ID="Default" ss:Name="Normal"><Alignment ss:Vertical="Bottom"/></Style></Styles>\n'
+        f'<Worksheet ss:Name="{escape(worksheet)}">\n<Table>\n{body}\n</Table>\n</Worksheet>\n</Workbook>\n'
+    )
+
+
+def make_passes(n_passes: int, seed: int = 0, params: Optional[dict] = None) -> list[dict]:
+    """Synthetic optimization passes (metrics plus parameter values)."""
+    rng = random.Random(seed)
+    params = params or DEFAULT_PARAMS
+    passes = []
+    for n in range(max(0, int(n_passes))):
+        values = {}
+        for name, (lo, hi, step) in params.items():
+            steps = int(round((hi - lo) / step))
+            v = lo + step * rng.randint(0, steps)
+            values[name] = round(v, 2) if isinstance(step, float) else int(v)
+        trades = rng.randint(20, 900)
+        pf = round(max(0.3, rng.gauss(1.25, 0.35)), 2)
+        profit = round(rng.gauss(800, 2500), 2)
+        dd = round(abs(rng.gauss(14, 8)) + 0.5, 2)
+        passes.append({
+            'Pass': n,
+            'Profit': profit,
+            'Expected Payoff': round(profit / trades, 4),
+            'Profit Factor': pf,
+            'Recovery Factor': round(profit / (dd * 100), 4),
+            'Sharpe Ratio': round(rng.gauss(0.8, 0.9), 4),
+            'Custom': round(profit * max(0.0, min(1.0, rng.random())) * math.sqrt(trades) / 100, 4),
+            'Equity DD %': dd,
+            'Trades': trades,
+            'params': values,
+        })
+    for p in passes:
+        p['Result'] = p['Custom']
+    return passes
+
+
+def write_optimization_reports(
+    base_path: Path,
+    n_passes: int,
+    seed: int = 0,
+    forward: bool = True,
+    params: Optional[dict] = None,
+) -> dict:
+    """
+    Write <base>.xml (and <base>.forward.xml) SpreadsheetML optimization reports.
+
+    Returns:
+        dict with xml_path, forward_xml_path (None without forward),
+        passes and size_bytes
+    """
+    base_path = Path(base_path)
+    base_path.parent.mkdir(parents=True, exist_ok=True)
+    passes = make_passes(n_passes, seed=seed, params=params)
+    names = list((params or DEFAULT_PARAMS).keys())
+
+    rows = [list(OPT_COLUMNS) + names]
+    for p in passes:
+        rows.append([p[c] for c in OPT_COLUMNS] + [p['params'][k] for k in names])
+    xml_path = base_path.with_name(base_path.name + '.xml')
+    xml_path.write_text(_spreadsheet(rows, 'Tester Optimizator Results'), encoding='utf-8')
+    size = xml_path.stat().st_size
+
+    forward_path = None
+    if forward:
+        rng = random.Random(seed + 1)
+        rows = [list(FORWARD_COLUMNS) + names]
+        for p in passes:
+            scale = rng.uniform(0.1, 0.4)
+            fwd = {
+                'Pass': p['Pass'],
+                'Forward Result': round(p['Result'] * rng.uniform(-0.5, 1.2) * scale, 4),
+                'Back Result': p['Result'],
+                'Profit': round(p['Profit'] * rng.uniform(-0.6, 1.1) * scale, 2),
+                'Expected Payoff': round(p['Expected Payoff'] * rng.uniform(0.2, 1.2), 4),
+                'Profit Factor': round(max(0.2, p['Profit Factor'] + rng.gauss(-0.1, 0.3)), 2),
+                'Recovery Factor': round(p['Recovery Factor'] * scale, 4),
+                'Sharpe Ratio': round(p['Sharpe Ratio'] + rng.gauss(-0.2, 0.5), 4),
+                'Custom': round(p['Custom'] * scale, 4),
+                'Equity DD %': round(p['Equity DD %'] * rng.uniform(0.5, 1.5), 2),
+                'Trades': max(1, int(p['Trades'] * scale)),
+            }
+            rows.append([fwd[c] for c in FORWARD_COLUMNS] + [p['params'][k] for k in names])
+        forward_path = base_path.with_name(base_path.name + '.forward.xml')
+        forward_path.write_text(_spreadsheet(rows, 'Tester Forward Results'), encoding='utf-8')
+        size += forward_path.stat().st_size
+
+    return {
+        'xml_path': str(xml_path),
+        'forward_xml_path': str(forward_path) if forward_path else None,
+        'passes': len(passes),
+        'size_bytes': size,
+    }
+
+
+# =============================================================================
+# Trades and workflow states
+# =============================================================================
+
+def make_trades(
+    n_trades: int,
+    seed: int = 0,
+    symbol: str = 'EURUSD',
+    start: datetime = DEFAULT_START,
+    days: int = 4 * 365,
+) -> list[Trade]:
+    """Closed trades spread evenly (with jitter) over `days` from `start`, in close-time order."""
+    rng = random.Random(seed)
+    n = max(0, int(n_trades))
+    span_s = days * 86400
+    trades = []
+    price = 1.1000
+    for i in range(n):
+        close = start + timedelta(seconds=int(span_s * (i + rng.random()) / max(1, n)))
+        hold = rng.randint(300, 3 * 86400)
+        volume = rng.choice((0.1, 0.2, 0.5, 1.0))
+        side = 'buy' if rng.random() < 0.5 else 'sell'
+        price = max(0.5, price + rng.gauss(0, 0.001))
+        move = rng.gauss(0.0002, 0.002)
+        gross = round(move * volume * CONTRACT_SIZE, 2)
+        commission = -round(COMMISSION_PER_LOT * volume, 2)
+        trades.append(Trade(
+            ticket=i + 2,
+            symbol=symbol,
+            trade_type=side,
+            volume=volume,
+            open_time=close - timedelta(seconds=hold),
+            close_time=close,
+            open_price=round(price, 5),
+            close_price=round(price + (move if side == 'buy' else -move), 5),
+            commission=commission,
+            gross_profit=gross,
+            net_profit=round(gross + commission, 2),
+            holding_seconds=hold,
+        ))
+    return trades
+
+
+def make_trade_profits(n_trades: int, seed: int = 0) -> list[float]:
+    """Net profits of make_trades()."""
+    return [t.net_profit for t in make_trades(n_trades, seed=seed)]
+
+
+def _equity(rng: random.Random, points: int, start: float = 10000.0, drift: float = 2.0) -> list[float]:
+    curve = [start]
+    for _ in range(max(0, points - 1)):
+        curve.append(round(curve[-1] + rng.gauss(drift, 40.0), 2))
+    return curve
+
+
+def make_workflow_state(
+    runs_dir: Path,
+    n_passes: int,
+    curve_points: int = 2000,
+    backtested: int = 20,
+    seed: int = 0,
+    ea_name: str = 'SyntheticEA',
+):
+    """
+    Workflow state with Step 7 optimization results, Step 9 backtests of the
+    top passes (in-sample and forward equity curves) and Step 10 Monte Carlo.
+
+    Args:
+        runs_dir: Runs directory the state file is written to
+        n_passes: Optimization passes
+        curve_points: Equity points per backtested pass (in-sample; forward is a quarter)
+        backtested: Passes with Step 9 backtests
+        seed: Random seed
+
+    Returns:
+        StateManager of the new workflow
+    """
+    from engine.state import StateManager
+    from modules.optimizer import normalize_pass_data
+
+    rng = random.Random(seed)
+    state = StateManager(
+        ea_name=ea_name,
+        ea_path=f'/synthetic/{ea_name}.mq5',
+        terminal='Synthetic',
+        runs_dir=str(runs_dir),
+    )
+    passes = []
+    for p in make_passes(n_passes, seed=seed):
+        row = {k: v for k, v in p.items() if k != 'params'}
+        row.update(p['params'])
+        normalized = normalize_pass_data(row)
+        normalized['forward_profit'] = round(normalized.get('profit', 0) * rng.uniform(-0.3, 0.5), 2)
+        normalized['forward_total_trades'] = max(1, int(normalized.get('total_trades', 0) * 0.25))
+        passes.append(normalized)
+    passes.sort(key=lambda p: p.get('result', 0), reverse=True)
+
+    state.start_step('7_run_optimization')
+    state.complete_step('7_run_optimization', True, {'success': True, 'passes': len(passes), 'results': passes})
+
+    all_results = []
+    for p in passes[:backtested]:
+        pass_num = p['params']['Pass']
+        in_sample = _equity(rng, curve_points)
+        forward = _equity(rng, max(2, curve_points // 4), start=in_sample[-1])
+        bt_trades = int(p.get('total_trades') or 100)
+        all_results.append({
+            'pass_num': pass_num,
+            'success': True,
+            'input_params': {k: v for k, v in p['params'].items() if k != 'Pass'},
+            'profit': round(forward[-1] - in_sample[0], 2),
+            'profit_factor': p.get('profit_factor', 0),
+            'max_drawdown_pct': p.get('max_drawdown_pct', 0),
+            'sharpe_ratio': p.get('sharpe_ratio', 0),
+            'total_trades': bt_trades,
+            'win_rate': round(rng.uniform(35, 65), 2),
+            'forward_result': round(p.get('result', 0) * 0.3, 4),
+            'back_result': p.get('result', 0),
+            'equity_curve': in_sample + forward[1:],
+            'equity_curve_in_sample': in_sample,
+            'equity_curve_forward': forward,
+            'charts': {'profit_histogram': {'bins': [rng.randint(0, 40) for _ in range(30)]}},
+        })
+    state.start_step('9_backtest_robust')
+    state.complete_step('9_backtest_robust', True, {'success': True, 'all_results': all_results})
+
+    if all_results:
+        state.start_step('10_monte_carlo')
+        state.complete_step('10_monte_carlo', True, {
+            'success': True,
+            'pass_num': all_results[0]['pass_num'],
+            'confidence': 91.2,
+            'ruin_probability': 0.4,
+            'median_profit': 2140.5,
+            'worst_case': -310.2,
+            'best_case': 5230.9,
+        })
+    return state
@@ -0,0 +1,252 @@
+"""
+Benchmark Harness
+
+Runs benchmarks (see suite.py), stores each run as JSON under
+runs/benchmarks/<timestamp>.json and compares a run against a baseline
+(by default the previous stored run).
+
+Timings use the best of `repeat` runs after `warmup` untimed runs: the
+minimum is the least noisy estimate of what the code costs. A benchmark
+regresses when its best time grows by more than the threshold (default
+BENCHMARK_REGRESSION_THRESHOLD) and by more than min_delta_s, so that
+sub-millisecond jitter never trips it.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import settings
+from benchmarks.suite import SCALES, get_benchmarks
+
+FORMAT_VERSION = 1
+
+
+def results_dir() -> Path:
+    """Stored runs (BENCHMARK_DIR, default runs/benchmarks)."""
+    return Path(getattr(settings, 'BENCHMARK_DIR', None) or Path(settings.RUNS_DIR) / 'benchmarks')
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=str(Path(__file__).parent.parent), capture_output=True, text=True, timeout=10,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(
+    names: Optional[Iterable[str]] = None,
+    scales: Optional[Iterable[str]] = None,
+    repeat: int = 5,
+    warmup: int = 1,
+    workdir: Optional[Path] = None,
+    on_progress: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """
+    Run benchmarks at the given scales.
+
+    Args:
+        names: Benchmark names (default: all)
+        scales: Scales (default: all of SCALES)
+        repeat: Timed runs per benchmark and scale
+        warmup: Untimed runs first
+        workdir: Where synthetic inputs are written (default: a temp dir)
+        on_progress: Callback(message)
+
+    Returns:
+        Run document: created_at, git_rev, python, platform, repeat and
+        results keyed '<name>@<scale>' (size, unit, min_s, median_s, mean_s,
+        stdev_s, per_item_us, setup_s)
+
+    Raises:
+        ValueError: For unknown benchmark names or scales
+    """
+    benchmarks = get_benchmarks(list(names or []))
+    scales = list(scales or SCALES)
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        raise ValueError(f"Unknown scale(s): {', '.join(unknown)} (known: {', '.join(SCALES)})")
+    repeat = max(1, int(repeat))
+
+    tmp = None
+    if workdir is None:
+        tmp = tempfile.TemporaryDirectory(prefix='ea_bench_')
+        workdir = Path(tmp.name)
+    workdir = Path(workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    results = {}
+    try:
+        for bench in benchmarks:
+            for scale in scales:
+                size = bench.sizes[scale]
+                bench_dir = workdir / bench.name
+                bench_dir.mkdir(parents=True, exist_ok=True)
+
+                t0 = time.perf_counter()
+                ctx = bench.setup(size, bench_dir)
+                setup_s = time.perf_counter() - t0
+
+                for _ in range(max(0, int(warmup))):
+                    bench.run(ctx)
+                times = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    bench.run(ctx)
+                    times.append(time.perf_counter() - t0)
+
+                key = f'{bench.name}@{scale}'
+                results[key] = {
+                    'benchmark': bench.name,
+                    'scale': scale,
+                    'size': size,
+                    'unit': bench.unit,
+                    'min_s': round(min(times), 6),
+                    'median_s': round(statistics.median(times), 6),
+                    'mean_s': round(statistics.fmean(times), 6),
+                    'stdev_s': round(statistics.stdev(times), 6) if len(times) > 1 else 0.0,
+                    'per_item_us': round(min(times) / max(1, size) * 1e6, 3),
+                    'setup_s': round(setup_s, 3),
+                }
+                if on_progress:
+                    on_progress(f"{key:<36} {size:>7} {bench.unit:<9} best {min(times) * 1000:9.2f} ms")
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    return {
+        'format': FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_rev': _git_rev(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+# =============================================================================
+# Storage
+# =============================================================================
+
+def save_results(doc: dict, out_dir: Optional[Path] = None) -> Path:
+    """Store a run as <out_dir>/<timestamp>.json (atomic write)."""
+    out_dir = Path(out_dir) if out_dir else results_dir()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.fromisoformat(doc['created_at']).strftime('%Y%m%d_%H%M%S')
+    path = out_dir / f'{stamp}.json'
+    n = 1
+    while path.exists():
+        n += 1
+        path = out_dir / f'{stamp}_{n}.json'
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(doc, indent=2), encoding='utf-8')
+    os.replace(tmp, path)
+    return path
+
+
+def load_results(path: Path) -> dict:
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def stored_runs(out_dir: Optional[Path] = None) -> list[Path]:
+    """Stored runs, oldest first."""
+    out_dir = Path(out_dir) if out_dir else results_dir()
+    if not out_dir.exists():
+        return []
+    return sorted(out_dir.glob('*.json'), key=lambda p: p.stat().st_mtime)
+
+
+def latest_run(out_dir: Optional[Path] = None) -> Optional[Path]:
+    """Most recent stored run."""
+    runs = stored_runs(out_dir)
+    return runs[-1] if runs else None
+
+
+# =============================================================================
+# Comparison
+# =============================================================================
+
+def compare(
+    current: dict,
+    baseline: dict,
+    threshold: Optional[float] = None,
+    min_delta_s: float = 0.002,
+) -> dict:
+    """
+    Compare a run against a baseline run (benchmarks of the current run only).
+
+    Args:
+        current: Run document
+        baseline: Run document
+        threshold: Allowed relative slowdown of min_s (default
+            BENCHMARK_REGRESSION_THRESHOLD, e.g. 0.25 = 25%)
+        min_delta_s: Absolute slowdown below which nothing counts as a change
+
+    Returns:
+        dict with threshold, regressions (count) and rows (key, baseline_s,
+        current_s, ratio, status: regressed / improved / ok / new)
+    """
+    if threshold is None:
+        threshold = float(getattr(settings, 'BENCHMARK_REGRESSION_THRESHOLD', 0.25))
+    cur = current.get('results') or {}
+    base = baseline.get('results') or {}
+
+    rows = []
+    for key in cur:
+        c = cur[key].get('min_s')
+        b = (base.get(key) or {}).get('min_s')
+        row = {'key': key, 'baseline_s': b, 'current_s': c, 'ratio': None}
+        if b is None:
+            row['status'] = 'new'
+        else:
+            row['ratio'] = round(c / b, 3) if b > 0 else None
+            if c - b > min_delta_s and c > b * (1 + threshold):
+                row['status'] = 'regressed'
+            elif b - c > min_delta_s and c < b / (1 + threshold):
+                row['status'] = 'improved'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+
+    return {
+        'threshold': threshold,
+        'baseline': {k: baseline.get(k) for k in ('created_at', 'git_rev')},
+        'current': {k: current.get(k) for k in ('created_at', 'git_rev')},
+        'regressions': sum(1 for r in rows if r['status'] == 'regressed'),
+        'rows': rows,
+    }
+
+
+def format_comparison(report: dict) -> str:
+    """Plain-text regression report."""
+    base = report['baseline']
+    cur = report['current']
+    lines = [
+        f"Baseline {base.get('created_at')} ({base.get('git_rev') or '-'}) -> "
+        f"current {cur.get('created_at')} ({cur.get('git_rev') or '-'}), "
+        f"threshold +{report['threshold'] * 100:.0f}%",
+        f"  {'benchmark':<36} {'baseline':>11} {'current':>11} {'ratio':>7}  status",
+    ]
+    for row in report['rows']:
+        b = f"{row['baseline_s'] * 1000:.2f} ms" if row['baseline_s'] is not None else '-'
+        c = f"{row['current_s'] * 1000:.2f} ms"
+        r = f"{row['ratio']:.2f}x" if row['ratio'] is not None else '-'
+        flag = row['status'].upper() if row['status'] == 'regressed' else row['status']
+        lines.append(f"  {row['key']:<36} {b:>11} {c:>11} {r:>7}  {flag}")
+    lines.append(f"{report['regressions']} regression(s)")
+    return '\n'.join(lines)
@@ -0,0 +1,193 @@
+"""
+Benchmark Definitions
+
+Each benchmark builds its synthetic input once per scale (setup, untimed)
+and then times `run` on it. Sizes are in the benchmark's unit (positions,
+passes, trades); the three scales are meant to bracket a small EA, a typical
+run and a heavy one.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks import generators
+
+SCALES = ('small', 'medium', 'large')
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    A timed operation at several input sizes.
+
+    Attributes:
+        name: Benchmark id
+        unit: What a size counts (per-item timings divide by it)
+        sizes: {scale: size}
+        setup: (size, workdir) -> context passed to run (not timed)
+        run: (context) -> anything (timed)
+        description: One-line summary
+    """
+    name: str
+    unit: str
+    sizes: dict[str, int]
+    setup: Callable[[int, Path], Any]
+    run: Callable[[Any], Any]
+    description: str = ''
+
+
+# =============================================================================
+# Setups
+# =============================================================================
+
+def _html_report(size: int, workdir: Path) -> Path:
+    path = workdir / f'report_{size}.htm'
+    if not path.exists():
+        generators.write_html_report(path, size, seed=size)
+    return path
+
+
+def _opt_reports(size: int, workdir: Path) -> dict:
+    return generators.write_optimization_reports(workdir / f'opt_{size}', size, seed=size, forward=True)
+
+
+def _trade_result(size: int, workdir: Path):
+    from modules.trade_extractor import TradeExtractionResult
+    return TradeExtractionResult(success=True, trades=generators.make_trades(size, seed=size), initial_balance=10000.0)
+
+
+def _window_engine_input(size: int, workdir: Path) -> dict:
+    trades = generators.make_trades(size, seed=size)
+    return {'trades': trades, 'start': trades[0].close_time, 'end': trades[-1].close_time}
+
+
+def _workflow(size: int, workdir: Path) -> dict:
+    state = generators.make_workflow_state(workdir / f'runs_{size}', size, seed=size)
+    return {'state_file': str(state.state_file), 'output_dir': str(workdir / f'dashboard_{size}')}
+
+
+# =============================================================================
+# Timed operations
+# =============================================================================
+
+def _run_extract_trades(path: Path):
+    from modules.trade_extractor import extract_trades
+    result = extract_trades(str(path))
+    if not result.success:
+        raise RuntimeError(result.error)
+    return len(result.trades)
+
+
+def _run_parse_html(path: Path):
+    from modules.backtest import parse_html_report
+    result = parse_html_report(path)
+    if not result.get('success'):
+        raise RuntimeError(result.get('errors'))
+    return result
+
+
+def _run_parse_optimization(ctx: dict):
+    from modules.optimizer import _merge_forward_results, parse_optimization_results
+    main = parse_optimization_results(ctx['xml_path'])
+    forward = parse_optimization_results(ctx['forward_xml_path'])
+    if not main.get('success') or not forward.get('success'):
+        raise RuntimeError('optimization report did not parse')
+    _merge_forward_results(main['results'], forward['results'])
+    return main['passes']
+
+
+def _run_monte_carlo(profits: list[float]):
+    from modules.monte_carlo import run_monte_carlo
+    random.seed(0)
+    return run_monte_carlo(profits, initial_balance=10000.0, iterations=1000)
+
+
+def _run_cost_overlay(trades_res):
+    from modules.stress_scenarios import _apply_cost_overlay, _estimate_pip_value_per_lot
+    pip_value = _estimate_pip_value_per_lot(trades_res.trades, 'EURUSD') or 10.0
+    # The overlay scenarios of Step 12: spread widening and slippage on one or both sides
+    return [
+        _apply_cost_overlay(trades_res, pip_value, spread, slippage, sides)
+        for spread, slippage, sides in ((1.0, 0.0, 0), (2.0, 0.5, 1), (3.0, 1.0, 2))
+    ]
+
+
+def _run_forward_windows(ctx: dict):
+    from modules.rolling_surface import compute_rolling_surface
+    from modules.window_metrics import WindowMetricsEngine
+    engine = WindowMetricsEngine.from_trades(ctx['trades'], 10000.0)
+    # Step 13: monthly slices plus the rolling 30/60/90-day surface
+    ws = ctx['start']
+    windows = []
+    while ws < ctx['end']:
+        we = ws + timedelta(days=30)
+        windows.append(engine.metrics(ws, we))
+        ws = we
+    surface = compute_rolling_surface(engine, ctx['start'], ctx['end'], [30, 60, 90], step_days=1)
+    return len(windows), surface
+
+
+def _run_dashboard(ctx: dict):
+    from reports.workflow_dashboard import generate_dashboard_from_workflow
+    return generate_dashboard_from_workflow(ctx['state_file'], output_dir=ctx['output_dir'], open_browser=False)
+
+
+BENCHMARKS = (
+    Benchmark(
+        'extract_trades', 'positions', {'small': 500, 'medium': 5000, 'large': 20000},
+        _html_report, _run_extract_trades,
+        'Deals table of a UTF-16 MT5 HTML report to closed trades (partial closes included)',
+    ),
+    Benchmark(
+        'parse_html_report', 'positions', {'small': 500, 'medium': 5000, 'large': 20000},
+        _html_report, _run_parse_html,
+        'Results table metrics of a UTF-16 MT5 HTML report',
+    ),
+    Benchmark(
+        'parse_optimization_results', 'passes', {'small': 1000, 'medium': 10000, 'large': 30000},
+        _opt_reports, _run_parse_optimization,
+        'SpreadsheetML optimization report plus forward report, merged',
+    ),
+    Benchmark(
+        'monte_carlo', 'trades', {'small': 100, 'medium': 500, 'large': 2000},
+        lambda size, workdir: generators.make_trade_profits(size, seed=size), _run_monte_carlo,
+        'Monte Carlo trade-order shuffles (1000 iterations)',
+    ),
+    Benchmark(
+        'cost_overlay', 'trades', {'small': 1000, 'medium': 10000, 'large': 50000},
+        _trade_result, _run_cost_overlay,
+        'Step 12 spread/slippage cost overlays (three scenarios)',
+    ),
+    Benchmark(
+        'forward_windows', 'trades', {'small': 1000, 'medium': 10000, 'large': 50000},
+        _window_engine_input, _run_forward_windows,
+        'Step 13 monthly windows and 30/60/90-day rolling surface',
+    ),
+    Benchmark(
+        'dashboard', 'passes', {'small': 100, 'medium': 1000, 'large': 5000},
+        _workflow, _run_dashboard,
+        'Workflow dashboard generation (20 backtested passes with equity curves)',
+    ),
+)
+
+
+def get_benchmarks(names=None) -> list[Benchmark]:
+    """
+    Benchmarks by name (all when names is empty).
+
+    Raises:
+        ValueError: For an unknown name
+    """
+    if not names:
+        return list(BENCHMARKS)
+    by_name = {b.name: b for b in BENCHMARKS}
+    unknown = [n for n in names if n not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)} (known: {', '.join(by_name)})")
+    return [by_name[n] for n in names]
@@ -4,12 +4,13 @@ Stage Framework Package
 Exports Stage protocol and supporting types for workflow stage implementations.
 """
 
-from ea_stress.stages.base import StageResult, Stage, StageContext
+from ea_stress.stages.base import StageResult, Stage, StageContext, traced_stage
 
 __all__ = [
     "StageResult",
     "Stage",
     "StageContext",
+    "traced_stage",
     # Stage implementations
     "LoadEAStage",
     "InjectOnTesterStage",
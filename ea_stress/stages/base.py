@@ -4,9 +4,10 @@ Stage Framework Base Module
 Defines the Stage protocol, StageResult, and StageContext for implementing workflow stages.
 """
 
+import functools
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Protocol, TYPE_CHECKING
+from typing import Any, Protocol, TYPE_CHECKING, TypeVar
 
 if TYPE_CHECKING:
     from ea_stress.core.metrics import GateResult
@@ -114,3 +115,27 @@ class StageContext:
     compiled_ea_path: Path | None = None
     wide_validation_params: dict[str, Any] | None = None
     optimization_ranges: list[dict[str, Any]] | None = None
+
+
+S = TypeVar("S")
+
+
+def traced_stage(cls: type[S]) -> type[S]:
+    """Class decorator running each execute() call in a "stage:<name>" trace span.
+
+    The span is recorded on the tracer active on the calling thread (see
+    engine.tracing) and is a no-op when none is.
+    """
+    execute = cls.execute
+
+    @functools.wraps(execute)
+    def traced_execute(self, state: "WorkflowState", mt5: "MT5Interface | None" = None) -> StageResult:
+        from engine import tracing
+
+        with tracing.span(f"stage:{self.name}", cat="stage") as sp:
+            result = execute(self, state, mt5)
+            sp.set(success=result.success)
+            return result
+
+    cls.execute = traced_execute
+    return cls
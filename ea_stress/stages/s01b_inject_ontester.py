@@ -6,13 +6,14 @@ Inject OnTester function for custom optimization criterion.
 
 from typing import TYPE_CHECKING
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class InjectOnTesterStage:
     """Stage 1B: Inject OnTester function for custom optimization criterion."""
 
@@ -7,13 +7,14 @@ Inject safety guards into modified EA.
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class InjectSafetyStage:
     """Stage 1C: Inject safety guards into modified EA."""
 
@@ -6,7 +6,7 @@ Extract input parameters from EA source code.
 
 from typing import TYPE_CHECKING
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.metrics import GateResult
@@ -14,6 +14,7 @@ if TYPE_CHECKING:
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class ExtractParamsStage:
     """Stage 3: Extract input parameters from EA source code."""
 
@@ -7,7 +7,7 @@ waits for external input (from /param-analyzer skill or auto-analysis).
 
 from typing import TYPE_CHECKING
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.metrics import GateResult
@@ -15,6 +15,7 @@ if TYPE_CHECKING:
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class AnalyzeParamsStage:
     """Stage 4: Analyze parameters (LLM pause point).
 
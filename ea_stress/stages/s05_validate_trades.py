@@ -8,13 +8,14 @@ Uses wide_validation_params from Step 4 with loose safety limits.
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class ValidateTradesStage:
     """Stage 5: Run validation backtest to prove EA generates trades."""
 
@@ -7,13 +7,14 @@ Tracks fix attempts and signals workflow to pause for /mql5-fixer skill.
 
 from typing import TYPE_CHECKING
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class FixEAStage:
     """Stage 5B: Workflow pause point when Step 5 validation fails.
 
@@ -8,13 +8,14 @@ from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class CreateINIStage:
     """Stage 6: Generate MT5 optimization INI file from ranges."""
 
@@ -6,13 +6,14 @@ Select top N passes for backtesting using Go Live Score calculation.
 
 from typing import TYPE_CHECKING, Any
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class SelectPassesStage:
     """Stage 8B: Select top passes for detailed backtesting."""
 
@@ -8,7 +8,7 @@ calculate composite scores, and select best pass for Monte Carlo.
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
@@ -19,6 +19,7 @@ if TYPE_CHECKING:
 RESULT_FIELDS = {"Pass", "Forward Result", "Back Result", "Custom", "Result"}
 
 
+@traced_stage
 class BacktestPassesStage:
     """Stage 9: Run detailed backtests on selected optimization passes."""
 
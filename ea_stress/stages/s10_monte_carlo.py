@@ -8,13 +8,14 @@ Shuffles trade order to test sequence dependency and estimate ruin probability.
 import random
 from typing import TYPE_CHECKING, Any
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class MonteCarloStage:
     """Stage 10: Run Monte Carlo simulation on best backtest pass."""
 
@@ -7,13 +7,14 @@ This stage ALWAYS runs, even when earlier steps fail.
 
 from typing import TYPE_CHECKING
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class GenerateReportsStage:
     """Stage 11: Generate dashboard, leaderboard, and boards reports.
 
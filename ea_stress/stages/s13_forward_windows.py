@@ -8,13 +8,15 @@ Analyzes performance across different time periods.
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
     from ea_stress.mt5.interface import MT5Interface
+    from modules.window_metrics import WindowMetricsEngine
 
 
+@traced_stage
 class ForwardWindowsStage:
     """Stage 13: Compute time-window metrics from trade list."""
 
@@ -93,9 +95,6 @@ class ForwardWindowsStage:
                 errors=(),
             )
 
-        # Sort trades by close time
-        trades = sorted(trades, key=lambda t: t.get("close_time", datetime.min))
-
         # Parse dates
         try:
             start_date = datetime.strptime(state.start_date, "%Y.%m.%d")
@@ -111,6 +110,10 @@ class ForwardWindowsStage:
         # Get initial balance
         initial_balance = getattr(settings, "DEPOSIT", 3000)
 
+        # Build the window engine once; each window is then an O(log n) query
+        from modules.window_metrics import WindowMetricsEngine
+        engine = WindowMetricsEngine.from_trades(trades, initial_balance)
+
         # Build windows
         windows = []
 
@@ -121,8 +124,7 @@ class ForwardWindowsStage:
             kind="full",
             from_date=start_date,
             to_date=end_date,
-            trades=trades,
-            initial_balance=initial_balance,
+            engine=engine,
         ))
 
         windows.append(self._build_window(
@@ -131,8 +133,7 @@ class ForwardWindowsStage:
             kind="segment",
             from_date=start_date,
             to_date=split_date,
-            trades=trades,
-            initial_balance=initial_balance,
+            engine=engine,
         ))
 
         windows.append(self._build_window(
@@ -141,8 +142,7 @@ class ForwardWindowsStage:
             kind="segment",
             from_date=split_date,
             to_date=end_date,
-            trades=trades,
-            initial_balance=initial_balance,
+            engine=engine,
         ))
 
         # Rolling windows (reuse stress settings)
@@ -155,8 +155,7 @@ class ForwardWindowsStage:
                 kind="rolling",
                 from_date=window_start,
                 to_date=end_date,
-                trades=trades,
-                initial_balance=initial_balance,
+                engine=engine,
             ))
 
         # Calendar months (reuse stress settings)
@@ -178,8 +177,7 @@ class ForwardWindowsStage:
                 kind="calendar",
                 from_date=month_date,
                 to_date=month_end,
-                trades=trades,
-                initial_balance=initial_balance,
+                engine=engine,
             ))
 
         # Yearly windows
@@ -201,8 +199,7 @@ class ForwardWindowsStage:
                 kind="year",
                 from_date=year_start,
                 to_date=year_end,
-                trades=trades,
-                initial_balance=initial_balance,
+                engine=engine,
             ))
 
         return StageResult(
@@ -236,15 +233,13 @@ class ForwardWindowsStage:
         kind: str,
         from_date: datetime,
         to_date: datetime,
-        trades: list[dict[str, Any]],
-        initial_balance: float,
+        engine: "WindowMetricsEngine",
     ) -> dict[str, Any]:
         """Build window with computed metrics."""
         metrics = self._compute_metrics(
-            trades=trades,
+            engine=engine,
             window_start=from_date,
             window_end=to_date,
-            initial_balance=initial_balance,
         )
 
         return {
@@ -258,77 +253,23 @@ class ForwardWindowsStage:
 
     def _compute_metrics(
         self,
-        trades: list[dict[str, Any]],
+        engine: "WindowMetricsEngine",
         window_start: datetime,
         window_end: datetime,
-        initial_balance: float,
     ) -> dict[str, Any]:
         """Compute metrics for a time window.
 
         Algorithm:
-        1. Calculate starting balance (initial + all trades before window)
-        2. Filter trades by close_time within window
-        3. Track profit, drawdown, wins/losses
+        1. Binary-search the window bounds in the sorted close times
+        2. Take profit/wins/gross totals from prefix-sum differences
+        3. Query max drawdown (from the balance at window_start) from the segment tree
         """
-        # Calculate starting balance at window_start
-        balance = initial_balance
-        for trade in trades:
-            close_time = trade.get("close_time")
-            if close_time and close_time < window_start:
-                balance += trade.get("net_profit", 0)
-            elif close_time and close_time >= window_start:
-                break
-
-        start_balance = balance
-        peak = start_balance
-        max_dd = 0.0
-
-        profit = 0.0
-        gross_profit = 0.0
-        gross_loss = 0.0
-        wins = 0
-        total = 0
-
-        for trade in trades:
-            close_time = trade.get("close_time")
-            if not close_time:
-                continue
-            if close_time < window_start:
-                continue
-            if close_time > window_end:
-                break
-
-            p = trade.get("net_profit", 0)
-            total += 1
-            profit += p
-
-            if p > 0:
-                wins += 1
-                gross_profit += p
-            elif p < 0:
-                gross_loss += abs(p)
-
-            # Update drawdown
-            balance += p
-            if balance > peak:
-                peak = balance
-            if peak > 0:
-                dd = (peak - balance) / peak
-                if dd > max_dd:
-                    max_dd = dd
-
-        # Calculate profit factor
-        if gross_loss <= 0:
-            pf = 99.0 if gross_profit > 0 else 0.0
-        else:
-            pf = gross_profit / gross_loss
-
-        win_rate = (wins / total * 100.0) if total > 0 else 0.0
+        m = engine.metrics(window_start, window_end)
 
         return {
-            "profit": profit,
-            "profit_factor": round(pf, 2),
-            "max_drawdown_pct": round(max_dd * 100.0, 2),
-            "total_trades": total,
-            "win_rate": round(win_rate, 1),
+            "profit": m["profit"],
+            "profit_factor": round(m["profit_factor"], 2),
+            "max_drawdown_pct": round(m["max_drawdown_pct"], 2),
+            "total_trades": m["total_trades"],
+            "win_rate": round(m["win_rate"], 1),
         }
@@ -7,13 +7,14 @@ Returns orchestration data for the pipeline (cannot instantiate WorkflowRunner f
 
 from typing import TYPE_CHECKING, Any
 
-from ea_stress.stages.base import StageResult
+from ea_stress.stages.base import StageResult, traced_stage
 
 if TYPE_CHECKING:
     from ea_stress.core.state import WorkflowState
     from ea_stress.mt5.interface import MT5Interface
 
 
+@traced_stage
 class MultiPairStage:
     """Stage 14: Prepare multi-pair workflow orchestration metadata."""
 
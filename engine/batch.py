@@ -0,0 +1,320 @@
+"""
+Batch Runner
+
+Runs queued workflow jobs (see job_queue.py) on a pool of worker threads.
+
+Each worker is bound to its own MT5 terminal (two tester runs cannot share a
+terminal), claims a job under a lease, renews the lease from a heartbeat
+thread while the workflow runs, and writes the job's summary to
+runs/batch/<batch_id>/job_<id>_<symbol>.json as soon as it finishes.
+Jobs that raise are retried up to their max_attempts (a workflow that ends
+failed or paused is a finished job); jobs left running by a crashed process
+are picked up again once their lease expires.
+
+A job is one full workflow: the EA profile (ea_path, wide_validation_params,
+optimization_ranges) on one symbol/timeframe. Options:
+
+    stress      run Step 12 stress scenarios
+    forward     run Step 13 forward windows
+    multi_pair  Step 14 symbols (list), run as child workflows of this job
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.job_queue import JobQueue, worker_id
+import settings
+
+
+def default_queue_path() -> Path:
+    """Queue database (BATCH_QUEUE_PATH, default runs/batch/queue.sqlite)."""
+    return Path(getattr(settings, 'BATCH_QUEUE_PATH', None) or Path(settings.RUNS_DIR) / 'batch' / 'queue.sqlite')
+
+
+def load_profile(path: str) -> dict:
+    """
+    Read an EA profile.
+
+    Raises:
+        ValueError: If ea_path, wide_validation_params or optimization_ranges is missing
+    """
+    profile = json.loads(Path(path).read_text(encoding='utf-8'))
+    missing = [k for k in ('ea_path', 'wide_validation_params', 'optimization_ranges') if not profile.get(k)]
+    if missing:
+        raise ValueError(f"Profile {path} is missing {', '.join(missing)}")
+    return profile
+
+
+def run_workflow_job(
+    job: dict,
+    terminal_name: Optional[str] = None,
+    on_workflow: Optional[Callable[[str], None]] = None,
+    on_progress: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """
+    Run one job's workflow to completion.
+
+    Args:
+        job: Queue job (profile, symbol, timeframe, options)
+        terminal_name: Terminal to run on (default: the active one)
+        on_workflow: Called with the workflow id once it exists
+        on_progress: Progress callback
+
+    Returns:
+        Workflow summary
+    """
+    from engine.runner import WorkflowRunner
+
+    profile = load_profile(job['profile'])
+    options = job.get('options') or {}
+    multi_pair = [s for s in (options.get('multi_pair') or []) if s]
+
+    runner = WorkflowRunner(
+        ea_path=profile['ea_path'],
+        terminal_name=terminal_name,
+        symbol=job['symbol'],
+        timeframe=job['timeframe'],
+        auto_stats_analysis=True,
+        auto_run_stress_scenarios=bool(options.get('stress')),
+        auto_run_forward_windows=bool(options.get('forward')),
+        auto_run_multi_pair=bool(multi_pair),
+        multi_pair_symbols=multi_pair,
+        on_progress=on_progress,
+    )
+    if on_workflow:
+        on_workflow(runner.state.workflow_id)
+
+    runner.run(stop_on_failure=False, pause_for_analysis=True)
+    return runner.continue_with_params(
+        wide_validation_params=profile['wide_validation_params'],
+        optimization_ranges=profile['optimization_ranges'],
+        stop_on_failure=False,
+    )
+
+
+def new_batch_id(prefix: str = 'batch') -> str:
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+def enqueue_profile(
+    queue: JobQueue,
+    batch_id: str,
+    profile_path: str,
+    symbols: list[str],
+    timeframe: str,
+    iterations: int = 1,
+    options: Optional[dict] = None,
+    max_attempts: Optional[int] = None,
+) -> list[int]:
+    """
+    Queue one job per (iteration, symbol) for an EA profile.
+
+    Args:
+        queue: Job queue
+        batch_id: Batch id
+        profile_path: EA profile JSON (validated before anything is queued)
+        symbols: Symbols
+        timeframe: Timeframe
+        iterations: Repeats of the whole symbol list
+        options: Job options (stress / forward / multi_pair)
+        max_attempts: Attempts per job (default BATCH_MAX_ATTEMPTS)
+
+    Returns:
+        Job ids
+    """
+    load_profile(profile_path)
+    if max_attempts is None:
+        max_attempts = int(getattr(settings, 'BATCH_MAX_ATTEMPTS', 2) or 1)
+    jobs = [
+        {
+            'profile': str(profile_path),
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'options': {**(options or {}), 'iteration': i + 1},
+        }
+        for i in range(max(1, int(iterations)))
+        for symbol in symbols
+    ]
+    return queue.add_jobs(batch_id, jobs, max_attempts=max_attempts)
+
+
+def batch_report(queue: JobQueue, batch_id: Optional[str] = None) -> dict:
+    """
+    Queue state for a batch (default: the most recent one).
+
+    Returns:
+        dict with batch_id, counts and one row per job
+    """
+    batch_id = batch_id or queue.latest_batch()
+    now = datetime.now().timestamp()
+    jobs = []
+    for job in queue.jobs(batch_id):
+        summary = job.get('summary') or {}
+        jobs.append({
+            'id': job['id'],
+            'symbol': job['symbol'],
+            'timeframe': job['timeframe'],
+            'status': job['status'],
+            'attempts': job['attempts'],
+            'max_attempts': job['max_attempts'],
+            'workflow_id': job['workflow_id'] or summary.get('workflow_id'),
+            'workflow_status': summary.get('status'),
+            'lease_owner': job['lease_owner'],
+            'lease_remaining_s': int(job['lease_expires'] - now) if job['lease_expires'] else None,
+            'error': job['error'],
+        })
+    return {'batch_id': batch_id, 'counts': queue.counts(batch_id) if batch_id else queue.counts(), 'jobs': jobs}
+
+
+class BatchRunner:
+    """Drains a job queue with one worker per terminal."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        terminals: Optional[list[Optional[str]]] = None,
+        workers: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        batch_id: Optional[str] = None,
+        summaries_dir: Optional[Path] = None,
+        run_job: Callable = run_workflow_job,
+        on_progress: Optional[Callable[[str], None]] = None,
+        poll_seconds: float = 5.0,
+    ):
+        """
+        Args:
+            queue: Job queue
+            terminals: Terminal names, one per worker (default: [active terminal])
+            workers: Worker count (default BATCH_WORKERS; capped at the number
+                of terminals)
+            lease_seconds: Job lease (default BATCH_LEASE_SECONDS)
+            batch_id: Only run jobs of this batch
+            summaries_dir: Per-job summary root (default: the queue's directory)
+            run_job: Callable(job, terminal_name, on_workflow, on_progress) -> summary
+            on_progress: Progress callback
+            poll_seconds: Idle wait while other workers' jobs may still be retried
+        """
+        self.queue = queue
+        terminals = list(dict.fromkeys(terminals or [None]))
+        if workers is None:
+            workers = int(getattr(settings, 'BATCH_WORKERS', 1) or 1)
+        self.terminals = terminals[:max(1, min(int(workers), len(terminals)))]
+        if lease_seconds is None:
+            lease_seconds = float(getattr(settings, 'BATCH_LEASE_SECONDS', 1800) or 1800)
+        self.lease_seconds = float(lease_seconds)
+        self.batch_id = batch_id
+        self.summaries_dir = Path(summaries_dir) if summaries_dir else queue.db_path.parent
+        self.run_job = run_job
+        self.on_progress = on_progress
+        self.poll_seconds = float(poll_seconds)
+        self._stop = threading.Event()
+
+    def _log(self, message: str) -> None:
+        if self.on_progress:
+            self.on_progress(message)
+
+    def stop(self) -> None:
+        """Let running jobs finish, but claim no new ones."""
+        self._stop.set()
+
+    def summary_path(self, job: dict) -> Path:
+        return self.summaries_dir / str(job['batch_id']) / f"job_{job['id']}_{job['symbol']}.json"
+
+    def _write_summary(self, job: dict, record: dict) -> Path:
+        path = self.summary_path(job)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(record, indent=2, default=str), encoding='utf-8')
+        os.replace(tmp, path)
+        return path
+
+    def _heartbeat(self, job_id: int, owner: str, done: threading.Event) -> None:
+        interval = max(0.05, self.lease_seconds / 3)
+        while not done.wait(interval):
+            if not self.queue.heartbeat(job_id, owner, self.lease_seconds):
+                self._log(f"Job {job_id}: lease lost")
+                return
+
+    def _run_one(self, job: dict, owner: str, terminal: Optional[str]) -> None:
+        tag = f"Job {job['id']} {job['symbol']} {job['timeframe']} (attempt {job['attempts']}/{job['max_attempts']})"
+        self._log(f"{tag}: started on {terminal or 'default terminal'}")
+
+        done = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(job['id'], owner, done), daemon=True)
+        beat.start()
+
+        record = {
+            'job_id': job['id'],
+            'batch_id': job['batch_id'],
+            'profile': job['profile'],
+            'symbol': job['symbol'],
+            'timeframe': job['timeframe'],
+            'options': job['options'],
+            'attempt': job['attempts'],
+            'terminal': terminal,
+            'started_at': datetime.now().isoformat(),
+        }
+        error = None
+        summary = None
+        try:
+            summary = self.run_job(
+                job,
+                terminal,
+                lambda workflow_id: self.queue.set_workflow(job['id'], owner, workflow_id),
+                (lambda m: self._log(f"[job {job['id']} {job['symbol']}] {m}")) if self.on_progress else None,
+            )
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            done.set()
+            beat.join()
+
+        record.update({
+            'finished_at': datetime.now().isoformat(),
+            'workflow_id': (summary or {}).get('workflow_id'),
+            'summary': summary,
+            'error': error,
+        })
+        if error is None:
+            ok = self.queue.complete(job['id'], owner, summary)
+            record['status'] = 'done' if ok else 'lease_lost'
+        else:
+            record['status'] = self.queue.fail(job['id'], owner, error, summary) or 'lease_lost'
+        path = self._write_summary(job, record)
+        self._log(f"{tag}: {record['status']}{f' ({error})' if error else ''} -> {path}")
+
+    def _worker(self, index: int, terminal: Optional[str]) -> None:
+        owner = worker_id(f'w{index}')
+        while not self._stop.is_set():
+            job = self.queue.claim(owner, self.lease_seconds, self.batch_id)
+            if job is None:
+                # Running jobs may still fail (or lose their lease) and come back for a retry
+                if not self.queue.counts(self.batch_id)['running']:
+                    return
+                self._stop.wait(self.poll_seconds)
+                continue
+            self._run_one(job, owner, terminal)
+
+    def run(self) -> dict:
+        """
+        Run until no queued jobs remain (or stop() is called).
+
+        Returns:
+            Job counts per status afterwards
+        """
+        threads = [
+            threading.Thread(target=self._worker, args=(i, t), name=f'batch-worker-{i}')
+            for i, t in enumerate(self.terminals)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return self.queue.counts(self.batch_id)
@@ -210,6 +210,23 @@ def check_monte_carlo_ruin(ruin_prob: float) -> GateResult:
     )
 
 
+def check_rolling_profitable_windows(profitable_pct: float, window_days: int) -> GateResult:
+    """Gate 13a: Share of rolling windows (longest configured length) that were profitable."""
+    threshold = float(getattr(settings, 'MIN_ROLLING_PROFITABLE_PCT', 60.0) or 0)
+    passed = profitable_pct >= threshold
+    return GateResult(
+        name='rolling_profitable_windows',
+        passed=passed,
+        value=round(profitable_pct, 1),
+        threshold=threshold,
+        operator='>=',
+        message=(
+            f"{'PASS' if passed else 'FAIL'}: {profitable_pct:.1f}% of {window_days}-day windows "
+            f"profitable (minimum: {threshold}%)"
+        ),
+    )
+
+
 def check_optimization_passes(passes: int) -> GateResult:
     """Gate 7: Check if optimization produced results."""
     passed = passes > 0
@@ -0,0 +1,319 @@
+"""
+Batch Job Queue
+
+On-disk queue of workflow jobs (EA profile, symbol, timeframe, options)
+stored in SQLite (runs/batch/queue.sqlite by default), so a batch survives
+crashes and restarts.
+
+Workers claim jobs under a lease that they renew while the job runs. A job
+whose lease expires (its worker died) is handed out again until it has used
+max_attempts; failed jobs are retried the same way. Every state change is
+committed immediately, so `watch_batch.py` and `batch_run.py status` read
+the live queue from another process.
+
+Job status: queued -> running -> done | failed (running -> queued on retry).
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    workflow_id TEXT,
+    summary TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs(batch_id, id);
+'''
+
+
+def worker_id(name: str = 'worker') -> str:
+    """Lease owner id: host, process and worker name."""
+    return f'{socket.gethostname()}:{os.getpid()}:{name}'
+
+
+class JobQueue:
+    """SQLite-backed job queue with leases and retries."""
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: SQLite file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        try:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        except sqlite3.DatabaseError:
+            pass
+        self.conn.executescript(SCHEMA)
+        # One connection is shared by the worker threads of a process
+        self._lock = threading.RLock()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _tx(self):
+        """Exclusive write transaction (claims must not race across processes)."""
+        return _Transaction(self.conn, self._lock)
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job['options'] = json.loads(job['options'] or '{}')
+        job['summary'] = json.loads(job['summary']) if job.get('summary') else None
+        return job
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+
+    def add_jobs(self, batch_id: str, jobs: Iterable[dict], max_attempts: int = 2) -> list[int]:
+        """
+        Enqueue jobs.
+
+        Args:
+            batch_id: Batch the jobs belong to
+            jobs: Dicts with profile, symbol, timeframe and optional options
+            max_attempts: Attempts per job (first run + retries)
+
+        Returns:
+            New job ids
+
+        Raises:
+            ValueError: If a job lacks profile/symbol/timeframe
+        """
+        now = time.time()
+        rows = []
+        for job in jobs:
+            missing = [k for k in ('profile', 'symbol', 'timeframe') if not job.get(k)]
+            if missing:
+                raise ValueError(f"Job is missing {', '.join(missing)}: {job}")
+            rows.append((
+                str(batch_id), str(job['profile']), str(job['symbol']).upper(), str(job['timeframe']).upper(),
+                json.dumps(job.get('options') or {}, sort_keys=True), 'queued',
+                max(1, int(max_attempts)), now, now,
+            ))
+
+        ids = []
+        with self._tx() as cur:
+            for row in rows:
+                cur.execute(
+                    'INSERT INTO jobs (batch_id, profile, symbol, timeframe, options, status, '
+                    'max_attempts, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    row,
+                )
+                ids.append(cur.lastrowid)
+        return ids
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _expire_leases(self, cur: sqlite3.Cursor, now: float) -> None:
+        """Requeue running jobs whose lease ran out (or fail them when out of attempts)."""
+        cur.execute(
+            "UPDATE jobs SET status = 'failed', error = 'lease expired', finished_at = ?, updated_at = ?, "
+            "lease_owner = NULL, lease_expires = NULL "
+            "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+            (now, now, now),
+        )
+        cur.execute(
+            "UPDATE jobs SET status = 'queued', error = 'lease expired', updated_at = ?, "
+            "lease_owner = NULL, lease_expires = NULL "
+            "WHERE status = 'running' AND lease_expires < ?",
+            (now, now),
+        )
+
+    def claim(self, owner: str, lease_seconds: float, batch_id: Optional[str] = None) -> Optional[dict]:
+        """
+        Lease the oldest queued job.
+
+        Args:
+            owner: Lease owner (see worker_id)
+            lease_seconds: Lease length; renew with heartbeat()
+            batch_id: Only claim jobs of this batch
+
+        Returns:
+            Job dict (attempts already incremented), or None if nothing is queued
+        """
+        now = time.time()
+        with self._tx() as cur:
+            self._expire_leases(cur, now)
+            sql = "SELECT id FROM jobs WHERE status = 'queued'"
+            args: list[Any] = []
+            if batch_id is not None:
+                sql += ' AND batch_id = ?'
+                args.append(batch_id)
+            row = cur.execute(sql + ' ORDER BY id LIMIT 1', args).fetchone()
+            if row is None:
+                return None
+            cur.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, "
+                'lease_expires = ?, started_at = ?, updated_at = ?, workflow_id = NULL WHERE id = ?',
+                (owner, now + lease_seconds, now, now, row['id']),
+            )
+            return self._row(cur.execute('SELECT * FROM jobs WHERE id = ?', (row['id'],)).fetchone())
+
+    def heartbeat(self, job_id: int, owner: str, lease_seconds: float) -> bool:
+        """Extend a lease; False if the job is no longer leased to owner."""
+        now = time.time()
+        with self._tx() as cur:
+            cur.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (now + lease_seconds, now, job_id, owner),
+            )
+            return cur.rowcount == 1
+
+    def set_workflow(self, job_id: int, owner: str, workflow_id: str) -> None:
+        """Record the workflow a running job created."""
+        with self._tx() as cur:
+            cur.execute(
+                "UPDATE jobs SET workflow_id = ?, updated_at = ? WHERE id = ? AND lease_owner = ?",
+                (workflow_id, time.time(), job_id, owner),
+            )
+
+    def complete(self, job_id: int, owner: str, summary: Optional[dict] = None) -> bool:
+        """Mark a leased job done; False if the lease was lost meanwhile."""
+        now = time.time()
+        with self._tx() as cur:
+            cur.execute(
+                "UPDATE jobs SET status = 'done', summary = ?, error = NULL, finished_at = ?, updated_at = ?, "
+                "lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (json.dumps(summary, default=str) if summary is not None else None, now, now, job_id, owner),
+            )
+            return cur.rowcount == 1
+
+    def fail(self, job_id: int, owner: str, error: str, summary: Optional[dict] = None) -> Optional[str]:
+        """
+        Record a failed attempt.
+
+        Returns:
+            'queued' if the job will be retried, 'failed' if it is out of
+            attempts, None if the lease was lost meanwhile
+        """
+        now = time.time()
+        with self._tx() as cur:
+            row = cur.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (job_id, owner),
+            ).fetchone()
+            if row is None:
+                return None
+            status = 'queued' if row['attempts'] < row['max_attempts'] else 'failed'
+            cur.execute(
+                'UPDATE jobs SET status = ?, error = ?, summary = ?, updated_at = ?, finished_at = ?, '
+                'lease_owner = NULL, lease_expires = NULL WHERE id = ?',
+                (
+                    status, str(error), json.dumps(summary, default=str) if summary is not None else None,
+                    now, now if status == 'failed' else None, job_id,
+                ),
+            )
+            return status
+
+    def requeue_running(self, batch_id: Optional[str] = None) -> int:
+        """Release every running job now (after a crash, when no other runner is alive)."""
+        now = time.time()
+        sql = "UPDATE jobs SET lease_expires = ? WHERE status = 'running'"
+        args: list[Any] = [now - 1]
+        if batch_id is not None:
+            sql += ' AND batch_id = ?'
+            args.append(batch_id)
+        with self._tx() as cur:
+            cur.execute(sql, args)
+            count = cur.rowcount
+            self._expire_leases(cur, now)
+        return count
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, job_id: int) -> Optional[dict]:
+        with self._lock:
+            row = self.conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def jobs(self, batch_id: Optional[str] = None, status: Optional[str] = None) -> list[dict]:
+        """Jobs in id order, optionally filtered by batch and status."""
+        sql = 'SELECT * FROM jobs WHERE 1 = 1'
+        args: list[Any] = []
+        if batch_id is not None:
+            sql += ' AND batch_id = ?'
+            args.append(batch_id)
+        if status is not None:
+            sql += ' AND status = ?'
+            args.append(status)
+        with self._lock:
+            return [self._row(r) for r in self.conn.execute(sql + ' ORDER BY id', args)]
+
+    def counts(self, batch_id: Optional[str] = None) -> dict[str, int]:
+        """Job count per status (every status present, zero if none)."""
+        sql = 'SELECT status, COUNT(*) FROM jobs'
+        args: list[Any] = []
+        if batch_id is not None:
+            sql += ' WHERE batch_id = ?'
+            args.append(batch_id)
+        counts = {s: 0 for s in JOB_STATUSES}
+        with self._lock:
+            for status, n in self.conn.execute(sql + ' GROUP BY status', args):
+                counts[status] = int(n)
+        return counts
+
+    def latest_batch(self) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute('SELECT batch_id FROM jobs ORDER BY id DESC LIMIT 1').fetchone()
+        return row[0] if row else None
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK around a cursor."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self) -> sqlite3.Cursor:
+        self.lock.acquire()
+        try:
+            self.cur = self.conn.cursor()
+            self.cur.execute('BEGIN IMMEDIATE')
+        except Exception:
+            self.lock.release()
+            raise
+        return self.cur
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self.cur.execute('COMMIT' if exc_type is None else 'ROLLBACK')
+            self.cur.close()
+        finally:
+            self.lock.release()
@@ -6,13 +6,20 @@ Each step has a gate that must pass before proceeding.
 """
 from pathlib import Path
 from typing import Optional, Callable
+import dataclasses
 import hashlib
+import os
+import queue
 import re
+import shutil
 import sys
+import threading
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from engine.state import StateManager
+from engine.scheduler import Leases, StepScheduler, StepSpec, terminal_lease
+from engine import tracing
 from engine.terminals import TerminalRegistry
 from engine import gates
 
@@ -185,23 +192,43 @@ class WorkflowRunner:
         results_dir.mkdir(parents=True, exist_ok=True)
         return results_dir
 
+    def _blob_store(self):
+        """Content-addressed store shared by all workflows under RUNS_DIR (None if disabled)."""
+        if not bool(getattr(settings, 'BLOB_STORE', True)):
+            return None
+        if getattr(self, '_blobs', None) is None:
+            from modules.blob_store import BlobStore
+            self._blobs = BlobStore(Path(settings.RUNS_DIR) / 'blobs')
+        return self._blobs
+
+    def _blob_refs(self, data: dict) -> dict:
+        """Move large sub-values of a step result into the blob store (state keeps references)."""
+        store = self._blob_store()
+        if store is None or not isinstance(data, dict):
+            return data
+        from modules.blob_store import externalize
+        return externalize(data, store)
+
     def _save_results(self, name: str, data: dict) -> str:
-        """Save large results to a separate JSON file."""
+        """Save large results to a separate JSON file (a blob manifest when BLOB_STORE is on)."""
         import json
         results_dir = self._get_results_dir()
         file_path = results_dir / f"{name}.json"
+        store = self._blob_store()
+        if store is not None:
+            from modules.blob_store import save_results_file
+            return save_results_file(file_path, data, store=store)
         with open(file_path, 'w') as f:
             json.dump(data, f, indent=2, default=str)
         return str(file_path)
 
     def _load_results(self, name: str) -> dict:
-        """Load results from a separate JSON file."""
-        import json
+        """Load results from a separate JSON file (resolving blob references)."""
+        from modules.blob_store import load_results_file
         results_dir = self._get_results_dir()
         file_path = results_dir / f"{name}.json"
         if file_path.exists():
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            return load_results_file(str(file_path))
         return {}
 
     def _restore_paths_from_state(self) -> None:
@@ -378,9 +405,91 @@ class WorkflowRunner:
     def _step_done(self, step_name: str, passed: bool, result: dict) -> None:
         """Handle step completion."""
         self.state.complete_step(step_name, passed, result)
+        self._index_catalog()
         if self.on_step_complete:
             self.on_step_complete(step_name, passed, result)
 
+    def _index_catalog(self) -> None:
+        """Refresh this workflow's summary sidecar and catalog row (best effort)."""
+        try:
+            if getattr(settings, 'WORKFLOW_CATALOG', True):
+                from reports.catalog import index_workflow_file
+                index_workflow_file(str(self.state.state_file))
+            elif getattr(settings, 'REPORT_SUMMARY_SIDECARS', True):
+                from reports.summary import ensure_summary
+                ensure_summary(str(self.state.state_file))
+        except Exception as e:
+            self._log(f"Warning: workflow catalog update failed: {e}")
+
+    def _step_leases(self) -> Leases:
+        """Terminal/report leases shared by this runner's steps."""
+        if getattr(self, '_leases', None) is None:
+            self._leases = Leases()
+        return self._leases
+
+    def _tracer(self) -> Optional[tracing.Tracer]:
+        """Tracer writing this workflow's spans to runs/<workflow_id>/trace.jsonl (None if TRACING is off)."""
+        if not tracing.tracing_enabled():
+            return None
+        if getattr(self, '_trace', None) is None:
+            self._trace = tracing.Tracer(
+                self.state.workflow_id,
+                path=tracing.trace_path(self.state.workflow_id, str(self.state.runs_dir)),
+            )
+        return self._trace
+
+    def _traced_step(self, spec: StepSpec, parent: Optional[tracing.Span]) -> StepSpec:
+        """Run a step inside a 'step:<name>' span on whichever thread the scheduler picks."""
+        tracer = self._tracer()
+        if tracer is None:
+            return spec
+        fn = spec.fn
+
+        def run():
+            with tracing.activate(tracer, parent=parent):
+                with tracer.span(f'step:{spec.name}', cat='step', kind=spec.kind) as sp:
+                    passed, result = fn()
+                    sp.set(passed=bool(passed))
+                    return passed, result
+
+        return dataclasses.replace(spec, fn=run)
+
+    def _run_steps(self, steps: list[StepSpec], stop_on_failure: bool = True, label: str = '') -> dict:
+        """
+        Run a step graph, checkpointing each step as it finishes.
+
+        Args:
+            steps: Steps in priority order
+            stop_on_failure: Skip pending steps (except `always` post-steps) after a failure
+            label: Suffix for log lines (e.g. ' (re-optimization)')
+
+        Returns:
+            {step name: True/False, or None if skipped}
+        """
+        def on_start(name: str) -> None:
+            self._log(f"Starting step: {name}{label}")
+            self.state.start_step(name)
+
+        def on_done(name: str, passed: bool, result: dict, error: Optional[str]) -> None:
+            if error:
+                self.state.complete_step(name, False, result, error)
+            self._step_done(name, passed, result)
+            self._log(f"Step {name} {'PASSED' if passed else 'FAILED'}")
+
+        def on_skip(name: str) -> None:
+            self._log(f"Skipping step: {name} (previous step failed)")
+
+        parent = tracing.current_span()
+        steps = [self._traced_step(spec, parent) for spec in steps]
+        workers = int(getattr(settings, 'STEP_WORKERS', 4) or 1)
+        scheduler = StepScheduler(
+            steps,
+            terminal=(self.terminal or {}).get('name'),
+            max_workers=workers,
+            leases=self._step_leases(),
+        )
+        return scheduler.run(stop_on_failure, on_start=on_start, on_done=on_done, on_skip=on_skip)
+
     # =========================================================================
     # STEP VALIDATION & PROTECTION
     # =========================================================================
@@ -672,33 +781,20 @@ class WorkflowRunner:
 
         # Phase 1: Steps 1-3 (preparation)
         phase1_steps = [
-            ('1_load_ea', self._step_load_ea),
-            ('1b_inject_ontester', self._step_inject_ontester),
-            ('1c_inject_safety', self._step_inject_safety),
-            ('2_compile', self._step_compile),
-            ('3_extract_params', self._step_extract_params),
+            StepSpec('1_load_ea', self._step_load_ea, produces=('ea_file',)),
+            StepSpec('1b_inject_ontester', self._step_inject_ontester,
+                     requires=('ea_file',), produces=('ontester_ea',)),
+            StepSpec('1c_inject_safety', self._step_inject_safety,
+                     requires=('ontester_ea',), produces=('modified_ea',)),
+            StepSpec('2_compile', self._step_compile, requires=('modified_ea',), produces=('compiled_ea',)),
+            StepSpec('3_extract_params', self._step_extract_params,
+                     requires=('modified_ea', 'compiled_ea'), produces=('params',)),
         ]
 
-        for step_name, step_func in phase1_steps:
-            self._log(f"Starting step: {step_name}")
-            self.state.start_step(step_name)
-
-            try:
-                passed, result = step_func()
-            except Exception as e:
-                passed = False
-                result = {'error': str(e)}
-                self.state.complete_step(step_name, False, result, str(e))
-
-            self._step_done(step_name, passed, result)
-
-            if not passed:
-                self._log(f"Step {step_name} FAILED")
-                if stop_on_failure:
-                    self.state.complete_workflow(False)
-                    return self.state.get_summary()
-
-            self._log(f"Step {step_name} PASSED")
+        outcomes = self._run_steps(phase1_steps, stop_on_failure)
+        if stop_on_failure and False in outcomes.values():
+            self.state.complete_workflow(False)
+            return self.state.get_summary()
 
         # If pause_for_analysis, return here so Claude can analyze params
         if pause_for_analysis:
@@ -801,6 +897,88 @@ class WorkflowRunner:
         # Continue with Phase 2
         return self._run_phase2(stop_on_failure)
 
+    def adopt_prepared(self, parent: 'WorkflowRunner') -> dict:
+        """
+        Seed Steps 1-3 from another workflow that prepared the same EA.
+
+        Multi-pair children use this instead of run(): injection, compilation
+        and parameter extraction do not depend on the symbol, so the parent's
+        modified/compiled EA and extracted params are reused (the EA files are
+        copied into this runner's terminal if it differs from the parent's).
+
+        Args:
+            parent: Runner whose Steps 1-3 passed
+
+        Returns:
+            Workflow state summary (status awaiting_param_analysis)
+
+        Raises:
+            ValueError: If the parent's Steps 1-3 have not passed
+        """
+        prepared = ['1_load_ea', '1b_inject_ontester', '1c_inject_safety', '2_compile', '3_extract_params']
+        parent_steps = parent.state.get('steps', {}) or {}
+        for step_name in prepared:
+            if (parent_steps.get(step_name) or {}).get('status') != 'passed':
+                raise ValueError(f"Cannot reuse preparation: parent step '{step_name}' did not pass")
+
+        modified_ea_path = parent.modified_ea_path
+        compiled_ea_path = parent.compiled_ea_path
+        if (parent.terminal or {}).get('data_path') != (self.terminal or {}).get('data_path'):
+            modified_ea_path = self._stage_ea_file(modified_ea_path, parent.terminal)
+            compiled_ea_path = self._stage_ea_file(compiled_ea_path, parent.terminal)
+
+        self.modified_ea_path = modified_ea_path
+        self.compiled_ea_path = compiled_ea_path
+        self.params = list(parent.params or [])
+
+        parent_gates = parent.state.get('gates', {}) or {}
+        reused_gates = {k: parent_gates[k] for k in ('compilation', 'params_found') if k in parent_gates}
+        if reused_gates:
+            self.state.update_gates(reused_gates)
+
+        self.state.set_status('in_progress')
+        for step_name in prepared:
+            result = dict(parent.state.get_step_result(step_name) or {})
+            if step_name == '1b_inject_ontester':
+                result['modified_path'] = modified_ea_path
+            elif step_name == '1c_inject_safety':
+                result['path'] = modified_ea_path
+            elif step_name == '2_compile':
+                result['exe_path'] = compiled_ea_path
+            result['reused_from'] = parent.state.workflow_id
+
+            self.state.start_step(step_name)
+            self._step_done(step_name, True, result)
+            self._log(f"Step {step_name} PASSED (reused from {parent.state.workflow_id})")
+
+        self.state.set_status('awaiting_param_analysis')
+        return self.state.get_summary()
+
+    def _stage_ea_file(self, path: Optional[str], source_terminal: Optional[dict]) -> Optional[str]:
+        """Copy an EA file from another terminal's Experts folder into this runner's terminal."""
+        if not path:
+            return path
+        src = Path(path)
+        rel = Path(src.name)
+        experts = (source_terminal or {}).get('experts_path')
+        if experts:
+            try:
+                rel = src.relative_to(experts)
+            except ValueError:
+                pass
+
+        dest = Path(self.terminal['experts_path']) / rel
+        src_stat = src.stat()
+        if dest.exists():
+            dest_stat = dest.stat()
+            if dest_stat.st_size == src_stat.st_size and dest_stat.st_mtime_ns >= src_stat.st_mtime_ns:
+                return str(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dest)
+        return str(dest)
+
     def _continue_automated(self, stop_on_failure: bool = True) -> dict:
         """
         DEPRECATED: Parameter analysis must be done by Claude via /param-analyzer skill.
@@ -854,31 +1032,17 @@ class WorkflowRunner:
     def _run_phase3(self, stop_on_failure: bool = True) -> dict:
         """Run Phase 3a steps (6-8) - optimization then pause for Claude analysis."""
         phase3a_steps = [
-            ('6_create_ini', self._step_create_ini),
-            ('7_run_optimization', self._step_run_optimization),
-            ('8_parse_results', self._step_parse_results),
+            StepSpec('6_create_ini', self._step_create_ini, produces=('optimization_ini',)),
+            StepSpec('7_run_optimization', self._step_run_optimization, kind='mt5',
+                     requires=('optimization_ini',), produces=('optimization_report',)),
+            StepSpec('8_parse_results', self._step_parse_results,
+                     requires=('optimization_report',), produces=('optimization_results',)),
         ]
 
-        for step_name, step_func in phase3a_steps:
-            self._log(f"Starting step: {step_name}")
-            self.state.start_step(step_name)
-
-            try:
-                passed, result = step_func()
-            except Exception as e:
-                passed = False
-                result = {'error': str(e)}
-                self.state.complete_step(step_name, False, result, str(e))
-
-            self._step_done(step_name, passed, result)
-
-            if not passed:
-                self._log(f"Step {step_name} FAILED")
-                if stop_on_failure:
-                    self.state.complete_workflow(False)
-                    return self.state.get_summary()
-
-            self._log(f"Step {step_name} PASSED")
+        outcomes = self._run_steps(phase3a_steps, stop_on_failure)
+        if stop_on_failure and False in outcomes.values():
+            self.state.complete_workflow(False)
+            return self.state.get_summary()
 
         auto_stats = self.auto_stats_analysis
         if auto_stats is None:
@@ -1068,72 +1232,55 @@ class WorkflowRunner:
         return self._run_phase3b(stop_on_failure)
 
     def _run_phase3b(self, stop_on_failure: bool = True) -> dict:
-        """Run Phase 3b steps (9-11) after Claude selects passes.
+        """Run Phase 3b steps (9-14) after Claude selects passes.
 
         Note: Step 11 (generate_reports) ALWAYS runs regardless of stop_on_failure,
         so users always see dashboards even when gates fail.
         """
+        # Steps 11-14 are post-steps: they run even after a failed gate (users
+        # always get dashboards). Forward windows and reports only need the
+        # Step 9/10 results, so they run alongside the MT5 stress scenarios;
+        # MT5 steps share the terminal lease.
         phase3b_steps = [
-            ('9_backtest_robust', self._step_backtest_robust),
-            ('10_monte_carlo', self._step_monte_carlo),
-            ('11_generate_reports', self._step_generate_reports),
+            StepSpec('9_backtest_robust', self._step_backtest_robust, kind='mt5',
+                     requires=('selected_passes',), produces=('backtest_results',)),
+            StepSpec('10_monte_carlo', self._step_monte_carlo,
+                     requires=('backtest_results',), produces=('monte_carlo',)),
+            StepSpec('11_generate_reports', self._step_generate_reports,
+                     requires=('backtest_results', 'monte_carlo'), produces=('reports',),
+                     resources=('reports',), always=True),
         ]
         auto_stress = self.auto_run_stress_scenarios
         if auto_stress is None:
             auto_stress = getattr(settings, 'AUTO_RUN_STRESS_SCENARIOS', True)
         if auto_stress:
-            phase3b_steps.append(('12_stress_scenarios', self._step_stress_scenarios))
+            phase3b_steps.append(StepSpec(
+                '12_stress_scenarios', self._step_stress_scenarios, kind='mt5',
+                requires=('backtest_results',), produces=('stress_scenarios',), always=True,
+            ))
 
         auto_forward = self.auto_run_forward_windows
         if auto_forward is None:
             auto_forward = bool(getattr(settings, 'AUTO_RUN_FORWARD_WINDOWS', False))
         if auto_forward:
-            phase3b_steps.append(('13_forward_windows', self._step_forward_windows))
+            phase3b_steps.append(StepSpec(
+                '13_forward_windows', self._step_forward_windows,
+                requires=('backtest_results',), produces=('forward_windows',), always=True,
+            ))
 
         auto_multi = self.auto_run_multi_pair
         if auto_multi is None:
             auto_multi = bool(getattr(settings, 'AUTO_RUN_MULTI_PAIR', False))
         if auto_multi:
-            phase3b_steps.append(('14_multi_pair', self._step_multi_pair))
-
-        all_passed = True
-        should_skip = False  # Track if we should skip to Step 11
-
-        for step_name, step_func in phase3b_steps:
-            # Step 11 (generate_reports) ALWAYS runs - users need dashboards
-            # Step 12 is post-step and should run even if earlier gates fail.
-            post_steps = {'11_generate_reports'}
-            if auto_stress:
-                post_steps.add('12_stress_scenarios')
-            if auto_forward:
-                post_steps.add('13_forward_windows')
-            if auto_multi:
-                post_steps.add('14_multi_pair')
-
-            if should_skip and step_name not in post_steps:
-                self._log(f"Skipping step: {step_name} (previous step failed)")
-                continue
+            # Children run on the multi-pair terminals (leased for the whole step)
+            phase3b_steps.append(StepSpec(
+                '14_multi_pair', self._step_multi_pair,
+                requires=('optimization_ranges',), produces=('multi_pair_runs',),
+                resources=tuple(terminal_lease(t) for t in self._multi_pair_terminals()), always=True,
+            ))
 
-            self._log(f"Starting step: {step_name}")
-            self.state.start_step(step_name)
-
-            try:
-                passed, result = step_func()
-            except Exception as e:
-                passed = False
-                result = {'error': str(e)}
-                self.state.complete_step(step_name, False, result, str(e))
-
-            self._step_done(step_name, passed, result)
-
-            if not passed:
-                all_passed = False
-                self._log(f"Step {step_name} FAILED")
-                # Don't break - skip to Step 11 instead
-                if stop_on_failure and step_name != '11_generate_reports':
-                    should_skip = True
-            else:
-                self._log(f"Step {step_name} PASSED")
+        outcomes = self._run_steps(phase3b_steps, stop_on_failure)
+        all_passed = all(outcomes.values())
 
         # Complete workflow
         self.state.complete_workflow(all_passed)
@@ -1829,7 +1976,7 @@ class WorkflowRunner:
         self._log(f"Backtest results saved to: {results_file}")
 
         return gate_results['all_passed'], {
-            'best_result': best_result,
+            'best_result': self._blob_refs(best_result),
             'results_file': results_file,
             'successful_count': len(backtest_results),
             'total_count': len(top_passes),
@@ -1862,7 +2009,7 @@ class WorkflowRunner:
         })
 
         return gate_results['all_passed'], {
-            **self.mc_results,
+            **self._blob_refs(self.mc_results),
             'pass_num': pass_num,
             'gates': gate_results['gates'],
         }
@@ -2030,6 +2177,16 @@ class WorkflowRunner:
                 'param_stability': 0.5,
             })
 
+        # Trade-level diff vs same-window OHLC run ("why did this scenario fail")
+        if bool(getattr(settings, 'STRESS_TRADE_DIFF', True)):
+            try:
+                from modules.trade_diff import diff_stress_scenarios
+                diff_info = diff_stress_scenarios(scenarios)
+                for err in diff_info.get('errors', []):
+                    self._log(f"Warning: stress trade diff: {err}")
+            except Exception as e:
+                self._log(f"Warning: stress trade diff failed: {e}")
+
         self.stress_results = {
             'success': True,
             'pass_num': pass_num,
@@ -2045,27 +2202,29 @@ class WorkflowRunner:
         dashboard_path = None
         leaderboard_path = None
         boards_path = None
-        try:
-            from reports.workflow_dashboard import generate_dashboard_from_workflow
-            dashboard_path = generate_dashboard_from_workflow(
-                str(self.state.state_file),
-                run_backtests=False,
-                open_browser=False,
-            )
-        except Exception as e:
-            self._log(f"Warning: Stress dashboard regeneration failed: {e}")
+        # Steps 11-13 run concurrently; the report outputs are shared, so render under the lease
+        with self._step_leases().hold('reports'):
+            try:
+                from reports.workflow_dashboard import generate_dashboard_from_workflow
+                dashboard_path = generate_dashboard_from_workflow(
+                    str(self.state.state_file),
+                    run_backtests=False,
+                    open_browser=False,
+                )
+            except Exception as e:
+                self._log(f"Warning: Stress dashboard regeneration failed: {e}")
 
-        try:
-            from reports.leaderboard import generate_leaderboard
-            leaderboard_path = generate_leaderboard(open_browser=False)
-        except Exception as e:
-            self._log(f"Warning: Stress leaderboard regeneration failed: {e}")
+            try:
+                from reports.leaderboard import generate_leaderboard
+                leaderboard_path = generate_leaderboard(open_browser=False)
+            except Exception as e:
+                self._log(f"Warning: Stress leaderboard regeneration failed: {e}")
 
-        try:
-            from reports.boards import generate_boards
-            boards_path = generate_boards(open_browser=False)
-        except Exception as e:
-            self._log(f"Warning: Stress boards regeneration failed: {e}")
+            try:
+                from reports.boards import generate_boards
+                boards_path = generate_boards(open_browser=False)
+            except Exception as e:
+                self._log(f"Warning: Stress boards regeneration failed: {e}")
 
         return True, {
             **self.stress_results,
@@ -2078,6 +2237,7 @@ class WorkflowRunner:
         """Step 13: Compute forward window slices from the best-pass trade list."""
         from datetime import datetime, timedelta, date
         from modules.trade_extractor import extract_trades
+        from modules.window_metrics import WindowMetricsEngine
 
         best = self.backtest_results if isinstance(self.backtest_results, dict) else {}
         report_path = best.get('report_path')
@@ -2115,65 +2275,12 @@ class WorkflowRunner:
             self.state.set('forward_windows', result)
             return True, result
 
-        trades_sorted = sorted(trades_res.trades, key=lambda t: t.close_time)
+        initial_balance = float(trades_res.initial_balance or getattr(settings, 'DEPOSIT', 0) or 0)
+        engine = WindowMetricsEngine.from_trades(trades_res.trades, initial_balance)
 
         def _metrics_for_window(window_start: datetime, window_end: datetime) -> dict:
-            # Start from the balance at window_start to get realistic drawdown %
-            balance = float(trades_res.initial_balance or getattr(settings, 'DEPOSIT', 0) or 0)
-            for t in trades_sorted:
-                if t.close_time < window_start:
-                    balance += float(t.net_profit or 0)
-                else:
-                    break
-
-            start_balance = balance
-            peak = start_balance if start_balance != 0 else max(start_balance, 1e-9)
-            max_dd = 0.0
-
-            profit = 0.0
-            gross_profit = 0.0
-            gross_loss = 0.0
-            wins = 0
-            total = 0
-
-            for t in trades_sorted:
-                if t.close_time < window_start:
-                    continue
-                if t.close_time > window_end:
-                    break
-
-                p = float(t.net_profit or 0)
-                total += 1
-                profit += p
-                if p > 0:
-                    wins += 1
-                    gross_profit += p
-                elif p < 0:
-                    gross_loss += abs(p)
-
-                balance += p
-                if balance > peak:
-                    peak = balance
-                if peak > 0:
-                    dd = (peak - balance) / peak
-                    if dd > max_dd:
-                        max_dd = dd
-
-            pf = 0.0
-            if gross_loss <= 1e-12:
-                pf = 99.0 if gross_profit > 0 else 0.0
-            else:
-                pf = gross_profit / gross_loss
-
-            win_rate = (wins / total * 100.0) if total > 0 else 0.0
-
-            return {
-                'profit': float(profit),
-                'profit_factor': float(pf),
-                'max_drawdown_pct': float(max_dd * 100.0),
-                'total_trades': int(total),
-                'win_rate': float(win_rate),
-            }
+            # Drawdown starts from the balance at window_start (prefix sums, O(log n))
+            return engine.metrics(window_start, window_end)
 
         windows: list[dict] = []
 
@@ -2251,31 +2358,166 @@ class WorkflowRunner:
             'windows': windows,
         }
 
+        # Monte Carlo bands: is each window within the variance of the in-sample edge?
+        if split_dt and bool(getattr(settings, 'AUTO_FORWARD_WINDOW_MC_BANDS', True)):
+            try:
+                result['mc_bands'] = self._attach_window_mc_bands(windows, engine, split_dt)
+            except Exception as e:
+                self._log(f"Warning: forward window MC bands failed: {e}")
+
+        # Dense rolling-window surfaces for every backtested pass
+        if start_dt and bool(getattr(settings, 'AUTO_ROLLING_SURFACES', True)):
+            try:
+                result['rolling'] = self._compute_rolling_surfaces(start_dt, end_dt, pass_num, engine)
+            except Exception as e:
+                self._log(f"Warning: rolling surfaces failed: {e}")
+
         self.state.set('forward_windows', result)
 
         # Refresh dashboard + boards so users can see the windows immediately
         dashboard_path = None
         boards_path = None
-        try:
-            from reports.workflow_dashboard import generate_dashboard_from_workflow
-            dashboard_path = generate_dashboard_from_workflow(
-                str(self.state.state_file),
-                run_backtests=False,
-                open_browser=False,
-            )
-        except Exception as e:
-            self._log(f"Warning: Forward windows dashboard regeneration failed: {e}")
+        with self._step_leases().hold('reports'):
+            try:
+                from reports.workflow_dashboard import generate_dashboard_from_workflow
+                dashboard_path = generate_dashboard_from_workflow(
+                    str(self.state.state_file),
+                    run_backtests=False,
+                    open_browser=False,
+                )
+            except Exception as e:
+                self._log(f"Warning: Forward windows dashboard regeneration failed: {e}")
 
-        try:
-            from reports.boards import generate_boards
-            boards_path = generate_boards(open_browser=False)
-        except Exception as e:
-            self._log(f"Warning: Forward windows boards regeneration failed: {e}")
+            try:
+                from reports.boards import generate_boards
+                boards_path = generate_boards(open_browser=False)
+            except Exception as e:
+                self._log(f"Warning: Forward windows boards regeneration failed: {e}")
 
         return True, {**result, 'dashboard_path': dashboard_path, 'boards_path': boards_path}
 
+    def _attach_window_mc_bands(self, windows: list[dict], engine, split_dt) -> dict:
+        """
+        Attach bootstrap confidence bands to each forward window (in place).
+
+        In-sample trades (closed before split_dt) are resampled to each window's
+        trade count; all windows share one batched simulation.
+        """
+        from datetime import datetime
+        from modules.monte_carlo import run_window_confidence_bands
+
+        split_idx = engine.bounds(split_dt, split_dt)[0]
+        sample = [engine.cum_profit[k + 1] - engine.cum_profit[k] for k in range(split_idx)]
+        iterations = int(getattr(settings, 'FORWARD_WINDOW_MC_ITERATIONS', 1000) or 1000)
+
+        inputs = []
+        for w in windows:
+            m = w.get('metrics') or {}
+            ws = datetime.strptime(w['from_date'], "%Y.%m.%d")
+            inputs.append({
+                'total_trades': m.get('total_trades', 0),
+                'profit': m.get('profit', 0),
+                'start_balance': engine.start_balance(ws),
+            })
+
+        bands = run_window_confidence_bands(sample, inputs, iterations=iterations)
+        outside = 0
+        for w, band in zip(windows, bands):
+            if band is None:
+                continue
+            w['mc_band'] = band
+            if not band['within_band']:
+                outside += 1
+
+        return {
+            'iterations': iterations,
+            'sample_size': len(sample),
+            'windows_with_band': sum(1 for b in bands if b is not None),
+            'windows_outside_band': outside,
+        }
+
+    def _compute_rolling_surfaces(self, start_dt, end_dt, best_pass_num, best_engine) -> dict:
+        """
+        Compute rolling-window surfaces for all Step 9 passes and save them next to backtests.json.
+
+        Returns the worst-window summary for the best pass (the full per-pass
+        summaries live in the rolling_surfaces.json index) and the
+        informational rolling_profitable_windows gate result.
+        """
+        from modules.trade_extractor import extract_trades
+        from modules.window_metrics import WindowMetricsEngine
+        from modules.rolling_surface import compute_rolling_surface, summarize_surface, save_rolling_surfaces
+
+        window_days = [int(d) for d in (getattr(settings, 'ROLLING_SURFACE_WINDOW_DAYS', []) or []) if int(d) > 0]
+        step_days = int(getattr(settings, 'ROLLING_SURFACE_STEP_DAYS', 1) or 1)
+        min_trades = int(getattr(settings, 'ROLLING_SURFACE_MIN_TRADES', 5) or 1)
+        if not window_days:
+            return {'skipped': True, 'reason': 'No rolling window lengths configured'}
+
+        surfaces: dict = {}
+        summaries: dict = {}
+        for r in self.top20_backtest_results or []:
+            if not isinstance(r, dict) or r.get('pass_num') is None:
+                continue
+            pass_num = r.get('pass_num')
+            if pass_num == best_pass_num:
+                engine = best_engine
+            else:
+                if not r.get('report_path'):
+                    continue
+                trades_res = extract_trades(str(r['report_path']))
+                if not trades_res.success or not trades_res.trades:
+                    continue
+                balance = float(trades_res.initial_balance or getattr(settings, 'DEPOSIT', 0) or 0)
+                engine = WindowMetricsEngine.from_trades(trades_res.trades, balance)
+
+            surfaces[pass_num] = compute_rolling_surface(engine, start_dt, end_dt, window_days, step_days)
+            summaries[pass_num] = summarize_surface(surfaces[pass_num], min_trades=min_trades)
+
+        if best_pass_num not in surfaces:
+            surfaces[best_pass_num] = compute_rolling_surface(best_engine, start_dt, end_dt, window_days, step_days)
+            summaries[best_pass_num] = summarize_surface(surfaces[best_pass_num], min_trades=min_trades)
+
+        index_file = save_rolling_surfaces(self._get_results_dir(), surfaces, summaries, window_days)
+
+        worst = summaries.get(best_pass_num, {})
+        longest = str(max(window_days))
+        longest_stats = worst.get(longest) or {}
+        # Informational: kept with the forward windows, not in state['gates'],
+        # so it never counts towards all_gates_passed()
+        gate = None
+        if longest_stats.get('active_windows'):
+            gate = gates.check_rolling_profitable_windows(
+                float(longest_stats.get('profitable_pct', 0) or 0), int(longest)
+            ).to_dict()
+
+        self._log(f"Rolling surfaces saved for {len(surfaces)} passes: {index_file}")
+        return {
+            'index_file': index_file,
+            'window_days': window_days,
+            'step_days': step_days,
+            'min_trades': min_trades,
+            'pass_count': len(surfaces),
+            'worst': worst,
+            'gate': gate,
+        }
+
+    def _multi_pair_terminals(self) -> list[str]:
+        """Terminals Step 14 children run on (MULTI_PAIR_TERMINALS, default: this workflow's terminal)."""
+        names = [str(t).strip() for t in (getattr(settings, 'MULTI_PAIR_TERMINALS', None) or []) if str(t).strip()]
+        known = getattr(self.registry, 'terminals', {}) or {}
+        unknown = [t for t in names if t not in known]
+        if unknown:
+            self._log(f"Warning: unknown MULTI_PAIR_TERMINALS ignored: {', '.join(unknown)}")
+        names = list(dict.fromkeys(t for t in names if t in known))
+        return names or [self.terminal.get('name')]
+
     def _step_multi_pair(self) -> tuple[bool, dict]:
-        """Step 14: Run the workflow on additional symbols (optimized per symbol)."""
+        """Step 14: Run the workflow on additional symbols (optimized per symbol).
+
+        Children reuse this workflow's Steps 1-3 and run concurrently, one per
+        terminal in MULTI_PAIR_TERMINALS.
+        """
         symbols = self.multi_pair_symbols
         if symbols is None:
             symbols = list(getattr(settings, 'MULTI_PAIR_SYMBOLS', []) or [])
@@ -2294,33 +2536,82 @@ class WorkflowRunner:
             self.state.set('multi_pair_runs', result)
             return True, result
 
-        runs: list[dict] = []
-
-        for sym in symbols:
+        terminals = self._multi_pair_terminals()
+        self._log(f"Multi-pair: {len(symbols)} symbol(s) across terminal(s) {', '.join(terminals)}")
+
+        # Combined progress for all children, published to state as they advance
+        progress = {sym: {'symbol': sym, 'status': 'queued', 'step': None, 'steps_done': 0} for sym in symbols}
+        progress_lock = threading.Lock()
+
+        def publish(line: Optional[str] = None) -> None:
+            with progress_lock:
+                runs = [dict(progress[sym]) for sym in symbols]
+                done = sum(1 for r in runs if r.get('finished'))
+                self.state.set('multi_pair_runs', {
+                    'success': True,
+                    'in_progress': True,
+                    'symbol_count': len(symbols),
+                    'symbols': symbols,
+                    'terminals': terminals,
+                    'runs': runs,
+                })
+            if line:
+                self._log(f"Multi-pair [{done}/{len(symbols)} done]: {line}")
+
+        free_terminals: queue.Queue = queue.Queue()
+        for name in terminals:
+            free_terminals.put(name)
+        # Children share this runner's 'reports' lease, so their Step 11 renders are
+        # serialized with ours; their terminal leases stay private (Step 14 holds ours)
+        leases = self._step_leases()
+        tracer = self._tracer()
+        step_span = tracing.current_span()
+
+        def run_child(sym: str) -> dict:
+            terminal_name = free_terminals.get()
+            entry = progress[sym]
             try:
-                self._log(f"Multi-pair: starting {sym} {self.timeframe}")
+                with progress_lock:
+                    entry.update({'status': 'running', 'terminal': terminal_name})
+                publish(f"starting {sym} {self.timeframe} on {terminal_name}")
+
+                def on_child_step(step_name: str, passed: bool, result: dict) -> None:
+                    with progress_lock:
+                        entry['step'] = step_name
+                        entry['steps_done'] += 1
+                    publish(f"{sym} {step_name} {'PASSED' if passed else 'FAILED'}")
+
                 child = WorkflowRunner(
                     ea_path=str(self.ea_path),
-                    terminal_name=self.terminal.get('name'),
+                    terminal_name=terminal_name,
                     symbol=sym,
                     timeframe=self.timeframe,
                     auto_run_stress_scenarios=True,
                     auto_stats_analysis=True,
                     auto_run_forward_windows=True,
                     auto_run_multi_pair=False,  # prevent recursion
-                    on_progress=self.on_progress,
+                    on_step_complete=on_child_step,
+                    on_progress=(lambda m: self.on_progress(f"[{sym}] {m}")) if self.on_progress else None,
                 )
-
-                # Phase 1 (Steps 1-3) then continue with reused params/ranges
-                child.run(stop_on_failure=False, pause_for_analysis=True)
+                child._leases = leases.scoped(f'multi_pair:{sym}')
+                with progress_lock:
+                    entry['workflow_id'] = child.state.workflow_id
+                # The child traces to its own runs/<child id>/trace.jsonl; its step
+                # spans point at this multi_pair:<sym> span as their parent
+                child_span = tracing.current_span()
+                if child_span is not None:
+                    child_span.set(workflow_id=child.state.workflow_id)
+
+                # Steps 1-3 are symbol independent: reuse this workflow's artifacts
+                child.adopt_prepared(self)
                 summary = child.continue_with_params(
                     wide_validation_params=self.wide_validation_params,
                     optimization_ranges=self.param_ranges,
                     stop_on_failure=False,
                 )
-
-                runs.append({
+                run = {
                     'symbol': sym,
+                    'terminal': terminal_name,
                     'workflow_id': summary.get('workflow_id'),
                     'status': summary.get('status'),
                     'dashboard_path': summary.get('dashboard_path'),
@@ -2328,18 +2619,41 @@ class WorkflowRunner:
                     'boards_path': summary.get('boards_path'),
                     'composite_score': summary.get('composite_score'),
                     'go_live': summary.get('go_live'),
-                })
+                }
+                finished = 'completed'
             except Exception as e:
-                runs.append({
+                run = {
                     'symbol': sym,
+                    'terminal': terminal_name,
                     'success': False,
                     'error': str(e),
-                })
+                }
+                finished = 'failed'
+            finally:
+                free_terminals.put(terminal_name)
+
+            with progress_lock:
+                entry.update({**run, 'status': run.get('status') or finished, 'finished': finished})
+            publish(f"{sym} {finished}")
+            return run
+
+        def traced_child(sym: str) -> dict:
+            with tracing.activate(tracer, parent=step_span):
+                with tracing.span(f'multi_pair:{sym}', cat='multi_pair', symbol=sym):
+                    return run_child(sym)
+
+        if len(terminals) > 1 and len(symbols) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(len(terminals), len(symbols))) as pool:
+                runs = list(pool.map(traced_child, symbols))
+        else:
+            runs = [traced_child(sym) for sym in symbols]
 
         result = {
             'success': True,
             'symbol_count': len(symbols),
             'symbols': symbols,
+            'terminals': terminals,
             'runs': runs,
         }
 
@@ -2349,7 +2663,8 @@ class WorkflowRunner:
         boards_path = None
         try:
             from reports.boards import generate_boards
-            boards_path = generate_boards(open_browser=False)
+            with self._step_leases().hold('reports'):
+                boards_path = generate_boards(open_browser=False)
         except Exception as e:
             self._log(f"Warning: Multi-pair boards regeneration failed: {e}")
 
@@ -2507,33 +2822,15 @@ class WorkflowRunner:
     def _run_reopt_steps(self, stop_on_failure: bool = True) -> dict:
         """Run Steps 6-8 for re-optimization."""
         reopt_steps = [
-            ('6_create_ini', self._step_create_ini),
-            ('7_run_optimization', self._step_run_optimization),
-            ('8_parse_results', self._step_parse_results),
+            StepSpec('6_create_ini', self._step_create_ini, produces=('optimization_ini',)),
+            StepSpec('7_run_optimization', self._step_run_optimization, kind='mt5',
+                     requires=('optimization_ini',), produces=('optimization_report',)),
+            StepSpec('8_parse_results', self._step_parse_results,
+                     requires=('optimization_report',), produces=('optimization_results',)),
         ]
 
-        all_passed = True
-
-        for step_name, step_func in reopt_steps:
-            self._log(f"Starting step: {step_name} (re-optimization)")
-            self.state.start_step(step_name)
-
-            try:
-                passed, result = step_func()
-            except Exception as e:
-                passed = False
-                result = {'error': str(e)}
-                self.state.complete_step(step_name, False, result, str(e))
-
-            self._step_done(step_name, passed, result)
-
-            if not passed:
-                all_passed = False
-                self._log(f"Step {step_name} FAILED")
-                if stop_on_failure:
-                    break
-            else:
-                self._log(f"Step {step_name} PASSED")
+        outcomes = self._run_steps(reopt_steps, stop_on_failure, label=' (re-optimization)')
+        all_passed = all(outcomes.values())
 
         # Update status
         if all_passed:
@@ -0,0 +1,261 @@
+"""
+Step Scheduler
+
+Runs workflow steps as a dependency graph instead of a fixed list.
+
+Each step declares the artifacts it requires and produces; a step depends on
+the steps (in the same graph) that produce what it requires. Artifacts that
+no step in the graph produces come from earlier phases and are assumed to be
+available. Ready steps run concurrently on a thread pool:
+
+- 'python' steps (Monte Carlo, forward windows, reports) only wait for their
+  dependencies and any extra resources they declare
+- 'mt5' steps also take the terminal lease, so one terminal never runs two
+  tester jobs at once
+
+Step callables run on worker threads; start/done callbacks run on the
+calling thread in completion order, so state checkpoints stay serialized.
+
+stop_on_failure: once any step fails, pending steps are skipped unless they
+are marked `always` (post-steps such as report generation).
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+STEP_KINDS = ('python', 'mt5')
+
+
+@dataclass
+class StepSpec:
+    """A workflow step and its place in the graph."""
+    name: str
+    fn: Callable[[], tuple[bool, dict]]
+    requires: tuple[str, ...] = ()
+    produces: tuple[str, ...] = ()
+    kind: str = 'python'
+    resources: tuple[str, ...] = ()
+    always: bool = False
+
+
+class Leases:
+    """Named exclusive leases (terminals, report output) shared by one scheduler run."""
+
+    def __init__(self):
+        self._held: set[str] = set()
+        self._cond = threading.Condition()
+        self._scope: Optional[str] = None
+        self._shared: frozenset[str] = frozenset()
+
+    def scoped(self, scope: str, shared: Iterable[str] = ('reports',)) -> 'Leases':
+        """
+        View of this registry for a nested runner (e.g. a Step 14 child).
+
+        The shared leases are the same ones the owner takes; every other lease
+        name is private to the scope, so the view never waits on the owner's
+        terminal leases.
+        """
+        view = Leases()
+        view._held = self._held
+        view._cond = self._cond
+        view._scope = f'{self._scope}/{scope}' if self._scope else scope
+        view._shared = frozenset(shared)
+        return view
+
+    def _keys(self, names: Iterable[str]) -> set[str]:
+        if self._scope is None:
+            return set(names)
+        return {n if n in self._shared else f'{self._scope}/{n}' for n in names}
+
+    def try_acquire(self, names: Iterable[str]) -> bool:
+        """Take all leases at once, or none if any is held."""
+        names = self._keys(names)
+        with self._cond:
+            if names & self._held:
+                return False
+            self._held |= names
+            return True
+
+    def release(self, names: Iterable[str]) -> None:
+        with self._cond:
+            self._held -= self._keys(names)
+            self._cond.notify_all()
+
+    def wait(self, timeout: float) -> None:
+        """Wait until some lease is released (or the timeout passes)."""
+        with self._cond:
+            self._cond.wait(timeout)
+
+    @contextmanager
+    def hold(self, name: str):
+        """Block until the lease is free and hold it for the block."""
+        key, = self._keys([name])
+        with self._cond:
+            while key in self._held:
+                self._cond.wait()
+            self._held.add(key)
+        try:
+            yield
+        finally:
+            self.release([name])
+
+
+def terminal_lease(terminal: Optional[str]) -> str:
+    """Lease name for an MT5 terminal."""
+    return f"terminal:{terminal or 'default'}"
+
+
+class StepScheduler:
+    """Executes a step graph, running ready steps concurrently."""
+
+    def __init__(
+        self,
+        steps: list[StepSpec],
+        terminal: Optional[str] = None,
+        max_workers: int = 1,
+        leases: Optional[Leases] = None,
+    ):
+        """
+        Args:
+            steps: Steps in priority order (earlier steps start first when ready)
+            terminal: Terminal name for the MT5 lease
+            max_workers: Concurrent steps (1 runs steps one by one on the calling thread)
+            leases: Lease registry (default: a new one for this scheduler)
+
+        Raises:
+            ValueError: On duplicate names/producers, unknown kinds or cycles
+        """
+        self.steps = list(steps)
+        self.max_workers = max(1, int(max_workers or 1))
+        self.leases = leases or Leases()
+        self.terminal_lease = terminal_lease(terminal)
+        self.deps = self._build_graph()
+
+    def _build_graph(self) -> dict[str, list[str]]:
+        producers: dict[str, str] = {}
+        names = set()
+        for spec in self.steps:
+            if spec.name in names:
+                raise ValueError(f"Duplicate step: {spec.name}")
+            if spec.kind not in STEP_KINDS:
+                raise ValueError(f"Unknown step kind for {spec.name}: {spec.kind}")
+            names.add(spec.name)
+            for artifact in spec.produces:
+                if artifact in producers:
+                    raise ValueError(f"'{artifact}' produced by both {producers[artifact]} and {spec.name}")
+                producers[artifact] = spec.name
+
+        deps = {}
+        for spec in self.steps:
+            found = [producers[a] for a in spec.requires if a in producers and producers[a] != spec.name]
+            deps[spec.name] = list(dict.fromkeys(found))
+
+        # Reject cycles (every step must become ready eventually)
+        done: set[str] = set()
+        remaining = [s.name for s in self.steps]
+        while remaining:
+            ready = [n for n in remaining if all(d in done for d in deps[n])]
+            if not ready:
+                raise ValueError(f"Step dependency cycle among: {', '.join(remaining)}")
+            done.update(ready)
+            remaining = [n for n in remaining if n not in done]
+        return deps
+
+    def _resources(self, spec: StepSpec) -> list[str]:
+        resources = list(spec.resources)
+        if spec.kind == 'mt5':
+            resources.append(self.terminal_lease)
+        return resources
+
+    @staticmethod
+    def _call(spec: StepSpec) -> tuple[bool, dict, Optional[str]]:
+        try:
+            passed, result = spec.fn()
+            return bool(passed), result, None
+        except Exception as e:
+            return False, {'error': str(e)}, str(e)
+
+    def run(
+        self,
+        stop_on_failure: bool = True,
+        on_start: Optional[Callable[[str], None]] = None,
+        on_done: Optional[Callable[[str, bool, dict, Optional[str]], None]] = None,
+        on_skip: Optional[Callable[[str], None]] = None,
+    ) -> dict[str, Optional[bool]]:
+        """
+        Run the graph to completion.
+
+        Args:
+            stop_on_failure: Skip non-`always` steps once a step has failed
+            on_start: Called with the step name before it starts
+            on_done: Called with (name, passed, result, error); error is set
+                when the step raised
+            on_skip: Called with the name of each skipped step
+
+        Returns:
+            {step name: True (passed) / False (failed) / None (skipped)}
+        """
+        outcomes: dict[str, Optional[bool]] = {}
+        pending = list(self.steps)
+        running: dict = {}
+        failed = False
+        pool = ThreadPoolExecutor(max_workers=self.max_workers) if self.max_workers > 1 else None
+
+        def finish(spec: StepSpec, passed: bool, result: dict, error: Optional[str]) -> None:
+            nonlocal failed
+            outcomes[spec.name] = passed
+            if not passed:
+                failed = True
+            if on_done:
+                on_done(spec.name, passed, result, error)
+
+        try:
+            while pending or running:
+                launched = False
+                for spec in list(pending):
+                    if any(d not in outcomes for d in self.deps[spec.name]):
+                        continue
+                    if stop_on_failure and failed and not spec.always:
+                        pending.remove(spec)
+                        outcomes[spec.name] = None
+                        if on_skip:
+                            on_skip(spec.name)
+                        continue
+                    if len(running) >= self.max_workers:
+                        continue
+                    resources = self._resources(spec)
+                    if not self.leases.try_acquire(resources):
+                        continue
+                    pending.remove(spec)
+                    launched = True
+                    if on_start:
+                        on_start(spec.name)
+                    if pool is None:
+                        try:
+                            outcome = self._call(spec)
+                        finally:
+                            self.leases.release(resources)
+                        finish(spec, *outcome)
+                        break  # re-evaluate readiness in priority order
+                    running[pool.submit(self._call, spec)] = (spec, resources)
+
+                if not running:
+                    if pending and not launched:
+                        # Everything ready is waiting on a lease held outside this run
+                        self.leases.wait(0.5)
+                    continue
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                order = {s.name: i for i, s in enumerate(self.steps)}
+                for future in sorted(done, key=lambda f: order[running[f][0].name]):
+                    spec, resources = running.pop(future)
+                    self.leases.release(resources)
+                    finish(spec, *future.result())
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+        return outcomes
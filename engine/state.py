@@ -3,9 +3,21 @@ Workflow State Manager
 
 Manages persistent state for EA stress test workflows.
 State is saved as JSON after each step for recovery and auditing.
+
+Persistence:
+- Small states are rewritten atomically on every update (workflow_<id>.json).
+- Once the snapshot is large (settings.STATE_JOURNAL_MIN_SNAPSHOT_BYTES), updates
+  are appended as small JSON-lines deltas to workflow_<id>.journal.jsonl (fsynced)
+  and a background compaction rewrites the full snapshot when the journal grows.
+
+The snapshot records the last journal sequence it contains (_journal_seq), so a
+crash at any point replays exactly the deltas that are missing. A torn final
+journal line (crash mid-append) is ignored. Use load_state_file() to read the
+current state; readers of the plain snapshot see the last compacted state.
 """
 import json
 import os
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Any
@@ -15,6 +27,89 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import settings
 
 
+JOURNAL_SUFFIX = '.journal.jsonl'
+SNAPSHOT_SEQ_KEY = '_journal_seq'
+
+
+def journal_path_for(state_file: Path) -> Path:
+    """Journal file next to a workflow snapshot (workflow_<id>.journal.jsonl)."""
+    state_file = Path(state_file)
+    return state_file.with_name(state_file.stem + JOURNAL_SUFFIX)
+
+
+def _copy_tree(value: Any) -> Any:
+    """Copy the dicts and lists of a JSON-like tree (leaf values are shared)."""
+    if isinstance(value, dict):
+        return {k: _copy_tree(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(v) for v in value]
+    return value
+
+
+def _apply_op(state: dict, op: dict) -> None:
+    """Apply one journal operation (set / merge / append at a key path)."""
+    path = list(op.get('path') or [])
+    if not path:
+        return
+    target = state
+    for key in path[:-1]:
+        nxt = target.get(key)
+        if not isinstance(nxt, dict):
+            nxt = {}
+            target[key] = nxt
+        target = nxt
+    last = path[-1]
+    kind = op.get('op', 'set')
+    if kind == 'merge':
+        if not isinstance(target.get(last), dict):
+            target[last] = {}
+        target[last].update(op.get('value') or {})
+    elif kind == 'append':
+        if not isinstance(target.get(last), list):
+            target[last] = []
+        target[last].append(op.get('value'))
+    else:
+        target[last] = op.get('value')
+
+
+def _replay_journal(state: dict, journal_path: Path, after_seq: int) -> int:
+    """Apply journal entries with seq > after_seq. Returns the last applied seq."""
+    last = after_seq
+    if not journal_path.exists():
+        return last
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except Exception:
+                break  # torn write from a crash: nothing after it was acknowledged
+            seq = int(entry.get('seq', 0) or 0)
+            if seq <= after_seq:
+                continue
+            for op in entry.get('ops') or []:
+                _apply_op(state, op)
+            last = seq
+    return last
+
+
+def _read_state(state_file: Path) -> tuple[dict, int, int]:
+    """Load snapshot + journal. Returns (state, snapshot_seq, last_seq)."""
+    with open(state_file, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    snapshot_seq = int(state.pop(SNAPSHOT_SEQ_KEY, 0) or 0)
+    last_seq = _replay_journal(state, journal_path_for(state_file), snapshot_seq)
+    return state, snapshot_seq, last_seq
+
+
+def load_state_file(state_file: str) -> dict:
+    """Read a workflow state file including journal deltas not yet compacted."""
+    state, _, _ = _read_state(Path(state_file))
+    return state
+
+
 class StateManager:
     """
     Manages workflow state with persistence.
@@ -109,6 +204,7 @@ class StateManager:
             'backtest_dates': settings.get_backtest_dates(),
         }
 
+        self._init_persistence()
         self._save()
 
     @classmethod
@@ -124,8 +220,7 @@ class StateManager:
         if not state_file.exists():
             raise FileNotFoundError(f"Workflow not found: {workflow_id}")
 
-        with open(state_file, 'r') as f:
-            state = json.load(f)
+        state, snapshot_seq, last_seq = _read_state(state_file)
 
         # Create instance without initializing new state
         instance = cls.__new__(cls)
@@ -133,6 +228,7 @@ class StateManager:
         instance.workflow_id = workflow_id
         instance.state_file = state_file
         instance.state = state
+        instance._init_persistence(snapshot_seq, last_seq)
 
         return instance
 
@@ -152,27 +248,40 @@ class StateManager:
         if not self.state_file.exists():
             raise FileNotFoundError(f"Workflow not found: {self.workflow_id}")
 
-        with open(self.state_file, 'r') as f:
-            self.state = json.load(f)
+        self.wait_for_compaction()
+        state, snapshot_seq, last_seq = _read_state(self.state_file)
+        self.state = state
+        self._init_persistence(snapshot_seq, last_seq)
 
     @classmethod
     def list_workflows(cls, runs_dir: Optional[str] = None) -> list[dict]:
         """List all workflow states."""
         runs_dir = Path(runs_dir or settings.RUNS_DIR)
 
+        if getattr(settings, 'WORKFLOW_CATALOG', True):
+            try:
+                from reports.catalog import open_catalog
+                catalog = open_catalog(str(runs_dir))
+                try:
+                    catalog.sync()
+                    return catalog.list_workflows()
+                finally:
+                    catalog.close()
+            except Exception as e:
+                print(f"Warning: workflow catalog unavailable, scanning JSON files: {e}", file=sys.stderr)
+
         workflows = []
         for f in sorted(runs_dir.glob('workflow_*.json'), reverse=True):
             try:
-                with open(f, 'r') as fp:
-                    state = json.load(fp)
-                    workflows.append({
-                        'workflow_id': state['workflow_id'],
-                        'ea_name': state['ea_name'],
-                        'status': state['status'],
-                        'created_at': state['created_at'],
-                        'current_step': state['current_step'],
-                        'file': str(f),
-                    })
+                state = load_state_file(f)
+                workflows.append({
+                    'workflow_id': state['workflow_id'],
+                    'ea_name': state['ea_name'],
+                    'status': state['status'],
+                    'created_at': state['created_at'],
+                    'current_step': state['current_step'],
+                    'file': str(f),
+                })
             except Exception as e:
                 # Don't silently hide corrupted workflows; surface them and log the error.
                 try:
@@ -191,18 +300,185 @@ class StateManager:
 
         return workflows
 
-    def _save(self) -> None:
-        """Save state to JSON file."""
-        self.state['updated_at'] = datetime.now().isoformat()
-        tmp_path = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+    def _init_persistence(self, snapshot_seq: int = 0, last_seq: int = 0) -> None:
+        """Set up journal bookkeeping (sequence numbers, locks, sizes)."""
+        self.journal_file = journal_path_for(self.state_file)
+        self._lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_seq = snapshot_seq
+        self._seq = max(snapshot_seq, last_seq)
+        # Serialization generation: orders snapshot writes even when seq is unchanged
+        self._gen = 0
+        self._written_gen = 0
+        self._compactor: Optional[threading.Thread] = None
+        try:
+            self._snapshot_bytes = self.state_file.stat().st_size
+        except OSError:
+            self._snapshot_bytes = 0
+        try:
+            self._journal_bytes = self.journal_file.stat().st_size
+        except OSError:
+            self._journal_bytes = 0
+
+    def _journal_active(self) -> bool:
+        """Journal deltas only pay off once the full snapshot is large."""
+        if not bool(getattr(settings, 'STATE_JOURNAL', True)):
+            return False
+        min_bytes = int(getattr(settings, 'STATE_JOURNAL_MIN_SNAPSHOT_BYTES', 256 * 1024) or 0)
+        return self._snapshot_bytes >= min_bytes
+
+    def _write_snapshot(self, text: str, seq: int, gen: int) -> bool:
+        """Atomically replace the snapshot unless a newer one was already written."""
+        with self._snapshot_lock:
+            if gen < self._written_gen:
+                return False
+            tmp_path = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                try:
+                    os.fsync(f.fileno())
+                except Exception:
+                    pass
+            os.replace(tmp_path, self.state_file)
+            self._snapshot_seq = seq
+            self._written_gen = gen
+            self._snapshot_bytes = len(text)
+            return True
+
+    def _snapshot_data(self, copy: bool = False) -> tuple[dict, int, int]:
+        """
+        Full state with its journal position. Call under self._lock.
+
+        With copy=True the state tree is copied, so it can be serialized after
+        the lock is released while mutators keep changing self.state.
+        """
+        data = _copy_tree(self.state) if copy else self.state
+        if self._seq:
+            data = {**data, SNAPSHOT_SEQ_KEY: self._seq}
+        self._gen += 1
+        return data, self._seq, self._gen
+
+    def _snapshot_text(self) -> tuple[str, int, int]:
+        """Serialize the full state (with its journal position). Call under self._lock."""
+        data, seq, gen = self._snapshot_data()
+        return json.dumps(data, indent=2, default=str), seq, gen
+
+    def _trim_journal(self) -> None:
+        """Drop journal entries already contained in the snapshot. Call under self._lock."""
+        if not self.journal_file.exists():
+            self._journal_bytes = 0
+            return
+        if self._seq <= self._snapshot_seq:
+            self.journal_file.unlink()
+            self._journal_bytes = 0
+            return
+
+        keep = []
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except Exception:
+                    break
+                if int(entry.get('seq', 0) or 0) > self._snapshot_seq:
+                    keep.append(line if line.endswith('\n') else line + '\n')
+
+        tmp_path = self.journal_file.with_suffix(self.journal_file.suffix + ".tmp")
         with open(tmp_path, 'w', encoding='utf-8') as f:
-            json.dump(self.state, f, indent=2, default=str)
+            f.writelines(keep)
             f.flush()
             try:
                 os.fsync(f.fileno())
             except Exception:
                 pass
-        os.replace(tmp_path, self.state_file)
+        os.replace(tmp_path, self.journal_file)
+        self._journal_bytes = sum(len(line) for line in keep)
+
+    def _save(self) -> None:
+        """Save the full state snapshot (atomic replace) and drop the journal."""
+        with self._lock:
+            self.state['updated_at'] = datetime.now().isoformat()
+            text, seq, gen = self._snapshot_text()
+            self._write_snapshot(text, seq, gen)
+            self._trim_journal()
+
+    def _commit(self, ops: list[dict]) -> None:
+        """
+        Persist a state change.
+
+        Small states are rewritten in full; large states append one fsynced
+        journal line holding the operations and compact in the background.
+        """
+        with self._lock:
+            now = datetime.now().isoformat()
+            self.state['updated_at'] = now
+            if not self._journal_active():
+                self._save()
+                return
+
+            self._seq += 1
+            entry = {'seq': self._seq, 'ops': ops + [{'op': 'set', 'path': ['updated_at'], 'value': now}]}
+            line = json.dumps(entry, default=str, separators=(',', ':')) + '\n'
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                try:
+                    os.fsync(f.fileno())
+                except Exception:
+                    pass
+            self._journal_bytes += len(line)
+
+            compact_bytes = int(getattr(settings, 'STATE_JOURNAL_COMPACT_BYTES', 4 * 1024 * 1024) or 0)
+            if self._journal_bytes >= compact_bytes:
+                self.compact(wait=False)
+
+    def compact(self, wait: bool = True) -> None:
+        """
+        Write a full snapshot and trim the journal.
+
+        Args:
+            wait: Compact synchronously; otherwise start a background compaction
+                  (no-op if one is already running).
+        """
+        if wait:
+            self.wait_for_compaction()
+            with self._lock:
+                text, seq, gen = self._snapshot_text()
+                self._write_snapshot(text, seq, gen)
+                self._trim_journal()
+            return
+
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(
+                target=self._compact_background,
+                name=f"state-compact-{self.workflow_id}",
+                daemon=True,
+            )
+            self._compactor.start()
+
+    def _compact_background(self) -> None:
+        try:
+            with self._lock:
+                data, seq, gen = self._snapshot_data(copy=True)
+            # Serialization and the file write happen outside the state lock so updates keep flowing
+            text = json.dumps(data, indent=2, default=str)
+            if self._write_snapshot(text, seq, gen):
+                with self._lock:
+                    self._trim_journal()
+        except Exception as e:
+            try:
+                print(f"Warning: state compaction failed for {self.workflow_id}: {e}", file=sys.stderr)
+            except Exception:
+                pass
+
+    def wait_for_compaction(self) -> None:
+        """Block until a running background compaction has finished."""
+        compactor = getattr(self, '_compactor', None)
+        if compactor is not None and compactor.is_alive():
+            compactor.join()
 
     def save(self) -> None:
         """Save state to disk (public alias for compatibility)."""
@@ -217,14 +493,19 @@ class StateManager:
 
     def start_step(self, step_name: str) -> None:
         """Mark a step as started."""
-        self.state['status'] = 'in_progress'
-        self.state['current_step'] = self.get_step_index(step_name)
-        self.state['steps'][step_name] = {
-            'status': 'in_progress',
-            'started_at': datetime.now().isoformat(),
-            'result': None,
-        }
-        self._save()
+        with self._lock:
+            self.state['status'] = 'in_progress'
+            self.state['current_step'] = self.get_step_index(step_name)
+            self.state['steps'][step_name] = {
+                'status': 'in_progress',
+                'started_at': datetime.now().isoformat(),
+                'result': None,
+            }
+            self._commit([
+                {'op': 'set', 'path': ['status'], 'value': self.state['status']},
+                {'op': 'set', 'path': ['current_step'], 'value': self.state['current_step']},
+                {'op': 'set', 'path': ['steps', step_name], 'value': self.state['steps'][step_name]},
+            ])
 
     def complete_step(
         self,
@@ -234,46 +515,57 @@ class StateManager:
         error: Optional[str] = None,
     ) -> None:
         """Mark a step as completed."""
-        step_data = self.state['steps'].get(step_name, {})
-        step_data['status'] = 'passed' if passed else 'failed'
-        step_data['completed_at'] = datetime.now().isoformat()
-        step_data['result'] = result
-
-        if error:
-            step_data['error'] = error
-            self.state['errors'].append({
-                'step': step_name,
-                'error': error,
-                'timestamp': datetime.now().isoformat(),
-            })
-
-        self.state['steps'][step_name] = step_data
-
-        # Update overall status if step failed
-        if not passed:
-            self.state['status'] = 'failed'
-
-        self._save()
+        with self._lock:
+            step_data = self.state['steps'].get(step_name, {})
+            step_data['status'] = 'passed' if passed else 'failed'
+            step_data['completed_at'] = datetime.now().isoformat()
+            step_data['result'] = result
+
+            ops = []
+            if error:
+                step_data['error'] = error
+                error_entry = {
+                    'step': step_name,
+                    'error': error,
+                    'timestamp': datetime.now().isoformat(),
+                }
+                self.state['errors'].append(error_entry)
+                ops.append({'op': 'append', 'path': ['errors'], 'value': error_entry})
+
+            self.state['steps'][step_name] = step_data
+            ops.append({'op': 'set', 'path': ['steps', step_name], 'value': step_data})
+
+            # Update overall status if step failed
+            if not passed:
+                self.state['status'] = 'failed'
+                ops.append({'op': 'set', 'path': ['status'], 'value': 'failed'})
+
+            self._commit(ops)
 
     def update_metrics(self, metrics: dict) -> None:
         """Update the metrics dictionary."""
-        self.state['metrics'].update(metrics)
-        self._save()
+        with self._lock:
+            self.state['metrics'].update(metrics)
+            self._commit([{'op': 'merge', 'path': ['metrics'], 'value': metrics}])
 
     def update_gates(self, gates: dict) -> None:
         """Update the gates dictionary."""
-        self.state['gates'].update(gates)
-        self._save()
+        with self._lock:
+            self.state['gates'].update(gates)
+            self._commit([{'op': 'merge', 'path': ['gates'], 'value': gates}])
 
     def set_status(self, status: str) -> None:
         """Set overall workflow status."""
-        self.state['status'] = status
-        self._save()
+        with self._lock:
+            self.state['status'] = status
+            self._commit([{'op': 'set', 'path': ['status'], 'value': status}])
 
     def complete_workflow(self, passed: bool) -> None:
         """Mark workflow as complete."""
         self.state['status'] = 'completed' if passed else 'failed'
         self.state['completed_at'] = datetime.now().isoformat()
+        # Final state is always written as a full snapshot
+        self.wait_for_compaction()
         self._save()
 
     def get(self, key: str, default: Any = None) -> Any:
@@ -282,8 +574,9 @@ class StateManager:
 
     def set(self, key: str, value: Any) -> None:
         """Set a value in state."""
-        self.state[key] = value
-        self._save()
+        with self._lock:
+            self.state[key] = value
+            self._commit([{'op': 'set', 'path': [key], 'value': value}])
 
     def get_step_result(self, step_name: str) -> Optional[dict]:
         """Get the result of a specific step."""
@@ -309,28 +602,30 @@ class StateManager:
 
     def get_summary(self) -> dict:
         """Get a summary of the workflow state."""
-        steps_passed = sum(
-            1 for s in self.state['steps'].values()
-            if s.get('status') == 'passed'
-        )
-        steps_failed = sum(
-            1 for s in self.state['steps'].values()
-            if s.get('status') == 'failed'
-        )
-
-        return {
-            'workflow_id': self.workflow_id,
-            'ea_name': self.state['ea_name'],
-            'status': self.state['status'],
-            'current_step': self.state['current_step'],
-            'total_steps': len(self.STEPS),
-            'steps_passed': steps_passed,
-            'steps_failed': steps_failed,
-            'all_gates_passed': self.all_gates_passed(),
-            'metrics': self.state['metrics'],
-            'errors': self.state['errors'],
-        }
+        with self._lock:
+            steps_passed = sum(
+                1 for s in self.state['steps'].values()
+                if s.get('status') == 'passed'
+            )
+            steps_failed = sum(
+                1 for s in self.state['steps'].values()
+                if s.get('status') == 'failed'
+            )
+
+            return {
+                'workflow_id': self.workflow_id,
+                'ea_name': self.state['ea_name'],
+                'status': self.state['status'],
+                'current_step': self.state['current_step'],
+                'total_steps': len(self.STEPS),
+                'steps_passed': steps_passed,
+                'steps_failed': steps_failed,
+                'all_gates_passed': self.all_gates_passed(),
+                'metrics': self.state['metrics'],
+                'errors': self.state['errors'],
+            }
 
     def to_dict(self) -> dict:
         """Return full state as dictionary."""
-        return self.state.copy()
+        with self._lock:
+            return self.state.copy()
@@ -5,15 +5,27 @@ Manages multiple MT5 terminal configurations for the stress test system.
 """
 import json
 import os
+import sys
 from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+
+# Environment override of settings.TERMINALS_FILE
+TERMINALS_ENV = 'EA_STRESS_TERMINALS'
+
+
+def default_config_path() -> Path:
+    """Registry file used when none is given ($EA_STRESS_TERMINALS, then TERMINALS_FILE)."""
+    return Path(os.environ.get(TERMINALS_ENV) or getattr(settings, 'TERMINALS_FILE', None) or 'terminals.json')
+
 
 class TerminalRegistry:
     """Manages MT5 terminal configurations."""
 
-    def __init__(self, config_path: str = "terminals.json"):
-        self.config_path = Path(config_path)
+    def __init__(self, config_path: Optional[str] = None):
+        self.config_path = Path(config_path) if config_path else default_config_path()
         self.terminals = {}
         self._active_terminal = None
         self._load()
@@ -142,6 +154,6 @@ class TerminalRegistry:
 
 
 # Convenience function for quick access
-def get_registry(config_path: str = "terminals.json") -> TerminalRegistry:
+def get_registry(config_path: Optional[str] = None) -> TerminalRegistry:
     """Get a terminal registry instance."""
     return TerminalRegistry(config_path)
@@ -0,0 +1,445 @@
+"""
+Workflow Tracing
+
+Lightweight nested spans recording where a workflow spends its time: wall
+time, CPU time of the span's thread and (optionally, via tracemalloc) the
+peak Python memory allocated while it was open.
+
+A Tracer belongs to one workflow and appends each finished span to
+runs/<workflow_id>/trace.jsonl, so a resumed workflow (continue_with_params
+after a pause) keeps adding to the same trace. Multi-pair children have
+their own traces; their step spans name the parent workflow's
+multi_pair:<symbol> span (which records the child's workflow_id) as parent. Code marks work with
+`span(name)` or `@traced(name)`; both are no-ops on threads where no tracer
+is active, so modules/* stay usable outside a workflow.
+
+Long wall time with little CPU time is time spent waiting on MT5 (tester
+runs, report files); CPU-heavy spans are parsing, Monte Carlo and reports.
+
+Traces export to Chrome trace event JSON (chrome://tracing, ui.perfetto.dev)
+with one process per workflow and one track per thread.
+
+Usage:
+    tracer = Tracer(workflow_id, path=trace_path(workflow_id))
+    with activate(tracer), span('step:9_backtest_robust', kind='mt5'):
+        ...
+"""
+
+import functools
+import json
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import settings
+
+TRACE_FILE = 'trace.jsonl'
+
+_local = threading.local()
+
+# Tracers recording memory share tracemalloc; it is stopped again once the
+# last of them closes (unless something else had started it)
+_memory_lock = threading.Lock()
+_memory_users = 0
+_memory_started = False
+
+
+def trace_path(workflow_id: str, runs_dir: Optional[str] = None) -> Path:
+    """Trace file of a workflow (runs/<workflow_id>/trace.jsonl)."""
+    return Path(runs_dir or settings.RUNS_DIR) / workflow_id / TRACE_FILE
+
+
+class Span:
+    """An open span; use through Tracer.span() or span()."""
+
+    __slots__ = (
+        'tracer', 'name', 'cat', 'attrs', 'id', 'parent', 'depth',
+        'ts', '_t0', '_c0', '_mem_start', '_mem_peak',
+    )
+
+    def __init__(self, tracer: 'Tracer', name: str, cat: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.attrs = attrs
+        self.id = uuid.uuid4().hex[:16]
+        self.parent = None
+        self.depth = 0
+        self._mem_start = None
+        self._mem_peak = 0
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes (e.g. an outcome) before the span closes."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> 'Span':
+        stack = _stack()
+        parent = stack[-1] if stack else None
+        if parent is not None:
+            self.parent = parent.id
+            self.depth = parent.depth + 1
+        if self.tracer.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # The peak is process wide: hand what was seen so far to the
+            # parent before resetting it for this span
+            if parent is not None:
+                parent._mem_peak = max(parent._mem_peak, peak)
+            tracemalloc.reset_peak()
+            self._mem_start = current
+            self._mem_peak = current
+        stack.append(self)
+        self.ts = time.time()
+        self._t0 = time.perf_counter()
+        self._c0 = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        wall = time.perf_counter() - self._t0
+        cpu = time.thread_time() - self._c0
+        stack = _stack()
+        if self in stack:
+            stack.remove(self)
+
+        record = {
+            'id': self.id,
+            'parent': self.parent,
+            'name': self.name,
+            'cat': self.cat,
+            'ts': round(self.ts, 6),
+            'wall_s': round(wall, 6),
+            'cpu_s': round(cpu, 6),
+            'thread': threading.current_thread().name,
+            'tid': threading.get_ident(),
+            'depth': self.depth,
+        }
+        if self._mem_start is not None and tracemalloc.is_tracing():
+            peak = max(self._mem_peak, tracemalloc.get_traced_memory()[1])
+            record['mem_peak_kb'] = round(max(0, peak - self._mem_start) / 1024, 1)
+            parent = stack[-1] if stack else None
+            if parent is not None:
+                parent._mem_peak = max(parent._mem_peak, peak)
+        if exc_type is not None:
+            record['error'] = f'{exc_type.__name__}: {exc}'
+        if self.attrs:
+            record['attrs'] = self.attrs
+        self.tracer._finish(record)
+        return False
+
+
+class _NullSpan:
+    """Stand-in used when no tracer is active."""
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects the spans of one workflow."""
+
+    def __init__(self, trace_id: str, path: Optional[Path] = None, memory: Optional[bool] = None):
+        """
+        Args:
+            trace_id: Workflow id
+            path: JSONL file finished spans are appended to (None: memory only)
+            memory: Record peak memory per span (default TRACE_MEMORY); starts
+                tracemalloc, which slows allocation-heavy code noticeably
+        """
+        self.trace_id = trace_id
+        self.path = Path(path) if path else None
+        if memory is None:
+            memory = bool(getattr(settings, 'TRACE_MEMORY', False))
+        self.memory = bool(memory)
+        if self.memory:
+            _memory_acquire()
+        self.spans: list[dict] = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str, cat: str = '', **attrs: Any) -> Span:
+        """Span on this tracer, nested under the calling thread's open span."""
+        return Span(self, name, cat or name.split(':')[0].split('.')[0], attrs)
+
+    def _finish(self, record: dict) -> None:
+        with self._lock:
+            self.spans.append(record)
+            if self.path is None:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, default=str) + '\n')
+            except OSError:
+                # Tracing must never fail a workflow
+                pass
+
+    def close(self) -> None:
+        """Release tracemalloc (stopped once no memory-recording tracer is left)."""
+        if self.memory:
+            self.memory = False
+            _memory_release()
+
+
+def _memory_acquire() -> None:
+    global _memory_users, _memory_started
+    with _memory_lock:
+        if _memory_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _memory_started = True
+        _memory_users += 1
+
+
+def _memory_release() -> None:
+    global _memory_users, _memory_started
+    with _memory_lock:
+        _memory_users = max(0, _memory_users - 1)
+        if _memory_users == 0 and _memory_started:
+            tracemalloc.stop()
+            _memory_started = False
+
+
+# =============================================================================
+# Thread context
+# =============================================================================
+
+def _stack() -> list:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Tracer active on the calling thread, if any."""
+    return getattr(_local, 'tracer', None)
+
+
+def current_span() -> Optional[Span]:
+    """Innermost open span on the calling thread, if any."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+class activate:
+    """
+    Make a tracer current on the calling thread.
+
+    Args:
+        tracer: Tracer (None disables tracing inside the block)
+        parent: Open span from another thread that spans opened here nest
+            under (e.g. the step that started a worker pool)
+    """
+
+    def __init__(self, tracer: Optional[Tracer], parent: Optional[Span] = None):
+        self.tracer = tracer
+        self.parent = parent
+
+    def __enter__(self) -> Optional[Tracer]:
+        self._saved = (getattr(_local, 'tracer', None), getattr(_local, 'stack', None))
+        _local.tracer = self.tracer
+        _local.stack = [self.parent] if self.parent is not None else []
+        return self.tracer
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _local.tracer, _local.stack = self._saved
+        return False
+
+
+def tracing_enabled() -> bool:
+    return bool(getattr(settings, 'TRACING', True))
+
+
+def span(name: str, cat: str = '', **attrs: Any):
+    """
+    Span on the calling thread's active tracer (a no-op without one).
+
+    Args:
+        name: Span name, dotted by area (e.g. 'backtest.report_wait')
+        cat: Category (default: the name's first component)
+        **attrs: Attributes stored with the span
+
+    Returns:
+        Context manager yielding the span (call .set() to add attributes)
+    """
+    tracer = getattr(_local, 'tracer', None)
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, cat, **attrs)
+
+
+def traced(name: Optional[str] = None, cat: str = '') -> Callable:
+    """Decorator wrapping every call of a function in span(name)."""
+    def decorate(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, 'tracer', None) is None:
+                return fn(*args, **kwargs)
+            with span(span_name, cat):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# =============================================================================
+# Reading, summaries and export
+# =============================================================================
+
+def load_spans(path: Path) -> list[dict]:
+    """Spans of a trace file (a torn last line from a crash is skipped)."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    spans = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                spans.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return spans
+
+
+def summarize(traces: dict[str, list[dict]], top: int = 20) -> dict:
+    """
+    Aggregate spans by name across one or more traces.
+
+    Self time is a span's wall time minus that of its direct children
+    (floored at zero, since children may run concurrently on other threads),
+    so ranking by it does not count nested work twice. Parents are matched
+    across the given traces: a multi-pair child's steps nest under the
+    parent workflow's multi_pair:<symbol> span.
+
+    Args:
+        traces: {trace id: spans}
+        top: Rows to keep (0: all)
+
+    Returns:
+        dict with traces, span_count, wall_s (sum of root spans) and rows
+        sorted by self time: name, count, total_s, self_s, cpu_s, max_s,
+        mem_peak_kb, errors
+    """
+    rows: dict[str, dict] = defaultdict(lambda: {
+        'count': 0, 'total_s': 0.0, 'self_s': 0.0, 'cpu_s': 0.0, 'max_s': 0.0, 'mem_peak_kb': None, 'errors': 0,
+    })
+    span_count = 0
+    root_wall = 0.0
+    # A parent missing from a span's own trace is looked up in the others
+    owner: dict[str, str] = {}
+    for trace_id, spans in traces.items():
+        for s in spans:
+            owner.setdefault(s.get('id'), trace_id)
+    own_ids = {trace_id: {s.get('id') for s in spans} for trace_id, spans in traces.items()}
+
+    def parent_key(trace_id: str, span: dict) -> Optional[tuple]:
+        parent = span.get('parent')
+        if not parent:
+            return None
+        if parent in own_ids[trace_id]:
+            return (trace_id, parent)
+        return (owner[parent], parent) if parent in owner else None
+
+    child_wall: dict[tuple, float] = defaultdict(float)
+    for trace_id, spans in traces.items():
+        for s in spans:
+            key = parent_key(trace_id, s)
+            if key:
+                child_wall[key] += float(s.get('wall_s') or 0.0)
+    for trace_id, spans in traces.items():
+        for s in spans:
+            wall = float(s.get('wall_s') or 0.0)
+            row = rows[s.get('name', '?')]
+            row['count'] += 1
+            row['total_s'] += wall
+            row['self_s'] += max(0.0, wall - child_wall.get((trace_id, s.get('id')), 0.0))
+            row['cpu_s'] += float(s.get('cpu_s') or 0.0)
+            row['max_s'] = max(row['max_s'], wall)
+            if s.get('mem_peak_kb') is not None:
+                row['mem_peak_kb'] = max(row['mem_peak_kb'] or 0.0, float(s['mem_peak_kb']))
+            if s.get('error'):
+                row['errors'] += 1
+            if parent_key(trace_id, s) is None:
+                root_wall += wall
+            span_count += 1
+
+    ranked = sorted(
+        ({'name': name, **{k: round(v, 3) if isinstance(v, float) else v for k, v in row.items()}}
+         for name, row in rows.items()),
+        key=lambda r: r['self_s'],
+        reverse=True,
+    )
+    return {
+        'traces': len(traces),
+        'span_count': span_count,
+        'wall_s': round(root_wall, 3),
+        'rows': ranked[:top] if top else ranked,
+    }
+
+
+def to_chrome_trace(traces: dict[str, list[dict]]) -> dict:
+    """
+    Chrome trace event JSON for one or more traces.
+
+    Each trace becomes a process (named after its id) and each thread a
+    track; spans are complete ("X") events with microsecond timestamps.
+
+    Returns:
+        dict ready for json.dump (open in chrome://tracing or ui.perfetto.dev)
+    """
+    events = []
+    for pid, (trace_id, spans) in enumerate(traces.items(), start=1):
+        events.append({'ph': 'M', 'name': 'process_name', 'pid': pid, 'tid': 0, 'args': {'name': trace_id}})
+        tids: dict[Any, int] = {}
+        for s in sorted(spans, key=lambda s: (s.get('ts', 0), s.get('depth', 0))):
+            key = s.get('tid', s.get('thread'))
+            if key not in tids:
+                tids[key] = len(tids) + 1
+                events.append({
+                    'ph': 'M', 'name': 'thread_name', 'pid': pid, 'tid': tids[key],
+                    'args': {'name': s.get('thread') or f'thread-{tids[key]}'},
+                })
+            args = dict(s.get('attrs') or {})
+            args['cpu_ms'] = round(float(s.get('cpu_s') or 0.0) * 1000, 3)
+            if s.get('mem_peak_kb') is not None:
+                args['mem_peak_kb'] = s['mem_peak_kb']
+            if s.get('error'):
+                args['error'] = s['error']
+            events.append({
+                'ph': 'X',
+                'name': s.get('name', '?'),
+                'cat': s.get('cat') or 'workflow',
+                'ts': int(round(float(s.get('ts') or 0.0) * 1e6)),
+                'dur': max(1, int(round(float(s.get('wall_s') or 0.0) * 1e6))),
+                'pid': pid,
+                'tid': tids[key],
+                'args': args,
+            })
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def load_traces(workflow_ids: Iterable[str], runs_dir: Optional[str] = None) -> dict[str, list[dict]]:
+    """{workflow id: spans} for the workflows that have a trace file."""
+    traces = {}
+    for workflow_id in workflow_ids:
+        spans = load_spans(trace_path(workflow_id, runs_dir))
+        if spans:
+            traces[workflow_id] = spans
+    return traces
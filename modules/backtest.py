@@ -14,6 +14,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from engine.terminals import TerminalRegistry
+from engine.tracing import span, traced
 import settings
 
 
@@ -161,6 +162,7 @@ def create_backtest_ini(
     return str(output_path)
 
 
+@traced('backtest.run')
 def run_backtest(
     ea_path: str,
     symbol: str,
@@ -254,24 +256,29 @@ def run_backtest(
         # Wait for completion
         start_time = time.time()
         last_progress = start_time
-        while process.poll() is None:
-            if time.time() - start_time > timeout:
-                process.kill()
-                return {
-                    'success': False,
-                    'errors': [f'Backtest timed out after {timeout} seconds'],
-                }
-            if on_progress and (time.time() - last_progress) >= float(progress_interval_s or 30):
+        with span('backtest.mt5', symbol=symbol, timeframe=timeframe):
+            while process.poll() is None:
+                if time.time() - start_time > timeout:
+                    process.kill()
+                    return {
+                        'success': False,
+                        'errors': [f'Backtest timed out after {timeout} seconds'],
+                    }
+                if on_progress and (time.time() - last_progress) >= float(progress_interval_s or 30):
+                    try:
+                        elapsed = time.time() - start_time
+                        on_progress(
+                            f"Backtest running: {report_name or ea_path.stem} {symbol} {timeframe} "
+                            f"({elapsed:.0f}s elapsed)"
+                        )
+                    except Exception:
+                        pass
+                    last_progress = time.time()
+                # Wake as soon as the terminal exits instead of sleeping a full interval
                 try:
-                    elapsed = time.time() - start_time
-                    on_progress(
-                        f"Backtest running: {report_name or ea_path.stem} {symbol} {timeframe} "
-                        f"({elapsed:.0f}s elapsed)"
-                    )
-                except Exception:
+                    process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
                     pass
-                last_progress = time.time()
-            time.sleep(1)
 
     except Exception as e:
         return {
@@ -293,12 +300,13 @@ def run_backtest(
         mtime_threshold = float(start_time) - 2.0  # allow small timestamp skew
 
         # Give MT5 a moment to flush report files after the process exits.
-        for _ in range(10):
-            expected_xml = report_dir / f'{report_name}.xml'
-            html_candidates = list(report_dir.glob(f'{report_name}.htm*'))
-            if expected_xml.exists() or html_candidates:
-                break
-            time.sleep(0.5)
+        with span('backtest.report_wait'):
+            for _ in range(10):
+                expected_xml = report_dir / f'{report_name}.xml'
+                html_candidates = list(report_dir.glob(f'{report_name}.htm*'))
+                if expected_xml.exists() or html_candidates:
+                    break
+                time.sleep(0.5)
 
         expected_xml = report_dir / f'{report_name}.xml'
         if expected_xml.exists():
@@ -457,6 +465,7 @@ def run_backtest(
     return results
 
 
+@traced('backtest.parse_xml')
 def parse_backtest_results(xml_path: Optional[Path]) -> dict:
     """Parse backtest results from XML report."""
     if xml_path is None or not Path(xml_path).exists():
@@ -504,6 +513,7 @@ def parse_backtest_results(xml_path: Optional[Path]) -> dict:
         return {'success': False, 'errors': [f'Error reading results: {str(e)}']}
 
 
+@traced('backtest.parse_html')
 def parse_html_report(html_path: Path) -> dict:
     """Parse backtest results from MT5 HTML report with extended metrics.
 
@@ -0,0 +1,227 @@
+"""
+Blob Store Module
+
+Content-addressed storage for large workflow artifacts (equity curves, chart
+data, pass lists, Monte Carlo distributions).
+
+Blobs live under runs/blobs/<aa>/<sha256>.json.gz, keyed by the SHA-256 of
+their canonical JSON, so an artifact that did not change between re-runs (or
+is shared by multi-pair child workflows) is stored once.
+
+Results files (runs/<workflow_id>/<name>.json) become small manifests where
+every large sub-value is replaced by a reference:
+
+    {"$blob": "<sha256>", "bytes": 123456}
+
+Readers open a manifest with ResultsFile and resolve only the keys they touch;
+resolve(..., skip=...) leaves heavy fields (e.g. equity curves) as references.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+
+BLOB_KEY = '$blob'
+MANIFEST_KEY = '_blob_manifest'
+
+# Per-pass fields that only dashboards render (left as references elsewhere)
+HEAVY_RESULT_KEYS = (
+    'equity_curve',
+    'equity_curve_in_sample',
+    'equity_curve_forward',
+    'charts',
+    'trades',
+    'distribution',
+    'drawdown_distribution',
+)
+
+
+def is_ref(value: Any) -> bool:
+    """True if value is a blob reference."""
+    return isinstance(value, dict) and BLOB_KEY in value and len(value) <= 2
+
+
+def _canonical(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+class BlobStore:
+    """Content-addressed JSON blob store with a small in-process read cache."""
+
+    def __init__(self, root: Optional[str] = None, cache_size: int = 64):
+        """
+        Args:
+            root: Store directory (default: <RUNS_DIR>/blobs)
+            cache_size: Number of decoded blobs kept in memory
+        """
+        self.root = Path(root) if root else Path(settings.RUNS_DIR) / 'blobs'
+        self.cache_size = max(0, int(cache_size))
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self.stats = {'written': 0, 'reused': 0, 'bytes_written': 0}
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.json.gz"
+
+    def has(self, digest: str) -> bool:
+        return self.path_for(digest).exists()
+
+    def put(self, obj: Any) -> dict:
+        """Store a JSON-serializable value; returns its reference."""
+        data = _canonical(obj)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+
+        if path.exists():
+            self.stats['reused'] += 1
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=6, mtime=0))
+                f.flush()
+                try:
+                    os.fsync(f.fileno())
+                except Exception:
+                    pass
+            os.replace(tmp_path, path)
+            self.stats['written'] += 1
+            self.stats['bytes_written'] += len(data)
+
+        self._remember(digest, data)
+        return {BLOB_KEY: digest, 'bytes': len(data)}
+
+    def get(self, ref: Any) -> Any:
+        """Load the value for a reference (or a bare digest)."""
+        digest = ref.get(BLOB_KEY) if isinstance(ref, dict) else str(ref)
+        data = self._cache.get(digest)
+        if data is not None:
+            self._cache.move_to_end(digest)
+        else:
+            path = self.path_for(digest)
+            if not path.exists():
+                raise FileNotFoundError(f"Blob not found: {digest}")
+            with open(path, 'rb') as f:
+                data = gzip.decompress(f.read())
+            self._remember(digest, data)
+        return json.loads(data)
+
+    def _remember(self, digest: str, data: bytes) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[digest] = data
+        self._cache.move_to_end(digest)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def externalize(obj: Any, store: BlobStore, min_bytes: int = None, _top: bool = True) -> Any:
+    """
+    Replace large sub-values with blob references (bottom-up).
+
+    Children are externalized first, so a pass dict keeps its small metrics
+    inline while its equity curves become references. The top-level value
+    itself is never replaced.
+    """
+    if min_bytes is None:
+        min_bytes = int(getattr(settings, 'BLOB_MIN_BYTES', 16 * 1024) or 0)
+
+    if isinstance(obj, dict):
+        if is_ref(obj):
+            return obj
+        out = {k: externalize(v, store, min_bytes, _top=False) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        out = [externalize(v, store, min_bytes, _top=False) for v in obj]
+    else:
+        return obj
+
+    if not _top and out and len(_canonical(out)) >= min_bytes:
+        return store.put(out)
+    return out
+
+
+def resolve(value: Any, store: BlobStore, skip: Iterable[str] = ()) -> Any:
+    """
+    Load references recursively.
+
+    Args:
+        value: Value possibly containing references
+        store: Blob store
+        skip: Dict keys whose values are left as references (not loaded)
+    """
+    skip = set(skip or ())
+    if is_ref(value):
+        value = store.get(value)
+    if isinstance(value, dict):
+        return {k: (v if k in skip and is_ref(v) else resolve(v, store, skip)) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve(v, store, skip) for v in value]
+    return value
+
+
+def store_for_results(results_path: Path) -> BlobStore:
+    """Blob store shared by all workflows under the runs directory of a results file."""
+    return BlobStore(Path(results_path).resolve().parent.parent / 'blobs')
+
+
+def save_results_file(file_path: Path, data: dict, store: Optional[BlobStore] = None) -> str:
+    """
+    Write a results file as a manifest with large values in the blob store.
+
+    Args:
+        file_path: runs/<workflow_id>/<name>.json
+        data: Results dict
+        store: Blob store (default: runs/blobs next to the workflow directory)
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    store = store or store_for_results(file_path)
+    manifest = externalize(data, store)
+    manifest[MANIFEST_KEY] = {'version': 1, 'store': os.path.relpath(store.root, file_path.parent)}
+    with open(file_path, 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    return str(file_path)
+
+
+class ResultsFile:
+    """
+    Lazy view of a results file (manifest or legacy inline JSON).
+
+    Only the keys that are read are loaded from the blob store.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        self._data = data
+        meta = data.pop(MANIFEST_KEY, None) if isinstance(data, dict) else None
+        self.is_manifest = isinstance(meta, dict)
+        if self.is_manifest:
+            self.store = BlobStore((self.path.parent / meta.get('store', '../blobs')).resolve())
+        else:
+            self.store = store_for_results(self.path)
+
+    def keys(self) -> list:
+        return list(self._data.keys()) if isinstance(self._data, dict) else []
+
+    def get(self, key: str, default: Any = None, skip: Iterable[str] = ()) -> Any:
+        """Resolve one top-level key (leaving `skip` fields as references)."""
+        if not isinstance(self._data, dict) or key not in self._data:
+            return default
+        return resolve(self._data[key], self.store, skip)
+
+    def load(self, skip: Iterable[str] = ()) -> Any:
+        """Resolve the whole file."""
+        return resolve(self._data, self.store, skip)
+
+
+def load_results_file(path: str, skip: Iterable[str] = ()) -> Any:
+    """Load a results file, resolving blob references (except `skip` fields)."""
+    return ResultsFile(path).load(skip=skip)
@@ -2,7 +2,19 @@
 EA Compiler Module
 
 Compiles MQL5 Expert Advisors using MetaEditor64.
+
+Successful compiles are cached (settings.COMPILE_CACHE) under
+runs/compile_cache, keyed by the SHA-256 of the source, every file in its
+transitive #include closure (resolved against the EA directory and the
+terminal's MQL5/Include tree) and the MetaEditor version. A hit restores the
+.ex5 and compiler log without launching MetaEditor. Per-file include lists,
+content hashes and compiler versions are kept in runs/compile_cache/index.json
+and invalidated by file mtime/size.
 """
+import hashlib
+import json
+import os
+import shutil
 import subprocess
 import re
 from pathlib import Path
@@ -10,14 +22,237 @@ from typing import Optional
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
 from engine.terminals import TerminalRegistry
+from engine.tracing import traced
+from modules.mql5_lexer import decode_source, lex
+
+COMPILE_CACHE_VERSION = 1
+
+
+def _file_sig(path: Path) -> Optional[list[int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def resolve_include(kind: str, name: str, including_dir: Path, include_dir: Optional[Path]) -> Optional[Path]:
+    """
+    Resolve an #include directive to a file.
+
+    Args:
+        kind: '"' (quoted: including file's directory, then the Include tree) or '<'
+        name: Included path as written
+        including_dir: Directory of the file containing the directive
+        include_dir: Terminal MQL5/Include directory (or custom include path)
+
+    Returns:
+        Normalized path, or None if the file cannot be found
+    """
+    name = name.strip().replace('\\', '/')
+    candidates = []
+    if kind == '"':
+        candidates.append(including_dir / name)
+    if include_dir is not None:
+        candidates.append(include_dir / name)
+    for candidate in candidates:
+        if candidate.is_file():
+            return Path(os.path.normpath(candidate))
+    return None
+
+
+class IncludeIndex:
+    """Per-file include directives, content hashes and compiler versions, invalidated by mtime/size."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.files: dict[str, dict] = {}
+        self.compilers: dict[str, dict] = {}
+        self.dirty = False
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == COMPILE_CACHE_VERSION:
+                self.files = dict(data.get('files') or {})
+                self.compilers = dict(data.get('compilers') or {})
+        except Exception:
+            pass
+
+    def file_entry(self, path: Path) -> Optional[dict]:
+        """{'sig', 'sha256', 'includes': [[kind, name], ...]} for a file, or None if unreadable."""
+        sig = _file_sig(path)
+        if sig is None:
+            return None
+        key = str(path)
+        entry = self.files.get(key)
+        if entry is None or entry.get('sig') != sig:
+            try:
+                data = path.read_bytes()
+            except OSError:
+                return None
+            entry = {
+                'sig': sig,
+                'sha256': hashlib.sha256(data).hexdigest(),
+                'includes': [[kind, name] for kind, name in lex(decode_source(data)).includes()],
+            }
+            self.files[key] = entry
+            self.dirty = True
+        return entry
+
+    def closure(self, source: Path, include_dir: Optional[Path]) -> list[tuple[str, str]]:
+        """
+        Content identity of a source file and its transitive #include closure.
+
+        Args:
+            source: Main .mq5 file
+            include_dir: Terminal MQL5/Include directory
 
+        Returns:
+            [(label, sha256)] starting with ('<source>', hash); includes are
+            labelled by directive (kind + name, relative to the including
+            label) so the key does not depend on where the EA lives.
+            Unresolved includes are recorded with an empty hash.
+        """
+        source = Path(os.path.normpath(source))
+        root = self.file_entry(source)
+        if root is None:
+            raise FileNotFoundError(f"Source not found: {source}")
 
+        out = [('<source>', root['sha256'])]
+        seen = {str(source)}
+        queue = [(source, root, '<source>')]
+        while queue:
+            path, entry, label = queue.pop(0)
+            for kind, name in entry['includes']:
+                child_label = f"{label}>{kind}{name.strip()}"
+                child = resolve_include(kind, name, path.parent, include_dir)
+                if child is None:
+                    out.append((child_label, ''))
+                    continue
+                if str(child) in seen:
+                    continue
+                seen.add(str(child))
+                child_entry = self.file_entry(child)
+                if child_entry is None:
+                    out.append((child_label, ''))
+                    continue
+                out.append((child_label, child_entry['sha256']))
+                queue.append((child, child_entry, child_label))
+        return out
+
+    def compiler_version(self, metaeditor_path: Path, terminal: dict) -> str:
+        """MetaEditor version (queried once per executable build), or a size/mtime fallback."""
+        sig = _file_sig(metaeditor_path) or [0, 0]
+        key = str(metaeditor_path)
+        entry = self.compilers.get(key)
+        if entry is None or entry.get('sig') != sig:
+            version = get_compiler_version(terminal) or f"unknown:{sig[0]}:{sig[1]}"
+            entry = {'sig': sig, 'version': version}
+            self.compilers[key] = entry
+            self.dirty = True
+        return entry['version']
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        payload = {'version': COMPILE_CACHE_VERSION, 'files': self.files, 'compilers': self.compilers}
+        tmp_path.write_text(json.dumps(payload, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def _write_atomic(src: Path, dest: Path) -> None:
+    tmp_path = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+    shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dest)
+
+
+class CompileCache:
+    """Compiled .ex5 files and compiler logs keyed by source closure + compiler version."""
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Cache directory (default: <RUNS_DIR>/compile_cache)
+        """
+        self.root = Path(root) if root else Path(settings.RUNS_DIR) / 'compile_cache'
+        self.index = IncludeIndex(self.root / 'index.json')
+
+    def key_for(
+        self,
+        ea_path: Path,
+        metaeditor_path: Path,
+        terminal: dict,
+        include_dir: Optional[Path],
+        include_option: Optional[str] = None,
+    ) -> str:
+        """Cache key for compiling ea_path with the given MetaEditor and include tree."""
+        h = hashlib.sha256()
+        h.update(f"v{COMPILE_CACHE_VERSION}\0{ea_path.name}\0{include_option or ''}\0".encode('utf-8'))
+        h.update(self.index.compiler_version(metaeditor_path, terminal).encode('utf-8') + b'\0')
+        for label, digest in self.index.closure(ea_path, include_dir):
+            h.update(f"{label}={digest}\n".encode('utf-8'))
+        self.index.save()
+        return h.hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path, Path]:
+        base = self.root / key[:2] / key
+        return base.with_suffix('.json'), base.with_suffix('.ex5'), base.with_suffix('.log')
+
+    def restore(self, key: str, ea_path: Path) -> Optional[dict]:
+        """Copy a cached .ex5 (and log) next to ea_path; returns the cached result or None."""
+        meta_path, ex5_path, log_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if not ex5_path.exists():
+                return None
+            exe_path = ea_path.with_suffix('.ex5')
+            _write_atomic(ex5_path, exe_path)
+            if log_path.exists():
+                _write_atomic(log_path, ea_path.with_suffix('.log'))
+        except Exception:
+            return None
+        return {
+            'success': True,
+            'exe_path': str(exe_path),
+            'errors': [],
+            'warnings': list(meta.get('warnings') or []),
+            'output': meta.get('output', ''),
+            'cached': True,
+            'cache_key': key,
+        }
+
+    def store(self, key: str, ea_path: Path, result: dict) -> None:
+        """Save a successful compile (the metadata file is written last and marks the entry complete)."""
+        meta_path, ex5_path, log_path = self._paths(key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(Path(result['exe_path']), ex5_path)
+        if ea_path.with_suffix('.log').exists():
+            _write_atomic(ea_path.with_suffix('.log'), log_path)
+        meta = {
+            'ea_name': ea_path.name,
+            'warnings': result.get('warnings', []),
+            'output': result.get('output', ''),
+        }
+        tmp_path = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(meta), encoding='utf-8')
+        os.replace(tmp_path, meta_path)
+
+
+@traced('compile.ea')
 def compile_ea(
     ea_path: str,
     terminal: Optional[dict] = None,
     registry: Optional[TerminalRegistry] = None,
     include_path: Optional[str] = None,
+    use_cache: bool = True,
 ) -> dict:
     """
     Compile an MQL5 EA using MetaEditor64.
@@ -27,6 +262,7 @@ def compile_ea(
         terminal: Terminal config dict (from registry.get_terminal())
         registry: TerminalRegistry instance (used if terminal not provided)
         include_path: Optional custom include path
+        use_cache: Reuse a cached compile of identical sources (if COMPILE_CACHE)
 
     Returns:
         dict with keys:
@@ -35,6 +271,7 @@ def compile_ea(
             - errors: list of error strings
             - warnings: list of warning strings
             - output: raw compiler output
+            - cached: bool (True if restored from the compile cache)
     """
     ea_path = Path(ea_path)
 
@@ -66,6 +303,26 @@ def compile_ea(
             'output': '',
         }
 
+    cache = None
+    cache_key = None
+    if use_cache and getattr(settings, 'COMPILE_CACHE', True):
+        if include_path:
+            include_dir = Path(include_path)
+        elif terminal.get('include_path'):
+            include_dir = Path(terminal['include_path'])
+        elif terminal.get('data_path'):
+            include_dir = Path(terminal['data_path']) / 'MQL5' / 'Include'
+        else:
+            include_dir = None
+        try:
+            cache = CompileCache()
+            cache_key = cache.key_for(ea_path, metaeditor_path, terminal, include_dir, include_path)
+            cached = cache.restore(cache_key, ea_path)
+            if cached is not None:
+                return cached
+        except Exception:
+            cache = None
+
     # Build compile command
     # MetaEditor64.exe /compile:"path\to\file.mq5" /log /inc:"include_path"
     cmd = [
@@ -144,14 +401,23 @@ def compile_ea(
         if not exe_path.exists():
             errors.append('Compilation failed: .ex5 file not created')
 
-    return {
+    result = {
         'success': success,
         'exe_path': str(exe_path) if success else None,
         'errors': errors,
         'warnings': warnings,
         'output': combined_output,
+        'cached': False,
     }
 
+    if success and cache is not None:
+        try:
+            cache.store(cache_key, ea_path, result)
+        except Exception:
+            pass
+
+    return result
+
 
 def get_compiler_version(terminal: Optional[dict] = None) -> Optional[str]:
     """Get MetaEditor version string."""
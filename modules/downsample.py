@@ -0,0 +1,109 @@
+"""
+Downsample Module
+
+Shape-preserving reduction of long series for chart payloads using
+Largest-Triangle-Three-Buckets (Steinarsson, 2013).
+
+The first and last points are always kept. The remaining points are split
+into equal buckets, and from each bucket the point forming the largest
+triangle with the previously kept point and the next bucket's average is
+kept, so peaks, troughs and drawdowns survive while flat stretches collapse.
+"""
+from typing import Optional, Sequence
+
+
+def lttb_indices(
+    values: Sequence[float],
+    threshold: int,
+    xs: Optional[Sequence[float]] = None,
+) -> list[int]:
+    """
+    Indices of the points LTTB keeps.
+
+    Args:
+        values: Y values
+        threshold: Maximum number of points to keep (>= 3 to downsample)
+        xs: X values (default: the index of each point)
+
+    Returns:
+        Sorted indices into values (all of them if no reduction is needed)
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    x = (lambda i: float(i)) if xs is None else (lambda i: float(xs[i]))
+    y = values
+
+    kept = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for b in range(threshold - 2):
+        start = int(b * bucket_size) + 1
+        end = int((b + 1) * bucket_size) + 1
+
+        # Average of the next bucket (the last point for the final bucket)
+        next_start = end
+        next_end = min(int((b + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        count = next_end - next_start
+        avg_x = sum(x(i) for i in range(next_start, next_end)) / count
+        avg_y = sum(float(y[i]) for i in range(next_start, next_end)) / count
+
+        ax, ay = x(a), float(y[a])
+        best = start
+        best_area = -1.0
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (float(y[i]) - ay) - (ax - x(i)) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = i
+
+        kept.append(best)
+        a = best
+
+    kept.append(n - 1)
+    return kept
+
+
+def lttb(
+    values: Sequence[float],
+    threshold: int,
+    xs: Optional[Sequence[float]] = None,
+) -> tuple[list[float], list[float]]:
+    """
+    Downsample a series with LTTB.
+
+    Args:
+        values: Y values
+        threshold: Maximum number of points to keep
+        xs: X values (default: the index of each point)
+
+    Returns:
+        (kept x values, kept y values)
+    """
+    idx = lttb_indices(values, threshold, xs)
+    if xs is None:
+        return list(idx), [values[i] for i in idx]
+    return [xs[i] for i in idx], [values[i] for i in idx]
+
+
+def compact_series(values: Sequence[float], threshold: int, digits: int = 2) -> list[float]:
+    """
+    Small copy of a series for storing alongside a result.
+
+    Args:
+        values: Y values (non-numeric entries are dropped)
+        threshold: Maximum number of points to keep
+        digits: Decimal places kept
+
+    Returns:
+        LTTB-reduced, rounded values ([] for fewer than two points)
+    """
+    ys = [float(v) for v in values if isinstance(v, (int, float))]
+    if len(ys) < 2:
+        return []
+    _, kept = lttb(ys, threshold)
+    return [round(v, digits) for v in kept]
@@ -4,13 +4,15 @@ EA Code Injector Module
 Injects OnTester() function and safety guards into MQL5 EAs.
 Creates modified copies without altering originals.
 """
-import re
 import shutil
+import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 import settings
+from modules.mql5_lexer import lex, read_source
 
 # OnTester function that returns custom optimization criterion
 # Profit-first with equity curve smoothness and soft drawdown penalty
@@ -255,19 +257,18 @@ bool EAStressSafety_OrderSendAsync(const MqlTradeRequest& request, MqlTradeResul
 
 def has_ontester(content: str) -> bool:
     """Check if EA already has an OnTester function."""
-    # Match OnTester function declaration
-    pattern = r'^\s*(double|int|void)\s+OnTester\s*\(\s*\)'
-    return bool(re.search(pattern, content, re.MULTILINE))
+    # Declared or defined at global scope (comments and strings ignored)
+    return lex(content).has_function('OnTester')
 
 
 def has_safety_guards(content: str) -> bool:
     """Check if EA already has safety guards injected."""
-    return 'STRESS_TEST_MODE' in content
+    return 'STRESS_TEST_MODE' in lex(content).identifiers
 
 
 def has_trade_safety_guards(content: str) -> bool:
     """Check if EA already has trade safety guards injected."""
-    return 'EAStressSafety_MaxSpreadPips' in content
+    return 'EAStressSafety_MaxSpreadPips' in lex(content).identifiers
 
 
 def inject_ontester(content: str) -> tuple[str, bool]:
@@ -280,30 +281,21 @@ def inject_ontester(content: str) -> tuple[str, bool]:
     Returns:
         Tuple of (modified_content, was_injected)
     """
-    if has_ontester(content):
+    source = lex(content)
+    if source.has_function('OnTester'):
         return content, False
 
-    # Find a good injection point - after the last #include or #property
-    # or before the first function definition
-
-    # Try to find last preprocessor directive
-    last_directive = 0
-    for match in re.finditer(r'^#\w+.*$', content, re.MULTILINE):
-        last_directive = match.end()
+    # Find a good injection point - after the last global preprocessor
+    # directive (#include / #property / ...) outside any #if block,
+    # else after the header comment block
+    last_directive = source.last_global_directive_end()
 
     if last_directive > 0:
         # Inject after last directive
         injection_point = last_directive
         prefix = '\n\n'
     else:
-        # Inject at beginning after any initial comments
-        comment_end = 0
-        # Skip initial block comment
-        if content.strip().startswith('//+'):
-            match = re.search(r'//\+-+\+\s*\n', content[50:])
-            if match:
-                comment_end = 50 + match.end()
-        injection_point = comment_end
+        injection_point = source.header_end()
         prefix = '\n'
 
     modified = content[:injection_point] + prefix + get_ontester_code() + '\n' + content[injection_point:]
@@ -323,43 +315,29 @@ def inject_safety(content: str) -> tuple[str, bool]:
     injected = False
 
     # Inject safety guards at the very beginning, after initial comment block
-    comment_end = 0
-
-    # Skip initial header comment block
-    if content.strip().startswith('//+'):
-        # Find end of header block (//+--...--+)
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if i > 0 and line.strip().startswith('//+') and line.strip().endswith('+'):
-                comment_end = sum(len(l) + 1 for l in lines[:i+1])
-                break
+    source = lex(content)
+    comment_end = source.header_end()
 
     # If safety guard block is missing, insert it
-    if not has_safety_guards(content):
+    if 'STRESS_TEST_MODE' not in source.identifiers:
         content = content[:comment_end] + '\n' + SAFETY_GUARDS + '\n' + content[comment_end:]
         injected = True
+        source = lex(content)
 
     # If trade safety is missing, insert it (upgrade older injected files)
-    if not has_trade_safety_guards(content):
+    if 'EAStressSafety_MaxSpreadPips' not in source.identifiers:
         # Prefer inserting immediately after the safety guard block if present
-        marker = '//| Safety Guards - Injected by EA Stress Test System'
-        idx = content.find(marker)
-        if idx != -1:
-            end_idx = content.find('#endif', idx)
+        marker = source.find_comment('Safety Guards - Injected by EA Stress Test System')
+        if marker is not None:
+            endif = source.find_directive('endif', after=marker.end)
+            end_idx = content.find('\n', endif.end) if endif is not None else -1
             if end_idx != -1:
-                end_idx = content.find('\n', end_idx)
-                if end_idx != -1:
-                    content = content[:end_idx+1] + TRADE_SAFETY_GUARDS + '\n' + content[end_idx+1:]
-                    injected = True
-                else:
-                    content = content + '\n' + TRADE_SAFETY_GUARDS + '\n'
-                    injected = True
+                content = content[:end_idx+1] + TRADE_SAFETY_GUARDS + '\n' + content[end_idx+1:]
             else:
                 content = content + '\n' + TRADE_SAFETY_GUARDS + '\n'
-                injected = True
         else:
             content = content[:comment_end] + '\n' + TRADE_SAFETY_GUARDS + '\n' + content[comment_end:]
-            injected = True
+        injected = True
 
     return content, injected
 
@@ -403,7 +381,7 @@ def create_modified_ea(
         }
 
     try:
-        content = ea_path.read_text(encoding='utf-8', errors='ignore')
+        content = read_source(str(ea_path))
     except Exception as e:
         return {
             'success': False,
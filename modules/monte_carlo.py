@@ -5,14 +5,17 @@ Performs Monte Carlo analysis on trading results to assess robustness.
 Shuffles trade sequence to estimate probability of ruin and confidence intervals.
 """
 import random
+from bisect import bisect_right
 from typing import Optional
 from pathlib import Path
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import settings
+from engine.tracing import traced
 
 
+@traced('monte_carlo.run')
 def run_monte_carlo(
     trades: list[float],
     initial_balance: float = 10000,
@@ -160,6 +163,128 @@ def run_monte_carlo(
     }
 
 
+@traced('monte_carlo.window_bands')
+def run_window_confidence_bands(
+    sample: list[float],
+    windows: list[dict],
+    iterations: int = None,
+    levels: tuple = (0.05, 0.50, 0.95),
+    seed: Optional[int] = None,
+) -> list[Optional[dict]]:
+    """
+    Bootstrap confidence bands for many trade windows in one batch.
+
+    Each iteration draws ONE bootstrap sequence (with replacement) from the
+    sample, as long as the largest window. The first n draws of that sequence
+    are a bootstrap of size n, so a single pass with running totals yields
+    profit / PF / drawdown for every window size at once instead of running
+    an independent simulation per window.
+
+    Drawdown is tracked in money and expressed as a % of each window's start
+    balance (peak-relative % would need one pass per start balance).
+
+    Args:
+        sample: Trade profits to resample (e.g. in-sample trades)
+        windows: List of dicts with total_trades, profit and start_balance
+        iterations: Bootstrap iterations (default: settings.FORWARD_WINDOW_MC_ITERATIONS)
+        levels: Percentile levels for the band
+        seed: Optional RNG seed for reproducible bands
+
+    Returns:
+        List aligned with windows; None for windows with no trades, else dict with:
+            - trade_count, iterations, sample_size
+            - profit / profit_factor / max_drawdown_pct: {'p5': .., 'p50': .., 'p95': ..}
+            - profit_percentile: % of simulations with profit <= realized profit
+            - within_band: realized profit inside the outer band levels
+    """
+    from modules.window_metrics import PF_NO_LOSS
+
+    if iterations is None:
+        iterations = getattr(settings, 'FORWARD_WINDOW_MC_ITERATIONS', 1000)
+    iterations = max(1, int(iterations or 1))
+
+    sample = [float(p or 0) for p in (sample or [])]
+    counts = sorted({int(w.get('total_trades', 0) or 0) for w in windows or []} - {0})
+    if not sample or not counts:
+        return [None for _ in (windows or [])]
+
+    rng = random.Random(seed)
+    max_n = counts[-1]
+    sim_profit = {n: [] for n in counts}
+    sim_pf = {n: [] for n in counts}
+    sim_dd = {n: [] for n in counts}
+
+    for _ in range(iterations):
+        draws = rng.choices(sample, k=max_n)
+        cum = 0.0
+        gross_profit = 0.0
+        gross_loss = 0.0
+        peak = 0.0
+        max_dd = 0.0
+        ci = 0
+        next_n = counts[0]
+
+        for k, p in enumerate(draws, 1):
+            cum += p
+            if p > 0:
+                gross_profit += p
+            elif p < 0:
+                gross_loss -= p
+            if cum > peak:
+                peak = cum
+            elif peak - cum > max_dd:
+                max_dd = peak - cum
+
+            if k == next_n:
+                sim_profit[k].append(cum)
+                if gross_loss > 0:
+                    sim_pf[k].append(gross_profit / gross_loss)
+                else:
+                    sim_pf[k].append(PF_NO_LOSS if gross_profit > 0 else 0.0)
+                sim_dd[k].append(max_dd)
+                ci += 1
+                next_n = counts[ci] if ci < len(counts) else None
+
+    for n in counts:
+        sim_profit[n].sort()
+        sim_pf[n].sort()
+        sim_dd[n].sort()
+
+    def _pct(values: list[float], level: float) -> float:
+        idx = max(0, min(int(level * len(values)), len(values) - 1))
+        return values[idx]
+
+    def _band(values: list[float], scale: float = 1.0) -> dict:
+        return {f"p{int(round(level * 100))}": round(_pct(values, level) * scale, 2) for level in levels}
+
+    low, high = min(levels), max(levels)
+    bands: list[Optional[dict]] = []
+    for w in windows:
+        n = int(w.get('total_trades', 0) or 0)
+        if n <= 0:
+            bands.append(None)
+            continue
+
+        realized = float(w.get('profit', 0) or 0)
+        profits = sim_profit[n]
+        below = bisect_right(profits, realized)
+        start_balance = float(w.get('start_balance', 0) or 0)
+        dd_scale = (100.0 / start_balance) if start_balance > 0 else 0.0
+
+        bands.append({
+            'trade_count': n,
+            'iterations': iterations,
+            'sample_size': len(sample),
+            'profit': _band(profits),
+            'profit_factor': _band(sim_pf[n]),
+            'max_drawdown_pct': _band(sim_dd[n], dd_scale),
+            'profit_percentile': round(below / len(profits) * 100.0, 1),
+            'within_band': _pct(profits, low) <= realized <= _pct(profits, high),
+        })
+
+    return bands
+
+
 def extract_trades_from_results(backtest_results: dict) -> list[float]:
     """
     Extract individual trade profits from backtest results.
@@ -0,0 +1,341 @@
+"""
+MQL5 Lexer Module
+
+Tokenizes MQL5 source once and answers the questions the pipeline asks of
+it: input declarations (Step 3), OnTester / safety guard detection and
+injection points (Steps 1B/1C) and #include directives (compile cache).
+
+Comments, strings and preprocessor lines are single tokens, so declarations
+split over several lines are parsed and anything inside a comment is
+ignored. Tokenized sources are cached by content hash; lex() on unchanged
+text returns the same MQL5Source.
+"""
+import hashlib
+import re
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+from typing import Optional
+
+Token = namedtuple('Token', ['kind', 'text', 'start', 'end'])
+
+# Alternatives are tried in order (identifiers first, being the most common);
+# whitespace is matched but not emitted.
+TOKEN_RE = re.compile(
+    r'(?P<ident>[A-Za-z_]\w*)'
+    r'|(?P<ws>\s+)'
+    r'|(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))'
+    r'|(?P<directive>\#(?:\\\r?\n|[^\n])*)'
+    r'|(?P<string>"(?:[^"\\\n]|\\.)*"?)'
+    r'|(?P<char>\'(?:[^\'\\\n]|\\.)*\'?)'
+    r'|(?P<number>(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)\w*)'
+    r'|(?P<punct>::|->|\+\+|--|&&|\|\||<<=?|>>=?|[<>!=+\-*/%&|^]=|.)',
+    re.DOTALL,
+)
+
+DIRECTIVE_RE = re.compile(r'\#\s*(\w*)\s*(.*)', re.DOTALL)
+INCLUDE_ARG_RE = re.compile(r'([<"])([^>"\r\n]+)[>"]')
+WORD_RE = re.compile(r'[A-Za-z_]\w*')
+
+CONDITIONAL_OPEN = {'if', 'ifdef', 'ifndef'}
+INPUT_KEYWORDS = {'input', 'sinput'}
+
+LEX_CACHE_SIZE = 32
+_CACHE: OrderedDict = OrderedDict()
+
+
+def tokenize(content: str) -> list[Token]:
+    """
+    Split MQL5 source into tokens (whitespace dropped).
+
+    Args:
+        content: Source text
+
+    Returns:
+        Tokens of kind comment, directive, string, char, number, ident or punct
+    """
+    return MQL5Source(content).tokens
+
+
+class MQL5Source:
+    """A tokenized MQL5 source with brace depth and preprocessor structure."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self._line_starts: Optional[list[int]] = None
+        self._inputs: Optional[list[dict]] = None
+        self._identifiers: Optional[set[str]] = None
+
+        # One pass: all tokens; code tokens with the brace depth they appear
+        # at; directives with (name, argument, brace depth, #if nesting after
+        # the directive); positions in code of global input/sinput keywords
+        self.tokens: list[Token] = []
+        self.code: list[tuple[Token, int]] = []
+        self.comments: list[Token] = []
+        self.directives: list[tuple[Token, str, str, int, int]] = []
+        self._input_starts: list[int] = []
+        tokens_append = self.tokens.append
+        code_append = self.code.append
+        depth = 0
+        cond = 0
+        for m in TOKEN_RE.finditer(content):
+            kind = m.lastgroup
+            if kind == 'ws':
+                continue
+            start, end = m.span()
+            text = content[start:end]
+            tok = Token(kind, text, start, end)
+            tokens_append(tok)
+            if kind == 'ident':
+                if depth == 0 and text in INPUT_KEYWORDS:
+                    self._input_starts.append(len(self.code))
+                code_append((tok, depth))
+            elif kind == 'comment':
+                self.comments.append(tok)
+            elif kind == 'directive':
+                d = DIRECTIVE_RE.match(text)
+                name, arg = d.group(1), d.group(2).strip()
+                if name in CONDITIONAL_OPEN:
+                    cond += 1
+                elif name == 'endif':
+                    cond = max(0, cond - 1)
+                self.directives.append((tok, name, arg, depth, cond))
+            elif text == '{':
+                code_append((tok, depth))
+                depth += 1
+            elif text == '}':
+                depth = max(0, depth - 1)
+                code_append((tok, depth))
+            else:
+                code_append((tok, depth))
+
+    # ------------------------------------------------------------------
+    # Positions
+    # ------------------------------------------------------------------
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number of a character offset."""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer('\n', self.content)]
+        return bisect_right(self._line_starts, offset)
+
+    def line_end(self, offset: int) -> int:
+        """Offset just past the newline ending the line that contains offset."""
+        idx = self.content.find('\n', offset)
+        return len(self.content) if idx == -1 else idx + 1
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def identifiers(self) -> set[str]:
+        """Identifiers used in code or preprocessor lines (not in comments or strings)."""
+        if self._identifiers is None:
+            names = {tok.text for tok, _ in self.code if tok.kind == 'ident'}
+            for tok, _, _, _, _ in self.directives:
+                names.update(WORD_RE.findall(tok.text))
+            self._identifiers = names
+        return self._identifiers
+
+    def includes(self) -> list[tuple[str, str]]:
+        """[(kind, name)] for each #include, kind '<' or '"'."""
+        out = []
+        for _, name, arg, _, _ in self.directives:
+            if name == 'include':
+                m = INCLUDE_ARG_RE.match(arg)
+                if m:
+                    out.append((m.group(1), m.group(2)))
+        return out
+
+    def has_function(self, name: str) -> bool:
+        """True if a global function called name is declared or defined."""
+        code = self.code
+        for i, (tok, depth) in enumerate(code):
+            if (
+                depth == 0
+                and tok.text == name
+                and tok.kind == 'ident'
+                and 0 < i < len(code) - 1
+                and code[i - 1][0].kind == 'ident'
+                and code[i + 1][0].text == '('
+            ):
+                return True
+        return False
+
+    def find_comment(self, text: str, after: int = 0) -> Optional[Token]:
+        """First comment containing text that starts at or after an offset."""
+        for tok in self.comments[bisect_left([c.start for c in self.comments], after):]:
+            if text in tok.text:
+                return tok
+        return None
+
+    def find_directive(self, name: str, after: int = 0) -> Optional[Token]:
+        """First #name directive that starts at or after an offset."""
+        for tok, dname, _, _, _ in self.directives:
+            if tok.start >= after and dname == name:
+                return tok
+        return None
+
+    def header_end(self) -> int:
+        """
+        Offset just past a leading //+----+ header box (0 if the file has none).
+
+        The box is the run of line comments at the top of the file; it ends at
+        the first //+...+ line after its opening line.
+        """
+        leading = []
+        for tok in self.tokens:
+            if tok.kind != 'comment' or not tok.text.startswith('//'):
+                break
+            leading.append(tok)
+        if not leading or not leading[0].text.startswith('//+'):
+            return 0
+        for tok in leading[1:]:
+            text = tok.text.strip()
+            if text.startswith('//+') and text.endswith('+'):
+                return self.line_end(tok.end)
+        return 0
+
+    def last_global_directive_end(self) -> int:
+        """
+        End of the last preprocessor line at global scope outside any #if block.
+
+        Returns:
+            Offset of the end of that line (before its newline), or 0
+        """
+        for tok, _, _, depth, cond in reversed(self.directives):
+            if depth == 0 and cond == 0:
+                return tok.end
+        return 0
+
+    def inputs(self) -> list[dict]:
+        """
+        Global input / sinput declarations.
+
+        Returns:
+            List of dicts with keys keyword, type, name, default (source text or
+            None), comment (trailing // comment or None) and line
+        """
+        if self._inputs is None:
+            self._inputs = self._parse_inputs()
+        return [dict(p) for p in self._inputs]
+
+    def _parse_inputs(self) -> list[dict]:
+        code = self.code
+        comment_starts = [c.start for c in self.comments]
+        params = []
+        n = len(code)
+        group_end = -1
+        for i in self._input_starts:
+            tok = code[i][0]
+            if i > 0 and code[i - 1][0].text not in (';', '}', '{') and i - 1 != group_end:
+                continue
+
+            # input group "Name" (MetaEditor writes it without a ';')
+            if i + 2 < n and code[i + 1][0].text == 'group' and code[i + 2][0].kind == 'string':
+                group_end = i + 2
+                continue
+
+            # Collect the declaration up to its terminating ';'
+            j = i + 1
+            nesting = 0
+            while j < n:
+                text = code[j][0].text
+                if text in ('(', '['):
+                    nesting += 1
+                elif text in (')', ']'):
+                    nesting -= 1
+                elif nesting <= 0 and text in (';', '{', '}'):
+                    break
+                j += 1
+            decl = [t for t, _ in code[i + 1:j]]
+            end_tok = code[j][0] if j < n else None
+
+            if not decl:
+                continue
+            if end_tok is None or end_tok.text != ';':
+                continue
+
+            comment = None
+            k = bisect_left(comment_starts, end_tok.end)
+            if k < len(self.comments):
+                c = self.comments[k]
+                if c.text.startswith('//') and '\n' not in self.content[end_tok.end:c.start]:
+                    comment = c.text[2:].strip() or None
+
+            mql_type = None
+            for k, part in enumerate(self._split_declarators(decl)):
+                eq = next((idx for idx, t in enumerate(part) if t.text == '='), len(part))
+                head = part[:eq]
+                if not head or head[-1].kind != 'ident':
+                    continue
+                if k == 0:
+                    if len(head) < 2:
+                        break
+                    mql_type = ' '.join(t.text for t in head[:-1])
+                default = None
+                if eq < len(part) - 1:
+                    raw = self.content[part[eq + 1].start:part[-1].end]
+                    default = re.sub(r'\s*\n\s*', ' ', raw).strip()
+                params.append({
+                    'keyword': tok.text,
+                    'type': mql_type,
+                    'name': head[-1].text,
+                    'default': default,
+                    'comment': comment,
+                    'line': self.line_of(tok.start if k == 0 else head[-1].start),
+                })
+        return params
+
+    @staticmethod
+    def _split_declarators(decl: list[Token]) -> list[list[Token]]:
+        """Split `type a = 1, b = 2` at top-level commas."""
+        parts: list[list[Token]] = [[]]
+        nesting = 0
+        for t in decl:
+            if t.text in ('(', '[', '{'):
+                nesting += 1
+            elif t.text in (')', ']', '}'):
+                nesting -= 1
+            elif t.text == ',' and nesting == 0:
+                parts.append([])
+                continue
+            parts[-1].append(t)
+        return [p for p in parts if p]
+
+
+def lex(content: str) -> MQL5Source:
+    """
+    Tokenized source, cached by content hash.
+
+    Args:
+        content: Source text
+
+    Returns:
+        MQL5Source (shared between callers; treat as read-only)
+    """
+    key = hashlib.sha1(content.encode('utf-8', errors='surrogatepass')).hexdigest()
+    source = _CACHE.get(key)
+    if source is not None:
+        _CACHE.move_to_end(key)
+        return source
+    source = MQL5Source(content)
+    _CACHE[key] = source
+    while len(_CACHE) > LEX_CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return source
+
+
+def decode_source(data: bytes) -> str:
+    """Decode an MQL5 source file (MetaEditor saves UTF-16 LE or UTF-8)."""
+    if data.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return data.decode('utf-16', errors='ignore')
+    if b'\x00' in data[:200]:
+        return data.decode('utf-16-le', errors='ignore')
+    return data.decode('utf-8-sig', errors='ignore')
+
+
+def read_source(path: str) -> str:
+    """Read and decode an MQL5 source file."""
+    return decode_source(Path(path).read_bytes())
@@ -14,6 +14,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from engine.terminals import TerminalRegistry
+from engine.tracing import span, traced
 import settings
 
 
@@ -170,6 +171,7 @@ def create_ini_file(
     return str(output_path)
 
 
+@traced('optimization.run')
 def run_optimization(
     ea_path: str,
     symbol: str,
@@ -234,21 +236,25 @@ def run_optimization(
     try:
         process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
-        while process.poll() is None:
-            if time.time() - start_time > timeout:
-                process.kill()
-                return {'success': False, 'errors': [f'Optimization timed out after {timeout}s']}
-            if on_progress and (time.time() - last_progress) >= float(progress_interval_s or 30):
+        with span('optimization.mt5', symbol=symbol, timeframe=timeframe):
+            while process.poll() is None:
+                if time.time() - start_time > timeout:
+                    process.kill()
+                    return {'success': False, 'errors': [f'Optimization timed out after {timeout}s']}
+                if on_progress and (time.time() - last_progress) >= float(progress_interval_s or 30):
+                    try:
+                        elapsed = time.time() - start_time
+                        on_progress(
+                            f"Optimization running: {report_name or ea_path.stem} {symbol} {timeframe} "
+                            f"({elapsed:.0f}s elapsed)"
+                        )
+                    except Exception:
+                        pass
+                    last_progress = time.time()
                 try:
-                    elapsed = time.time() - start_time
-                    on_progress(
-                        f"Optimization running: {report_name or ea_path.stem} {symbol} {timeframe} "
-                        f"({elapsed:.0f}s elapsed)"
-                    )
-                except Exception:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
                     pass
-                last_progress = time.time()
-            time.sleep(5)
 
     except Exception as e:
         return {'success': False, 'errors': [f'Failed to run optimization: {str(e)}']}
@@ -421,6 +427,7 @@ def _merge_forward_results(base_results: list[dict], forward_results: list[dict]
             pass
 
 
+@traced('optimization.parse')
 def parse_optimization_results(xml_path: str) -> dict:
     """
     Parse optimization results from XML file.
@@ -3,10 +3,13 @@ EA Parameter Extractor Module
 
 Extracts input parameters from MQL5 source files.
 """
-import re
+import sys
 from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from modules.mql5_lexer import lex, read_source
+
 
 # MQL5 type mappings
 MQL5_TYPES = {
@@ -54,68 +57,49 @@ def extract_params(ea_path: str) -> list[dict]:
     if not ea_path.exists():
         raise FileNotFoundError(f"EA file not found: {ea_path}")
 
-    content = ea_path.read_text(encoding='utf-8', errors='ignore')
-    lines = content.split('\n')
+    content = read_source(str(ea_path))
 
     params = []
 
-    # Pattern for input declarations:
+    # Declarations come from the token stream, so inputs split over several
+    # lines are found and commented-out ones are not:
     # input int MyParam = 10; // Comment
     # input double Lots = 0.1;
     # sinput string Comment = "test"; // Static input (not optimizable)
-    input_pattern = re.compile(
-        r'^[\s]*(sinput|input)\s+'  # input or sinput keyword
-        r'([\w\s]+?)\s+'            # type (may include ENUM_)
-        r'(\w+)\s*'                 # parameter name
-        r'(?:=\s*([^;/]+?))?'       # optional default value
-        r'\s*;'                     # semicolon
-        r'(?:\s*//\s*(.*))?$',      # optional comment
-        re.MULTILINE
-    )
-
-    for line_num, line in enumerate(lines, 1):
-        # Skip commented lines
-        stripped = line.strip()
-        if stripped.startswith('//') or stripped.startswith('/*'):
-            continue
-
-        match = input_pattern.match(line)
-        if match:
-            input_type = match.group(1)  # 'input' or 'sinput'
-            mql_type = match.group(2).strip()
-            name = match.group(3).strip()
-            default = match.group(4).strip() if match.group(4) else None
-            comment = match.group(5).strip() if match.group(5) else None
-
-            # Determine base type
-            base_type = 'string'  # default
-            mql_type_lower = mql_type.lower()
-
-            for mql_t, base_t in MQL5_TYPES.items():
-                if mql_t.lower() == mql_type_lower:
-                    base_type = base_t
-                    break
-
-            # Check for enum types
-            if mql_type.startswith('ENUM_') or mql_type.isupper():
-                base_type = 'enum'
-
-            # sinput = static input, not optimizable
-            optimizable = (input_type == 'input') and (base_type in ['int', 'double'])
-
-            # Injected safety params must never be optimized
-            if name.startswith('EAStressSafety_'):
-                optimizable = False
-
-            params.append({
-                'name': name,
-                'type': mql_type,
-                'base_type': base_type,
-                'default': default,
-                'comment': comment,
-                'line': line_num,
-                'optimizable': optimizable,
-            })
+    for decl in lex(content).inputs():
+        input_type = decl['keyword']  # 'input' or 'sinput'
+        mql_type = decl['type']
+        name = decl['name']
+
+        # Determine base type
+        base_type = 'string'  # default
+        mql_type_lower = mql_type.lower()
+
+        for mql_t, base_t in MQL5_TYPES.items():
+            if mql_t.lower() == mql_type_lower:
+                base_type = base_t
+                break
+
+        # Check for enum types
+        if mql_type.startswith('ENUM_') or mql_type.isupper():
+            base_type = 'enum'
+
+        # sinput = static input, not optimizable
+        optimizable = (input_type == 'input') and (base_type in ['int', 'double'])
+
+        # Injected safety params must never be optimized
+        if name.startswith('EAStressSafety_'):
+            optimizable = False
+
+        params.append({
+            'name': name,
+            'type': mql_type,
+            'base_type': base_type,
+            'default': decl['default'],
+            'comment': decl['comment'],
+            'line': decl['line'],
+            'optimizable': optimizable,
+        })
 
     return params
 
@@ -0,0 +1,274 @@
+"""
+Rolling Surface Module
+
+Dense rolling-window metric series (profit, PF, drawdown, win rate) across the
+full backtest period, e.g. every 30/60/90-day window stepped daily.
+
+Each window length is computed in a single sweep over the sorted trade table:
+window bounds only ever move forward (two pointers), totals come from the
+WindowMetricsEngine prefix sums and drawdown from its segment tree.
+
+Series are stored as float32 arrays in a binary file next to backtests.json
+(`rolling_surfaces.bin`) with a small JSON index (`rolling_surfaces.json`)
+holding offsets and worst-window statistics per pass.
+"""
+import json
+import sys
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from modules.window_metrics import WindowMetricsEngine, PF_NO_LOSS, GROSS_LOSS_EPS
+
+# Order of series within a surface (and within the binary file)
+ROLLING_METRICS = ('profit', 'profit_factor', 'max_drawdown_pct', 'win_rate', 'total_trades')
+
+SURFACE_INDEX_NAME = 'rolling_surfaces.json'
+SURFACE_DATA_NAME = 'rolling_surfaces.bin'
+
+
+def compute_rolling_surface(
+    engine: WindowMetricsEngine,
+    start: datetime,
+    end: datetime,
+    window_days: list[int],
+    step_days: int = 1,
+) -> dict:
+    """
+    Compute rolling-window series for one pass.
+
+    Window k of length W covers [end_k - W days, end_k] where
+    end_k = start + W days + k * step_days, for every end_k <= end.
+
+    Args:
+        engine: Window engine built from the pass trade list
+        start: Backtest start date
+        end: Backtest end date
+        window_days: Window lengths in days (e.g. [30, 60, 90])
+        step_days: Step between consecutive windows in days
+
+    Returns:
+        dict with step_days and, per window length, the first window end date
+        and a float32 array per metric in ROLLING_METRICS
+    """
+    step = timedelta(days=max(1, int(step_days or 1)))
+    times = engine.close_times
+    n = len(times)
+    cum_profit = engine.cum_profit
+    cum_gp = engine.cum_gross_profit
+    cum_gl = engine.cum_gross_loss
+    cum_wins = engine.cum_wins
+
+    windows: dict[str, dict] = {}
+    for days in window_days or []:
+        try:
+            w = int(days)
+        except Exception:
+            continue
+        if w <= 0:
+            continue
+
+        span = timedelta(days=w)
+        series = {m: array('f') for m in ROLLING_METRICS}
+        first_end = start + span
+        window_end = first_end
+        i = 0
+        j = 0
+
+        while window_end <= end:
+            window_start = window_end - span
+            while i < n and times[i] < window_start:
+                i += 1
+            if j < i:
+                j = i
+            while j < n and times[j] <= window_end:
+                j += 1
+
+            total = j - i
+            if total > 0:
+                gp = cum_gp[j] - cum_gp[i]
+                gl = cum_gl[j] - cum_gl[i]
+                if gl <= GROSS_LOSS_EPS:
+                    pf = PF_NO_LOSS if gp > GROSS_LOSS_EPS else 0.0
+                else:
+                    pf = gp / gl
+                series['profit'].append(cum_profit[j] - cum_profit[i])
+                series['profit_factor'].append(pf)
+                series['max_drawdown_pct'].append(engine.max_drawdown(i, j) * 100.0)
+                series['win_rate'].append((cum_wins[j] - cum_wins[i]) / total * 100.0)
+            else:
+                series['profit'].append(0.0)
+                series['profit_factor'].append(0.0)
+                series['max_drawdown_pct'].append(0.0)
+                series['win_rate'].append(0.0)
+            series['total_trades'].append(total)
+
+            window_end += step
+
+        windows[str(w)] = {
+            'first_end': first_end.strftime('%Y.%m.%d'),
+            'count': len(series['profit']),
+            'series': series,
+        }
+
+    return {
+        'step_days': step.days,
+        'windows': windows,
+    }
+
+
+def summarize_surface(surface: dict, min_trades: int = 5) -> dict:
+    """
+    Worst-window statistics per window length.
+
+    Windows with fewer than min_trades trades are ignored for profit factor and
+    win rate (a 1-trade window says nothing about edge).
+
+    Returns:
+        dict keyed by window length (days, as str) with:
+            windows, active_windows, profitable_pct,
+            worst_profit / worst_profit_end,
+            worst_profit_factor / worst_profit_factor_end,
+            max_drawdown_pct / max_drawdown_end,
+            worst_win_rate / worst_win_rate_end
+    """
+    step_days = int(surface.get('step_days', 1) or 1)
+    summary: dict[str, dict] = {}
+
+    for key, win in (surface.get('windows') or {}).items():
+        series = win.get('series') or {}
+        profits = series.get('profit') or []
+        pfs = series.get('profit_factor') or []
+        dds = series.get('max_drawdown_pct') or []
+        wrs = series.get('win_rate') or []
+        trades = series.get('total_trades') or []
+        try:
+            first_end = datetime.strptime(win.get('first_end'), '%Y.%m.%d')
+        except Exception:
+            first_end = None
+
+        def _end_date(k: Optional[int]) -> Optional[str]:
+            if k is None or first_end is None:
+                return None
+            return (first_end + timedelta(days=k * step_days)).strftime('%Y.%m.%d')
+
+        active = [k for k in range(len(trades)) if trades[k] > 0]
+        qualified = [k for k in active if trades[k] >= min_trades]
+
+        worst_profit = min(active, key=lambda k: profits[k], default=None)
+        worst_pf = min(qualified, key=lambda k: pfs[k], default=None)
+        worst_dd = max(active, key=lambda k: dds[k], default=None)
+        worst_wr = min(qualified, key=lambda k: wrs[k], default=None)
+        profitable = sum(1 for k in active if profits[k] > 0)
+
+        summary[key] = {
+            'windows': len(trades),
+            'active_windows': len(active),
+            'profitable_pct': round(profitable / len(active) * 100.0, 1) if active else 0.0,
+            'worst_profit': round(float(profits[worst_profit]), 2) if worst_profit is not None else 0.0,
+            'worst_profit_end': _end_date(worst_profit),
+            'worst_profit_factor': round(float(pfs[worst_pf]), 2) if worst_pf is not None else None,
+            'worst_profit_factor_end': _end_date(worst_pf),
+            'max_drawdown_pct': round(float(dds[worst_dd]), 2) if worst_dd is not None else 0.0,
+            'max_drawdown_end': _end_date(worst_dd),
+            'worst_win_rate': round(float(wrs[worst_wr]), 1) if worst_wr is not None else None,
+            'worst_win_rate_end': _end_date(worst_wr),
+        }
+
+    return summary
+
+
+def save_rolling_surfaces(
+    results_dir: Path,
+    surfaces: dict,
+    summaries: dict,
+    window_days: list[int],
+) -> str:
+    """
+    Write surfaces for all passes to rolling_surfaces.bin + rolling_surfaces.json.
+
+    Args:
+        results_dir: Workflow results directory (runs/<workflow_id>)
+        surfaces: {pass_num: surface from compute_rolling_surface}
+        summaries: {pass_num: summary from summarize_surface}
+        window_days: Window lengths that were computed
+
+    Returns:
+        Path to the JSON index
+    """
+    results_dir = Path(results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    index = {
+        'dtype': 'float32',
+        'byteorder': 'little',
+        'data_file': SURFACE_DATA_NAME,
+        'metrics': list(ROLLING_METRICS),
+        'window_days': [int(d) for d in window_days],
+        'passes': {},
+    }
+
+    offset = 0
+    with open(results_dir / SURFACE_DATA_NAME, 'wb') as f:
+        for pass_num, surface in surfaces.items():
+            pass_entry = {
+                'step_days': surface.get('step_days', 1),
+                'windows': {},
+                'worst': summaries.get(pass_num, {}),
+            }
+            for key, win in (surface.get('windows') or {}).items():
+                entry = {
+                    'first_end': win.get('first_end'),
+                    'count': win.get('count', 0),
+                    'offsets': {},
+                }
+                for metric in ROLLING_METRICS:
+                    arr = win['series'][metric]
+                    if sys.byteorder != 'little':
+                        arr = array('f', arr)
+                        arr.byteswap()
+                    data = arr.tobytes()
+                    f.write(data)
+                    entry['offsets'][metric] = offset
+                    offset += len(data)
+                pass_entry['windows'][key] = entry
+            index['passes'][str(pass_num)] = pass_entry
+
+    index_path = results_dir / SURFACE_INDEX_NAME
+    with open(index_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    return str(index_path)
+
+
+def load_rolling_index(index_path: str) -> dict:
+    """Load the rolling surface index (offsets + worst-window stats)."""
+    path = Path(index_path)
+    if not path.exists():
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_rolling_series(index_path: str, pass_num, window_days: int, metric: str) -> array:
+    """
+    Read one float32 series from rolling_surfaces.bin without loading the rest.
+
+    Returns:
+        array('f') (empty if the pass/window/metric is not stored)
+    """
+    index = load_rolling_index(index_path)
+    entry = (((index.get('passes') or {}).get(str(pass_num)) or {}).get('windows') or {}).get(str(int(window_days)))
+    out = array('f')
+    if not entry or metric not in (entry.get('offsets') or {}):
+        return out
+
+    data_path = Path(index_path).parent / index.get('data_file', SURFACE_DATA_NAME)
+    count = int(entry.get('count', 0) or 0)
+    with open(data_path, 'rb') as f:
+        f.seek(int(entry['offsets'][metric]))
+        out.frombytes(f.read(count * out.itemsize))
+    if sys.byteorder != 'little':
+        out.byteswap()
+    return out
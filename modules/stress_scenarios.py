@@ -21,6 +21,7 @@ from typing import Optional, Any, Iterable, Callable
 
 import settings
 from modules.backtest import run_backtest
+from modules.downsample import compact_series
 from modules.trade_extractor import extract_trades
 
 
@@ -378,6 +379,7 @@ def _apply_cost_overlay(
     balance = float(initial_balance or 0)
     peak = balance if balance != 0 else max(balance, 1e-9)
     max_dd = 0.0
+    balances = [balance]
 
     for _, p in rows:
         profit += p
@@ -387,6 +389,7 @@ def _apply_cost_overlay(
             gross_loss += abs(p)
 
         balance += p
+        balances.append(balance)
         if balance > peak:
             peak = balance
         if peak > 0:
@@ -413,6 +416,8 @@ def _apply_cost_overlay(
             "pip_value_per_lot_est": float(pip_value_per_lot),
             "overlay_cost_total": float(overlay_cost_total),
         },
+        # Compact adjusted equity for report sparklines
+        "equity_points": compact_series(balances, int(getattr(settings, "SPARKLINE_POINTS", 48) or 48)),
     }
 
 
@@ -556,6 +561,74 @@ def build_dynamic_scenarios(workflow_dates: Optional[dict[str, str]] = None) ->
     return scenarios
 
 
+def _decisive_rule(rule: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+    """Merge a decisive-mode rule with defaults from settings."""
+    base = {
+        "tags": ["tick"],
+        "min_profit_factor": 1.0,
+        "min_profit": None,
+        "max_drawdown_pct": None,
+        "min_trades": 1,
+        "max_failures": 1,
+    }
+    configured = getattr(settings, "STRESS_DECISIVE_RULE", None)
+    if isinstance(configured, dict):
+        base.update(configured)
+    if isinstance(rule, dict):
+        base.update(rule)
+    base["tags"] = [str(t) for t in (base.get("tags") or [])]
+    try:
+        base["max_failures"] = max(1, int(base.get("max_failures") or 1))
+    except Exception:
+        base["max_failures"] = 1
+    return base
+
+
+def _rule_counts_scenario(scenario: dict[str, Any], rule: dict[str, Any]) -> bool:
+    """True if the scenario carries every tag the rule requires."""
+    tags = set(str(t) for t in (scenario.get("tags") or []))
+    return all(t in tags for t in rule.get("tags") or [])
+
+
+def _rule_outcome(entry: dict[str, Any], rule: dict[str, Any]) -> Optional[bool]:
+    """
+    Evaluate the decisive rule for one completed scenario.
+
+    Returns:
+        True (passed), False (failed) or None (inconclusive: run failed or too few trades)
+    """
+    if not entry.get("success"):
+        return None
+    r = entry.get("result", {}) if isinstance(entry.get("result"), dict) else {}
+    if int(r.get("total_trades", 0) or 0) < int(rule.get("min_trades") or 0):
+        return None
+
+    min_pf = rule.get("min_profit_factor")
+    if min_pf is not None and float(r.get("profit_factor", 0) or 0) < float(min_pf):
+        return False
+    min_profit = rule.get("min_profit")
+    if min_profit is not None and float(r.get("profit", 0) or 0) < float(min_profit):
+        return False
+    max_dd = rule.get("max_drawdown_pct")
+    if max_dd is not None and float(r.get("max_drawdown_pct", 0) or 0) > float(max_dd):
+        return False
+    return True
+
+
+def _decisive_verdict(failures: int, pending: int, max_failures: int) -> Optional[str]:
+    """
+    Verdict once it can no longer change.
+
+    FAIL is fixed when failures reach max_failures; PASS is fixed when even
+    failing every pending rule scenario cannot reach max_failures.
+    """
+    if failures >= max_failures:
+        return "fail"
+    if failures + pending < max_failures:
+        return "pass"
+    return None
+
+
 def run_stress_scenarios(
     compiled_ea_path: str,
     symbol: str,
@@ -568,6 +641,8 @@ def run_stress_scenarios(
     baseline: Optional[dict[str, Any]] = None,
     include_overlays: Optional[bool] = None,
     on_progress: Optional[Callable[[str], None]] = None,
+    decisive: Optional[bool] = None,
+    decisive_rule: Optional[dict[str, Any]] = None,
 ) -> dict:
     """
     Run stress scenarios for a compiled EA.
@@ -586,12 +661,16 @@ def run_stress_scenarios(
         workflow_dates: Backtest dates dict from workflow state (used for dynamic suite anchoring)
         baseline: Optional dict for baseline overlays. Expected keys: report_path, profit_factor, etc.
         include_overlays: Override settings.STRESS_INCLUDE_OVERLAYS
+        decisive: Override settings.STRESS_DECISIVE_MODE (stop once the verdict is fixed)
+        decisive_rule: Override/extend settings.STRESS_DECISIVE_RULE
 
     Returns:
         dict with:
           - success: bool
           - scenario_count: int
           - scenarios: list of scenario result dicts (some may fail individually)
+          - skipped_scenarios: list of {id, label, reason} for scenarios not run (decisive mode)
+          - decisive: rule, verdict and counts (decisive mode only)
     """
     scenario_defs = scenarios if scenarios is not None else getattr(settings, "STRESS_SCENARIOS", None)
     if scenario_defs is None:
@@ -634,9 +713,47 @@ def run_stress_scenarios(
             "tags": ["baseline", "ohlc"],
         })
 
-    for s in scenario_defs:
-        if not isinstance(s, dict):
-            continue
+    if decisive is None:
+        decisive = bool(getattr(settings, "STRESS_DECISIVE_MODE", False))
+
+    queue = [s for s in scenario_defs if isinstance(s, dict)]
+    skipped: list[dict] = []
+    decision: Optional[dict[str, Any]] = None
+    rule: dict[str, Any] = {}
+
+    if decisive:
+        rule = _decisive_rule(decisive_rule)
+        # Rule scenarios first so the verdict is reached with as few MT5 runs as possible
+        queue.sort(key=lambda sc: 0 if _rule_counts_scenario(sc, rule) else 1)
+        cancel_all_on_fail = bool(getattr(settings, "STRESS_DECISIVE_CANCEL_ALL_ON_FAIL", True))
+        decision = {
+            "enabled": True,
+            "rule": rule,
+            "verdict": None,
+            "decided_after": None,
+            "counted": 0,
+            "passed": 0,
+            "failed": 0,
+            "inconclusive": 0,
+            "pending": sum(1 for sc in queue if _rule_counts_scenario(sc, rule)),
+        }
+
+    for s in queue:
+        if decision is not None and decision["verdict"] is not None:
+            counted = _rule_counts_scenario(s, rule)
+            if counted or (decision["verdict"] == "fail" and cancel_all_on_fail):
+                skipped.append({
+                    "id": _sanitize_id(str(s.get("id") or "scenario")),
+                    "label": str(s.get("label") or s.get("id") or "scenario"),
+                    "reason": (
+                        f"Stress verdict {decision['verdict'].upper()} already fixed after "
+                        f"{decision['decided_after']}"
+                        + ("" if counted else " (non-rule scenario cancelled on FAIL)")
+                    ),
+                })
+                if counted:
+                    decision["pending"] -= 1
+                continue
 
         scenario_id = _sanitize_id(str(s.get("id") or "scenario"))
         label = str(s.get("label") or scenario_id)
@@ -738,6 +855,29 @@ def run_stress_scenarios(
             except Exception:
                 pass
 
+        if decision is not None and _rule_counts_scenario(s, rule):
+            decision["pending"] -= 1
+            outcome = _rule_outcome(entry, rule)
+            entry["decisive"] = {"counted": True, "outcome": {True: "pass", False: "fail", None: "inconclusive"}[outcome]}
+            if outcome is None:
+                decision["inconclusive"] += 1
+            else:
+                decision["counted"] += 1
+                decision["passed" if outcome else "failed"] += 1
+            if decision["verdict"] is None:
+                verdict = _decisive_verdict(decision["failed"], decision["pending"], rule["max_failures"])
+                # An all-inconclusive rule set proves nothing: keep running the rest
+                if verdict == "pass" and decision["counted"] == 0:
+                    verdict = None
+                if verdict is not None:
+                    decision["verdict"] = verdict
+                    decision["decided_after"] = scenario_id
+                    if on_progress:
+                        try:
+                            on_progress(f"Stress verdict {verdict.upper()} fixed after {scenario_id}; skipping scenarios that cannot change it")
+                        except Exception:
+                            pass
+
         # Track eligible bases for overlays (skip latency variants by default)
         if entry["success"] and entry.get("report_path") and "latency" not in set(entry.get("tags") or []):
             overlay_bases.append(entry)
@@ -860,6 +1000,7 @@ def run_stress_scenarios(
                             "ticks": base_res.get("ticks", 0),
                             "symbols": base_res.get("symbols", 0),
                             "overlay": overlay_metrics.get("overlay", {}),
+                            "equity_points": overlay_metrics.get("equity_points", []),
                             "tick_files_ok": base_res.get("tick_files_ok"),
                             "tick_files_missing": base_res.get("tick_files_missing"),
                         },
@@ -875,8 +1016,13 @@ def run_stress_scenarios(
             except Exception:
                 pass
 
-    return {
+    out = {
         "success": True,
         "scenario_count": len(results),
         "scenarios": results,
+        "skipped_scenarios": skipped,
     }
+    if decision is not None:
+        decision["skipped_count"] = len(skipped)
+        out["decisive"] = decision
+    return out
@@ -0,0 +1,267 @@
+"""
+Trade Diff Module
+
+Trade-level comparison between two backtest reports of the same parameter set
+(e.g. a tick or latency stress scenario vs the OHLC run of the same window).
+
+Trades are matched with a hash join on (open-time bucket, side, volume): the
+reference trades are indexed once in a dict, then every scenario trade probes
+its own bucket and the two neighbouring buckets (a few seconds of latency can
+push an entry across a bucket edge). Cost is O(n + m) per pair.
+
+Each trade is classified as:
+- identical:     matched, same net profit
+- price_shifted: matched, different net profit (fill / exit price moved)
+- missing:       in the reference only (scenario never took the trade)
+- extra:         in the scenario only
+
+and the total profit delta is attributed to those classes (the class deltas
+sum exactly to the headline difference).
+"""
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+
+DIFF_CLASSES = ('identical', 'price_shifted', 'missing', 'extra')
+
+
+def _field(trade: Any, name: str) -> Any:
+    """Read a field from a Trade object or a trade dict."""
+    if isinstance(trade, dict):
+        return trade.get(name)
+    return getattr(trade, name, None)
+
+
+def _bucket(trade: Any, bucket_seconds: int) -> Optional[int]:
+    open_time = _field(trade, 'open_time')
+    if open_time is None:
+        return None
+    return int(open_time.timestamp()) // bucket_seconds
+
+
+def _trade_summary(trade: Any) -> dict:
+    open_time = _field(trade, 'open_time')
+    return {
+        'ticket': _field(trade, 'ticket'),
+        'open_time': open_time.strftime('%Y.%m.%d %H:%M:%S') if open_time else None,
+        'type': _field(trade, 'trade_type'),
+        'volume': _field(trade, 'volume'),
+        'open_price': _field(trade, 'open_price'),
+        'close_price': _field(trade, 'close_price'),
+        'net_profit': round(float(_field(trade, 'net_profit') or 0), 2),
+    }
+
+
+def diff_trades(
+    reference: Iterable[Any],
+    scenario: Iterable[Any],
+    bucket_seconds: int = None,
+    profit_tolerance: float = 0.01,
+    top_n: int = 5,
+) -> dict:
+    """
+    Match two trade lists and attribute the profit delta to trade classes.
+
+    Args:
+        reference: Trades of the reference run (e.g. OHLC window)
+        scenario: Trades of the stressed run (e.g. tick / latency window)
+        bucket_seconds: Open-time bucket size (default: settings.STRESS_TRADE_DIFF_BUCKET_SECONDS)
+        profit_tolerance: Max |profit difference| for a match to count as identical
+        top_n: Number of largest contributors kept per class
+
+    Returns:
+        dict with:
+            - reference_trades / scenario_trades: int
+            - reference_profit / scenario_profit / profit_delta: float
+            - classes: {class: {'count', 'profit_delta'}} for DIFF_CLASSES
+            - entry_shift_avg: mean adverse entry price shift of matched trades
+            - top: {class: [trade summaries]} largest |profit impact| first
+    """
+    if bucket_seconds is None:
+        bucket_seconds = getattr(settings, 'STRESS_TRADE_DIFF_BUCKET_SECONDS', 60)
+    bucket_seconds = max(1, int(bucket_seconds or 1))
+
+    # Build side: reference trades by key, each bucket in open-time order
+    index: dict[tuple, deque] = {}
+    ref_list = sorted(
+        (t for t in reference or [] if _field(t, 'open_time') is not None),
+        key=lambda t: _field(t, 'open_time'),
+    )
+    for t in ref_list:
+        key = (
+            _bucket(t, bucket_seconds),
+            str(_field(t, 'trade_type') or '').lower(),
+            round(float(_field(t, 'volume') or 0), 2),
+        )
+        index.setdefault(key, deque()).append(t)
+
+    classes = {c: {'count': 0, 'profit_delta': 0.0} for c in DIFF_CLASSES}
+    impacts: dict[str, list] = {c: [] for c in DIFF_CLASSES}
+    entry_shift_sum = 0.0
+    matched = 0
+    scenario_count = 0
+    scenario_profit = 0.0
+
+    # Probe side: each scenario trade looks up its bucket and both neighbours
+    for t in scenario or []:
+        scenario_count += 1
+        profit = float(_field(t, 'net_profit') or 0)
+        scenario_profit += profit
+        bucket = _bucket(t, bucket_seconds)
+        side = str(_field(t, 'trade_type') or '').lower()
+        volume = round(float(_field(t, 'volume') or 0), 2)
+
+        best_q = None
+        if bucket is not None:
+            open_time = _field(t, 'open_time')
+            best_gap = None
+            for b in (bucket, bucket - 1, bucket + 1):
+                q = index.get((b, side, volume))
+                if not q:
+                    continue
+                gap = abs((_field(q[0], 'open_time') - open_time).total_seconds())
+                if best_gap is None or gap < best_gap:
+                    best_gap = gap
+                    best_q = q
+
+        if best_q is None:
+            classes['extra']['count'] += 1
+            classes['extra']['profit_delta'] += profit
+            impacts['extra'].append((profit, t))
+            continue
+
+        ref = best_q.popleft()
+        delta = profit - float(_field(ref, 'net_profit') or 0)
+        cls = 'identical' if abs(delta) <= profit_tolerance else 'price_shifted'
+        classes[cls]['count'] += 1
+        classes[cls]['profit_delta'] += delta
+        if cls == 'price_shifted':
+            impacts[cls].append((delta, t))
+
+        shift = float(_field(t, 'open_price') or 0) - float(_field(ref, 'open_price') or 0)
+        entry_shift_sum += shift if side == 'buy' else -shift
+        matched += 1
+
+    reference_profit = 0.0
+    for t in ref_list:
+        reference_profit += float(_field(t, 'net_profit') or 0)
+    for q in index.values():
+        for t in q:
+            profit = float(_field(t, 'net_profit') or 0)
+            classes['missing']['count'] += 1
+            classes['missing']['profit_delta'] -= profit
+            impacts['missing'].append((-profit, t))
+
+    top = {}
+    for c in ('price_shifted', 'missing', 'extra'):
+        ranked = sorted(impacts[c], key=lambda item: abs(item[0]), reverse=True)[:max(0, int(top_n))]
+        top[c] = [{**_trade_summary(t), 'profit_impact': round(impact, 2)} for impact, t in ranked]
+
+    for c in DIFF_CLASSES:
+        classes[c]['profit_delta'] = round(classes[c]['profit_delta'], 2)
+
+    return {
+        'bucket_seconds': bucket_seconds,
+        'reference_trades': len(ref_list),
+        'scenario_trades': scenario_count,
+        'reference_profit': round(reference_profit, 2),
+        'scenario_profit': round(scenario_profit, 2),
+        'profit_delta': round(scenario_profit - reference_profit, 2),
+        'classes': classes,
+        'entry_shift_avg': round(entry_shift_sum / matched, 6) if matched else 0.0,
+        'top': top,
+    }
+
+
+def explain_diff(diff: dict) -> str:
+    """One-line explanation: largest negative contributors first."""
+    classes = diff.get('classes') or {}
+    parts = []
+    for c in sorted(('price_shifted', 'missing', 'extra'), key=lambda c: classes.get(c, {}).get('profit_delta', 0)):
+        info = classes.get(c) or {}
+        if not info.get('count'):
+            continue
+        parts.append(f"{c.replace('_', '-')} {info['count']} trade(s) {info['profit_delta']:+.2f}")
+    if not parts:
+        return 'All trades identical'
+    return f"Profit delta {float(diff.get('profit_delta', 0) or 0):+.2f}: " + ', '.join(parts)
+
+
+def _reference_id(scenario: dict, base_by_window: dict) -> Optional[str]:
+    """OHLC run of the same window is the reference for tick / latency scenarios."""
+    tags = set(scenario.get('tags') or [])
+    if 'tick' not in tags:
+        return None
+    window_id = (scenario.get('window') or {}).get('id')
+    return base_by_window.get(window_id)
+
+
+def diff_stress_scenarios(
+    scenarios: list[dict],
+    extract: Callable[[str], Any] = None,
+    bucket_seconds: int = None,
+    top_n: int = 5,
+) -> dict:
+    """
+    Attach a trade diff to every tick / latency scenario (in place).
+
+    Each report is parsed once; diffs only run for base (MT5) rows that have a
+    same-window OHLC reference.
+
+    Args:
+        scenarios: Stress scenario rows from run_stress_scenarios
+        extract: Report -> TradeExtractionResult (default: extract_trades)
+        bucket_seconds: Open-time bucket size
+        top_n: Largest contributors kept per class
+
+    Returns:
+        dict with diff_count and errors (list of str)
+    """
+    if extract is None:
+        from modules.trade_extractor import extract_trades
+        extract = extract_trades
+
+    base_by_window: dict[str, str] = {}
+    by_id: dict[str, dict] = {}
+    for s in scenarios or []:
+        if not isinstance(s, dict) or s.get('variant', 'base') != 'base':
+            continue
+        by_id[str(s.get('id'))] = s
+        tags = set(s.get('tags') or [])
+        window_id = (s.get('window') or {}).get('id')
+        if 'ohlc' in tags and window_id and s.get('success') and s.get('report_path'):
+            base_by_window.setdefault(window_id, str(s.get('id')))
+
+    cache: dict[str, Optional[list]] = {}
+    errors: list[str] = []
+
+    def _trades(path: str) -> Optional[list]:
+        if path not in cache:
+            res = extract(path)
+            cache[path] = list(res.trades) if getattr(res, 'success', False) else None
+            if cache[path] is None:
+                errors.append(f"{path}: {getattr(res, 'error', None) or 'trade extraction failed'}")
+        return cache[path]
+
+    count = 0
+    for s in list(by_id.values()):
+        ref_id = _reference_id(s, base_by_window)
+        if not ref_id or not s.get('success') or not s.get('report_path'):
+            continue
+        ref = by_id[ref_id]
+        ref_trades = _trades(str(ref['report_path']))
+        scen_trades = _trades(str(s['report_path']))
+        if ref_trades is None or scen_trades is None:
+            continue
+
+        diff = diff_trades(ref_trades, scen_trades, bucket_seconds=bucket_seconds, top_n=top_n)
+        diff['reference_id'] = ref_id
+        diff['explanation'] = explain_diff(diff)
+        s['trade_diff'] = diff
+        count += 1
+
+    return {'diff_count': count, 'errors': errors}
@@ -0,0 +1,208 @@
+"""
+Window Metrics Engine
+
+Computes per-window trade metrics (profit, profit factor, drawdown, win rate)
+over a trade table sorted by close time.
+
+The engine is built once per trade list:
+- window boundaries are found with binary search on the close times
+- profit / gross profit / gross loss / wins come from prefix sums
+- max drawdown over any balance range comes from a segment tree
+
+so each window costs O(log n) instead of a rescan of the whole trade list.
+This makes thousands of windows (rolling surfaces, per-pass slices) cheap.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+
+# Profit factor reported when a window has wins but no losses
+PF_NO_LOSS = 99.0
+
+# Tolerance for "no gross loss" (prefix-sum differences are not exactly zero)
+GROSS_LOSS_EPS = 1e-9
+
+
+def _trade_field(trade: Any, name: str) -> Any:
+    """Read a field from a Trade object or a trade dict."""
+    if isinstance(trade, dict):
+        return trade.get(name)
+    return getattr(trade, name, None)
+
+
+def _merge(left: Optional[tuple], right: Optional[tuple]) -> Optional[tuple]:
+    """
+    Merge two adjacent balance segments.
+
+    A segment is (peak, trough, max_dd) where max_dd is the largest
+    fractional drop from a balance to any LATER balance inside the segment.
+    Crossing drawdowns use the left peak and the right trough, which is exact
+    while balances stay positive (an account below zero is already ruined).
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+    l_max, l_min, l_dd = left
+    r_max, r_min, r_dd = right
+    cross = (l_max - r_min) / l_max if l_max > 0 else 0.0
+    return (
+        l_max if l_max >= r_max else r_max,
+        l_min if l_min <= r_min else r_min,
+        max(l_dd, r_dd, cross),
+    )
+
+
+class WindowMetricsEngine:
+    """
+    Range-query engine over a sorted trade table.
+
+    Balance point k is the balance after the first k trades, so a window
+    covering trades [i, j) starts at balance point i and ends at point j.
+    """
+
+    def __init__(
+        self,
+        close_times: list[datetime],
+        profits: list[float],
+        initial_balance: float = 0.0,
+    ):
+        """
+        Build prefix sums and the drawdown segment tree.
+
+        Args:
+            close_times: Trade close times, sorted ascending
+            profits: Net profit per trade (same order as close_times)
+            initial_balance: Account balance before the first trade
+        """
+        if len(close_times) != len(profits):
+            raise ValueError("close_times and profits must have the same length")
+
+        self.close_times = list(close_times)
+        self.initial_balance = float(initial_balance or 0)
+
+        n = len(self.close_times)
+        cum_profit = [0.0] * (n + 1)
+        cum_gross_profit = [0.0] * (n + 1)
+        cum_gross_loss = [0.0] * (n + 1)
+        cum_wins = [0] * (n + 1)
+
+        for k, value in enumerate(profits):
+            p = float(value or 0)
+            cum_profit[k + 1] = cum_profit[k] + p
+            cum_gross_profit[k + 1] = cum_gross_profit[k] + (p if p > 0 else 0.0)
+            cum_gross_loss[k + 1] = cum_gross_loss[k] + (-p if p < 0 else 0.0)
+            cum_wins[k + 1] = cum_wins[k] + (1 if p > 0 else 0)
+
+        self.cum_profit = cum_profit
+        self.cum_gross_profit = cum_gross_profit
+        self.cum_gross_loss = cum_gross_loss
+        self.cum_wins = cum_wins
+        self.balances = [self.initial_balance + c for c in cum_profit]
+
+        # Iterative segment tree over balance points (leaves at [size, size + n])
+        size = 1
+        while size < n + 1:
+            size *= 2
+        tree: list[Optional[tuple]] = [None] * (2 * size)
+        for k, b in enumerate(self.balances):
+            tree[size + k] = (b, b, 0.0)
+        for k in range(size - 1, 0, -1):
+            tree[k] = _merge(tree[2 * k], tree[2 * k + 1])
+        self._size = size
+        self._tree = tree
+
+    @classmethod
+    def from_trades(cls, trades: Iterable[Any], initial_balance: float = 0.0) -> 'WindowMetricsEngine':
+        """
+        Build an engine from Trade objects or trade dicts.
+
+        Trades without a close_time are ignored; the rest are sorted by close time.
+        """
+        rows = []
+        for t in trades or []:
+            close_time = _trade_field(t, 'close_time')
+            if close_time is None:
+                continue
+            rows.append((close_time, float(_trade_field(t, 'net_profit') or 0)))
+        rows.sort(key=lambda r: r[0])
+        return cls(
+            close_times=[r[0] for r in rows],
+            profits=[r[1] for r in rows],
+            initial_balance=initial_balance,
+        )
+
+    def __len__(self) -> int:
+        return len(self.close_times)
+
+    def bounds(self, window_start: datetime, window_end: datetime) -> tuple[int, int]:
+        """Return trade index range [i, j) with window_start <= close_time <= window_end."""
+        i = bisect_left(self.close_times, window_start)
+        j = bisect_right(self.close_times, window_end)
+        return i, max(i, j)
+
+    def max_drawdown(self, lo: int, hi: int) -> float:
+        """Max fractional drawdown across balance points lo..hi (inclusive)."""
+        if hi <= lo:
+            return 0.0
+        left: Optional[tuple] = None
+        right: Optional[tuple] = None
+        a = lo + self._size
+        b = hi + self._size + 1
+        tree = self._tree
+        while a < b:
+            if a & 1:
+                left = _merge(left, tree[a])
+                a += 1
+            if b & 1:
+                b -= 1
+                right = _merge(tree[b], right)
+            a //= 2
+            b //= 2
+        merged = _merge(left, right)
+        return merged[2] if merged else 0.0
+
+    def range_metrics(self, i: int, j: int) -> dict:
+        """Metrics for trades [i, j) of the sorted table."""
+        total = j - i
+        if total <= 0:
+            return {
+                'profit': 0.0,
+                'profit_factor': 0.0,
+                'max_drawdown_pct': 0.0,
+                'total_trades': 0,
+                'win_rate': 0.0,
+            }
+
+        profit = self.cum_profit[j] - self.cum_profit[i]
+        gross_profit = self.cum_gross_profit[j] - self.cum_gross_profit[i]
+        gross_loss = self.cum_gross_loss[j] - self.cum_gross_loss[i]
+        wins = self.cum_wins[j] - self.cum_wins[i]
+
+        if gross_loss <= GROSS_LOSS_EPS:
+            pf = PF_NO_LOSS if gross_profit > GROSS_LOSS_EPS else 0.0
+        else:
+            pf = gross_profit / gross_loss
+
+        return {
+            'profit': float(profit),
+            'profit_factor': float(pf),
+            'max_drawdown_pct': float(self.max_drawdown(i, j) * 100.0),
+            'total_trades': int(total),
+            'win_rate': float(wins / total * 100.0),
+        }
+
+    def metrics(self, window_start: datetime, window_end: datetime) -> dict:
+        """
+        Metrics for trades closed within [window_start, window_end].
+
+        Drawdown is measured from the balance at window_start, so it reflects
+        the account size at that point rather than the initial deposit.
+        """
+        i, j = self.bounds(window_start, window_end)
+        return self.range_metrics(i, j)
+
+    def start_balance(self, window_start: datetime) -> float:
+        """Balance after all trades closed before window_start."""
+        return self.balances[bisect_left(self.close_times, window_start)]
@@ -36,7 +36,7 @@ def mql5_search(query: str, max_results: int = 10) -> list:
         max_results: Maximum number of results to return
 
     Returns:
-        List of dicts with 'title', 'pages', 'score' keys
+        List of dicts with 'title', 'pages', 'score' (BM25) keys, best first
     """
     ref = _get_ref()
     results = ref.search(query, max_results)
@@ -135,4 +135,4 @@ if __name__ == "__main__":
     print("=" * 40)
     print("\nSearching for 'order send':")
     for r in mql5_search("order send", 5):
-        print(f"  [{r['score']:2d}] {r['title']} (p.{r['pages']})")
+        print(f"  [{r['score']:6.2f}] {r['title']} (p.{r['pages']})")
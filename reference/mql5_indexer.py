@@ -3,29 +3,39 @@ MQL5 Reference Indexer and Lookup System
 
 Provides indexed access to the 7000-page MQL5 reference PDF.
 Extracts sections on-demand to avoid loading the entire document.
+
+Searches run against the memory-mapped BM25 index (mql5_index.bin, see
+reference/search_index.py), rebuilt automatically from mql5_index.json when
+that changes. Extracted page text is kept in a compressed LRU page cache
+(reference/page_cache.py). Searching, listing sections and reading cached
+pages do not need PyMuPDF; only extracting uncached page text does.
 """
 
 import json
 import re
+import sys
 from pathlib import Path
 from typing import Optional
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    raise ImportError("Install PyMuPDF: pip install pymupdf")
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+from reference.page_cache import PAGE_CACHE_NAME, PageCache, split_pages
+from reference.search_index import SearchIndex, build_search_index, open_search_index
 
 
 class MQL5Reference:
     """Indexed access to MQL5 reference documentation."""
 
-    def __init__(self, pdf_path: Optional[str] = None):
+    def __init__(self, pdf_path: Optional[str] = None, cache_dir: Optional[str] = None):
         self.project_root = Path(__file__).parent.parent
         self.pdf_path = Path(pdf_path) if pdf_path else self.project_root / "mql5.pdf"
         self.index_path = self.project_root / "reference" / "mql5_index.json"
-        self.cache_dir = self.project_root / "reference" / "cache"
+        self.search_index_path = self.project_root / "reference" / "mql5_index.bin"
+        self.cache_dir = Path(cache_dir) if cache_dir else self.project_root / "reference" / "cache"
 
         self._index = None
+        self._search_index = None
+        self._page_cache = None
         self._doc = None
 
     @property
@@ -39,10 +49,33 @@ class MQL5Reference:
                 self._index = self.build_index()
         return self._index
 
+    @property
+    def search_index(self) -> SearchIndex:
+        """Lazy-open the binary search index."""
+        if self._search_index is None:
+            if not self.index_path.exists() and not self.search_index_path.exists():
+                self.build_index()
+            self._search_index = open_search_index(self.search_index_path, self.index_path)
+        return self._search_index
+
+    @property
+    def page_cache(self) -> Optional[PageCache]:
+        """Lazy-open the page text cache (None if REFERENCE_PAGE_CACHE_BYTES is 0)."""
+        if self._page_cache is None:
+            max_bytes = int(getattr(settings, 'REFERENCE_PAGE_CACHE_BYTES', 64 * 1024 * 1024) or 0)
+            if max_bytes <= 0:
+                return None
+            self._page_cache = PageCache(self.cache_dir / PAGE_CACHE_NAME, max_bytes)
+        return self._page_cache
+
     @property
     def doc(self):
         """Lazy-load the PDF document."""
         if self._doc is None:
+            try:
+                import fitz  # PyMuPDF
+            except ImportError:
+                raise ImportError("Install PyMuPDF: pip install pymupdf")
             self._doc = fitz.open(str(self.pdf_path))
         return self._doc
 
@@ -94,6 +127,11 @@ class MQL5Reference:
         with open(self.index_path, 'w', encoding='utf-8') as f:
             json.dump(index, f, indent=2)
 
+        if self._search_index is not None:
+            self._search_index.close()
+            self._search_index = None
+        build_search_index(entries, self.search_index_path, total_pages, self.index_path.stat().st_size)
+
         print(f"Index saved: {len(entries)} entries, {len(keyword_index)} keywords")
         return index
 
@@ -121,59 +159,113 @@ class MQL5Reference:
         ]
 
     def search(self, query: str, max_results: int = 20) -> list:
-        """Search for topics matching query."""
-        query_terms = query.lower().split()
-        results = []
-
-        for idx, entry in enumerate(self.index['entries']):
-            title_lower = entry['title'].lower()
-
-            # Score by how many query terms match
-            score = 0
-            for term in query_terms:
-                if term in title_lower:
-                    score += 10  # Title contains term
-                if term in entry['keywords']:
-                    score += 5  # Keyword match
-                # Partial match
-                for kw in entry['keywords']:
-                    if term in kw or kw in term:
-                        score += 2
-
-            if score > 0:
-                results.append({
-                    'score': score,
-                    'title': entry['title'],
-                    'level': entry['level'],
-                    'pages': f"{entry['start_page']}-{entry['end_page']}",
-                    'index': idx
-                })
-
-        # Sort by score descending
-        results.sort(key=lambda x: (-x['score'], x['level']))
-        return results[:max_results]
+        """Search for topics matching query (BM25 over titles, prefix matching on identifiers)."""
+        return self.search_index.search(query, max_results)
 
     def get_section(self, entry_index: int) -> str:
         """Extract text content for a specific section."""
-        entry = self.index['entries'][entry_index]
+        entry = self.search_index.entry(entry_index)
         return self.extract_pages(entry['start_page'], entry['end_page'])
 
+    def _page_count(self) -> int:
+        try:
+            total = self.search_index.total_pages
+        except (OSError, ValueError):
+            total = 0
+        return total or len(self.doc)
+
+    def page_texts(self, pages: list) -> dict:
+        """
+        Text of 1-based pages, served from the page cache where possible.
+
+        The PDF is opened only if some requested page is not cached.
+
+        Args:
+            pages: Page numbers (out-of-range pages are skipped)
+
+        Returns:
+            {page: text}
+        """
+        total = self._page_count()
+        pages = [p for p in pages if 1 <= p <= total]
+        cache = self.page_cache
+        pdf_id = cache.pdf_id(self.pdf_path) if cache is not None else None
+
+        texts = cache.get_many(pdf_id, pages) if pdf_id else {}
+        missing = [p for p in pages if p not in texts]
+        if missing:
+            doc = self.doc
+            # PDF pages are 0-indexed, but TOC uses 1-indexed
+            extracted = {p: doc[p - 1].get_text() for p in missing if p <= len(doc)}
+            if pdf_id:
+                cache.put_many(pdf_id, extracted)
+            texts.update(extracted)
+        return texts
+
     def extract_pages(self, start: int, end: int, max_pages: int = 50) -> str:
         """Extract text from a page range."""
-        doc = self.doc
-
         # Limit extraction to prevent huge outputs
         actual_end = min(end, start + max_pages - 1)
 
-        text_parts = []
-        # PDF pages are 0-indexed, but TOC uses 1-indexed
-        for page_num in range(start - 1, actual_end):
-            if 0 <= page_num < len(doc):
-                page = doc[page_num]
-                text = page.get_text()
-                text_parts.append(f"\n--- Page {page_num + 1} ---\n{text}")
-
-        return "\n".join(text_parts)
+        texts = self.page_texts(list(range(start, actual_end + 1)))
+        if self.page_cache is not None:
+            self.page_cache.record_use(start, actual_end)
+
+        return "\n".join(
+            f"\n--- Page {page_num} ---\n{texts[page_num]}"
+            for page_num in range(start, actual_end + 1)
+            if page_num in texts
+        )
+
+    def prewarm(self, limit: int = 20, topics: Optional[list] = None, max_pages: int = 50) -> dict:
+        """
+        Cache the most looked-up sections (plus common topics) in one pass over the PDF.
+
+        Args:
+            limit: Number of most used page ranges to warm
+            topics: Topics to warm as well (default: lookup.COMMON_TOPICS)
+            max_pages: Per-section page cap (as in extract_pages)
+
+        Returns:
+            dict with sections, pages and extracted (pages read from the PDF)
+        """
+        if self.page_cache is None:
+            return {'sections': 0, 'pages': 0, 'extracted': 0}
+        if topics is None:
+            from reference.lookup import COMMON_TOPICS
+            topics = list(COMMON_TOPICS.values())
+
+        ranges = self.page_cache.most_used(limit)
+        for topic in topics:
+            results = self.search(topic, max_results=1)
+            if results:
+                entry = self.search_index.entry(results[0]['index'])
+                ranges.append((entry['start_page'], entry['end_page']))
+
+        pages = sorted({
+            p for start, end in ranges for p in range(start, min(end, start + max_pages - 1) + 1)
+        })
+        pdf_id = self.page_cache.pdf_id(self.pdf_path)
+        cached = len(self.page_cache.get_many(pdf_id, pages)) if pdf_id else 0
+        self.page_texts(pages)
+        return {'sections': len(set(ranges)), 'pages': len(pages), 'extracted': len(pages) - cached}
+
+    def import_topic_files(self) -> int:
+        """
+        Load pages from saved topic .txt files in cache_dir into the page cache.
+
+        Returns:
+            Number of pages imported
+        """
+        cache = self.page_cache
+        pdf_id = cache.pdf_id(self.pdf_path) if cache is not None else None
+        if not pdf_id:
+            raise FileNotFoundError(f"Reference PDF not found (needed to key the cache): {self.pdf_path}")
+        texts = {}
+        for path in sorted(self.cache_dir.glob('*.txt')):
+            texts.update(split_pages(path.read_text(encoding='utf-8', errors='ignore')))
+        cache.put_many(pdf_id, texts)
+        return len(texts)
 
     def get_topic(self, topic: str, max_pages: int = 30) -> str:
         """Search for a topic and extract its content."""
@@ -182,7 +274,7 @@ class MQL5Reference:
             return f"No results found for: {topic}"
 
         best = results[0]
-        entry = self.index['entries'][best['index']]
+        entry = self.search_index.entry(best['index'])
 
         header = f"=== {entry['title']} (Pages {entry['start_page']}-{entry['end_page']}) ===\n"
         content = self.extract_pages(entry['start_page'], entry['end_page'], max_pages)
@@ -191,34 +283,43 @@ class MQL5Reference:
 
     def list_sections(self, level: int = 2) -> list:
         """List all sections up to given level."""
+        entries = (self.search_index.entry(i) for i in range(len(self.search_index)))
         return [
             f"[{e['start_page']:4d}] {'  ' * (e['level']-1)}{e['title']}"
-            for e in self.index['entries']
+            for e in entries
             if e['level'] <= level
         ]
 
     def close(self):
-        """Close the PDF document."""
+        """Close the PDF document, the search index and the page cache."""
         if self._doc:
             self._doc.close()
             self._doc = None
+        if self._search_index is not None:
+            self._search_index.close()
+            self._search_index = None
+        if self._page_cache is not None:
+            self._page_cache.close()
+            self._page_cache = None
 
 
 def main():
     """CLI for MQL5 reference lookup."""
-    import sys
-
     ref = MQL5Reference()
 
     if len(sys.argv) < 2:
         print("MQL5 Reference Lookup")
         print("=" * 40)
-        print(f"Indexed: {ref.index['total_entries']} entries, {ref.index['total_pages']} pages")
+        print(f"Indexed: {len(ref.search_index)} entries, {ref.search_index.total_pages} pages")
         print("\nUsage:")
         print("  python mql5_indexer.py search <query>  - Search for topics")
         print("  python mql5_indexer.py get <topic>     - Get content for topic")
         print("  python mql5_indexer.py sections        - List major sections")
         print("  python mql5_indexer.py rebuild         - Rebuild index")
+        print("  python mql5_indexer.py rebuild-search  - Rebuild the binary search index from the JSON index")
+        print("  python mql5_indexer.py prewarm [N]     - Cache pages of the N most used sections + common topics")
+        print("  python mql5_indexer.py import-cache    - Load saved topic .txt files into the page cache")
+        print("  python mql5_indexer.py cache-stats     - Show page cache size")
         return
 
     cmd = sys.argv[1]
@@ -229,6 +330,24 @@ def main():
             ref.index_path.unlink()
         ref.build_index()
 
+    elif cmd == "rebuild-search":
+        ref.close()
+        data = ref.index
+        build_search_index(data['entries'], ref.search_index_path, data['total_pages'], ref.index_path.stat().st_size)
+        print(f"Search index saved: {ref.search_index_path}")
+
+    elif cmd == "prewarm":
+        limit = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+        result = ref.prewarm(limit)
+        print(f"Prewarmed {result['sections']} sections: {result['pages']} pages ({result['extracted']} extracted)")
+
+    elif cmd == "import-cache":
+        print(f"Imported {ref.import_topic_files()} pages from {ref.cache_dir}")
+
+    elif cmd == "cache-stats":
+        stats = ref.page_cache.stats() if ref.page_cache is not None else {'pages': 0, 'bytes': 0, 'max_bytes': 0}
+        print(f"Page cache: {stats['pages']} pages, {stats['bytes'] / 1024:.0f} KB of {stats['max_bytes'] / 1024:.0f} KB")
+
     elif cmd == "sections":
         for line in ref.list_sections():
             print(line)
@@ -238,7 +357,7 @@ def main():
         results = ref.search(query)
         print(f"Results for '{query}':")
         for r in results:
-            print(f"  [{r['score']:2d}] {r['title']} (p.{r['pages']})")
+            print(f"  [{r['score']:6.2f}] {r['title']} (p.{r['pages']})")
 
     elif cmd == "get" and len(sys.argv) > 2:
         topic = " ".join(sys.argv[2:])
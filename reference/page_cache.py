@@ -0,0 +1,233 @@
+"""
+MQL5 Reference Page Cache
+
+Extracted page text of the reference PDF, stored zlib-compressed in SQLite
+(reference/cache/pages.sqlite) and keyed by the PDF's SHA-256 and page
+number, so a new edition of the PDF never serves stale text.
+
+The cache is bounded by REFERENCE_PAGE_CACHE_BYTES of compressed text;
+least recently used pages are evicted first. Section lookups are counted so
+the most used sections can be prewarmed in bulk (mql5_indexer.py prewarm).
+
+The PDF hash is remembered per path + size + mtime, so once every requested
+page is cached a lookup never opens (or even reads) the PDF. If the PDF is
+not present at all, the last PDF the cache saw is assumed.
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Iterable, Optional
+
+PAGE_CACHE_NAME = 'pages.sqlite'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+COMPRESS_LEVEL = 6
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    pdf_id TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (pdf_id, page)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_lru ON pages(last_used);
+CREATE TABLE IF NOT EXISTS usage (
+    pages TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+'''
+
+# Page markers written by MQL5Reference.extract_pages (and the legacy topic .txt files)
+PAGE_MARKER_RE = re.compile(r'\n--- Page (\d+) ---\n')
+
+
+class PageCache:
+    """Size-bounded LRU cache of compressed page text."""
+
+    def __init__(self, db_path: Path, max_bytes: Optional[int] = None):
+        """
+        Args:
+            db_path: SQLite file
+            max_bytes: Budget for compressed page text (default: DEFAULT_MAX_BYTES)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else int(max_bytes)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        except sqlite3.DatabaseError:
+            pass
+        self.conn.executescript(SCHEMA)
+        self._total: Optional[int] = None
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Meta
+    # ------------------------------------------------------------------
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)', (key, value))
+
+    def pdf_id(self, pdf_path: Path) -> Optional[str]:
+        """
+        SHA-256 of the PDF, hashed once per path/size/mtime.
+
+        Args:
+            pdf_path: Reference PDF
+
+        Returns:
+            Hex digest; the last seen PDF's digest if the file is missing; None
+            if neither is known
+        """
+        pdf_path = Path(pdf_path)
+        try:
+            st = pdf_path.stat()
+        except OSError:
+            return self._meta('current_pdf')
+
+        sig = f'{st.st_size}:{st.st_mtime_ns}'
+        key = f'pdf:{pdf_path.resolve()}'
+        remembered = self._meta(key)
+        if remembered and remembered.split('=', 1)[0] == sig:
+            digest = remembered.split('=', 1)[1]
+        else:
+            h = hashlib.sha256()
+            with open(pdf_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            self._set_meta(key, f'{sig}={digest}')
+        if self._meta('current_pdf') != digest:
+            self._set_meta('current_pdf', digest)
+        return digest
+
+    # ------------------------------------------------------------------
+    # Pages
+    # ------------------------------------------------------------------
+
+    def get_many(self, pdf_id: str, pages: Iterable[int]) -> dict[int, str]:
+        """Cached text for the requested pages (missing pages are absent from the result)."""
+        pages = sorted(set(int(p) for p in pages))
+        if not pages:
+            return {}
+        out = {}
+        for i in range(0, len(pages), 500):
+            chunk = pages[i:i + 500]
+            marks = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT page, data FROM pages WHERE pdf_id = ? AND page IN ({marks})',
+                [pdf_id, *chunk],
+            ).fetchall()
+            for page, data in rows:
+                out[page] = zlib.decompress(data).decode('utf-8')
+        if out:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    'UPDATE pages SET last_used = ? WHERE pdf_id = ? AND page = ?',
+                    [(now, pdf_id, p) for p in out],
+                )
+        return out
+
+    def put_many(self, pdf_id: str, texts: dict[int, str]) -> None:
+        """Store page texts, then evict least recently used pages over budget."""
+        if not texts:
+            return
+        now = time.time()
+        rows = []
+        for page, text in texts.items():
+            data = zlib.compress(text.encode('utf-8'), COMPRESS_LEVEL)
+            rows.append((pdf_id, int(page), data, len(data), now))
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)', rows)
+        self._total = None
+        self.evict()
+
+    def total_bytes(self) -> int:
+        if self._total is None:
+            self._total = int(self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0])
+        return self._total
+
+    def evict(self) -> int:
+        """Drop least recently used pages until the cache fits max_bytes; returns pages dropped."""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return 0
+        dropped = []
+        for pdf_id, page, size in self.conn.execute('SELECT pdf_id, page, size FROM pages ORDER BY last_used, page'):
+            if total <= self.max_bytes:
+                break
+            dropped.append((pdf_id, page))
+            total -= size
+        with self.conn:
+            self.conn.executemany('DELETE FROM pages WHERE pdf_id = ? AND page = ?', dropped)
+        self._total = total
+        return len(dropped)
+
+    # ------------------------------------------------------------------
+    # Usage (for prewarming)
+    # ------------------------------------------------------------------
+
+    def record_use(self, start: int, end: int) -> None:
+        """Count a lookup of the page range start-end."""
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO usage(pages, hits, last_used) VALUES (?, 1, ?) '
+                'ON CONFLICT(pages) DO UPDATE SET hits = hits + 1, last_used = excluded.last_used',
+                (f'{int(start)}-{int(end)}', time.time()),
+            )
+
+    def most_used(self, limit: int = 20) -> list[tuple[int, int]]:
+        """Most looked-up page ranges as (start, end), most used first."""
+        rows = self.conn.execute(
+            'SELECT pages FROM usage ORDER BY hits DESC, last_used DESC LIMIT ?', (int(limit),)
+        ).fetchall()
+        out = []
+        for (pages,) in rows:
+            start, _, end = pages.partition('-')
+            out.append((int(start), int(end)))
+        return out
+
+    def stats(self) -> dict:
+        """Cached page count, compressed bytes and budget."""
+        count = self.conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+        return {'pages': int(count), 'bytes': self.total_bytes(), 'max_bytes': self.max_bytes}
+
+
+def split_pages(text: str) -> dict[int, str]:
+    """
+    Page texts from extract_pages output (or a saved topic .txt file).
+
+    Args:
+        text: Text containing '--- Page N ---' markers
+
+    Returns:
+        {page: text}
+    """
+    parts = PAGE_MARKER_RE.split('\n' + text if text.startswith('--- Page') else text)
+    pages = {}
+    # parts: [preamble, page, text, page, text, ...]; pages are joined with '\n'
+    for i in range(1, len(parts) - 1, 2):
+        body = parts[i + 1]
+        if i + 2 < len(parts) and body.endswith('\n'):
+            body = body[:-1]
+        pages[int(parts[i])] = body
+    return pages
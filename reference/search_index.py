@@ -0,0 +1,327 @@
+"""
+MQL5 Reference Search Index
+
+Compact binary inverted index over the reference table of contents
+(mql5_index.json -> mql5_index.bin), ranked with BM25.
+
+Titles are analyzed into lowercase words plus the camel-case parts of
+identifiers, so "OrderSend" indexes as ordersend / order / send and
+"CTrade" as ctrade / c / trade. Query terms of 3+ characters also match
+every indexed term they prefix (at PREFIX_WEIGHT), so "copyrat" finds
+CopyRates.
+
+File layout (little-endian uint32 arrays, then UTF-8 blobs):
+
+    header      magic, version, counts, avg section length, source size
+    docs        n_docs x [start_page, end_page, level, length]
+    title_offs  n_docs + 1 offsets into the titles blob
+    term_offs   n_terms + 1 offsets into the terms blob (terms sorted by bytes)
+    post_offs   n_terms + 1 offsets into postings (in pairs)
+    postings    [doc, tf] pairs, grouped by term
+    titles      UTF-8 titles
+    terms       UTF-8 terms
+
+The file is memory-mapped and read in place: opening it parses only the
+header, and a search touches only the postings of its terms.
+"""
+
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Optional
+
+MAGIC = b'MQ5BM25\x00'
+INDEX_VERSION = 1
+HEADER = struct.Struct('<8sIIIIIIdQ')
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+PREFIX_WEIGHT = 0.6
+PREFIX_MIN_CHARS = 3
+MAX_PREFIX_TERMS = 64
+
+WORD_RE = re.compile(r'[A-Za-z0-9_]+')
+CAMEL_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+
+def analyze(text: str) -> list[str]:
+    """
+    Split text into index terms.
+
+    Args:
+        text: Title or query
+
+    Returns:
+        Lowercase words, each followed by its camel-case / snake_case parts
+        when it has more than one
+    """
+    terms = []
+    for word in WORD_RE.findall(text):
+        terms.append(word.lower())
+        parts = CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            terms.extend(p.lower() for p in parts)
+    return terms
+
+
+def _u32(values: Iterable[int]) -> bytes:
+    arr = array('I', values)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def build_search_index(entries: list[dict], path: Path, total_pages: int = 0, source_size: int = 0) -> Path:
+    """
+    Write a binary search index for TOC entries.
+
+    Args:
+        entries: mql5_index.json entries (title, level, start_page, end_page)
+        path: Output .bin path
+        total_pages: Page count of the reference
+        source_size: Size of the JSON index it was built from (staleness check)
+
+    Returns:
+        Path written
+    """
+    path = Path(path)
+    postings: dict[str, dict[int, int]] = {}
+    docs = []
+    titles = []
+    for doc_id, entry in enumerate(entries):
+        title = str(entry.get('title', ''))
+        terms = analyze(title)
+        for term in terms:
+            tfs = postings.setdefault(term, {})
+            tfs[doc_id] = tfs.get(doc_id, 0) + 1
+        docs.extend([
+            int(entry.get('start_page', 0)),
+            int(entry.get('end_page', 0)),
+            int(entry.get('level', 0)),
+            len(terms),
+        ])
+        titles.append(title.encode('utf-8'))
+
+    n_docs = len(entries)
+    lengths = docs[3::4]
+    avgdl = (sum(lengths) / n_docs) if n_docs else 0.0
+
+    sorted_terms = sorted(postings, key=lambda t: t.encode('utf-8'))
+    term_blobs = [t.encode('utf-8') for t in sorted_terms]
+    pairs = []
+    post_offs = [0]
+    for term in sorted_terms:
+        for doc_id, tf in sorted(postings[term].items()):
+            pairs.extend((doc_id, tf))
+        post_offs.append(len(pairs) // 2)
+
+    def offsets(blobs: list[bytes]) -> list[int]:
+        out = [0]
+        for blob in blobs:
+            out.append(out[-1] + len(blob))
+        return out
+
+    title_blob = b''.join(titles)
+    terms_blob = b''.join(term_blobs)
+    header = HEADER.pack(
+        MAGIC, INDEX_VERSION, n_docs, len(sorted_terms), len(pairs) // 2,
+        len(title_blob), int(total_pages), avgdl, int(source_size),
+    )
+    body = b''.join([
+        _u32(docs),
+        _u32(offsets(titles)),
+        _u32(offsets(term_blobs)),
+        _u32(post_offs),
+        _u32(pairs),
+        title_blob,
+        terms_blob,
+    ])
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(header + body)
+    os.replace(tmp_path, path)
+    return path
+
+
+class SearchIndex:
+    """Memory-mapped BM25 index over the reference table of contents."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        (magic, version, self.n_docs, self.n_terms, n_postings,
+         title_bytes, self.total_pages, self.avgdl, self.source_size) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"Not a search index (or wrong version): {self.path}")
+
+        pos = HEADER.size
+
+        def u32(count: int):
+            nonlocal pos
+            view = memoryview(self._mm)[pos:pos + 4 * count]
+            pos += 4 * count
+            if sys.byteorder != 'little':
+                arr = array('I', view.tobytes())
+                arr.byteswap()
+                return arr
+            return view.cast('I')
+
+        self._docs = u32(4 * self.n_docs)
+        self._title_offs = u32(self.n_docs + 1)
+        self._term_offs = u32(self.n_terms + 1)
+        self._post_offs = u32(self.n_terms + 1)
+        self._postings = u32(2 * n_postings)
+        self._titles_at = pos
+        self._terms_at = pos + title_bytes
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def close(self) -> None:
+        """Release the mapping (required before the file can be replaced on Windows)."""
+        for name in ('_docs', '_title_offs', '_term_offs', '_post_offs', '_postings'):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+            setattr(self, name, None)
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def entry(self, doc_id: int) -> dict:
+        """TOC entry: title, level, start_page, end_page."""
+        if not 0 <= doc_id < self.n_docs:
+            raise IndexError(doc_id)
+        base = 4 * doc_id
+        a = self._titles_at + self._title_offs[doc_id]
+        b = self._titles_at + self._title_offs[doc_id + 1]
+        return {
+            'title': self._mm[a:b].decode('utf-8'),
+            'level': self._docs[base + 2],
+            'start_page': self._docs[base],
+            'end_page': self._docs[base + 1],
+        }
+
+    def _term(self, i: int) -> bytes:
+        return self._mm[self._terms_at + self._term_offs[i]:self._terms_at + self._term_offs[i + 1]]
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _matches(self, term: str, prefix: bool) -> list[tuple[int, float]]:
+        """[(term id, weight)] for the exact term and (optionally) terms it prefixes."""
+        key = term.encode('utf-8')
+        i = self._lower_bound(key)
+        out = []
+        if i < self.n_terms and self._term(i) == key:
+            out.append((i, 1.0))
+            i += 1
+        if prefix and len(term) >= PREFIX_MIN_CHARS:
+            end = min(self.n_terms, i + MAX_PREFIX_TERMS)
+            while i < end and self._term(i).startswith(key):
+                out.append((i, PREFIX_WEIGHT))
+                i += 1
+        return out
+
+    def search(self, query: str, max_results: int = 20, prefix: bool = True) -> list[dict]:
+        """
+        Rank TOC entries for a query with BM25.
+
+        Args:
+            query: Free text or identifiers (e.g. "order history", "CTrade")
+            max_results: Maximum results
+            prefix: Also match indexed terms that start with a query term
+
+        Returns:
+            List of dicts with score, title, level, pages and index, best first
+            (ties broken by heading level, then document order)
+        """
+        n = self.n_docs
+        if not n:
+            return []
+        avgdl = self.avgdl or 1.0
+        docs = self._docs
+        post_offs = self._post_offs
+        postings = self._postings
+        scores: dict[int, float] = {}
+
+        for term in dict.fromkeys(analyze(query)):
+            for term_id, weight in self._matches(term, prefix):
+                a, b = post_offs[term_id], post_offs[term_id + 1]
+                df = b - a
+                idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+                for j in range(2 * a, 2 * b, 2):
+                    doc = postings[j]
+                    tf = postings[j + 1]
+                    dl = docs[4 * doc + 3]
+                    norm = tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * dl / avgdl))
+                    scores[doc] = scores.get(doc, 0.0) + weight * idf * norm
+
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], docs[4 * kv[0] + 2], kv[0]))
+        results = []
+        for doc, score in ranked[:max_results]:
+            entry = self.entry(doc)
+            results.append({
+                'score': round(score, 3),
+                'title': entry['title'],
+                'level': entry['level'],
+                'pages': f"{entry['start_page']}-{entry['end_page']}",
+                'index': doc,
+            })
+        return results
+
+
+def open_search_index(bin_path: Path, json_path: Optional[Path] = None) -> SearchIndex:
+    """
+    Open the binary index, (re)building it from the JSON index if it is
+    missing or was built from a different JSON file.
+
+    Args:
+        bin_path: mql5_index.bin
+        json_path: mql5_index.json (source for rebuilds)
+
+    Returns:
+        SearchIndex
+    """
+    bin_path = Path(bin_path)
+    source_size = json_path.stat().st_size if json_path is not None and Path(json_path).exists() else None
+
+    if bin_path.exists():
+        try:
+            index = SearchIndex(bin_path)
+        except (OSError, ValueError, struct.error):
+            index = None
+        if index is not None:
+            if source_size is None or index.source_size == source_size:
+                return index
+            index.close()
+
+    if source_size is None:
+        raise FileNotFoundError(f"No search index at {bin_path} and no JSON index to build it from")
+
+    import json
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    build_search_index(data.get('entries', []), bin_path, data.get('total_pages', 0), source_size)
+    return SearchIndex(bin_path)
@@ -16,10 +16,15 @@ from typing import Any, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import settings
 from engine.gates import calculate_composite_score
+from reports.summary import ensure_summary, output_up_to_date, reuse_output, stat_signature, write_manifest
 
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 
+# Statuses to exclude from boards (stuck/failed workflows)
+EXCLUDED_STATUSES = {"failed", "awaiting_param_analysis", "awaiting_stats_analysis", "awaiting_ea_fix", "pending"}
+
 
 def _as_dict(value: Any) -> dict[str, Any]:
     return value if isinstance(value, dict) else {}
@@ -167,153 +172,190 @@ def _best_workflow_metrics(state: dict[str, Any]) -> dict[str, Any]:
     return {}
 
 
-def generate_boards(
-    runs_dir: str = "runs",
-    output_dir: Optional[str] = None,
-    open_browser: bool = False,
-) -> str:
-    runs_path = Path(runs_dir)
-    out_dir = Path(output_dir) if output_dir else (runs_path / "boards")
-    out_dir.mkdir(parents=True, exist_ok=True)
+def _board_rows_for_state(state: dict[str, Any], state_file: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Build the workflow row and scenario rows (stress + forward windows) for one workflow."""
+    workflow_id = state.get("workflow_id") or state_file.stem.replace("workflow_", "")
+    ea_name = state.get("ea_name", "Unknown")
+    symbol = state.get("symbol", "")
+    timeframe = state.get("timeframe", "")
+    created_at = state.get("created_at", "")
+    status = state.get("status", "")
+
+    metrics = _best_workflow_metrics(state)
+    notes = _generate_notes(state)
+
+    # Calculate Go Live Score from metrics
+    go_live_score = calculate_composite_score(metrics)
+
+    go_live = _as_dict(state.get("go_live"))
+    go_live_ready = go_live.get("go_live_ready") if go_live else None
+
+    forward_result = float(metrics.get("forward_result") or 0)
+    back_result = float(metrics.get("back_result") or 0)
+
+    workflow_row = {
+        "workflow_id": workflow_id,
+        "ea_name": ea_name,
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "created_at": created_at,
+        "created_at_fmt": _format_date(created_at),
+        "status": status,
+        "notes": notes,
+        "score_num": go_live_score,
+        "profit_num": float(metrics.get("profit") or 0),
+        "pf_num": float(metrics.get("profit_factor") or 0),
+        "dd_num": float(metrics.get("max_drawdown_pct") or 0),
+        "trades_num": int(metrics.get("total_trades") or 0),
+        "win_rate_num": float(metrics.get("win_rate") or 0),
+        "forward_num": forward_result,
+        "back_num": back_result,
+        "go_live_ready": go_live_ready,
+        "dashboard_link": f"../dashboards/{workflow_id}/index.html",
+    }
 
-    workflows: list[dict[str, Any]] = []
     scenarios: list[dict[str, Any]] = []
-
-    # Statuses to exclude from boards (stuck/failed workflows)
-    EXCLUDED_STATUSES = {'failed', 'awaiting_param_analysis', 'awaiting_stats_analysis', 'awaiting_ea_fix', 'pending'}
-
-    for state_file in sorted(runs_path.glob("workflow_*.json")):
-        try:
-            state = json.loads(state_file.read_text(encoding="utf-8"))
-        except Exception:
+    stress = _as_dict(state.get("stress_scenarios"))
+    for s in _as_list(stress.get("scenarios")):
+        if not isinstance(s, dict):
             continue
+        set_ = _as_dict(s.get("settings"))
+        res = _as_dict(s.get("result"))
+        window = _as_dict(s.get("window"))
 
-        workflow_id = state.get("workflow_id") or state_file.stem.replace("workflow_", "")
-        ea_name = state.get("ea_name", "Unknown")
-        symbol = state.get("symbol", "")
-        timeframe = state.get("timeframe", "")
-        created_at = state.get("created_at", "")
-        status = state.get("status", "")
+        scenarios.append(
+            {
+                "workflow_id": workflow_id,
+                "ea_name": ea_name,
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "created_at": created_at,
+                "dashboard_link": f"../dashboards/{workflow_id}/index.html",
+                "scenario_id": s.get("id"),
+                "scenario_label": s.get("label") or s.get("id") or "Scenario",
+                "success": bool(s.get("success")),
+                "variant": s.get("variant") or "base",
+                "tags": list(s.get("tags") or []),
+                "window_id": window.get("id") or s.get("period") or "",
+                "window_label": window.get("label") or "",
+                "from_date": set_.get("from_date"),
+                "to_date": set_.get("to_date"),
+                "model": set_.get("model"),
+                "execution_latency_ms": set_.get("execution_latency_ms"),
+                "spread_points": set_.get("spread_points"),
+                "overlay_spread_pips": set_.get("overlay_spread_pips"),
+                "overlay_slippage_pips": set_.get("overlay_slippage_pips"),
+                "overlay_slippage_sides": set_.get("overlay_slippage_sides"),
+                "profit_num": float(res.get("profit") or 0),
+                "pf_num": float(res.get("profit_factor") or 0),
+                "dd_num": float(res.get("max_drawdown_pct") or 0),
+                "trades_num": int(res.get("total_trades") or 0),
+                "hq_num": float(res.get("history_quality_pct") or 0),
+                "tick_files_ok": res.get("tick_files_ok"),
+                "tick_files_missing": res.get("tick_files_missing"),
+                "errors": list(s.get("errors") or []),
+            }
+        )
 
-        # Skip failed/stuck workflows
-        if status in EXCLUDED_STATUSES:
+    fw = _as_dict(state.get("forward_windows"))
+    for w in _as_list(fw.get("windows")):
+        if not isinstance(w, dict):
             continue
-
-        metrics = _best_workflow_metrics(state)
-        notes = _generate_notes(state)
-
-        # Calculate Go Live Score from metrics
-        go_live_score = calculate_composite_score(metrics)
-
-        go_live = _as_dict(state.get("go_live"))
-        go_live_ready = go_live.get("go_live_ready") if go_live else None
-
-        forward_result = float(metrics.get("forward_result") or 0)
-        back_result = float(metrics.get("back_result") or 0)
-
-        workflows.append(
+        metrics_w = _as_dict(w.get("metrics"))
+        scenarios.append(
             {
                 "workflow_id": workflow_id,
                 "ea_name": ea_name,
                 "symbol": symbol,
                 "timeframe": timeframe,
                 "created_at": created_at,
-                "created_at_fmt": _format_date(created_at),
-                "status": status,
-                "notes": notes,
-                "score_num": go_live_score,
-                "profit_num": float(metrics.get("profit") or 0),
-                "pf_num": float(metrics.get("profit_factor") or 0),
-                "dd_num": float(metrics.get("max_drawdown_pct") or 0),
-                "trades_num": int(metrics.get("total_trades") or 0),
-                "win_rate_num": float(metrics.get("win_rate") or 0),
-                "forward_num": forward_result,
-                "back_num": back_result,
-                "go_live_ready": go_live_ready,
                 "dashboard_link": f"../dashboards/{workflow_id}/index.html",
+                "scenario_id": f"forward::{w.get('id')}",
+                "scenario_label": f"Forward Window: {w.get('label') or w.get('id') or 'window'}",
+                "success": bool(fw.get("success", True)),
+                "variant": "forward_window",
+                "tags": ["forward", w.get("kind")],
+                "window_id": w.get("id") or "",
+                "window_label": w.get("label") or "",
+                "from_date": w.get("from_date"),
+                "to_date": w.get("to_date"),
+                "model": fw.get("model", 1),
+                "execution_latency_ms": None,
+                "spread_points": None,
+                "overlay_spread_pips": None,
+                "overlay_slippage_pips": None,
+                "overlay_slippage_sides": None,
+                "profit_num": float(metrics_w.get("profit") or 0),
+                "pf_num": float(metrics_w.get("profit_factor") or 0),
+                "dd_num": float(metrics_w.get("max_drawdown_pct") or 0),
+                "trades_num": int(metrics_w.get("total_trades") or 0),
+                "hq_num": float(fw.get("history_quality_pct") or 0),
+                "tick_files_ok": None,
+                "tick_files_missing": None,
+                "errors": [fw.get("error")] if fw.get("error") else [],
             }
         )
 
-        stress = _as_dict(state.get("stress_scenarios"))
-        for s in _as_list(stress.get("scenarios")):
-            if not isinstance(s, dict):
+    return workflow_row, scenarios
+
+
+def _manifest(template_path: Path, hashes: dict[str, str]) -> dict[str, Any]:
+    """Inputs of the boards output: template version + per-workflow summary hashes."""
+    return {"template": stat_signature(template_path), "workflows": hashes}
+
+
+def generate_boards(
+    runs_dir: str = "runs",
+    output_dir: Optional[str] = None,
+    open_browser: bool = False,
+) -> str:
+    runs_path = Path(runs_dir)
+    out_dir = Path(output_dir) if output_dir else (runs_path / "boards")
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    workflows: list[dict[str, Any]] = []
+    scenarios: list[dict[str, Any]] = []
+
+    template_path = TEMPLATES_DIR / "boards_spa.html"
+    output_path = out_dir / "index.html"
+
+    catalog = None
+    if getattr(settings, "WORKFLOW_CATALOG", True):
+        try:
+            from reports.catalog import open_catalog
+            catalog = open_catalog(runs_path)
+            catalog.sync()
+        except Exception as e:
+            print(f"Warning: workflow catalog unavailable, scanning JSON files: {e}", file=sys.stderr)
+            catalog = None
+
+    if catalog is not None:
+        try:
+            manifest = _manifest(template_path, catalog.summary_hashes(exclude_statuses=EXCLUDED_STATUSES))
+            if output_up_to_date(out_dir, manifest, ("index.html", "data.json")):
+                return reuse_output(output_path, open_browser)
+            workflows, scenarios = catalog.board_rows(exclude_statuses=EXCLUDED_STATUSES)
+        finally:
+            catalog.close()
+    else:
+        hashes: dict[str, str] = {}
+        for state_file in sorted(runs_path.glob("workflow_*.json")):
+            try:
+                summary = ensure_summary(str(state_file))
+            except Exception:
                 continue
-            set_ = _as_dict(s.get("settings"))
-            res = _as_dict(s.get("result"))
-            window = _as_dict(s.get("window"))
-
-            scenarios.append(
-                {
-                    "workflow_id": workflow_id,
-                    "ea_name": ea_name,
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "created_at": created_at,
-                    "dashboard_link": f"../dashboards/{workflow_id}/index.html",
-                    "scenario_id": s.get("id"),
-                    "scenario_label": s.get("label") or s.get("id") or "Scenario",
-                    "success": bool(s.get("success")),
-                    "variant": s.get("variant") or "base",
-                    "tags": list(s.get("tags") or []),
-                    "window_id": window.get("id") or s.get("period") or "",
-                    "window_label": window.get("label") or "",
-                    "from_date": set_.get("from_date"),
-                    "to_date": set_.get("to_date"),
-                    "model": set_.get("model"),
-                    "execution_latency_ms": set_.get("execution_latency_ms"),
-                    "spread_points": set_.get("spread_points"),
-                    "overlay_spread_pips": set_.get("overlay_spread_pips"),
-                    "overlay_slippage_pips": set_.get("overlay_slippage_pips"),
-                    "overlay_slippage_sides": set_.get("overlay_slippage_sides"),
-                    "profit_num": float(res.get("profit") or 0),
-                    "pf_num": float(res.get("profit_factor") or 0),
-                    "dd_num": float(res.get("max_drawdown_pct") or 0),
-                    "trades_num": int(res.get("total_trades") or 0),
-                    "hq_num": float(res.get("history_quality_pct") or 0),
-                    "tick_files_ok": res.get("tick_files_ok"),
-                    "tick_files_missing": res.get("tick_files_missing"),
-                    "errors": list(s.get("errors") or []),
-                }
-            )
-
-        fw = _as_dict(state.get("forward_windows"))
-        for w in _as_list(fw.get("windows")):
-            if not isinstance(w, dict):
+
+            # Skip failed/stuck workflows
+            if summary["workflow"]["status"] in EXCLUDED_STATUSES:
                 continue
-            metrics_w = _as_dict(w.get("metrics"))
-            scenarios.append(
-                {
-                    "workflow_id": workflow_id,
-                    "ea_name": ea_name,
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "created_at": created_at,
-                    "dashboard_link": f"../dashboards/{workflow_id}/index.html",
-                    "scenario_id": f"forward::{w.get('id')}",
-                    "scenario_label": f"Forward Window: {w.get('label') or w.get('id') or 'window'}",
-                    "success": bool(fw.get("success", True)),
-                    "variant": "forward_window",
-                    "tags": ["forward", w.get("kind")],
-                    "window_id": w.get("id") or "",
-                    "window_label": w.get("label") or "",
-                    "from_date": w.get("from_date"),
-                    "to_date": w.get("to_date"),
-                    "model": fw.get("model", 1),
-                    "execution_latency_ms": None,
-                    "spread_points": None,
-                    "overlay_spread_pips": None,
-                    "overlay_slippage_pips": None,
-                    "overlay_slippage_sides": None,
-                    "profit_num": float(metrics_w.get("profit") or 0),
-                    "pf_num": float(metrics_w.get("profit_factor") or 0),
-                    "dd_num": float(metrics_w.get("max_drawdown_pct") or 0),
-                    "trades_num": int(metrics_w.get("total_trades") or 0),
-                    "hq_num": float(fw.get("history_quality_pct") or 0),
-                    "tick_files_ok": None,
-                    "tick_files_missing": None,
-                    "errors": [fw.get("error")] if fw.get("error") else [],
-                }
-            )
+
+            hashes[summary["workflow"]["workflow_id"]] = summary["hash"]
+            workflows.append(summary["board"]["workflow"])
+            scenarios.extend(summary["board"]["scenarios"])
+
+        manifest = _manifest(template_path, hashes)
+        if output_up_to_date(out_dir, manifest, ("index.html", "data.json")):
+            return reuse_output(output_path, open_browser)
 
     workflows.sort(key=lambda w: w.get("created_at", ""), reverse=True)
 
@@ -329,12 +371,12 @@ def generate_boards(
         },
     }
 
-    template = (TEMPLATES_DIR / "boards_spa.html").read_text(encoding="utf-8")
+    template = template_path.read_text(encoding="utf-8")
     html = template.replace("{{DATA_JSON}}", json.dumps(data, indent=2))
 
-    output_path = out_dir / "index.html"
     output_path.write_text(html, encoding="utf-8")
     (out_dir / "data.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
+    write_manifest(out_dir, manifest)
 
     # Convenience: keep a Desktop shortcut up to date on Windows.
     try:
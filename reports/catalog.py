@@ -0,0 +1,734 @@
+"""
+Workflow Catalog (SQLite)
+
+Local index of all workflows under runs/ so listing, boards and the leaderboard
+don't have to glob and json-load every workflow_*.json on every refresh.
+
+Per workflow the catalog holds:
+- a summary row (status, EA, symbol, best-pass metrics, go-live score, stress summary)
+- gate outcomes
+- precomputed board rows (workflow + stress / forward-window scenarios)
+- precomputed leaderboard rows (top passes)
+
+Rows are replaced in one transaction when a workflow is indexed (the runner does
+this after every completed step) from the workflow's summary sidecar
+(reports/summary.py). sync() re-indexes only workflows whose inputs changed
+(stat signature of snapshot, journal and results files), so files written by
+other processes are picked up cheaply.
+
+Rebuild from the JSON files:
+    python -m reports.catalog --rebuild [--runs-dir runs]
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import settings
+from engine.state import journal_path_for
+from reports.summary import ensure_summary, inputs_fresh, stat_signature, workflow_id_for
+
+CATALOG_NAME = "catalog.sqlite"
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS workflows (
+    workflow_id TEXT PRIMARY KEY,
+    state_file TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    summary_hash TEXT,
+    ea_name TEXT,
+    symbol TEXT,
+    timeframe TEXT,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    current_step INTEGER,
+    composite_score REAL,
+    go_live_score REAL,
+    go_live_ready INTEGER,
+    profit REAL,
+    profit_factor REAL,
+    max_drawdown_pct REAL,
+    total_trades INTEGER,
+    win_rate REAL,
+    stress_pass_num INTEGER,
+    stress_count INTEGER,
+    stress_worst_profit REAL,
+    stress_worst_label TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_workflows_status ON workflows(status);
+CREATE INDEX IF NOT EXISTS idx_workflows_created ON workflows(created_at);
+CREATE INDEX IF NOT EXISTS idx_workflows_ea ON workflows(ea_name, symbol);
+CREATE INDEX IF NOT EXISTS idx_workflows_score ON workflows(go_live_score);
+
+CREATE TABLE IF NOT EXISTS gates (
+    workflow_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    passed INTEGER,
+    value REAL,
+    threshold REAL,
+    PRIMARY KEY (workflow_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_gates_name ON gates(name, passed);
+
+CREATE TABLE IF NOT EXISTS board_workflows (
+    workflow_id TEXT PRIMARY KEY,
+    row_json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS board_scenarios (
+    workflow_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    scenario_id TEXT,
+    variant TEXT,
+    profit REAL,
+    row_json TEXT NOT NULL,
+    PRIMARY KEY (workflow_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_board_scenarios_variant ON board_scenarios(variant, profit);
+
+CREATE TABLE IF NOT EXISTS leaderboard_passes (
+    workflow_id TEXT NOT NULL,
+    pass_rank INTEGER NOT NULL,
+    pass_num INTEGER,
+    score REAL,
+    row_json TEXT NOT NULL,
+    PRIMARY KEY (workflow_id, pass_rank)
+);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_score ON leaderboard_passes(score);
+"""
+
+_ROW_TABLES = ("gates", "board_workflows", "board_scenarios", "leaderboard_passes", "workflows")
+
+
+def _signature_fresh(signature: str) -> bool:
+    """True if none of the input files recorded in a signature changed."""
+    try:
+        return inputs_fresh(json.loads(signature))
+    except (TypeError, ValueError):
+        return False
+
+
+def _num(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _field(key: str) -> str:
+    """SQL expression for a top-level field of a stored row (keys come from whitelists)."""
+    return f"json_extract(row_json, '$.{key}')"
+
+
+def _status_condition(exclude_statuses: Iterable[str]) -> tuple[list[str], list[Any]]:
+    excluded = list(exclude_statuses or [])
+    if not excluded:
+        return ["1 = 1"], []
+    return [f"w.status NOT IN ({','.join('?' * len(excluded))})"], excluded
+
+
+def _search_text(keys: Iterable[str]) -> str:
+    return "LOWER(" + " || ' ' || ".join(f"COALESCE({_field(k)}, '')" for k in keys) + ")"
+
+
+def _like_pattern(text: str) -> str:
+    escaped = text.strip().lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+BOARD_SORT_KEYS = {
+    "workflows": (
+        "ea_name", "symbol", "timeframe", "score_num", "profit_num", "forward_num", "back_num",
+        "trades_num", "pf_num", "dd_num", "status", "created_at", "notes", "workflow_id",
+    ),
+    "scenarios": (
+        "workflow_id", "ea_name", "scenario_label", "window_id", "model", "variant", "overlay_costs",
+        "profit_num", "pf_num", "dd_num", "trades_num", "hq_num", "tick_files_ok", "success", "created_at",
+    ),
+}
+
+BOARD_FILTERS = {
+    "workflows": {
+        "ea_name": _field("ea_name"),
+        "symbol": _field("symbol"),
+        "timeframe": _field("timeframe"),
+    },
+    "scenarios": {
+        "ea_name": _field("ea_name"),
+        "symbol": _field("symbol"),
+        "timeframe": _field("timeframe"),
+        "model": f"CAST({_field('model')} AS TEXT)",
+        "variant": f"COALESCE(NULLIF({_field('variant')}, ''), 'base')",
+        "window": f"COALESCE(NULLIF({_field('window_id')}, ''), {_field('window_label')}, '')",
+    },
+}
+
+BOARD_SEARCH_FIELDS = (
+    "ea_name", "workflow_id", "symbol", "timeframe", "scenario_label", "scenario_id", "window_label",
+)
+
+# Same ordering as the boards SPA: overlay spread/slippage, then plain spread, then none
+_OVERLAY_COSTS_SQL = (
+    f"CASE WHEN {_field('overlay_spread_pips')} IS NOT NULL OR {_field('overlay_slippage_pips')} IS NOT NULL "
+    f"THEN COALESCE({_field('overlay_spread_pips')}, 0) * 1000 + COALESCE({_field('overlay_slippage_pips')}, 0) "
+    f"WHEN {_field('spread_points')} IS NOT NULL THEN {_field('spread_points')} ELSE -1 END"
+)
+
+LEADERBOARD_SORTS = {
+    "rank": "rank",
+    "ea_name": _field("ea_name"),
+    "status": (
+        f"CASE {_field('status')} WHEN 'consistent' THEN 0 WHEN 'forward_only' THEN 1 "
+        "WHEN 'back_only' THEN 2 WHEN 'mixed' THEN 3 ELSE 4 END"
+    ),
+    "score": "COALESCE(score, 0)",
+    "profit": f"COALESCE({_field('profit_num')}, 0)",
+    "stress": _field("stress_worst_profit_num"),
+    "pf": f"COALESCE({_field('pf_num')}, 0)",
+    "dd": f"COALESCE({_field('dd_num')}, 0)",
+    "trades": f"COALESCE({_field('total_trades')}, 0)",
+    "forward": f"COALESCE({_field('forward_num')}, 0)",
+    "back": f"COALESCE({_field('back_num')}, 0)",
+    "winrate": f"COALESCE({_field('win_rate_num')}, 0)",
+}
+
+
+class WorkflowCatalog:
+    """SQLite-backed index of workflow state files."""
+
+    def __init__(self, runs_dir: str = "runs", db_path: Optional[str] = None, check_same_thread: bool = True):
+        self.runs_dir = Path(runs_dir)
+        self.runs_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = Path(db_path) if db_path else self.runs_dir / CATALOG_NAME
+        # check_same_thread=False lets a caller that serialises access (the report
+        # server) share one connection across request threads
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=check_same_thread)
+        self.conn.row_factory = sqlite3.Row
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.DatabaseError:
+            pass
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _migrate(self) -> None:
+        """Drop tables from an older schema; sync() repopulates them."""
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.OperationalError:
+            return
+        if row is not None and row["value"] == str(SCHEMA_VERSION):
+            return
+        with self.conn:
+            for table in _ROW_TABLES:
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def index_workflow(self, state_file: str, state: Optional[dict[str, Any]] = None, force: bool = False) -> str:
+        """
+        (Re)index one workflow in a single transaction.
+
+        Rows come from the workflow's summary sidecar, which is only rebuilt
+        (state + results re-read) when one of its inputs changed.
+
+        Args:
+            state_file: Path to workflow_<id>.json
+            state: Already-loaded state (avoids re-reading the file)
+            force: Rebuild the summary even if the sidecar is fresh
+
+        Returns:
+            workflow_id
+        """
+        path = Path(state_file)
+        workflow_id = workflow_id_for(path)
+
+        try:
+            summary = ensure_summary(str(path), state=state, force=force)
+        except Exception as e:
+            signature = json.dumps(
+                {str(p): stat_signature(p) for p in (path, journal_path_for(path))}, sort_keys=True
+            )
+            with self.conn:
+                self._delete_rows(workflow_id)
+                # Keep corrupted workflows visible (list_workflows surfaces them)
+                self.conn.execute(
+                    "INSERT INTO workflows(workflow_id, state_file, signature, ea_name, status, created_at, current_step, error) "
+                    "VALUES (?, ?, ?, 'Unknown', 'corrupted', '', -1, ?)",
+                    (workflow_id, str(path), signature, str(e)),
+                )
+            return workflow_id
+
+        wf = summary["workflow"]
+        board_row = summary["board"]["workflow"]
+        scenario_rows = summary["board"]["scenarios"]
+
+        with self.conn:
+            self._delete_rows(workflow_id)
+            if wf["workflow_id"] != workflow_id:
+                self._delete_rows(wf["workflow_id"])
+            workflow_id = wf["workflow_id"]
+
+            self.conn.execute(
+                "INSERT INTO workflows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    workflow_id,
+                    str(path),
+                    json.dumps(summary["inputs"], sort_keys=True),
+                    summary["hash"],
+                    wf["ea_name"],
+                    wf["symbol"],
+                    wf["timeframe"],
+                    wf["status"],
+                    wf["created_at"],
+                    wf["updated_at"],
+                    wf["current_step"],
+                    _num(wf["composite_score"]),
+                    _num(board_row.get("score_num")),
+                    None if wf["go_live_ready"] is None else int(bool(wf["go_live_ready"])),
+                    _num(board_row.get("profit_num")),
+                    _num(board_row.get("pf_num")),
+                    _num(board_row.get("dd_num")),
+                    int(board_row.get("trades_num") or 0),
+                    _num(board_row.get("win_rate_num")),
+                    wf["stress_pass_num"],
+                    wf["stress_count"],
+                    wf["stress_worst_profit"],
+                    wf["stress_worst_label"],
+                    None,
+                ),
+            )
+
+            self.conn.executemany(
+                "INSERT INTO gates VALUES (?, ?, ?, ?, ?)",
+                [
+                    (workflow_id, name, int(bool(g["passed"])), _num(g["value"]), _num(g["threshold"]))
+                    for name, g in summary["gates"].items()
+                ],
+            )
+
+            self.conn.execute(
+                "INSERT INTO board_workflows VALUES (?, ?)",
+                (workflow_id, json.dumps(board_row, default=str)),
+            )
+            self.conn.executemany(
+                "INSERT INTO board_scenarios VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        workflow_id,
+                        seq,
+                        row.get("scenario_id"),
+                        row.get("variant"),
+                        _num(row.get("profit_num")),
+                        json.dumps(row, default=str),
+                    )
+                    for seq, row in enumerate(scenario_rows)
+                ],
+            )
+
+            self.conn.executemany(
+                "INSERT INTO leaderboard_passes VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        workflow_id,
+                        rank,
+                        int(p.get("pass_num") or 0),
+                        _num(p.get("score_num")),
+                        json.dumps(p, default=str),
+                    )
+                    for rank, p in enumerate(summary["leaderboard"])
+                ],
+            )
+
+        return workflow_id
+
+    def _delete_rows(self, workflow_id: str) -> None:
+        for table in _ROW_TABLES:
+            self.conn.execute(f"DELETE FROM {table} WHERE workflow_id = ?", (workflow_id,))
+
+    def remove_workflow(self, workflow_id: str) -> None:
+        with self.conn:
+            self._delete_rows(workflow_id)
+
+    def sync(self, force: bool = False) -> dict[str, int]:
+        """
+        Bring the catalog in line with the workflow files on disk.
+
+        Only workflows whose inputs changed are re-read (all of them with force).
+
+        Returns:
+            dict with indexed, removed and unchanged counts
+        """
+        known = {
+            row["state_file"]: (row["workflow_id"], row["signature"])
+            for row in self.conn.execute("SELECT workflow_id, state_file, signature FROM workflows")
+        }
+        seen = set()
+        indexed = 0
+        unchanged = 0
+
+        for state_file in sorted(self.runs_dir.glob("workflow_*.json")):
+            key = str(state_file)
+            seen.add(key)
+            entry = known.get(key)
+            if entry and not force and _signature_fresh(entry[1]):
+                unchanged += 1
+                continue
+            self.index_workflow(key, force=force)
+            indexed += 1
+
+        removed = 0
+        for key, (workflow_id, _) in known.items():
+            if key not in seen:
+                self.remove_workflow(workflow_id)
+                removed += 1
+
+        return {"indexed": indexed, "removed": removed, "unchanged": unchanged}
+
+    def rebuild(self) -> dict[str, int]:
+        """Drop every indexed row and re-index all workflow JSON files (ignoring sidecars)."""
+        with self.conn:
+            for table in _ROW_TABLES:
+                self.conn.execute(f"DELETE FROM {table}")
+        return self.sync(force=True)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def list_workflows(self) -> list[dict[str, Any]]:
+        """Same shape as StateManager.list_workflows (newest file name first)."""
+        rows = self.conn.execute(
+            "SELECT workflow_id, ea_name, status, created_at, current_step, state_file, error "
+            "FROM workflows ORDER BY state_file DESC"
+        ).fetchall()
+        out = []
+        for r in rows:
+            item = {
+                "workflow_id": r["workflow_id"],
+                "ea_name": r["ea_name"],
+                "status": r["status"],
+                "created_at": r["created_at"],
+                "current_step": r["current_step"],
+                "file": r["state_file"],
+            }
+            if r["error"]:
+                item["error"] = r["error"]
+            out.append(item)
+        return out
+
+    def workflows(
+        self,
+        status: Optional[str] = None,
+        ea_name: Optional[str] = None,
+        symbol: Optional[str] = None,
+        order_by: str = "created_at",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Summary rows filtered on indexed columns."""
+        allowed = {"created_at", "go_live_score", "profit", "profit_factor", "max_drawdown_pct", "ea_name", "status"}
+        if order_by not in allowed:
+            raise ValueError(f"Unsupported order_by: {order_by}")
+
+        where, args = [], []
+        for column, value in (("status", status), ("ea_name", ea_name), ("symbol", symbol)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        sql = "SELECT * FROM workflows"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            args += [int(limit), int(offset)]
+        return [dict(r) for r in self.conn.execute(sql, args)]
+
+    def gates_for(self, workflow_id: str) -> dict[str, dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT name, passed, value, threshold FROM gates WHERE workflow_id = ?", (workflow_id,)
+        )
+        return {
+            r["name"]: {"passed": bool(r["passed"]), "value": r["value"], "threshold": r["threshold"]}
+            for r in rows
+        }
+
+    def state_files(self, exclude_statuses: Iterable[str] = ()) -> list[str]:
+        """Indexed workflow state files (optionally excluding statuses)."""
+        excluded = list(exclude_statuses or [])
+        sql = "SELECT state_file FROM workflows"
+        if excluded:
+            sql += f" WHERE status NOT IN ({','.join('?' * len(excluded))})"
+        return [r["state_file"] for r in self.conn.execute(sql + " ORDER BY state_file", excluded)]
+
+    def summary_hashes(self, exclude_statuses: Iterable[str] = ()) -> dict[str, str]:
+        """workflow_id -> summary hash for workflows not in exclude_statuses."""
+        excluded = list(exclude_statuses or [])
+        sql = "SELECT workflow_id, summary_hash FROM workflows"
+        if excluded:
+            sql += f" WHERE status NOT IN ({','.join('?' * len(excluded))})"
+        return {r["workflow_id"]: r["summary_hash"] or "" for r in self.conn.execute(sql, excluded)}
+
+    def board_rows(self, exclude_statuses: Iterable[str] = ()) -> tuple[list[dict], list[dict]]:
+        """Board workflow rows and scenario rows for workflows not in exclude_statuses."""
+        excluded = list(exclude_statuses or [])
+        cond = f"w.status NOT IN ({','.join('?' * len(excluded))})" if excluded else "1 = 1"
+        workflows = [
+            json.loads(r["row_json"])
+            for r in self.conn.execute(
+                f"SELECT b.row_json FROM board_workflows b JOIN workflows w USING (workflow_id) "
+                f"WHERE {cond} ORDER BY w.state_file",
+                excluded,
+            )
+        ]
+        scenarios = [
+            json.loads(r["row_json"])
+            for r in self.conn.execute(
+                f"SELECT s.row_json FROM board_scenarios s JOIN workflows w USING (workflow_id) "
+                f"WHERE {cond} ORDER BY w.state_file, s.seq",
+                excluded,
+            )
+        ]
+        return workflows, scenarios
+
+    def leaderboard_rows(
+        self,
+        exclude_statuses: Iterable[str] = (),
+        passes_per_workflow: int = 30,
+    ) -> tuple[list[dict], int]:
+        """
+        Leaderboard pass rows (top passes_per_workflow per workflow).
+
+        Returns:
+            (rows, workflows_processed)
+        """
+        excluded = list(exclude_statuses or [])
+        cond = f"w.status NOT IN ({','.join('?' * len(excluded))})" if excluded else "1 = 1"
+        rows = self.conn.execute(
+            f"SELECT p.workflow_id, p.row_json FROM leaderboard_passes p JOIN workflows w USING (workflow_id) "
+            f"WHERE {cond} AND p.pass_rank < ? ORDER BY w.state_file, p.pass_rank",
+            excluded + [int(passes_per_workflow)],
+        ).fetchall()
+        return [json.loads(r["row_json"]) for r in rows], len({r["workflow_id"] for r in rows})
+
+    # ------------------------------------------------------------------
+    # Paginated queries (report server)
+    # ------------------------------------------------------------------
+
+    def board_page(
+        self,
+        view: str = "workflows",
+        exclude_statuses: Iterable[str] = (),
+        search: Optional[str] = None,
+        filters: Optional[dict[str, str]] = None,
+        sort: str = "created_at",
+        descending: bool = True,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> tuple[list[dict], int]:
+        """
+        One page of board rows, filtered and sorted in SQL.
+
+        Args:
+            view: "workflows" or "scenarios"
+            exclude_statuses: Workflow statuses left off the board
+            search: Case-insensitive substring over EA / workflow / symbol / scenario text
+            filters: Exact-match filters (see BOARD_FILTERS for the keys of each view)
+            sort: Row field to order by (see BOARD_SORT_KEYS)
+            descending: Sort direction (missing values always sort last)
+            limit: Page size
+            offset: Rows to skip
+
+        Returns:
+            (rows, total rows matching the filters)
+        """
+        if view not in BOARD_SORT_KEYS:
+            raise ValueError(f"Unknown board view: {view}")
+        if sort not in BOARD_SORT_KEYS[view]:
+            raise ValueError(f"Unsupported sort for {view}: {sort}")
+
+        table = "board_workflows" if view == "workflows" else "board_scenarios"
+        where, args = _status_condition(exclude_statuses)
+        for key, value in (filters or {}).items():
+            if key not in BOARD_FILTERS[view]:
+                raise ValueError(f"Unsupported filter for {view}: {key}")
+            where.append(f"{BOARD_FILTERS[view][key]} = ?")
+            args.append(str(value))
+        if search:
+            where.append(f"{_search_text(BOARD_SEARCH_FIELDS)} LIKE ? ESCAPE '\\'")
+            args.append(_like_pattern(search))
+
+        expr = _OVERLAY_COSTS_SQL if sort == "overlay_costs" else _field(sort)
+        tiebreak = "w.state_file" if view == "workflows" else "w.state_file, b.seq"
+        base = f"FROM {table} b JOIN workflows w USING (workflow_id) WHERE {' AND '.join(where)}"
+
+        total = self.conn.execute(f"SELECT COUNT(*) {base}", args).fetchone()[0]
+        rows = self.conn.execute(
+            f"SELECT b.row_json {base} "
+            f"ORDER BY ({expr}) IS NULL, {expr} {'DESC' if descending else 'ASC'}, {tiebreak} "
+            f"LIMIT ? OFFSET ?",
+            args + [int(limit), int(offset)],
+        )
+        return [json.loads(r["row_json"]) for r in rows], total
+
+    def board_facets(self, exclude_statuses: Iterable[str] = ()) -> dict[str, Any]:
+        """Distinct filter values and headline counts for the boards."""
+        where, args = _status_condition(exclude_statuses)
+        cond = " AND ".join(where)
+
+        def distinct(table: str, expr: str) -> list[str]:
+            rows = self.conn.execute(
+                f"SELECT DISTINCT {expr} AS v FROM {table} b JOIN workflows w USING (workflow_id) "
+                f"WHERE {cond} AND {expr} IS NOT NULL AND {expr} != '' ORDER BY v",
+                args,
+            )
+            return [str(r["v"]) for r in rows]
+
+        counts = {
+            "workflows": self.conn.execute(
+                f"SELECT COUNT(*) FROM board_workflows b JOIN workflows w USING (workflow_id) WHERE {cond}", args
+            ).fetchone()[0],
+            "scenarios": self.conn.execute(
+                f"SELECT COUNT(*) FROM board_scenarios b JOIN workflows w USING (workflow_id) WHERE {cond}", args
+            ).fetchone()[0],
+        }
+        ea_names = distinct("board_workflows", _field("ea_name"))
+        symbols = distinct("board_workflows", _field("symbol"))
+        counts["unique_eas"] = len(ea_names)
+        counts["unique_symbols"] = len(symbols)
+        return {
+            "counts": counts,
+            "ea_name": ea_names,
+            "symbol": symbols,
+            "timeframe": distinct("board_workflows", _field("timeframe")),
+            "variant": distinct("board_scenarios", BOARD_FILTERS["scenarios"]["variant"]),
+            "window": distinct("board_scenarios", BOARD_FILTERS["scenarios"]["window"]),
+        }
+
+    def leaderboard_page(
+        self,
+        exclude_statuses: Iterable[str] = (),
+        passes_per_workflow: int = 30,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        sort: str = "rank",
+        descending: bool = False,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> tuple[list[dict], int, int]:
+        """
+        One page of leaderboard passes, filtered and sorted in SQL.
+
+        rank is the pass's position in the full leaderboard (Go Live score,
+        highest first), independent of filters and sort.
+
+        Returns:
+            (rows, total rows matching the filters, workflows on the leaderboard)
+        """
+        if sort not in LEADERBOARD_SORTS:
+            raise ValueError(f"Unsupported sort for leaderboard: {sort}")
+
+        where, args = _status_condition(exclude_statuses)
+        ranked = (
+            "WITH ranked AS ("
+            " SELECT p.workflow_id, p.row_json, p.score,"
+            " ROW_NUMBER() OVER (ORDER BY COALESCE(p.score, 0) DESC, w.state_file, p.pass_rank) AS rank"
+            " FROM leaderboard_passes p JOIN workflows w USING (workflow_id)"
+            f" WHERE {' AND '.join(where)} AND p.pass_rank < ?"
+            ") "
+        )
+        args.append(int(passes_per_workflow))
+
+        filters, filter_args = ["1 = 1"], []
+        if status:
+            filters.append(f"{_field('status')} = ?")
+            filter_args.append(status)
+        if search:
+            filters.append(f"{_search_text(('ea_name', 'symbol'))} LIKE ? ESCAPE '\\'")
+            filter_args.append(_like_pattern(search))
+        cond = " AND ".join(filters)
+
+        workflows = self.conn.execute(
+            ranked + "SELECT COUNT(DISTINCT workflow_id) FROM ranked", args
+        ).fetchone()[0]
+        total = self.conn.execute(
+            ranked + f"SELECT COUNT(*) FROM ranked WHERE {cond}", args + filter_args
+        ).fetchone()[0]
+
+        expr = LEADERBOARD_SORTS[sort]
+        rows = self.conn.execute(
+            ranked + f"SELECT row_json, rank FROM ranked WHERE {cond} "
+            f"ORDER BY ({expr}) IS NULL, {expr} {'DESC' if descending else 'ASC'}, rank "
+            f"LIMIT ? OFFSET ?",
+            args + filter_args + [int(limit), int(offset)],
+        )
+        out = []
+        for r in rows:
+            row = json.loads(r["row_json"])
+            row["rank"] = r["rank"]
+            out.append(row)
+        return out, total, workflows
+
+
+def open_catalog(runs_dir: str = "runs") -> WorkflowCatalog:
+    """Open (creating if needed) the catalog for a runs directory."""
+    return WorkflowCatalog(runs_dir)
+
+
+def index_workflow_file(state_file: str, runs_dir: Optional[str] = None) -> Optional[str]:
+    """Index one workflow into the catalog of its runs directory (no-op if disabled)."""
+    if not getattr(settings, "WORKFLOW_CATALOG", True):
+        return None
+    catalog = open_catalog(runs_dir or str(Path(state_file).parent))
+    try:
+        return catalog.index_workflow(state_file)
+    finally:
+        catalog.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Workflow catalog maintenance")
+    parser.add_argument("--runs-dir", default=getattr(settings, "RUNS_DIR", "runs"))
+    parser.add_argument("--rebuild", action="store_true", help="Re-index every workflow JSON file")
+    args = parser.parse_args(argv)
+
+    catalog = open_catalog(args.runs_dir)
+    try:
+        counts = catalog.rebuild() if args.rebuild else catalog.sync()
+    finally:
+        catalog.close()
+    print(
+        f"Catalog {Path(args.runs_dir) / CATALOG_NAME}: "
+        f"{counts['indexed']} indexed, {counts['removed']} removed, {counts['unchanged']} unchanged"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
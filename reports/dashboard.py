@@ -2,12 +2,14 @@
 Dashboard Generator
 
 Generates HTML dashboard from StatsReport data.
-Uses simple string templating - no external dependencies.
+Uses simple string templating - no external dependencies. Templates are
+compiled once into a render plan and reused.
 """
 import json
 import shutil
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 import re
 
@@ -44,14 +46,11 @@ def generate_dashboard(
     # Copy CSS
     shutil.copy(TEMPLATES_DIR / 'styles.css', output_dir / 'styles.css')
 
-    # Read template
-    template = (TEMPLATES_DIR / 'dashboard.html').read_text(encoding='utf-8')
-
     # Build template context
     ctx = build_context(report)
 
-    # Render template
-    html = render_template(template, ctx)
+    # Render template (compiled plan cached per template file)
+    html = render_template_file(TEMPLATES_DIR / 'dashboard.html', ctx)
 
     # Write output
     output_path = output_dir / 'index.html'
@@ -242,6 +241,122 @@ def build_context(report: StatsReport) -> dict:
     return ctx
 
 
+# {{name}}, {{a.b}}, {{.}}, {{#section}}, {{^inverted}}, {{/section}}
+_TAG_RE = re.compile(r'\{\{\s*([#^/]?)\s*(\.|[a-zA-Z_][a-zA-Z0-9_.]*)\s*\}\}')
+
+# Compiled plans for template files: path -> ((mtime_ns, size), plan)
+_FILE_PLANS: dict = {}
+
+
+def compile_template(template: str) -> tuple:
+    """
+    Parse a template into a render plan (done once per template).
+
+    Plan nodes:
+        ('text', str)
+        ('var', path)
+        ('section', path, children)
+        ('inverted', path, children)
+
+    where path is a tuple of keys (() for {{.}}).
+
+    Raises:
+        ValueError: On unbalanced section tags
+    """
+    root: list = []
+    stack = [(None, root)]  # (open tag name, node list)
+    pos = 0
+
+    for match in _TAG_RE.finditer(template):
+        if match.start() > pos:
+            stack[-1][1].append(('text', template[pos:match.start()]))
+        pos = match.end()
+
+        sigil, name = match.group(1), match.group(2)
+        path = () if name == '.' else tuple(name.split('.'))
+
+        if sigil in ('#', '^'):
+            children: list = []
+            stack[-1][1].append(('section' if sigil == '#' else 'inverted', path, children))
+            stack.append((name, children))
+        elif sigil == '/':
+            if stack[-1][0] != name:
+                raise ValueError(f"Unexpected {{{{/{name}}}}} (open section: {stack[-1][0]})")
+            stack.pop()
+        else:
+            stack[-1][1].append(('var', path))
+
+    if len(stack) > 1:
+        raise ValueError(f"Unclosed section {{{{#{stack[-1][0]}}}}}")
+    if pos < len(template):
+        root.append(('text', template[pos:]))
+    return _freeze(root)
+
+
+def _freeze(nodes: list) -> tuple:
+    return tuple(
+        (n[0], n[1], _freeze(n[2])) if n[0] in ('section', 'inverted') else n
+        for n in nodes
+    )
+
+
+@lru_cache(maxsize=32)
+def _compiled(template: str) -> tuple:
+    return compile_template(template)
+
+
+def _lookup(stack: list, path: tuple):
+    """Resolve a path against the context stack (innermost scope first)."""
+    if not path:
+        return stack[-1]
+    head = path[0]
+    for scope in reversed(stack):
+        if isinstance(scope, dict) and head in scope:
+            value = scope[head]
+            break
+    else:
+        return None
+    for key in path[1:]:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _render_nodes(nodes: tuple, stack: list, out: list) -> None:
+    for node in nodes:
+        kind = node[0]
+        if kind == 'text':
+            out.append(node[1])
+        elif kind == 'var':
+            value = _lookup(stack, node[1])
+            if value is not None:
+                out.append(str(value))
+        elif kind == 'section':
+            value = _lookup(stack, node[1])
+            if isinstance(value, list):
+                for item in value:
+                    stack.append(item)
+                    _render_nodes(node[2], stack, out)
+                    stack.pop()
+            elif isinstance(value, dict) and value:
+                stack.append(value)
+                _render_nodes(node[2], stack, out)
+                stack.pop()
+            elif value:
+                _render_nodes(node[2], stack, out)
+        else:  # inverted
+            if not _lookup(stack, node[1]):
+                _render_nodes(node[2], stack, out)
+
+
+def render_plan(plan: tuple, ctx: dict) -> str:
+    """Render a compiled plan with a context dict."""
+    out: list = []
+    _render_nodes(plan, [ctx], out)
+    return ''.join(out)
+
+
 def render_template(template: str, ctx: dict) -> str:
     """
     Simple mustache-like template rendering.
@@ -249,99 +364,26 @@ def render_template(template: str, ctx: dict) -> str:
     Supports:
     - {{variable}} - simple substitution
     - {{object.property}} - nested access
-    - {{#list}}...{{/list}} - iteration
+    - {{#list}}...{{/list}} - iteration (item keys shadow outer ones)
     - {{^list}}...{{/list}} - inverted (if empty)
     - {{#bool}}...{{/bool}} - conditional
+    - {{.}} - current item of a simple list
+
+    The template is compiled once and the plan reused for later renders.
     """
-    result = template
-
-    # Handle nested object access like {{metrics.profit}}
-    def replace_nested(match):
-        keys = match.group(1).split('.')
-        value = ctx
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key, '')
-            else:
-                return ''
-        return str(value) if value is not None else ''
-
-    result = re.sub(r'\{\{([a-zA-Z_][a-zA-Z0-9_.]*)\}\}', replace_nested, result)
-
-    # Handle sections (lists and conditionals)
-    # This is simplified - for complex templates, use a proper library
-
-    # {{#list}}...{{/list}} - iteration over lists
-    section_pattern = r'\{\{#([a-zA-Z_][a-zA-Z0-9_]*)\}\}(.*?)\{\{/\1\}\}'
-
-    def replace_section(match):
-        key = match.group(1)
-        content = match.group(2)
-        value = ctx.get(key)
-
-        if value is None:
-            return ''
-
-        if isinstance(value, list):
-            # Iterate over list
-            result_parts = []
-            for item in value:
-                item_content = content
-                if isinstance(item, dict):
-                    # Replace {{.property}} with item.property
-                    for k, v in item.items():
-                        item_content = item_content.replace(f'{{{{{k}}}}}', str(v) if v else '')
-                        # Handle {{#key}} conditionals within item
-                        if v:
-                            item_content = re.sub(
-                                rf'\{{\{{#{k}\}}\}}(.*?)\{{\{{/{k}\}}\}}',
-                                r'\1',
-                                item_content,
-                                flags=re.DOTALL
-                            )
-                        else:
-                            item_content = re.sub(
-                                rf'\{{\{{#{k}\}}\}}.*?\{{\{{/{k}\}}\}}',
-                                '',
-                                item_content,
-                                flags=re.DOTALL
-                            )
-                else:
-                    # Simple list - replace {{.}} with item
-                    item_content = item_content.replace('{{.}}', str(item))
-                result_parts.append(item_content)
-            return ''.join(result_parts)
-
-        elif isinstance(value, bool):
-            # Conditional
-            return content if value else ''
-
-        elif value:
-            # Truthy value
-            return content
-
-        return ''
-
-    # Apply section replacements (may need multiple passes for nested)
-    for _ in range(3):
-        result = re.sub(section_pattern, replace_section, result, flags=re.DOTALL)
-
-    # Handle inverted sections {{^key}}...{{/key}}
-    inverted_pattern = r'\{\{\^([a-zA-Z_][a-zA-Z0-9_]*)\}\}(.*?)\{\{/\1\}\}'
-
-    def replace_inverted(match):
-        key = match.group(1)
-        content = match.group(2)
-        value = ctx.get(key)
-
-        # Show content if value is falsy or empty list
-        if not value or (isinstance(value, list) and len(value) == 0):
-            return content
-        return ''
-
-    result = re.sub(inverted_pattern, replace_inverted, result, flags=re.DOTALL)
-
-    return result
+    return render_plan(_compiled(template), ctx)
+
+
+def render_template_file(path: Path, ctx: dict) -> str:
+    """Render a template file, recompiling only when its mtime/size changes."""
+    path = Path(path)
+    st = path.stat()
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _FILE_PLANS.get(str(path))
+    if cached is None or cached[0] != signature:
+        cached = (signature, compile_template(path.read_text(encoding='utf-8')))
+        _FILE_PLANS[str(path)] = cached
+    return render_plan(cached[1], ctx)
 
 
 def generate_sample_dashboard(output_dir: Optional[str] = None) -> str:
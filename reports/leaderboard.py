@@ -11,13 +11,17 @@ from __future__ import annotations
 import json
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import settings
+from engine.state import load_state_file
+from modules.blob_store import HEAVY_RESULT_KEYS, load_results_file
 from modules.loader import load_module
+from reports.summary import ensure_summary, output_up_to_date, reuse_output, stat_signature, write_manifest
 
 _pass_analyzer = load_module("pass_analyzer", "modules/pass_analyzer.py")
 analyze_passes = _pass_analyzer.analyze_passes
@@ -28,6 +32,9 @@ calculate_composite_score = _gates.calculate_composite_score
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 PASSES_PER_WORKFLOW = getattr(settings, "TOP_PASSES_BACKTEST", 30)
 
+# Statuses to exclude from leaderboard (stuck/failed workflows)
+EXCLUDED_STATUSES = {"failed", "awaiting_param_analysis", "awaiting_stats_analysis", "awaiting_ea_fix", "pending"}
+
 
 def generate_leaderboard(
     runs_dir: str = "runs",
@@ -42,24 +49,66 @@ def generate_leaderboard(
     all_passes: list[dict[str, Any]] = []
     workflows_processed = 0
 
-    # Statuses to exclude from leaderboard (stuck/failed workflows)
-    EXCLUDED_STATUSES = {'failed', 'awaiting_param_analysis', 'awaiting_stats_analysis', 'awaiting_ea_fix', 'pending'}
+    template_path = TEMPLATES_DIR / "leaderboard_spa.html"
+    if not template_path.exists():
+        raise FileNotFoundError(f"Missing template: {template_path}")
+    index_path = out_dir / "index.html"
+
+    # Summary sidecars / catalog hold the top PASSES_PER_WORKFLOW rows per workflow
+    use_summaries = passes_per_workflow <= PASSES_PER_WORKFLOW
+    manifest: Optional[dict[str, Any]] = None
 
-    for state_file in sorted(runs_path.glob("workflow_*.json")):
+    catalog = None
+    if getattr(settings, "WORKFLOW_CATALOG", True) and use_summaries:
         try:
-            state = json.loads(state_file.read_text(encoding="utf-8"))
-        except Exception:
-            continue
+            from reports.catalog import open_catalog
+            catalog = open_catalog(runs_path)
+            catalog.sync()
+        except Exception as e:
+            print(f"Warning: workflow catalog unavailable, scanning JSON files: {e}", file=sys.stderr)
+            catalog = None
+
+    if catalog is not None:
+        try:
+            manifest = _manifest(template_path, passes_per_workflow, catalog.summary_hashes(EXCLUDED_STATUSES))
+            if output_up_to_date(out_dir, manifest, ("index.html", "data.json")):
+                return reuse_output(index_path, open_browser)
+            all_passes, workflows_processed = catalog.leaderboard_rows(
+                exclude_statuses=EXCLUDED_STATUSES,
+                passes_per_workflow=passes_per_workflow,
+            )
+        finally:
+            catalog.close()
+    else:
+        hashes: dict[str, str] = {}
+        for state_file in sorted(runs_path.glob("workflow_*.json")):
+            try:
+                if use_summaries:
+                    summary = ensure_summary(str(state_file))
+                    status = summary["workflow"]["status"]
+                else:
+                    state = load_state_file(state_file)
+                    status = state.get("status", "")
+            except Exception:
+                continue
 
-        # Skip failed/stuck workflows
-        status = state.get("status", "")
-        if status in EXCLUDED_STATUSES:
-            continue
+            # Skip failed/stuck workflows
+            if status in EXCLUDED_STATUSES:
+                continue
+
+            if use_summaries:
+                hashes[summary["workflow"]["workflow_id"]] = summary["hash"]
+                passes = summary["leaderboard"][:passes_per_workflow]
+            else:
+                passes = extract_top_passes(state, state_file, top_n=passes_per_workflow)
+            if passes:
+                all_passes.extend(passes)
+                workflows_processed += 1
 
-        passes = extract_top_passes(state, state_file, top_n=passes_per_workflow)
-        if passes:
-            all_passes.extend(passes)
-            workflows_processed += 1
+        if use_summaries:
+            manifest = _manifest(template_path, passes_per_workflow, hashes)
+            if output_up_to_date(out_dir, manifest, ("index.html", "data.json")):
+                return reuse_output(index_path, open_browser)
 
     all_passes.sort(key=lambda p: float(p.get("score_num") or 0), reverse=True)
     for idx, p in enumerate(all_passes, 1):
@@ -72,22 +121,29 @@ def generate_leaderboard(
         "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
     }
 
-    template_path = TEMPLATES_DIR / "leaderboard_spa.html"
-    if not template_path.exists():
-        raise FileNotFoundError(f"Missing template: {template_path}")
-
     template = template_path.read_text(encoding="utf-8")
     html = template.replace("{{DATA_JSON}}", json.dumps(data, indent=2))
 
-    (out_dir / "index.html").write_text(html, encoding="utf-8")
+    index_path.write_text(html, encoding="utf-8")
     (out_dir / "data.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
+    if manifest is not None:
+        write_manifest(out_dir, manifest)
 
     if open_browser:
         import webbrowser
 
-        webbrowser.open(f"file://{(out_dir / 'index.html').absolute()}")
+        webbrowser.open(f"file://{index_path.absolute()}")
 
-    return str(out_dir / "index.html")
+    return str(index_path)
+
+
+def _manifest(template_path: Path, passes_per_workflow: int, hashes: dict[str, str]) -> dict[str, Any]:
+    """Inputs of the leaderboard output: template version, row limit and per-workflow summary hashes."""
+    return {
+        "template": stat_signature(template_path),
+        "passes_per_workflow": passes_per_workflow,
+        "workflows": hashes,
+    }
 
 
 def _load_results_file(results_file: str, state_file: Path) -> list[dict[str, Any]]:
@@ -98,7 +154,8 @@ def _load_results_file(results_file: str, state_file: Path) -> list[dict[str, An
     for candidate in candidates:
         if candidate.exists():
             try:
-                data = json.loads(candidate.read_text(encoding="utf-8"))
+                # Blob manifests: equity curves / charts stay unloaded
+                data = load_results_file(str(candidate), skip=HEAVY_RESULT_KEYS)
             except Exception:
                 return []
             if isinstance(data, list):
@@ -154,6 +211,12 @@ def _score_for_backtest(pass_result: dict[str, Any]) -> float:
         forward = float(params.get("Forward Result") or 0)
         back = float(params.get("Back Result") or 0)
 
+    return _composite_score(profit, trades, pf, dd, forward, back)
+
+
+@lru_cache(maxsize=4096)
+def _composite_score(profit: float, trades: int, pf: float, dd: float, forward: float, back: float) -> float:
+    """Memoized Go Live Score (passes are scored once to sort and again per row)."""
     return float(
         calculate_composite_score(
             {
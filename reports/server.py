@@ -0,0 +1,422 @@
+"""
+Report Server
+
+Optional local HTTP server (stdlib only) for the boards, leaderboard and
+workflow dashboards, meant to run on the same box as the batch runner:
+
+    python -m reports.server [--runs-dir runs] [--host 127.0.0.1] [--port 8765]
+
+Static files under runs/boards, runs/leaderboard and runs/dashboards are served
+with ETags (304 on If-None-Match) and gzip for text content. JSON endpoints give
+the SPAs server-side filtering, sorting and pagination from the workflow
+catalog, so a board with thousands of rows ships and renders one page at a time:
+
+    GET /api/health
+    GET /api/boards/facets
+    GET /api/boards/workflows?q=&ea_name=&symbol=&timeframe=&sort=&desc=&page=&page_size=
+    GET /api/boards/scenarios?...&model=&variant=&window=
+    GET /api/leaderboard?q=&status=&sort=&desc=&page=&page_size=
+
+The catalog is re-synced at most every REPORT_SERVER_SYNC_SECONDS, so workflows
+written by the batch runner show up without a restart. The SPAs fall back to
+their embedded data when opened from disk.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import settings
+from reports.catalog import WorkflowCatalog
+
+API_VERSION = 1
+STATIC_ROOTS = ("boards", "leaderboard", "dashboards")
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+GZIP_MIN_BYTES = 1024
+GZIP_CACHE_ENTRIES = 64
+MAX_PAGE_SIZE = 1000
+
+BOARD_VIEW_FILTERS = {
+    "workflows": ("ea_name", "symbol", "timeframe"),
+    "scenarios": ("ea_name", "symbol", "timeframe", "model", "variant", "window"),
+}
+
+
+def _flag(value: Optional[str], default: bool) -> bool:
+    if value is None or value == "":
+        return default
+    return value.lower() in ("1", "true", "yes", "desc")
+
+
+def _page_args(params: dict[str, str], default_size: int) -> tuple[int, int]:
+    """(page, page_size) from query params; raises ValueError on bad input."""
+    page = int(params.get("page") or 1)
+    page_size = int(params.get("page_size") or default_size)
+    if page < 1 or page_size < 1:
+        raise ValueError("page and page_size must be positive")
+    return page, min(page_size, MAX_PAGE_SIZE)
+
+
+def _page_payload(rows: list[dict], total: int, page: int, page_size: int, sort: str, desc: bool) -> dict[str, Any]:
+    return {
+        "rows": rows,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": max(1, -(-total // page_size)),
+        "sort": sort,
+        "desc": desc,
+    }
+
+
+def board_page(catalog: WorkflowCatalog, view: str, params: dict[str, str], default_size: int) -> dict[str, Any]:
+    """
+    One page of board rows for the boards SPA.
+
+    Args:
+        catalog: Open workflow catalog
+        view: "workflows" or "scenarios"
+        params: Query parameters (last value of each)
+        default_size: Page size when none is requested
+
+    Returns:
+        dict with rows, total, page, page_size, pages, sort and desc
+    """
+    from reports.boards import EXCLUDED_STATUSES
+
+    page, page_size = _page_args(params, default_size)
+    sort = params.get("sort") or "created_at"
+    desc = _flag(params.get("desc"), True)
+    filters = {
+        key: params[key]
+        for key in BOARD_VIEW_FILTERS[view]
+        if params.get(key) not in (None, "", "all")
+    }
+    rows, total = catalog.board_page(
+        view,
+        exclude_statuses=EXCLUDED_STATUSES,
+        search=params.get("q") or None,
+        filters=filters,
+        sort=sort,
+        descending=desc,
+        limit=page_size,
+        offset=(page - 1) * page_size,
+    )
+    return _page_payload(rows, total, page, page_size, sort, desc)
+
+
+def leaderboard_page(catalog: WorkflowCatalog, params: dict[str, str], default_size: int) -> dict[str, Any]:
+    """
+    One page of leaderboard passes for the leaderboard SPA.
+
+    Returns:
+        dict with rows, total, page, page_size, pages, sort, desc and workflows_processed
+    """
+    from reports.leaderboard import EXCLUDED_STATUSES, PASSES_PER_WORKFLOW
+
+    page, page_size = _page_args(params, default_size)
+    sort = params.get("sort") or "rank"
+    desc = _flag(params.get("desc"), False)
+    status = params.get("status")
+    rows, total, workflows = catalog.leaderboard_page(
+        exclude_statuses=EXCLUDED_STATUSES,
+        passes_per_workflow=PASSES_PER_WORKFLOW,
+        status=None if status in (None, "", "all") else status,
+        search=params.get("q") or None,
+        sort=sort,
+        descending=desc,
+        limit=page_size,
+        offset=(page - 1) * page_size,
+    )
+    payload = _page_payload(rows, total, page, page_size, sort, desc)
+    payload["workflows_processed"] = workflows
+    return payload
+
+
+class ReportServer(ThreadingHTTPServer):
+    """Threaded HTTP server over one runs directory and its workflow catalog."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        runs_dir: str = "runs",
+        sync_seconds: Optional[float] = None,
+        page_size: Optional[int] = None,
+        quiet: bool = False,
+    ):
+        super().__init__(address, ReportRequestHandler)
+        self.runs_dir = Path(runs_dir)
+        self.sync_seconds = float(
+            sync_seconds if sync_seconds is not None else getattr(settings, "REPORT_SERVER_SYNC_SECONDS", 5)
+        )
+        self.page_size = int(page_size or getattr(settings, "REPORT_SERVER_PAGE_SIZE", 100))
+        self.quiet = quiet
+        self._catalog: Optional[WorkflowCatalog] = None
+        self._catalog_lock = threading.Lock()
+        self._synced_at: Optional[float] = None
+        self._gzip_cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._gzip_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def query(self, fn: Callable[[WorkflowCatalog], Any]) -> Any:
+        """Run fn(catalog) with exclusive use of the shared catalog, syncing it first if due."""
+        with self._catalog_lock:
+            if self._catalog is None:
+                self._catalog = WorkflowCatalog(str(self.runs_dir), check_same_thread=False)
+            now = time.monotonic()
+            if self._synced_at is None or now - self._synced_at >= self.sync_seconds:
+                self._catalog.sync()
+                self._synced_at = now
+            return fn(self._catalog)
+
+    def static_path(self, url_path: str) -> Optional[Path]:
+        """File under one of the STATIC_ROOTS for a URL path (index.html for directories)."""
+        parts = [p for p in url_path.split("/") if p]
+        if not parts or parts[0] not in STATIC_ROOTS:
+            return None
+        if any(p in (".", "..") or "\\" in p or ":" in p for p in parts):
+            return None
+        path = self.runs_dir.joinpath(*parts)
+        if path.is_dir():
+            path = path / "index.html"
+        if not path.is_file():
+            return None
+        if not path.resolve().is_relative_to(self.runs_dir.resolve()):
+            return None
+        return path
+
+    def gzipped(self, key: tuple[str, str], body: bytes) -> bytes:
+        """gzip body, caching the result for unchanged files (key = path, stat signature)."""
+        with self._gzip_lock:
+            cached = self._gzip_cache.get(key)
+            if cached is not None:
+                self._gzip_cache.move_to_end(key)
+                return cached
+        data = gzip.compress(body, compresslevel=6)
+        with self._gzip_lock:
+            self._gzip_cache[key] = data
+            while len(self._gzip_cache) > GZIP_CACHE_ENTRIES:
+                self._gzip_cache.popitem(last=False)
+        return data
+
+    def server_close(self) -> None:
+        super().server_close()
+        with self._catalog_lock:
+            if self._catalog is not None:
+                self._catalog.close()
+                self._catalog = None
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """GET / HEAD handler for static report files and the JSON API."""
+
+    server: ReportServer
+    server_version = "EAStressTestReports/1"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self._handle(head=False)
+
+    def do_HEAD(self) -> None:
+        self._handle(head=True)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def _handle(self, head: bool) -> None:
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        try:
+            if path in ("", "/"):
+                self._redirect("/boards/")
+            elif path.startswith("/api/"):
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                self._api(path[len("/api/"):].strip("/"), params, head)
+            else:
+                self._static(path, head)
+        except ValueError as e:
+            self._send_json({"error": str(e)}, head, status=400)
+        except Exception as e:
+            self.log_error("Error serving %s: %s", self.path, e)
+            self._send_json({"error": str(e)}, head, status=500)
+
+    def _api(self, route: str, params: dict[str, str], head: bool) -> None:
+        page_size = self.server.page_size
+        if route == "health":
+            payload: Any = {"ok": True, "api": API_VERSION}
+        elif route == "boards/facets":
+            from reports.boards import EXCLUDED_STATUSES
+
+            payload = self.server.query(lambda c: c.board_facets(EXCLUDED_STATUSES))
+        elif route in ("boards/workflows", "boards/scenarios"):
+            view = route.split("/", 1)[1]
+            payload = self.server.query(lambda c: board_page(c, view, params, page_size))
+        elif route == "leaderboard":
+            payload = self.server.query(lambda c: leaderboard_page(c, params, page_size))
+        else:
+            self._send_json({"error": f"Unknown endpoint: /api/{route}"}, head, status=404)
+            return
+        self._send_json(payload, head)
+
+    def _static(self, url_path: str, head: bool) -> None:
+        path = self.server.static_path(url_path)
+        if path is None:
+            self._send(404, b"Not found", "text/plain; charset=utf-8", head)
+            return
+        if path.name == "index.html" and not url_path.endswith(("/", ".html")):
+            # Relative links (../dashboards/...) need the trailing slash
+            self._redirect(url_path + "/")
+            return
+
+        st = path.stat()
+        signature = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/json", "application/javascript"):
+            content_type += "; charset=utf-8"
+
+        compress = self._wants_gzip(content_type, st.st_size)
+        etag = f'"{signature}{"-gz" if compress else ""}"'
+        if self._not_modified(etag):
+            self._send_not_modified(etag)
+            return
+
+        body = path.read_bytes()
+        if compress:
+            body = self.server.gzipped((str(path), signature), body)
+        self._send(200, body, content_type, head, etag=etag, gzipped=compress)
+
+    # ------------------------------------------------------------------
+    # Responses
+    # ------------------------------------------------------------------
+
+    def _wants_gzip(self, content_type: str, size: int) -> bool:
+        if size < GZIP_MIN_BYTES or not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        accepted = self.headers.get("Accept-Encoding", "")
+        return any(token.split(";")[0].strip() == "gzip" for token in accepted.split(","))
+
+    def _not_modified(self, etag: str) -> bool:
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        tags = {t.strip() for t in header.split(",")}
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    def _send_json(self, payload: Any, head: bool, status: int = 200) -> None:
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        content_type = "application/json; charset=utf-8"
+        if status != 200:
+            self._send(status, body, content_type, head)
+            return
+        compress = self._wants_gzip(content_type, len(body))
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}{"-gz" if compress else ""}"'
+        if self._not_modified(etag):
+            self._send_not_modified(etag)
+            return
+        if compress:
+            body = gzip.compress(body, compresslevel=6)
+        self._send(200, body, content_type, head, etag=etag, gzipped=compress)
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        head: bool,
+        etag: Optional[str] = None,
+        gzipped: bool = False,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        # Always revalidate; unchanged content costs a 304
+        self.send_header("Cache-Control", "no-cache")
+        if etag:
+            self.send_header("ETag", etag)
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        if content_type.startswith(COMPRESSIBLE_TYPES):
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_not_modified(self, etag: str) -> None:
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _redirect(self, location: str) -> None:
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def make_server(
+    runs_dir: str = "runs",
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    quiet: bool = False,
+) -> ReportServer:
+    """Create (but don't start) a report server; port 0 picks a free port."""
+    host = host if host is not None else getattr(settings, "REPORT_SERVER_HOST", "127.0.0.1")
+    port = port if port is not None else getattr(settings, "REPORT_SERVER_PORT", 8765)
+    return ReportServer((host, int(port)), runs_dir=runs_dir, quiet=quiet)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve boards, leaderboard and dashboards locally")
+    parser.add_argument("--runs-dir", default=getattr(settings, "RUNS_DIR", "runs"))
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--open", action="store_true", help="Open the boards in a browser")
+    parser.add_argument("--quiet", action="store_true", help="Don't log requests")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.runs_dir, args.host, args.port, quiet=args.quiet)
+    print(f"Serving {Path(args.runs_dir).resolve()} at {server.url} (Ctrl+C to stop)")
+    if args.open:
+        import webbrowser
+
+        webbrowser.open(server.url + "boards/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
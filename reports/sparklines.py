@@ -0,0 +1,276 @@
+"""
+Equity Sparklines
+
+Tiny inline SVG equity previews for board and leaderboard rows, so the tables
+show curve shape without any client-side charting.
+
+Curves are reduced with LTTB (modules/downsample.py) to SPARKLINE_POINTS and
+rendered as a single <path>. Sources:
+- passes: Step 9 backtest equity curves (in-sample + forward, blob references
+  resolved only when needed)
+- stress scenarios: the compact equity_points recorded when the scenario ran,
+  else the scenario's MT5 report (base variants only)
+
+Rendered SVGs are cached per workflow in runs/<workflow_id>/sparklines.json,
+keyed by the identity of each source curve (blob digest, content hash or
+report stat signature), so rebuilding a summary after an unrelated state
+change does not re-read or re-render any curve.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import settings
+from modules.blob_store import BLOB_KEY, BlobStore, is_ref, resolve
+from modules.downsample import lttb
+from reports.summary import stat_signature, workflow_id_for
+
+SPARKLINES_NAME = "sparklines.json"
+SPARKLINE_VERSION = 1
+SPARK_WIDTH = 100
+SPARK_HEIGHT = 24
+GOOD_COLOR = "#198754"
+BAD_COLOR = "#dc3545"
+
+
+def _as_dict(value: Any) -> dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _points() -> int:
+    return int(getattr(settings, "SPARKLINE_POINTS", 48) or 48)
+
+
+def _numeric(values: Optional[Sequence[Any]]) -> list[float]:
+    return [float(v) for v in (values or []) if isinstance(v, (int, float))]
+
+
+def _fmt(value: float) -> str:
+    text = f"{value:.1f}"
+    return text[:-2] if text.endswith(".0") else text
+
+
+def sparkline_path(values: Sequence[float], width: int = SPARK_WIDTH, height: int = SPARK_HEIGHT, points: Optional[int] = None) -> str:
+    """
+    SVG path data for a series scaled into a width x height box.
+
+    Args:
+        values: Y values (non-numeric entries are ignored)
+        width: Box width
+        height: Box height (1px padding top and bottom)
+        points: Maximum points kept (default: SPARKLINE_POINTS)
+
+    Returns:
+        "M x,y L x,y ..." (compact), or "" for fewer than two points
+    """
+    ys_all = _numeric(values)
+    if len(ys_all) < 2:
+        return ""
+    xs, ys = lttb(ys_all, points or _points())
+    last_x = xs[-1] or 1
+    lo, hi = min(ys), max(ys)
+    span = hi - lo
+    inner = height - 2
+
+    def scale_y(y: float) -> float:
+        if span <= 0:
+            return height / 2
+        return height - 1 - (y - lo) / span * inner
+
+    return "".join(
+        f"{'M' if i == 0 else 'L'}{_fmt(x / last_x * width)},{_fmt(scale_y(y))}"
+        for i, (x, y) in enumerate(zip(xs, ys))
+    )
+
+
+def sparkline_svg(values: Sequence[float], width: int = SPARK_WIDTH, height: int = SPARK_HEIGHT, points: Optional[int] = None) -> str:
+    """
+    Inline SVG element for a series (green if it ends at or above its start, red otherwise).
+
+    Returns:
+        SVG markup, or "" if there is nothing to draw
+    """
+    ys = _numeric(values)
+    d = sparkline_path(ys, width, height, points)
+    if not d:
+        return ""
+    color = GOOD_COLOR if ys[-1] >= ys[0] else BAD_COLOR
+    return (
+        f'<svg class="spark" width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+        f'preserveAspectRatio="none" aria-hidden="true">'
+        f'<path d="{d}" fill="none" stroke="{color}" stroke-width="1.2" stroke-linejoin="round"/></svg>'
+    )
+
+
+def _fingerprint(value: Any) -> str:
+    """Identity of a curve: blob digest for references, content hash for inline lists."""
+    if is_ref(value):
+        return str(value.get(BLOB_KEY))
+    if isinstance(value, list) and value:
+        data = json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+        return hashlib.sha1(data).hexdigest()[:16]
+    return "-"
+
+
+def sparklines_path(state_file: Path) -> Path:
+    """runs/workflow_<id>.json -> runs/<id>/sparklines.json"""
+    state_file = Path(state_file)
+    return state_file.parent / workflow_id_for(state_file) / SPARKLINES_NAME
+
+
+class SparklineCache:
+    """Rendered sparklines of one workflow, keyed by source curve identity."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.geometry = f"{SPARK_WIDTH}x{SPARK_HEIGHT}x{_points()}"
+        self.entries: dict[str, str] = {}
+        self.used: set[str] = set()
+        self.dirty = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == SPARKLINE_VERSION and data.get("geometry") == self.geometry:
+                self.entries = {str(k): str(v) for k, v in _as_dict(data.get("entries")).items()}
+        except Exception:
+            pass
+
+    def get(self, key: str, load: Callable[[], Optional[Sequence[float]]]) -> str:
+        """Cached SVG for key, rendering load() on a miss ("" if the curve is unavailable)."""
+        self.used.add(key)
+        if key not in self.entries:
+            try:
+                values = load()
+            except Exception:
+                values = None
+            self.entries[key] = sparkline_svg(values or [])
+            self.dirty = True
+        return self.entries[key]
+
+    def save(self) -> None:
+        """Write the cache, dropping entries no longer referenced."""
+        if set(self.entries) != self.used:
+            self.entries = {k: v for k, v in self.entries.items() if k in self.used}
+            self.dirty = True
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        payload = {"version": SPARKLINE_VERSION, "geometry": self.geometry, "entries": self.entries}
+        tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def _backtests(state: dict[str, Any], state_file: Path) -> tuple[list[dict[str, Any]], Optional[dict[str, Any]]]:
+    """Step 9 pass results (heavy fields left as references) and the selected best result."""
+    from reports.leaderboard import _load_results_file
+
+    bt_result = _as_dict(_as_dict(_as_dict(state.get("steps")).get("9_backtest_robust")).get("result"))
+    backtests = bt_result.get("all_results") if isinstance(bt_result.get("all_results"), list) else []
+    if not backtests and bt_result.get("results_file"):
+        backtests = _load_results_file(str(bt_result["results_file"]), state_file)
+    best = bt_result.get("best_result") if isinstance(bt_result.get("best_result"), dict) else None
+    return [p for p in backtests if isinstance(p, dict)], best
+
+
+def _pass_source(p: dict[str, Any], store: BlobStore) -> tuple[str, Callable[[], list[float]]]:
+    """(cache key, loader) for a pass's full equity curve."""
+    if p.get("equity_curve_in_sample") or p.get("equity_curve_forward"):
+        parts = [p.get("equity_curve_in_sample"), p.get("equity_curve_forward")]
+    else:
+        parts = [p.get("equity_curve")]
+
+    def load() -> list[float]:
+        values: list[float] = []
+        for part in parts:
+            values.extend(_numeric(resolve(part, store) if part is not None else []))
+        return values
+
+    return "pass:" + ":".join(_fingerprint(part) for part in parts), load
+
+
+def _scenario_source(scenario: dict[str, Any]) -> Optional[tuple[str, Callable[[], list[float]]]]:
+    """(cache key, loader) for a stress scenario's equity curve, if one is available."""
+    points = _as_dict(scenario.get("result")).get("equity_points")
+    if isinstance(points, list) and points:
+        return "points:" + _fingerprint(points), lambda: list(points)
+
+    # Overlay rows point at their base report; its curve would not include the added costs
+    report_path = scenario.get("report_path")
+    if scenario.get("variant") == "overlay" or not report_path:
+        return None
+    signature = stat_signature(Path(str(report_path)))
+    if signature == "-":
+        return None
+
+    def load() -> list[float]:
+        from modules.trade_extractor import compute_equity_curve, extract_trades
+
+        trades = extract_trades(str(report_path))
+        if not trades.success or not trades.trades:
+            return []
+        return compute_equity_curve(trades.trades, trades.initial_balance)
+
+    return f"report:{report_path}:{signature}", load
+
+
+def attach_sparklines(
+    state: dict[str, Any],
+    state_file: Path,
+    board_row: dict[str, Any],
+    scenario_rows: list[dict[str, Any]],
+    leaderboard_rows: list[dict[str, Any]],
+) -> None:
+    """
+    Set a "sparkline" SVG string on a workflow's board, scenario and leaderboard rows.
+
+    The board row gets the best pass (Step 9 selection, else the top leaderboard
+    pass); forward-window rows and passes without curves get "".
+
+    Args:
+        state: Loaded workflow state
+        state_file: Path to workflow_<id>.json
+        board_row: Board workflow row (updated in place)
+        scenario_rows: Board scenario rows (updated in place)
+        leaderboard_rows: Leaderboard pass rows (updated in place)
+    """
+    state_file = Path(state_file)
+    cache = SparklineCache(sparklines_path(state_file))
+    store = BlobStore(str(state_file.parent / "blobs"))
+
+    backtests, best = _backtests(state, state_file)
+    pass_sources = {}
+    for p in backtests:
+        pass_sources.setdefault(int(p.get("pass_num") or 0), p)
+
+    def pass_svg(pass_num: Any) -> str:
+        p = pass_sources.get(int(pass_num or 0))
+        return cache.get(*_pass_source(p, store)) if p is not None else ""
+
+    for row in leaderboard_rows:
+        row["sparkline"] = pass_svg(row.get("pass_num"))
+
+    best_pass_num = (best or {}).get("pass_num")
+    if best_pass_num is None and leaderboard_rows:
+        best_pass_num = leaderboard_rows[0].get("pass_num")
+    board_row["sparkline"] = pass_svg(best_pass_num) if best_pass_num is not None else ""
+
+    stress = _as_dict(state.get("stress_scenarios"))
+    scenarios = {
+        s.get("id"): s for s in (stress.get("scenarios") or []) if isinstance(s, dict) and s.get("id")
+    }
+    for row in scenario_rows:
+        scenario = scenarios.get(row.get("scenario_id")) if row.get("variant") != "forward_window" else None
+        source = _scenario_source(scenario) if scenario else None
+        row["sparkline"] = cache.get(*source) if source else ""
+
+    cache.save()
@@ -0,0 +1,246 @@
+"""
+Workflow Summary Sidecars
+
+Each workflow gets a small runs/<workflow_id>/summary.json holding everything
+the global reports need from it:
+- catalog fields (status, EA, symbol, gates, stress summary)
+- board rows (workflow + stress / forward-window scenarios)
+- leaderboard rows (top passes, already scored)
+- equity sparklines on those rows (reports/sparklines.py)
+
+The sidecar records the stat signature of its inputs (state snapshot, journal
+and the results files the leaderboard reads) plus a content hash. It is only
+rebuilt when an input changed, so the boards / leaderboard refresh after each
+post-step re-reads just the workflows that moved.
+
+Report outputs keep a manifest.json of (workflow_id -> summary hash); when the
+manifest is unchanged the output is left as-is.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import settings
+from engine.state import journal_path_for, load_state_file
+
+SUMMARY_NAME = "summary.json"
+SUMMARY_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+
+
+def _as_dict(value: Any) -> dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def stat_signature(path: Path) -> str:
+    """(mtime_ns, size) of a file, or '-' if it does not exist."""
+    try:
+        st = Path(path).stat()
+        return f"{st.st_mtime_ns}:{st.st_size}"
+    except OSError:
+        return "-"
+
+
+def inputs_fresh(inputs: dict[str, str]) -> bool:
+    """True if every recorded input still has the same stat signature."""
+    return bool(inputs) and all(stat_signature(Path(p)) == sig for p, sig in inputs.items())
+
+
+def workflow_id_for(state_file: Path) -> str:
+    return Path(state_file).stem.replace("workflow_", "", 1)
+
+
+def summary_path(state_file: Path) -> Path:
+    """runs/workflow_<id>.json -> runs/<id>/summary.json"""
+    state_file = Path(state_file)
+    return state_file.parent / workflow_id_for(state_file) / SUMMARY_NAME
+
+
+def _results_inputs(state: dict[str, Any], state_file: Path) -> list[Path]:
+    """Results files extract_top_passes may read (resolved like _load_results_file)."""
+    steps = _as_dict(state.get("steps"))
+    paths = []
+    for step in ("9_backtest_robust", "7_run_optimization"):
+        results_file = _as_dict(_as_dict(steps.get(step)).get("result")).get("results_file")
+        if not results_file:
+            continue
+        for candidate in (Path(str(results_file)), state_file.parent / str(results_file)):
+            if candidate.exists():
+                paths.append(candidate)
+                break
+    return paths
+
+
+def input_signatures(state: dict[str, Any], state_file: Path) -> dict[str, str]:
+    """Stat signatures of everything a workflow's reports are built from."""
+    paths = [state_file, journal_path_for(state_file)] + _results_inputs(state, state_file)
+    return {str(p): stat_signature(p) for p in paths}
+
+
+def summary_hash(summary: dict[str, Any]) -> str:
+    """Content hash of a summary (ignores its input signatures)."""
+    body = {k: v for k, v in summary.items() if k not in ("inputs", "hash")}
+    data = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def build_summary(state: dict[str, Any], state_file: Path) -> dict[str, Any]:
+    """
+    Compute the summary for one workflow.
+
+    Args:
+        state: Loaded workflow state
+        state_file: Path to workflow_<id>.json
+
+    Returns:
+        Summary dict (with inputs and hash)
+    """
+    from reports.boards import _board_rows_for_state
+    from reports.leaderboard import PASSES_PER_WORKFLOW, _stress_summary, _worst_stress_profit, extract_top_passes
+
+    state_file = Path(state_file)
+    # Stat before reading derived data so a concurrent write marks the sidecar stale
+    inputs = input_signatures(state, state_file)
+
+    board_row, scenario_rows = _board_rows_for_state(state, state_file)
+    leaderboard_rows = extract_top_passes(state, state_file, top_n=PASSES_PER_WORKFLOW)
+    if getattr(settings, "REPORT_SPARKLINES", True):
+        try:
+            from reports.sparklines import attach_sparklines
+
+            attach_sparklines(state, state_file, board_row, scenario_rows, leaderboard_rows)
+        except Exception as e:
+            print(f"Warning: failed to build sparklines for {state_file}: {e}", file=sys.stderr)
+    stress_pass_num, stress = _stress_summary(state)
+    worst_profit, worst_label = _worst_stress_profit(stress) if stress else (None, "-")
+    go_live = _as_dict(state.get("go_live"))
+    gates = {
+        str(name): {"passed": bool(g.get("passed")), "value": g.get("value"), "threshold": g.get("threshold")}
+        for name, g in _as_dict(state.get("gates")).items()
+        if isinstance(g, dict)
+    }
+
+    summary = {
+        "version": SUMMARY_VERSION,
+        "workflow": {
+            "workflow_id": state.get("workflow_id") or workflow_id_for(state_file),
+            "ea_name": state.get("ea_name", "Unknown"),
+            "symbol": state.get("symbol", ""),
+            "timeframe": state.get("timeframe", ""),
+            "status": state.get("status", ""),
+            "created_at": state.get("created_at", ""),
+            "updated_at": state.get("updated_at", ""),
+            "current_step": int(state.get("current_step", 0) or 0),
+            "composite_score": state.get("composite_score"),
+            "go_live_ready": go_live.get("go_live_ready") if go_live else None,
+            "stress_pass_num": stress_pass_num,
+            "stress_count": len(stress.get("scenarios") or []) if stress else 0,
+            "stress_worst_profit": worst_profit,
+            "stress_worst_label": worst_label if worst_profit is not None else None,
+        },
+        "gates": gates,
+        "board": {"workflow": board_row, "scenarios": scenario_rows},
+        "leaderboard": leaderboard_rows,
+        "inputs": inputs,
+    }
+    # Round-trip so cached and freshly built summaries compare equal
+    summary = json.loads(json.dumps(summary, default=str))
+    summary["hash"] = summary_hash(summary)
+    return summary
+
+
+def load_summary(state_file: Path) -> Optional[dict[str, Any]]:
+    """Cached summary for a workflow, or None if missing / stale / unreadable."""
+    path = summary_path(state_file)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            summary = json.load(f)
+    except Exception:
+        return None
+    if not isinstance(summary, dict) or summary.get("version") != SUMMARY_VERSION:
+        return None
+    if not inputs_fresh(_as_dict(summary.get("inputs"))):
+        return None
+    return summary
+
+
+def write_summary(state_file: Path, summary: dict[str, Any]) -> None:
+    path = summary_path(state_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(summary, indent=2, default=str), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def ensure_summary(state_file: str, state: Optional[dict[str, Any]] = None, force: bool = False) -> dict[str, Any]:
+    """
+    Return an up-to-date summary, rebuilding the sidecar only if an input changed.
+
+    Args:
+        state_file: Path to workflow_<id>.json
+        state: Already-loaded state (skips the read when the sidecar is stale)
+        force: Rebuild even if the sidecar is fresh
+
+    Returns:
+        Summary dict
+
+    Raises:
+        Whatever load_state_file raises for an unreadable state file
+    """
+    state_file = Path(state_file)
+    use_sidecar = getattr(settings, "REPORT_SUMMARY_SIDECARS", True)
+
+    if use_sidecar and not force:
+        cached = load_summary(state_file)
+        if cached is not None:
+            return cached
+
+    if state is None:
+        state = load_state_file(state_file)
+    summary = build_summary(state, state_file)
+
+    if use_sidecar:
+        try:
+            write_summary(state_file, summary)
+        except Exception as e:
+            print(f"Warning: failed to write summary sidecar for {state_file}: {e}", file=sys.stderr)
+    return summary
+
+
+def read_manifest(out_dir: Path) -> Optional[dict[str, Any]]:
+    try:
+        with open(Path(out_dir) / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def output_up_to_date(out_dir: Path, manifest: dict[str, Any], outputs: tuple[str, ...]) -> bool:
+    """True if the stored manifest matches and every output file still exists."""
+    if not getattr(settings, "REPORT_SUMMARY_SIDECARS", True):
+        return False
+    out_dir = Path(out_dir)
+    if not all((out_dir / name).exists() for name in outputs):
+        return False
+    return read_manifest(out_dir) == manifest
+
+
+def write_manifest(out_dir: Path, manifest: dict[str, Any]) -> None:
+    (Path(out_dir) / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def reuse_output(index_path: Path, open_browser: bool = False) -> str:
+    """Return an up-to-date output unchanged (opening it if requested)."""
+    if open_browser:
+        import webbrowser
+
+        webbrowser.open(f"file://{Path(index_path).absolute()}")
+    return str(index_path)
@@ -5,6 +5,7 @@ Uses SPA (Single Page Application) approach with JSON-embedded data.
 Supports running backtests for top passes to get full equity curves.
 """
 import json
+import os
 import sys
 import shutil
 from pathlib import Path
@@ -13,6 +14,8 @@ from typing import Optional, Dict, Any
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import settings
+from engine.state import load_state_file
+from modules.blob_store import ResultsFile
 
 # Direct import to avoid circular dependency through modules/__init__.py
 from modules.loader import load_module
@@ -27,31 +30,29 @@ calculate_composite_score = _gates.calculate_composite_score
 def _load_results_file(results_file: str, state_file: Path = None) -> list:
     """Load results from a separate JSON file.
 
-    Results may be stored relative to runs dir or as absolute path.
+    Results may be stored relative to runs dir or as absolute path, and may be
+    a blob-store manifest (only the result list is loaded).
     """
     if not results_file:
         return []
 
-    results_path = Path(results_file)
-
-    # Try as-is first
-    if results_path.exists():
-        with open(results_path, 'r') as f:
-            data = json.load(f)
-        # Handle both direct list and dict with 'all_results' or 'results' key
-        if isinstance(data, list):
-            return data
-        return data.get('all_results', data.get('results', []))
-
+    candidates = [Path(results_file)]
     # Try relative to state file's parent if provided
     if state_file:
-        relative_path = state_file.parent / results_file
-        if relative_path.exists():
-            with open(relative_path, 'r') as f:
-                data = json.load(f)
-            if isinstance(data, list):
-                return data
-            return data.get('all_results', data.get('results', []))
+        candidates.append(state_file.parent / results_file)
+
+    for results_path in candidates:
+        if not results_path.exists():
+            continue
+        results = ResultsFile(str(results_path))
+        # Handle both direct list and dict with 'all_results' or 'results' key
+        if not results.keys():
+            data = results.load()
+            return data if isinstance(data, list) else []
+        data = results.get('all_results')
+        if data is None:
+            data = results.get('results', [])
+        return data or []
 
     return []
 
@@ -77,8 +78,10 @@ def generate_dashboard_from_workflow(
         Path to generated dashboard
     """
     state_file = Path(workflow_path)
-    with open(state_file, 'r') as f:
-        state = json.load(f)
+    state = load_state_file(state_file)
+    # Stat the inputs before rendering: a write during the render leaves the record stale
+    from reports.summary import input_signatures
+    inputs = input_signatures(state, state_file)
 
     # Determine workflow ID
     workflow_id = state.get('workflow_id', '')
@@ -103,6 +106,11 @@ def generate_dashboard_from_workflow(
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Keep the embedded payload small; full-resolution curves load on demand
+    _downsample_equity(data, output_dir)
+    if getattr(settings, 'DASHBOARD_SHARDS', True):
+        _split_shards(data, output_dir)
+
     # Read SPA template
     templates_dir = Path(__file__).parent / 'templates'
     template_path = templates_dir / 'dashboard_spa.html'
@@ -112,8 +120,8 @@ def generate_dashboard_from_workflow(
 
     template = template_path.read_text(encoding='utf-8')
 
-    # Embed JSON data
-    json_data = json.dumps(data, indent=2)
+    # Embed JSON data (compact; '</' escaped so strings cannot close the script tag)
+    json_data = _compact_json(data).replace('</', '<\\/')
     html = template.replace('{{DATA_JSON}}', json_data)
     html = html.replace('{{ea_name}}', data.get('ea_name', 'EA Dashboard'))
 
@@ -121,9 +129,15 @@ def generate_dashboard_from_workflow(
     output_path = output_dir / 'index.html'
     output_path.write_text(html, encoding='utf-8')
 
-    # Also save raw data for debugging/API access
+    # Also save raw data for debugging/API access (summary document; see data['shards'])
     data_path = output_dir / 'data.json'
-    data_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+    data_path.write_text(_compact_json(data), encoding='utf-8')
+
+    # Record what this render was built from (generate_all_dashboards skips unchanged inputs)
+    try:
+        _write_render_record(output_dir, dashboard_input_hash(inputs, run_backtests))
+    except Exception as e:
+        print(f"Warning: failed to write {output_dir / RENDER_RECORD}: {e}", file=sys.stderr)
 
     if open_browser:
         import webbrowser
@@ -132,6 +146,110 @@ def generate_dashboard_from_workflow(
     return str(output_path)
 
 
+# Per-pass fields only needed once a pass is selected (loaded from data/pass_<n>)
+PASS_SHARD_KEYS = (
+    'advanced',
+    'drawdown',
+    'streaks',
+    'positions',
+    'holding_times',
+    'costs',
+    'direction',
+    'charts',
+    'equity',
+)
+
+# Dashboard sections rendered after the pass table (loaded from data/section_<name>)
+SECTION_SHARD_KEYS = ('stress_scenarios', 'forward_windows', 'multi_pair_runs')
+
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+def _write_shard(output_dir: Path, name: str, payload: Any) -> str:
+    """
+    Write one shard as <name>.json (fetch) and <name>.js (file:// script fallback).
+
+    Returns:
+        Shard name relative to the dashboard (without extension)
+    """
+    body = _compact_json(payload)
+    json_path = output_dir / f'{name}.json'
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    json_path.write_text(body, encoding='utf-8')
+    (output_dir / f'{name}.js').write_text(
+        'window.__DASHBOARD_SHARDS = window.__DASHBOARD_SHARDS || {};\n'
+        f'window.__DASHBOARD_SHARDS[{json.dumps(name)}] = {body};\n',
+        encoding='utf-8',
+    )
+    return name
+
+
+def _split_shards(data: dict, output_dir: Path) -> None:
+    """
+    Move per-pass detail and late sections out of the embedded document.
+
+    The summary keeps everything the header, pass table and KPIs need and
+    lists the shards under data['shards'].
+    """
+    shard_dir = output_dir / 'data'
+    shutil.rmtree(shard_dir, ignore_errors=True)
+
+    shards = {'passes': {}, 'sections': {}}
+    for pass_key, p in (data.get('passes') or {}).items():
+        if not isinstance(p, dict):
+            continue
+        detail = {k: p.pop(k) for k in PASS_SHARD_KEYS if k in p}
+        if detail:
+            shards['passes'][str(pass_key)] = _write_shard(output_dir, f'data/pass_{pass_key}', detail)
+
+    for key in SECTION_SHARD_KEYS:
+        if key in data:
+            shards['sections'][key] = _write_shard(output_dir, f'data/section_{key}', data.pop(key))
+
+    data['shards'] = shards
+
+
+def _downsample_equity(data: dict, output_dir: Path) -> None:
+    """
+    Downsample per-pass equity curves to DASHBOARD_CHART_POINTS (LTTB).
+
+    Reduced curves keep their original trade indices (in_sample_x / forward_x)
+    and point counts; the full-resolution series is written as the shard
+    equity/<pass> and referenced as equity.full.
+    """
+    from modules.downsample import lttb
+
+    budgets = getattr(settings, 'DASHBOARD_CHART_POINTS', {}) or {}
+    in_budget = int(budgets.get('equity_in_sample', 0) or 0)
+    fwd_budget = int(budgets.get('equity_forward', 0) or 0)
+
+    equity_dir = output_dir / 'equity'
+    shutil.rmtree(equity_dir, ignore_errors=True)
+
+    for pass_key, p in (data.get('passes') or {}).items():
+        eq = p.get('equity') if isinstance(p, dict) else None
+        if not isinstance(eq, dict):
+            continue
+        in_sample = eq.get('in_sample') if isinstance(eq.get('in_sample'), list) else []
+        forward = eq.get('forward') if isinstance(eq.get('forward'), list) else []
+
+        reduced = {'in_sample_points': len(in_sample), 'forward_points': len(forward)}
+        for key, series, budget in (('in_sample', in_sample, in_budget), ('forward', forward, fwd_budget)):
+            if budget and len(series) > budget:
+                reduced[f'{key}_x'], reduced[key] = lttb(series, budget)
+            else:
+                reduced[key] = series
+
+        if 'in_sample_x' in reduced or 'forward_x' in reduced:
+            reduced['full'] = _write_shard(
+                output_dir, f'equity/{pass_key}', {'in_sample': in_sample, 'forward': forward}
+            )
+
+        p['equity'] = reduced
+
+
 def prepare_data_from_optimization(state: dict, state_file: Path = None) -> dict:
     """
     Prepare dashboard data from workflow state.
@@ -439,6 +557,18 @@ def _prepare_data_from_backtests(state: dict, backtest_results: list) -> dict:
             'best_95pct': mc_result.get('best_case', 0),
         }
 
+    # Rolling-window worst-case stats per pass (Step 13 rolling surfaces index)
+    rolling_by_pass = {}
+    fw_rolling = (state.get('forward_windows') or {}).get('rolling') if isinstance(state.get('forward_windows'), dict) else None
+    if isinstance(fw_rolling, dict) and fw_rolling.get('index_file'):
+        try:
+            from modules.rolling_surface import load_rolling_index
+            rolling_index = load_rolling_index(fw_rolling['index_file'])
+            for key, entry in (rolling_index.get('passes') or {}).items():
+                rolling_by_pass[key] = (entry or {}).get('worst', {})
+        except Exception:
+            rolling_by_pass = {}
+
     # Build scatter data
     scatter_data = []
     for p in sorted_results:
@@ -566,6 +696,7 @@ def _prepare_data_from_backtests(state: dict, backtest_results: list) -> dict:
                 'in_sample': in_sample_equity,
                 'forward': forward_equity,
             },
+            'rolling': rolling_by_pass.get(str(pass_num), {}),
             'monte_carlo': {
                 **(best_monte_carlo if pass_num == best_pass_num else {}),
             }
@@ -635,26 +766,188 @@ def _prepare_data_from_backtests(state: dict, backtest_results: list) -> dict:
 # _get_optimization_analysis) were REMOVED - SPA-only approach now.
 
 
+RENDER_RECORD = 'render.json'
+
+# Code the rendered output depends on (relative to the repo root); editing any
+# of these invalidates existing render records
+RENDER_SOURCES = (
+    'reports/workflow_dashboard.py',
+    'reports/templates/dashboard_spa.html',
+    'reports/pass_backtest.py',
+    'reports/sparklines.py',
+    'modules/downsample.py',
+    'modules/pass_analyzer.py',
+    'modules/trade_extractor.py',
+    'modules/rolling_surface.py',
+    'modules/blob_store.py',
+    'engine/gates.py',
+    'engine/state.py',
+)
+
+
+def dashboard_input_hash(inputs: dict, run_backtests: bool = False) -> str:
+    """
+    Hash of everything a dashboard render depends on.
+
+    Args:
+        inputs: Stat signatures of the workflow's state / results files
+            (reports.summary.input_signatures)
+        run_backtests: Whether the render re-runs backtests
+
+    Returns:
+        Hex digest
+    """
+    import hashlib
+    from reports.summary import stat_signature
+
+    root = Path(__file__).parent.parent
+    payload = {
+        'inputs': inputs,
+        'sources': {name: stat_signature(root / name) for name in RENDER_SOURCES},
+        'settings': {
+            'chart_points': getattr(settings, 'DASHBOARD_CHART_POINTS', {}),
+            'shards': getattr(settings, 'DASHBOARD_SHARDS', True),
+            'best_pass_selection': getattr(settings, 'BEST_PASS_SELECTION', 'score'),
+        },
+        'run_backtests': bool(run_backtests),
+    }
+    data = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _write_render_record(output_dir: Path, input_hash: str) -> None:
+    (output_dir / RENDER_RECORD).write_text(
+        json.dumps({'input_hash': input_hash, 'rendered_at': datetime.now().isoformat()}, indent=2),
+        encoding='utf-8',
+    )
+
+
+def _rendered_hash(output_dir: Path) -> Optional[str]:
+    if not (output_dir / 'index.html').exists():
+        return None
+    try:
+        return json.loads((output_dir / RENDER_RECORD).read_text(encoding='utf-8')).get('input_hash')
+    except Exception:
+        return None
+
+
+def _render_worker(state_file: str, output_dir: str, run_backtests: bool) -> dict:
+    """Render one dashboard (process-pool entry point); errors are returned, not raised."""
+    import time
+
+    start = time.perf_counter()
+    try:
+        path = generate_dashboard_from_workflow(state_file, output_dir=output_dir, run_backtests=run_backtests)
+        return {'state_file': state_file, 'path': path, 'error': None, 'seconds': time.perf_counter() - start}
+    except Exception as e:
+        return {'state_file': state_file, 'path': None, 'error': str(e), 'seconds': time.perf_counter() - start}
+
+
 def generate_all_dashboards(
     runs_dir: str = 'runs',
     open_browser: bool = False,
     run_backtests: bool = False,
+    workers: Optional[int] = None,
+    force: bool = False,
+    dashboards_dir: Optional[str] = None,
 ) -> list[str]:
-    """Generate dashboards for all workflow runs."""
+    """
+    Generate dashboards for all workflow runs.
+
+    Workflows whose inputs are unchanged since their last render are skipped;
+    the rest are rendered in a process pool (sequentially when backtests are
+    re-run, since those drive the terminal).
+
+    Args:
+        runs_dir: Directory with workflow_*.json files
+        open_browser: Open the first dashboard after generation
+        run_backtests: Re-run backtests for top passes (slow)
+        workers: Process count (default: settings.DASHBOARD_WORKERS; <= 1 = sequential)
+        force: Re-render even if inputs are unchanged
+        dashboards_dir: Output root (default: runs/dashboards)
+
+    Returns:
+        Paths of all up-to-date dashboards (rebuilt and skipped)
+    """
+    import time
+    from reports.summary import ensure_summary
+
+    start = time.perf_counter()
     runs_path = Path(runs_dir)
+    dashboards_root = Path(dashboards_dir) if dashboards_dir else Path('runs/dashboards')
     generated = []
 
-    for state_file in runs_path.glob('workflow_*.json'):
+    state_files = None
+    if getattr(settings, 'WORKFLOW_CATALOG', True):
         try:
-            path = generate_dashboard_from_workflow(
-                str(state_file),
-                open_browser=False,
-                run_backtests=run_backtests,
-            )
-            generated.append(path)
-            print(f"Generated: {path}")
+            from reports.catalog import open_catalog
+            catalog = open_catalog(runs_path)
+            try:
+                catalog.sync()
+                state_files = [Path(f) for f in catalog.state_files(exclude_statuses={'corrupted'})]
+            finally:
+                catalog.close()
         except Exception as e:
+            print(f"Warning: workflow catalog unavailable, scanning JSON files: {e}")
+    if state_files is None:
+        state_files = list(runs_path.glob('workflow_*.json'))
+
+    # Decide what needs rendering (input hash vs last render)
+    todo = []
+    skipped = 0
+    failed = 0
+    for state_file in state_files:
+        try:
+            summary = ensure_summary(str(state_file))
+        except Exception as e:
+            failed += 1
             print(f"Error generating dashboard for {state_file.name}: {e}")
+            continue
+        output_dir = dashboards_root / summary['workflow']['workflow_id']
+        input_hash = dashboard_input_hash(summary['inputs'], run_backtests)
+        if not force and _rendered_hash(output_dir) == input_hash:
+            skipped += 1
+            generated.append(str(output_dir / 'index.html'))
+            continue
+        todo.append((str(state_file), str(output_dir)))
+
+    if workers is None:
+        workers = int(getattr(settings, 'DASHBOARD_WORKERS', 4) or 1)
+    workers = max(1, min(workers, os.cpu_count() or 1, len(todo) or 1))
+    if run_backtests:
+        workers = 1
+
+    results = []
+    pending = list(todo)
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_render_worker, sf, od, run_backtests): (sf, od) for sf, od in todo}
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    pending.remove(futures[future])
+        except Exception as e:
+            # Pool unavailable or a worker died: finish the remainder in-process
+            print(f"Warning: dashboard process pool failed ({e}); rendering {len(pending)} sequentially")
+    if workers <= 1 or pending:
+        for sf, od in list(pending):
+            results.append(_render_worker(sf, od, run_backtests))
+
+    rebuilt = 0
+    for r in results:
+        if r['error']:
+            failed += 1
+            print(f"Error generating dashboard for {Path(r['state_file']).name}: {r['error']}")
+            continue
+        rebuilt += 1
+        generated.append(r['path'])
+        print(f"Generated: {r['path']} ({r['seconds']:.1f}s)")
+
+    print(
+        f"Dashboards: {rebuilt} rebuilt, {skipped} skipped (unchanged), {failed} failed "
+        f"in {time.perf_counter() - start:.1f}s ({workers} worker{'s' if workers != 1 else ''})"
+    )
 
     if open_browser and generated:
         import webbrowser
@@ -664,8 +957,9 @@ def generate_all_dashboards(
 
 
 if __name__ == '__main__':
-    if len(sys.argv) > 1:
-        workflow_path = sys.argv[1]
+    positional = [a for a in sys.argv[1:] if not a.startswith('-')]
+    if positional:
+        workflow_path = positional[0]
         run_bt = '--backtest' in sys.argv or '-b' in sys.argv
         path = generate_dashboard_from_workflow(
             workflow_path,
@@ -674,5 +968,5 @@ if __name__ == '__main__':
         )
         print(f"Generated: {path}")
     else:
-        paths = generate_all_dashboards(open_browser=True)
+        paths = generate_all_dashboards(open_browser=True, force='--force' in sys.argv)
         print(f"Generated {len(paths)} dashboards")
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import argparse
+import json
+import signal
+from datetime import datetime
+from pathlib import Path
+
+import sys
+
+# Allow running as `python scripts/batch_run.py` without installing the repo as a package.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from engine.batch import BatchRunner, batch_report, default_queue_path, enqueue_profile, load_profile, new_batch_id
+from engine.job_queue import JobQueue
+
+
+def _parse_csv_list(value: str | None) -> list[str]:
+    parts = [p.strip() for p in (value or "").split(",")]
+    return [p for p in parts if p]
+
+
+def _progress(message: str) -> None:
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{ts}] {message}", flush=True)
+
+
+def run_queue(queue: JobQueue, args: argparse.Namespace, batch_id: str | None) -> dict:
+    """Drain the queue (Ctrl+C finishes running jobs, then stops)."""
+    if getattr(args, "reclaim", False):
+        released = queue.requeue_running(batch_id)
+        if released:
+            _progress(f"Released {released} job(s) left running by a previous run")
+
+    terminals = _parse_csv_list(args.terminals) or [None]
+    runner = BatchRunner(
+        queue,
+        terminals=terminals,
+        workers=args.workers if args.workers else len(terminals),
+        lease_seconds=args.lease_seconds,
+        batch_id=batch_id,
+        on_progress=_progress,
+    )
+
+    def _stop(signum, frame):  # noqa: ARG001
+        _progress("Stop requested: finishing running jobs, no new jobs will start")
+        runner.stop()
+
+    try:
+        signal.signal(signal.SIGINT, _stop)
+    except ValueError:
+        pass
+
+    _progress(f"Running batch {batch_id or '(all)'} with {len(runner.terminals)} worker(s)")
+    counts = runner.run()
+    _progress(f"Batch finished: {json.dumps(counts)}")
+    return counts
+
+
+def _add_run_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--terminals", default=None, help="Comma-separated terminal names, one worker each (default: active)")
+    ap.add_argument("--workers", type=int, default=None, help="Workers (default: one per terminal)")
+    ap.add_argument("--lease-seconds", type=float, default=None, help="Job lease (default: BATCH_LEASE_SECONDS)")
+    ap.add_argument("--reclaim", action="store_true", help="Requeue jobs left running by a crashed run now")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Queue and run unattended workflow batches.")
+    ap.add_argument("--queue", default=None, help="Queue database (default: BATCH_QUEUE_PATH)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    enq = sub.add_parser("enqueue", help="Queue jobs for an EA profile")
+    enq.add_argument("--profile", required=True)
+    enq.add_argument("--symbols", default=None, help="Comma-separated symbols (default: profile symbol_default)")
+    enq.add_argument("--timeframe", default=None, help="Timeframe (default: profile timeframe_default)")
+    enq.add_argument("--iterations", type=int, default=1)
+    enq.add_argument("--stress", action="store_true", help="Run Step 12 stress scenarios")
+    enq.add_argument("--forward", action="store_true", help="Run Step 13 forward windows")
+    enq.add_argument("--multi-pair", default=None, help="Comma-separated Step 14 symbols per job")
+    enq.add_argument("--max-attempts", type=int, default=None)
+    enq.add_argument("--batch-id", default=None)
+    enq.add_argument("--run", action="store_true", help="Run the batch right away")
+    _add_run_args(enq)
+
+    run = sub.add_parser("run", help="Run queued jobs (resumes an interrupted batch)")
+    run.add_argument("--batch-id", default=None, help="Only this batch (default: all queued jobs)")
+    _add_run_args(run)
+
+    st = sub.add_parser("status", help="Show queue state")
+    st.add_argument("--batch-id", default=None, help="Batch (default: most recent)")
+    st.add_argument("--json", action="store_true")
+
+    args = ap.parse_args()
+    queue = JobQueue(Path(args.queue) if args.queue else default_queue_path())
+
+    try:
+        if args.command == "enqueue":
+            profile = load_profile(args.profile)
+            symbols = [s.upper() for s in _parse_csv_list(args.symbols)] or [
+                str(profile.get("symbol_default") or "EURUSD").upper()
+            ]
+            tf = args.timeframe or profile.get("timeframe_default") or "H1"
+            options = {"stress": bool(args.stress), "forward": bool(args.forward)}
+            multi = [s.upper() for s in _parse_csv_list(args.multi_pair)]
+            if multi:
+                options["multi_pair"] = multi
+            batch_id = args.batch_id or new_batch_id(Path(args.profile).stem)
+            ids = enqueue_profile(queue, batch_id, args.profile, symbols, tf, args.iterations, options, args.max_attempts)
+            print(json.dumps({"batch_id": batch_id, "jobs": ids, "queue": str(queue.db_path)}, indent=2), flush=True)
+            if args.run:
+                run_queue(queue, args, batch_id)
+
+        elif args.command == "run":
+            run_queue(queue, args, args.batch_id)
+
+        else:
+            report = batch_report(queue, args.batch_id)
+            if args.json:
+                print(json.dumps(report, indent=2))
+            else:
+                print(f"Batch {report['batch_id'] or '-'}: " + " ".join(f"{k}={v}" for k, v in report["counts"].items()))
+                for job in report["jobs"]:
+                    line = (
+                        f"  #{job['id']:<4} {job['symbol']:<8} {job['timeframe']:<4} {job['status']:<8} "
+                        f"attempt {job['attempts']}/{job['max_attempts']}"
+                    )
+                    if job["workflow_id"]:
+                        line += f"  {job['workflow_id']}"
+                    if job["lease_remaining_s"] is not None:
+                        line += f"  lease {job['lease_remaining_s']}s"
+                    if job["error"]:
+                        line += f"  error: {job['error']}"
+                    print(line)
+    finally:
+        queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
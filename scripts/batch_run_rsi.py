@@ -12,7 +12,8 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from engine.runner import WorkflowRunner
+from engine.batch import BatchRunner, default_queue_path, enqueue_profile
+from engine.job_queue import JobQueue
 
 
 def _parse_csv_list(value: str) -> list[str]:
@@ -24,6 +25,7 @@ def main() -> int:
     ap = argparse.ArgumentParser(description="Run unattended RSI Divergence Pro batch workflows.")
     ap.add_argument("--profile", default="reference/rsi_divergence_pro_profile.json")
     ap.add_argument("--terminal", default=None, help="Terminal name from terminals.json (default: active)")
+    ap.add_argument("--terminals", default=None, help="Comma-separated terminals, one concurrent worker each")
     ap.add_argument("--timeframe", default=None, help="Override timeframe (default from profile)")
     ap.add_argument("--base-symbol", default=None, help="Base symbol (default from profile)")
     ap.add_argument("--symbols", default=None, help="Comma-separated list of total symbols to run (includes base)")
@@ -31,14 +33,14 @@ def main() -> int:
     ap.add_argument("--stress", action="store_true", help="Run Step 12 stress scenarios")
     ap.add_argument("--forward", action="store_true", help="Run Step 13 forward windows")
     ap.add_argument("--no-multi", action="store_true", help="Disable multi-pair (only base symbol)")
+    ap.add_argument("--queue", default=None, help="Queue database (default: BATCH_QUEUE_PATH)")
+    ap.add_argument("--resume", default=None, metavar="BATCH_ID", help="Resume an interrupted batch instead of queueing a new one")
     args = ap.parse_args()
 
     profile_path = Path(args.profile)
     profile = json.loads(profile_path.read_text(encoding="utf-8"))
 
     ea_path = profile["ea_path"]
-    wide = profile["wide_validation_params"]
-    ranges = profile["optimization_ranges"]
 
     tf = args.timeframe or profile.get("timeframe_default") or "H4"
     base_symbol = (args.base_symbol or profile.get("symbol_default") or "GBPUSD").upper()
@@ -52,62 +54,80 @@ def main() -> int:
     else:
         symbols = [base_symbol]
 
+    if args.no_multi:
+        symbols = [base_symbol]
     other_symbols = [s for s in symbols if s != base_symbol]
 
     out_dir = Path("runs") / "batch"
     out_dir.mkdir(parents=True, exist_ok=True)
-    batch_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-    summary_path = out_dir / f"rsi_batch_{batch_id}.json"
-
-    summaries = []
+    queue = JobQueue(Path(args.queue) if args.queue else default_queue_path())
 
     def _progress(message: str) -> None:
         ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{ts}] {message}", flush=True)
 
-    print(
-        json.dumps(
-            {
-                "batch_id": batch_id,
-                "ea_path": ea_path,
-                "timeframe": tf,
-                "base_symbol": base_symbol,
-                "other_symbols": other_symbols,
-                "iterations": int(args.iterations),
-                "stress": bool(args.stress),
-                "forward": bool(args.forward),
-                "multi_pair": (not args.no_multi and bool(other_symbols)),
-                "profile": str(profile_path),
-            },
-            indent=2,
-        ),
-        flush=True,
-    )
-
-    for i in range(max(1, int(args.iterations))):
-        _progress(f"Batch iteration {i + 1}/{max(1, int(args.iterations))}: starting base workflow")
-        runner = WorkflowRunner(
-            ea_path=ea_path,
-            terminal_name=args.terminal,
-            symbol=base_symbol,
-            timeframe=tf,
-            auto_stats_analysis=True,
-            auto_run_stress_scenarios=bool(args.stress),
-            auto_run_forward_windows=bool(args.forward),
-            auto_run_multi_pair=(not args.no_multi and bool(other_symbols)),
-            multi_pair_symbols=other_symbols,
-            on_progress=_progress,
+    if args.resume:
+        batch_id = args.resume
+        released = queue.requeue_running(batch_id)
+        _progress(f"Resuming batch {batch_id} ({released} interrupted job(s) requeued)")
+    else:
+        batch_id = f"rsi_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # One queued base-symbol job per iteration; the other symbols run as its
+        # Step 14 multi-pair children (iterations run concurrently with --terminals)
+        options: dict = {"stress": bool(args.stress), "forward": bool(args.forward)}
+        if other_symbols:
+            options["multi_pair"] = other_symbols
+        job_ids = enqueue_profile(
+            queue,
+            batch_id,
+            str(profile_path),
+            [base_symbol],
+            tf,
+            iterations=max(1, int(args.iterations)),
+            options=options,
+        )
+        print(
+            json.dumps(
+                {
+                    "batch_id": batch_id,
+                    "queue": str(queue.db_path),
+                    "jobs": job_ids,
+                    "ea_path": ea_path,
+                    "timeframe": tf,
+                    "base_symbol": base_symbol,
+                    "other_symbols": other_symbols,
+                    "iterations": int(args.iterations),
+                    "stress": bool(args.stress),
+                    "forward": bool(args.forward),
+                    "multi_pair": bool(other_symbols),
+                    "profile": str(profile_path),
+                },
+                indent=2,
+            ),
+            flush=True,
         )
 
-        phase1 = runner.run(stop_on_failure=False, pause_for_analysis=True)
-        _progress(f"Phase 1 complete: status={phase1.get('status')} workflow_id={phase1.get('workflow_id')}")
-        summary = runner.continue_with_params(wide_validation_params=wide, optimization_ranges=ranges, stop_on_failure=False)
-        summaries.append(summary)
-        _progress(f"Workflow complete: status={summary.get('status')} workflow_id={summary.get('workflow_id')}")
-
-        # If multi-pair is enabled, the child workflows are created by Step 14 and will show in Boards/Leaderboard.
-
-    summary_path.write_text(json.dumps({"batch_id": batch_id, "summaries": summaries}, indent=2), encoding="utf-8")
+    # Terminal names are case-sensitive keys of terminals.json, so only symbols are upper-cased
+    terminals = [t.strip() for t in (args.terminals or "").split(",") if t.strip()] or [args.terminal]
+    runner = BatchRunner(
+        queue,
+        terminals=terminals,
+        workers=len(terminals),
+        batch_id=batch_id,
+        summaries_dir=out_dir,
+        on_progress=_progress,
+    )
+    counts = runner.run()
+
+    # Per-job summaries are written as each job finishes (runs/batch/<batch_id>/);
+    # this file collects them for the whole batch.
+    summary_path = out_dir / f"rsi_batch_{batch_id.removeprefix('rsi_')}.json"
+    summaries = [job["summary"] for job in queue.jobs(batch_id) if job.get("summary")]
+    summary_path.write_text(
+        json.dumps({"batch_id": batch_id, "counts": counts, "summaries": summaries}, indent=2),
+        encoding="utf-8",
+    )
+    queue.close()
     print(f"Wrote: {summary_path}")
     return 0
 
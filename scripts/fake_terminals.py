@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import sys
+
+# Allow running as `python scripts/fake_terminals.py` without installing the repo as a package.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.fake_terminal import DEFAULT_OPTIONS, install_fake_terminal
+from engine.terminals import TERMINALS_ENV
+
+
+def _parse_csv_list(value: str | None) -> list[str]:
+    parts = [p.strip() for p in (value or "").split(",")]
+    return [p for p in parts if p]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Install fake terminal64.exe stand-ins and write a terminals.json for end-to-end load tests."
+    )
+    ap.add_argument("--root", required=True, help="Directory for the fake terminal installs")
+    ap.add_argument("--count", type=int, default=4, help="Number of terminals")
+    ap.add_argument("--prefix", default="Fake", help="Terminal name prefix (names are <prefix>_<n>)")
+    ap.add_argument(
+        "--out",
+        default=None,
+        help="terminals.json to write (default: <root>/terminals.json); point EA_STRESS_TERMINALS at it",
+    )
+    ap.add_argument("--backtest-s", type=float, default=DEFAULT_OPTIONS["backtest_s"])
+    ap.add_argument("--optimization-s", type=float, default=DEFAULT_OPTIONS["optimization_s"])
+    ap.add_argument("--trades", type=int, default=DEFAULT_OPTIONS["trades"], help="Positions per backtest")
+    ap.add_argument("--passes", type=int, default=DEFAULT_OPTIONS["passes"], help="Passes per optimization")
+    ap.add_argument("--ea", default=None, help="Comma-separated EA names to place as .ex5 in every terminal")
+    args = ap.parse_args()
+
+    if args.count < 1:
+        print("--count must be at least 1")
+        return 2
+
+    root = Path(args.root)
+    registry: dict = {"_comment": "Fake MT5 terminals (benchmarks/fake_terminal.py)"}
+    for n in range(1, args.count + 1):
+        name = f"{args.prefix}_{n}"
+        terminal = install_fake_terminal(
+            root / name,
+            backtest_s=args.backtest_s,
+            optimization_s=args.optimization_s,
+            trades=args.trades,
+            passes=args.passes,
+        )
+        for ea in _parse_csv_list(args.ea):
+            (Path(terminal["data_path"]) / "MQL5" / "Experts" / f"{Path(ea).stem}.ex5").write_bytes(b"EX5")
+        registry[name] = {**terminal, "default": n == 1}
+
+    out = Path(args.out) if args.out else root / "terminals.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(registry, indent=2), encoding="utf-8")
+    print(f"Installed {args.count} fake terminal(s) under {root}")
+    print(f"Wrote {out}")
+    # TerminalRegistry() reads terminals.json from the working directory unless told otherwise
+    print(f"Use it with: export {TERMINALS_ENV}={out.resolve()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import sys
+
+# Allow running as `python scripts/run_benchmarks.py` without installing the repo as a package.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.harness import (
+    compare,
+    format_comparison,
+    latest_run,
+    load_results,
+    results_dir,
+    run_benchmarks,
+    save_results,
+)
+from benchmarks.suite import BENCHMARKS, SCALES
+
+
+def _parse_csv_list(value: str | None) -> list[str]:
+    parts = [p.strip() for p in (value or "").split(",")]
+    return [p for p in parts if p]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Run the Python-side benchmarks and compare with a previous run.")
+    ap.add_argument("--bench", default=None, help="Comma-separated benchmarks (default: all)")
+    ap.add_argument("--scale", default=None, help=f"Comma-separated scales: {', '.join(SCALES)} (default: all)")
+    ap.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (best is kept)")
+    ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument("--workdir", default=None, help="Keep generated inputs here (default: temp dir)")
+    ap.add_argument("--out-dir", default=None, help="Stored runs (default: BENCHMARK_DIR)")
+    ap.add_argument("--baseline", default=None, help="Run JSON to compare with (default: previous stored run)")
+    ap.add_argument("--threshold", type=float, default=None, help="Allowed slowdown, e.g. 0.25 = 25%%")
+    ap.add_argument("--no-save", action="store_true", help="Do not store this run")
+    ap.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when anything regressed")
+    ap.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+    ap.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = ap.parse_args()
+
+    if args.list:
+        for bench in BENCHMARKS:
+            sizes = ", ".join(f"{s}={bench.sizes[s]}" for s in SCALES)
+            print(f"{bench.name:<28} {bench.unit:<9} {sizes}  {bench.description}")
+        return 0
+
+    out_dir = Path(args.out_dir) if args.out_dir else results_dir()
+    baseline_path = Path(args.baseline) if args.baseline else latest_run(out_dir)
+
+    doc = run_benchmarks(
+        names=_parse_csv_list(args.bench),
+        scales=_parse_csv_list(args.scale),
+        repeat=args.repeat,
+        warmup=args.warmup,
+        workdir=Path(args.workdir) if args.workdir else None,
+        on_progress=lambda m: print(m, flush=True),
+    )
+    if not args.no_save:
+        print(f"Saved {save_results(doc, out_dir)}")
+
+    if baseline_path is None:
+        print("No previous run to compare with")
+        return 0
+
+    report = compare(doc, load_results(baseline_path), threshold=args.threshold)
+    report["baseline"]["path"] = str(baseline_path)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_comparison(report))
+    return 1 if args.fail_on_regression and report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
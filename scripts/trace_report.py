@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import sys
+
+# Allow running as `python scripts/trace_report.py` without installing the repo as a package.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import settings
+from engine.tracing import TRACE_FILE, load_traces, summarize, to_chrome_trace
+
+
+def _batch_workflows(queue_path: Path, batch_id: str | None) -> tuple[str | None, list[str]]:
+    """Workflow ids of a queued batch (default: the most recent one)."""
+    from engine.job_queue import JobQueue
+
+    if not queue_path.exists():
+        raise SystemExit(f"No batch queue at {queue_path}")
+    queue = JobQueue(queue_path)
+    try:
+        batch_id = batch_id or queue.latest_batch()
+        ids = []
+        for job in queue.jobs(batch_id):
+            workflow_id = job["workflow_id"] or (job.get("summary") or {}).get("workflow_id")
+            if workflow_id:
+                ids.append(workflow_id)
+        return batch_id, ids
+    finally:
+        queue.close()
+
+
+def _select(args: argparse.Namespace) -> tuple[str, dict[str, list[dict]]]:
+    runs_dir = Path(args.runs_dir or settings.RUNS_DIR)
+    if args.batch is not None:
+        from engine.batch import default_queue_path
+
+        queue_path = Path(args.queue) if args.queue else default_queue_path()
+        batch_id, ids = _batch_workflows(queue_path, args.batch or None)
+        label = f"batch {batch_id or '-'}"
+    elif args.workflows:
+        ids = list(args.workflows)
+        label = ", ".join(ids)
+    else:
+        ids = sorted(p.parent.name for p in runs_dir.glob(f"*/{TRACE_FILE}"))
+        label = f"all traces in {runs_dir}"
+    return label, load_traces(dict.fromkeys(ids), str(runs_dir))
+
+
+def _fmt_s(seconds: float) -> str:
+    if seconds >= 3600:
+        return f"{seconds / 3600:.2f}h"
+    if seconds >= 60:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds:.2f}s"
+
+
+def print_summary(label: str, report: dict) -> None:
+    print(f"Trace summary: {label}")
+    print(f"  {report['traces']} workflow(s), {report['span_count']} span(s), {_fmt_s(report['wall_s'])} traced")
+    if not report["rows"]:
+        return
+    total_self = sum(r["self_s"] for r in report["rows"]) or 1.0
+    print(f"  {'span':<40} {'count':>6} {'self':>9} {'self%':>6} {'total':>9} {'cpu':>9} {'max':>9} {'mem KB':>9}")
+    for row in report["rows"]:
+        mem = f"{row['mem_peak_kb']:.0f}" if row["mem_peak_kb"] is not None else "-"
+        print(
+            f"  {row['name'][:40]:<40} {row['count']:>6} {_fmt_s(row['self_s']):>9} "
+            f"{100 * row['self_s'] / total_self:>5.1f}% {_fmt_s(row['total_s']):>9} "
+            f"{_fmt_s(row['cpu_s']):>9} {_fmt_s(row['max_s']):>9} {mem:>9}"
+            + (f"  ({row['errors']} failed)" if row["errors"] else "")
+        )
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Summarize or export workflow traces (runs/<workflow_id>/trace.jsonl).")
+    ap.add_argument("--runs-dir", default=None, help="Runs directory (default: RUNS_DIR)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    def _add_selectors(p: argparse.ArgumentParser) -> None:
+        p.add_argument("workflows", nargs="*", help="Workflow ids (default: every traced workflow)")
+        p.add_argument("--batch", nargs="?", const="", default=None,
+                       help="Workflows of a queued batch (default: the most recent batch)")
+        p.add_argument("--queue", default=None, help="Batch queue database (default: BATCH_QUEUE_PATH)")
+
+    summary = sub.add_parser("summary", help="Top time consumers by span name")
+    _add_selectors(summary)
+    summary.add_argument("--top", type=int, default=20, help="Rows to show (0: all)")
+    summary.add_argument("--json", action="store_true")
+
+    export = sub.add_parser("export", help="Write Chrome/Perfetto trace JSON")
+    _add_selectors(export)
+    export.add_argument("--out", required=True, help="Output .json (open in ui.perfetto.dev or chrome://tracing)")
+
+    args = ap.parse_args()
+    label, traces = _select(args)
+
+    if args.command == "summary":
+        report = summarize(traces, top=args.top)
+        if args.json:
+            print(json.dumps({"selection": label, **report}, indent=2))
+        else:
+            print_summary(label, report)
+    else:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(to_chrome_trace(traces)), encoding="utf-8")
+        print(f"Wrote {sum(len(s) for s in traces.values())} span(s) from {len(traces)} workflow(s) to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,6 +5,13 @@ import json
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import sys
+
+# Allow running as `python scripts/watch_batch.py` without installing the repo as a package.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
 
 def _now() -> datetime:
     return datetime.now()
@@ -63,6 +70,25 @@ def _latest_file(dir_path: Path, pattern: str) -> Path | None:
     return files[0]
 
 
+def _queue_status(queue_path: Path, batch_id: str | None) -> dict | None:
+    """Live job queue state (see engine/job_queue.py), or None if there is no queue."""
+    if not queue_path.exists():
+        return None
+    from engine.batch import batch_report
+    from engine.job_queue import JobQueue
+
+    queue = JobQueue(queue_path)
+    try:
+        report = batch_report(queue, batch_id)
+    finally:
+        queue.close()
+    report["queue"] = str(queue_path)
+    report["running"] = [j for j in report["jobs"] if j["status"] == "running"]
+    report["expired_leases"] = [j["id"] for j in report["running"] if (j["lease_remaining_s"] or 0) < 0]
+    report["failed"] = [j["id"] for j in report["jobs"] if j["status"] == "failed"]
+    return report
+
+
 def _desktop_path() -> Path:
     # Avoid extra deps; Windows-only repo anyway.
     return Path.home() / "Desktop"
@@ -74,6 +100,8 @@ def main() -> int:
     ap.add_argument("--stale-minutes", type=int, default=20, help="Warn if no log updates for this long")
     ap.add_argument("--desktop-alert", action="store_true", help="Write a Desktop alert file if attention needed")
     ap.add_argument("--task-name", default=None, help="Optional name to include in alert/status")
+    ap.add_argument("--queue", default=None, help="Batch job queue (default: BATCH_QUEUE_PATH)")
+    ap.add_argument("--batch-id", default=None, help="Batch to watch (default: most recent in the queue)")
     args = ap.parse_args()
 
     runs_dir = Path(args.runs_dir)
@@ -93,10 +121,17 @@ def main() -> int:
     workflow = {}
     try:
         wf_root = runs_dir.parent if runs_dir.name.lower() == "batch" else Path("runs")
+        from engine.state import journal_path_for, load_state_file
+
+        def _touched(path: Path) -> float:
+            # Updates land in the journal; the snapshot only changes on compaction
+            journal = journal_path_for(path)
+            return max(path.stat().st_mtime, journal.stat().st_mtime if journal.exists() else 0.0)
+
         wf_files = list(Path(wf_root).glob("workflow_*.json"))
-        wf_files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        wf_files.sort(key=_touched, reverse=True)
         if wf_files:
-            workflow = json.loads(wf_files[0].read_text(encoding="utf-8"))
+            workflow = load_state_file(str(wf_files[0]))
             workflow = {
                 "workflow_id": workflow.get("workflow_id"),
                 "symbol": workflow.get("symbol"),
@@ -108,6 +143,21 @@ def main() -> int:
     except Exception:
         workflow = {}
 
+    queue = None
+    try:
+        from engine.batch import default_queue_path
+
+        queue = _queue_status(Path(args.queue) if args.queue else default_queue_path(), args.batch_id)
+    except Exception as e:
+        queue = {"error": str(e)}
+
+    # Jobs being run are known exactly from the queue
+    if queue and queue.get("running"):
+        workflow = {
+            "workflow_ids": [j["workflow_id"] for j in queue["running"] if j["workflow_id"]],
+            "symbols": [j["symbol"] for j in queue["running"]],
+        }
+
     stale = False
     stale_for_minutes = None
     if out_mtime:
@@ -129,6 +179,17 @@ def main() -> int:
             needs_attention = True
             reasons.append("stderr has content")
 
+    if queue and queue.get("error"):
+        needs_attention = True
+        reasons.append(f"queue unreadable: {queue['error']}")
+    elif queue:
+        if queue["expired_leases"]:
+            needs_attention = True
+            reasons.append(f"lease expired for job(s) {queue['expired_leases']} (worker died?)")
+        if queue["failed"]:
+            needs_attention = True
+            reasons.append(f"{len(queue['failed'])} job(s) failed after all attempts")
+
     status = {
         "ts": _now().isoformat(timespec="seconds"),
         "task": args.task_name,
@@ -141,6 +202,7 @@ def main() -> int:
         "err_log": str(err_log) if err_log else None,
         "err_log_size": err_size,
         "workflow": workflow,
+        "queue": {k: v for k, v in queue.items() if k != "running"} if queue else None,
         "needs_attention": needs_attention,
         "reasons": reasons,
     }
@@ -148,6 +210,8 @@ def main() -> int:
     (runs_dir / "watchdog_status.json").write_text(json.dumps(status, indent=2), encoding="utf-8")
 
     line = f"[{status['ts']}] ok pid={pid} running={running} stale_min={stale_for_minutes} err={err_size}"
+    if queue and queue.get("counts"):
+        line += " jobs " + " ".join(f"{k}={v}" for k, v in queue["counts"].items())
     if needs_attention:
         line += " ATTENTION: " + "; ".join(reasons)
     (runs_dir / "watchdog.log").open("a", encoding="utf-8").write(line + "\n")
@@ -201,6 +201,29 @@ AUTO_STATS_TOP_N = 20
 AUTO_RUN_FORWARD_WINDOWS = True   # Step 13 (fast, trade-list based)
 AUTO_RUN_MULTI_PAIR = False       # Step 14 (slow, runs full workflow per symbol)
 MULTI_PAIR_SYMBOLS = ["EURUSD", "USDJPY"]
+# Terminals (terminals.json names) Step 14 fans child workflows out across, one child
+# per terminal at a time. Empty = run children one by one on the workflow's terminal.
+MULTI_PAIR_TERMINALS = []
+
+# Workflow steps run as a dependency graph: independent steps (e.g. Step 13 and the
+# report refresh next to Step 12's MT5 runs) execute concurrently on up to this many
+# threads. MT5 steps always take the terminal lease. 1 = strictly sequential.
+STEP_WORKERS = 4
+
+# Dense rolling-window surfaces (Step 13): every window length is stepped across the
+# full backtest period for every backtested pass (stored as float32 series).
+AUTO_ROLLING_SURFACES = True
+ROLLING_SURFACE_WINDOW_DAYS = [30, 60, 90]
+ROLLING_SURFACE_STEP_DAYS = 1
+ROLLING_SURFACE_MIN_TRADES = 5  # Windows with fewer trades are ignored for worst PF / win rate
+
+# Informational gate: % of the longest rolling windows that must be profitable
+MIN_ROLLING_PROFITABLE_PCT = 60.0
+
+# Monte Carlo bands per forward window (Step 13): in-sample trades are bootstrapped
+# to each window's trade count so a bad month can be judged against normal variance.
+AUTO_FORWARD_WINDOW_MC_BANDS = True
+FORWARD_WINDOW_MC_ITERATIONS = 1000
 
 # =============================================================================
 # POST-STEP STRESS SCENARIOS (Step 12)
@@ -237,6 +260,27 @@ STRESS_OVERLAY_SPREAD_PIPS = [0.0, 1.0, 2.0, 3.0, 5.0]
 STRESS_OVERLAY_SLIPPAGE_PIPS = [0.0, 1.0, 3.0]
 STRESS_OVERLAY_SLIPPAGE_SIDES = 2  # entry + exit
 
+# Decisive mode: evaluate a stress-gate rule after every MT5 scenario and stop running
+# scenarios that can no longer change the pass/fail verdict. Rule scenarios run first.
+# A counted scenario fails the rule when PF < min_profit_factor (or profit < min_profit /
+# DD% > max_drawdown_pct when set). Scenarios with fewer than min_trades trades are
+# inconclusive. The verdict is FAIL once max_failures counted scenarios have failed.
+STRESS_DECISIVE_MODE = False
+STRESS_DECISIVE_RULE = {
+    "tags": ["tick"],          # Scenario must carry all of these tags to be counted
+    "min_profit_factor": 1.0,
+    "min_profit": None,
+    "max_drawdown_pct": None,
+    "min_trades": 1,
+    "max_failures": 1,
+}
+STRESS_DECISIVE_CANCEL_ALL_ON_FAIL = True  # On FAIL also skip non-rule scenarios
+
+# Trade-level diff: tick / latency scenarios are matched trade-by-trade against the
+# OHLC run of the same window (open-time bucket + side + volume) to explain failures.
+STRESS_TRADE_DIFF = True
+STRESS_TRADE_DIFF_BUCKET_SECONDS = 60
+
 # If True, Step 12 runs automatically after Step 11.
 # If False, you can invoke stress scenarios manually for a completed workflow.
 AUTO_RUN_STRESS_SCENARIOS = True
@@ -266,13 +310,99 @@ TOP_PASSES_BACKTEST = 30
 
 # Runs directory for workflow states and outputs
 RUNS_DIR = "runs"
+
+# Terminal registry read by TerminalRegistry() when no path is given (relative paths
+# resolve against the working directory). The EA_STRESS_TERMINALS environment
+# variable overrides it, e.g. for the registry scripts/fake_terminals.py writes.
+TERMINALS_FILE = "terminals.json"
+
+# Workflow state persistence: once workflow_<id>.json exceeds the size below, updates
+# are appended to workflow_<id>.journal.jsonl and compacted in the background.
+STATE_JOURNAL = True
+STATE_JOURNAL_MIN_SNAPSHOT_BYTES = 256 * 1024
+STATE_JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024
+
+# Content-addressed blob store (runs/blobs) for large artifacts. Results files and
+# step results keep references to values larger than BLOB_MIN_BYTES.
+BLOB_STORE = True
+BLOB_MIN_BYTES = 16 * 1024
+
+# Compile cache (runs/compile_cache). MetaEditor is skipped when the .mq5, every file
+# in its #include closure and the compiler version match a previous successful compile.
+COMPILE_CACHE = True
+
+# Batch job queue (runs/batch/queue.sqlite) used by scripts/batch_run.py. Each worker
+# owns one terminal; a job's lease is renewed while it runs and a job whose worker
+# died is retried once the lease expires (up to BATCH_MAX_ATTEMPTS attempts).
+BATCH_QUEUE_PATH = None  # None = <RUNS_DIR>/batch/queue.sqlite
+BATCH_WORKERS = 1
+BATCH_LEASE_SECONDS = 30 * 60
+BATCH_MAX_ATTEMPTS = 2
+
+# Workflow tracing: nested spans (steps, MT5 runs, report waits, parsing, Monte Carlo)
+# with wall/CPU time appended to runs/<workflow_id>/trace.jsonl. Summarize or export
+# to Chrome/Perfetto JSON with scripts/trace_report.py. TRACE_MEMORY adds per-span
+# peak Python memory via tracemalloc (slower).
+TRACING = True
+TRACE_MEMORY = False
+
+# Benchmarks (scripts/run_benchmarks.py): each run is stored in BENCHMARK_DIR and
+# compared with the previous one. A benchmark whose best time grows by more than
+# BENCHMARK_REGRESSION_THRESHOLD (0.25 = 25%) is reported as a regression.
+BENCHMARK_DIR = None  # None = <RUNS_DIR>/benchmarks
+BENCHMARK_REGRESSION_THRESHOLD = 0.25
+
+# SQLite workflow catalog (runs/catalog.sqlite) used by listing, boards, leaderboard and
+# dashboard regeneration. Rebuild with: python -m reports.catalog --rebuild
+WORKFLOW_CATALOG = True
+
+# Per-workflow summary sidecars (runs/<workflow_id>/summary.json). Boards and the
+# leaderboard only re-read workflows whose inputs changed and skip regeneration
+# when no summary hash changed.
+REPORT_SUMMARY_SIDECARS = True
+
+# Inline SVG equity sparklines on boards / leaderboard rows (best pass, each stress
+# scenario, each leaderboard pass), LTTB-reduced to SPARKLINE_POINTS and cached in
+# runs/<workflow_id>/sparklines.json.
+REPORT_SPARKLINES = True
+SPARKLINE_POINTS = 48
+
 DASHBOARDS_DIR = "runs/dashboards"
 LEADERBOARD_DIR = "runs/leaderboard"
 
+# Dashboard chart point budgets. Longer series are downsampled with LTTB when the
+# payload is built; full-resolution equity curves are written next to the
+# dashboard (equity/<pass>.json) and loaded on demand. 0 disables downsampling.
+DASHBOARD_CHART_POINTS = {
+    'equity_in_sample': 1500,
+    'equity_forward': 600,
+}
+
+# Split dashboard data into a small embedded summary plus per-pass / per-section
+# shards (data/*.json, with .js twins for file:// viewing) fetched on demand.
+DASHBOARD_SHARDS = True
+
+# Processes used by generate_all_dashboards (1 = sequential). Dashboards whose
+# inputs are unchanged since their last render are skipped.
+DASHBOARD_WORKERS = 4
+
+# Local report server (python -m reports.server): serves boards, leaderboard and
+# dashboards with gzip/ETags plus paginated JSON endpoints backed by the catalog.
+# The catalog is re-synced with the workflow files at most every SYNC_SECONDS.
+REPORT_SERVER_HOST = "127.0.0.1"
+REPORT_SERVER_PORT = 8765
+REPORT_SERVER_PAGE_SIZE = 100
+REPORT_SERVER_SYNC_SECONDS = 5
+
 # Reference system
 REFERENCE_DIR = "reference"
 REFERENCE_CACHE_DIR = "reference/cache"
 
+# Extracted MQL5 reference page text is cached zlib-compressed in
+# reference/cache/pages.sqlite (keyed by PDF hash + page) with LRU eviction
+# above this many compressed bytes. 0 disables the cache.
+REFERENCE_PAGE_CACHE_BYTES = 64 * 1024 * 1024
+
 # =============================================================================
 # AUTONOMOUS MODE (Future)
 # =============================================================================
@@ -0,0 +1,151 @@
+"""
+Tests for the Benchmark Suite
+
+Tests that the synthetic generators produce inputs the real parsers accept
+(with the expected counts and totals), and the harness's storage and
+regression comparison.
+"""
+import json
+import subprocess
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from benchmarks import generators
+from benchmarks.harness import compare, format_comparison, latest_run, load_results, run_benchmarks, save_results
+from benchmarks.suite import get_benchmarks
+from modules.backtest import parse_html_report
+from modules.optimizer import _merge_forward_results, parse_optimization_results
+from modules.trade_extractor import extract_trades
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+class TestGenerators:
+    """Tests that synthetic inputs parse like real MT5 output."""
+
+    def test_html_report_round_trip(self, temp_dir):
+        info = generators.write_html_report(temp_dir / 'report.htm', 200, seed=3, partial_ratio=0.5)
+        raw = (temp_dir / 'report.htm').read_bytes()
+        assert raw[:2] == b'\xff\xfe'
+
+        result = extract_trades(info['path'])
+        assert result.success
+        assert len(result.trades) == info['closed_trades'] > 200  # partial closes add trades
+        assert result.initial_balance == pytest.approx(10000.0)
+        assert result.total_net_profit == pytest.approx(info['net_profit'], abs=0.05)
+        assert result.final_balance == pytest.approx(info['final_balance'], abs=0.01)
+
+        metrics = parse_html_report(Path(info['path']))
+        assert metrics['success']
+        assert metrics['total_trades'] == info['closed_trades']
+        assert metrics['profit'] == pytest.approx(info['net_profit'], abs=0.01)
+
+    def test_deterministic(self, temp_dir):
+        a = generators.write_html_report(temp_dir / 'a.htm', 50, seed=1)
+        b = generators.write_html_report(temp_dir / 'b.htm', 50, seed=1)
+        assert (temp_dir / 'a.htm').read_bytes() == (temp_dir / 'b.htm').read_bytes()
+        assert a['net_profit'] == b['net_profit']
+
+    def test_optimization_reports(self, temp_dir):
+        info = generators.write_optimization_reports(temp_dir / 'EA_OPT', 120, seed=2)
+        main = parse_optimization_results(info['xml_path'])
+        forward = parse_optimization_results(info['forward_xml_path'])
+
+        assert main['success'] and main['passes'] == 120 and forward['passes'] == 120
+        best = main['best_result']
+        assert set(best['params']) >= {'Pass', 'FastPeriod', 'RiskPercent'}
+        assert {'profit', 'profit_factor', 'max_drawdown_pct', 'total_trades'} <= set(best)
+
+        _merge_forward_results(main['results'], forward['results'])
+        assert all('forward_profit' in p and 'Forward Result' in p['params'] for p in main['results'])
+
+    def test_trades_sorted_and_spread(self):
+        trades = generators.make_trades(500, seed=4, days=365)
+        closes = [t.close_time for t in trades]
+        assert closes == sorted(closes)
+        assert (closes[-1] - closes[0]).days >= 360
+        assert all(t.net_profit == pytest.approx(t.gross_profit + t.commission) for t in trades)
+
+    def test_workflow_state_builds_dashboard(self, temp_dir):
+        from reports.workflow_dashboard import generate_dashboard_from_workflow
+
+        state = generators.make_workflow_state(temp_dir / 'runs', 60, curve_points=200, backtested=5)
+        steps = state.get('steps')
+        assert len(steps['7_run_optimization']['result']['results']) == 60
+        assert len(steps['9_backtest_robust']['result']['all_results']) == 5
+
+        path = generate_dashboard_from_workflow(str(state.state_file), output_dir=str(temp_dir / 'dash'))
+        assert Path(path).exists()
+
+
+def _doc(created_at, **times):
+    return {
+        'created_at': created_at,
+        'git_rev': 'abc',
+        'results': {k: {'min_s': v} for k, v in times.items()},
+    }
+
+
+class TestHarness:
+    """Tests for running, storing and comparing benchmark runs."""
+
+    def test_run_subset(self, temp_dir):
+        doc = run_benchmarks(['cost_overlay'], ['small'], repeat=2, warmup=0, workdir=temp_dir)
+        result = doc['results']['cost_overlay@small']
+        assert result['size'] == 1000 and result['unit'] == 'trades'
+        assert 0 < result['min_s'] <= result['median_s']
+        assert doc['repeat'] == 2
+
+        with pytest.raises(ValueError):
+            run_benchmarks(['nope'])
+        with pytest.raises(ValueError):
+            run_benchmarks(['cost_overlay'], ['huge'])
+
+    def test_every_benchmark_has_all_scales(self):
+        for bench in get_benchmarks():
+            assert set(bench.sizes) == {'small', 'medium', 'large'}
+
+    def test_compare_thresholds(self):
+        baseline = _doc('2026-01-01T00:00:00', a=0.100, b=0.100, c=0.100, d=0.0010)
+        current = _doc('2026-01-02T00:00:00', a=0.140, b=0.110, c=0.050, d=0.0020, e=0.3)
+
+        report = compare(current, baseline, threshold=0.25)
+        status = {r['key']: r['status'] for r in report['rows']}
+        assert status == {'a': 'regressed', 'b': 'ok', 'c': 'improved', 'd': 'ok', 'e': 'new'}
+        assert report['regressions'] == 1
+        assert next(r for r in report['rows'] if r['key'] == 'a')['ratio'] == 1.4
+        text = format_comparison(report)
+        assert 'REGRESSED' in text and '1 regression(s)' in text
+
+    def test_storage(self, temp_dir):
+        first = save_results(_doc('2026-01-01T00:00:00', a=0.1), temp_dir)
+        second = save_results(_doc('2026-01-01T00:00:00', a=0.2), temp_dir)
+        assert first != second
+        assert latest_run(temp_dir) == second
+        assert load_results(second)['results']['a']['min_s'] == 0.2
+
+    def test_cli_compares_with_previous_run(self, temp_dir):
+        cmd = [
+            sys.executable, str(REPO_ROOT / 'scripts' / 'run_benchmarks.py'),
+            '--bench', 'cost_overlay', '--scale', 'small', '--repeat', '1', '--warmup', '0',
+            '--out-dir', str(temp_dir / 'bench'),
+        ]
+        first = subprocess.run(cmd, check=True, capture_output=True, text=True, cwd=str(temp_dir)).stdout
+        assert 'No previous run' in first
+
+        # A baseline ten times faster makes this run a regression
+        stored = load_results(latest_run(temp_dir / 'bench'))
+        stored['results']['cost_overlay@small']['min_s'] /= 10
+        baseline = temp_dir / 'baseline.json'
+        baseline.write_text(json.dumps(stored))
+
+        proc = subprocess.run(
+            cmd + ['--baseline', str(baseline), '--no-save', '--fail-on-regression', '--json'],
+            capture_output=True, text=True, cwd=str(temp_dir),
+        )
+        assert proc.returncode == 1
+        report = json.loads(proc.stdout[proc.stdout.index('{'):])
+        assert report['rows'][0]['status'] == 'regressed'
+        assert len(list((temp_dir / 'bench').glob('*.json'))) == 1
@@ -0,0 +1,130 @@
+"""
+Tests for Blob Store Module
+
+Tests content addressing, de-duplication, manifest round-trips and lazy
+resolution of results files.
+"""
+import json
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from modules.blob_store import (
+    BlobStore,
+    ResultsFile,
+    externalize,
+    resolve,
+    is_ref,
+    save_results_file,
+    load_results_file,
+)
+
+
+def _backtests(seed: float = 1.0) -> dict:
+    passes = []
+    for n in range(3):
+        passes.append({
+            'pass_num': n,
+            'profit': 100.0 * n,
+            'equity_curve': [10000 + i * seed for i in range(3000)],
+            'charts': {'histogram': list(range(5000))},
+        })
+    return {'best_result': passes[0], 'all_results': passes, 'selection': {'metric': 'score'}}
+
+
+class TestBlobStore:
+    """Tests for the content-addressed store."""
+
+    def test_put_get_round_trip(self, temp_dir):
+        """Stored values load back unchanged."""
+        store = BlobStore(temp_dir / 'blobs')
+        ref = store.put({'a': [1, 2, 3]})
+
+        assert is_ref(ref)
+        assert BlobStore(temp_dir / 'blobs').get(ref) == {'a': [1, 2, 3]}
+
+    def test_identical_content_deduplicated(self, temp_dir):
+        """Same content (any key order) is stored once."""
+        store = BlobStore(temp_dir / 'blobs')
+        a = store.put({'x': 1, 'y': [1, 2]})
+        b = store.put({'y': [1, 2], 'x': 1})
+
+        assert a == b
+        assert store.stats['written'] == 1
+        assert store.stats['reused'] == 1
+        assert len(list((temp_dir / 'blobs').rglob('*.json.gz'))) == 1
+
+    def test_missing_blob(self, temp_dir):
+        """Unknown digest raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            BlobStore(temp_dir / 'blobs').get('0' * 64)
+
+
+class TestExternalize:
+    """Tests for reference replacement."""
+
+    def test_large_children_become_refs(self, temp_dir):
+        """Equity curves are moved out, small metrics stay inline."""
+        store = BlobStore(temp_dir / 'blobs')
+        data = _backtests()
+        out = externalize(data, store, min_bytes=4096)
+
+        assert out['selection'] == {'metric': 'score'}
+        assert resolve(out, store) == data
+        best = out['best_result']
+        assert is_ref(best) or is_ref(best['equity_curve'])
+
+    def test_resolve_skip(self, temp_dir):
+        """Skipped keys stay as references."""
+        store = BlobStore(temp_dir / 'blobs')
+        out = externalize({'p': {'profit': 1, 'equity_curve': list(range(5000))}}, store, min_bytes=1024)
+        loaded = resolve(out, store, skip=('equity_curve',))
+
+        assert loaded['p']['profit'] == 1
+        assert is_ref(loaded['p']['equity_curve'])
+
+
+class TestResultsFile:
+    """Tests for manifest results files."""
+
+    def test_manifest_round_trip(self, temp_dir):
+        """Manifest is small and loads back to the original data."""
+        path = temp_dir / 'runs' / 'wf_1' / 'backtests.json'
+        data = _backtests()
+        save_results_file(path, data)
+
+        assert path.stat().st_size < 4096
+        assert load_results_file(str(path)) == data
+        assert (temp_dir / 'runs' / 'blobs').exists()
+
+    def test_rerun_deduplicates(self, temp_dir):
+        """A second workflow with identical artifacts writes no new blobs."""
+        data = _backtests()
+        save_results_file(temp_dir / 'runs' / 'wf_1' / 'backtests.json', data)
+        before = len(list((temp_dir / 'runs' / 'blobs').rglob('*.json.gz')))
+
+        store = BlobStore(temp_dir / 'runs' / 'blobs')
+        save_results_file(temp_dir / 'runs' / 'wf_2' / 'backtests.json', data, store=store)
+
+        assert store.stats['written'] == 0
+        assert len(list((temp_dir / 'runs' / 'blobs').rglob('*.json.gz'))) == before
+
+    def test_lazy_key_access(self, temp_dir):
+        """Reading one key does not need the other blobs."""
+        path = temp_dir / 'runs' / 'wf_1' / 'backtests.json'
+        save_results_file(path, _backtests())
+        results = ResultsFile(str(path))
+
+        assert results.is_manifest
+        assert results.get('selection') == {'metric': 'score'}
+        assert results.get('missing', 'x') == 'x'
+
+    def test_legacy_inline_file(self, temp_dir):
+        """Plain JSON results files still load."""
+        path = temp_dir / 'optimization.json'
+        path.write_text(json.dumps({'results': [{'pass_num': 1}]}))
+        results = ResultsFile(str(path))
+
+        assert not results.is_manifest
+        assert results.get('results') == [{'pass_num': 1}]
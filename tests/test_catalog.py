@@ -0,0 +1,179 @@
+"""
+Tests for the Workflow Catalog
+
+Tests SQLite indexing of workflow state files, incremental sync and the
+board / leaderboard queries.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+from engine.state import StateManager
+from reports.catalog import WorkflowCatalog, index_workflow_file
+
+
+def _make_workflow(runs_dir, ea_name='TestEA', symbol='EURUSD', status=None):
+    state = StateManager(
+        ea_name=ea_name,
+        ea_path=f'/path/to/{ea_name}.mq5',
+        terminal='TestBroker',
+        symbol=symbol,
+        runs_dir=str(runs_dir),
+    )
+    state.update_gates({
+        'profit_factor': {'passed': True, 'value': 1.8, 'threshold': 1.5},
+        'max_drawdown': {'passed': False, 'value': 35.0, 'threshold': 30.0},
+    })
+    if status:
+        state.set_status(status)
+    return state
+
+
+@pytest.fixture
+def catalog(temp_dir):
+    cat = WorkflowCatalog(str(temp_dir))
+    yield cat
+    cat.close()
+
+
+class TestSync:
+    """Tests for incremental sync."""
+
+    def test_sync_indexes_new_workflows(self, temp_dir, catalog):
+        """New workflow files are indexed on first sync."""
+        _make_workflow(temp_dir, 'EA_A')
+        _make_workflow(temp_dir, 'EA_B')
+
+        counts = catalog.sync()
+
+        assert counts == {'indexed': 2, 'removed': 0, 'unchanged': 0}
+        names = sorted(w['ea_name'] for w in catalog.list_workflows())
+        assert names == ['EA_A', 'EA_B']
+
+    def test_sync_skips_unchanged_and_reindexes_changed(self, temp_dir, catalog):
+        """Only files whose stat signature changed are re-read."""
+        a = _make_workflow(temp_dir, 'EA_A')
+        _make_workflow(temp_dir, 'EA_B')
+        catalog.sync()
+
+        a.set_status('completed')
+        st = a.state_file.stat()
+        os.utime(a.state_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        counts = catalog.sync()
+
+        assert counts == {'indexed': 1, 'removed': 0, 'unchanged': 1}
+        rows = catalog.workflows(status='completed')
+        assert [r['ea_name'] for r in rows] == ['EA_A']
+
+    def test_sync_removes_deleted_workflows(self, temp_dir, catalog):
+        """Rows for deleted state files are dropped."""
+        a = _make_workflow(temp_dir, 'EA_A')
+        _make_workflow(temp_dir, 'EA_B')
+        catalog.sync()
+
+        a.state_file.unlink()
+        counts = catalog.sync()
+
+        assert counts['removed'] == 1
+        assert catalog.gates_for(a.workflow_id) == {}
+        assert [w['ea_name'] for w in catalog.list_workflows()] == ['EA_B']
+
+    def test_corrupted_file_is_listed(self, temp_dir, catalog):
+        """Unreadable state files stay visible as 'corrupted'."""
+        (Path(temp_dir) / 'workflow_Broken_1.json').write_text('{not json')
+
+        catalog.sync()
+        rows = catalog.list_workflows()
+
+        assert len(rows) == 1
+        assert rows[0]['workflow_id'] == 'Broken_1'
+        assert rows[0]['status'] == 'corrupted'
+        assert 'error' in rows[0]
+
+    def test_rebuild_reindexes_everything(self, temp_dir, catalog):
+        """rebuild() re-reads every file regardless of signatures."""
+        _make_workflow(temp_dir, 'EA_A')
+        _make_workflow(temp_dir, 'EA_B')
+        catalog.sync()
+
+        counts = catalog.rebuild()
+
+        assert counts == {'indexed': 2, 'removed': 0, 'unchanged': 0}
+
+
+class TestQueries:
+    """Tests for catalog queries."""
+
+    def test_gates_for(self, temp_dir, catalog):
+        """Gate outcomes are stored per workflow."""
+        state = _make_workflow(temp_dir)
+        index_workflow_file(str(state.state_file))
+        catalog.sync()
+
+        gates = catalog.gates_for(state.workflow_id)
+
+        assert gates['profit_factor'] == {'passed': True, 'value': 1.8, 'threshold': 1.5}
+        assert gates['max_drawdown']['passed'] is False
+
+    def test_board_rows_exclude_statuses(self, temp_dir, catalog):
+        """board_rows filters on workflow status."""
+        _make_workflow(temp_dir, 'EA_A', status='completed')
+        _make_workflow(temp_dir, 'EA_B', status='failed')
+        catalog.sync()
+
+        workflows, _ = catalog.board_rows(exclude_statuses={'failed'})
+
+        assert [w['ea_name'] for w in workflows] == ['EA_A']
+
+    def test_state_files_exclude_statuses(self, temp_dir, catalog):
+        """state_files lists indexed files, optionally filtered."""
+        a = _make_workflow(temp_dir, 'EA_A', status='completed')
+        _make_workflow(temp_dir, 'EA_B', status='failed')
+        catalog.sync()
+
+        assert catalog.state_files(exclude_statuses={'failed'}) == [str(a.state_file)]
+        assert len(catalog.state_files()) == 2
+
+    def test_list_workflows_matches_state_manager(self, temp_dir, monkeypatch):
+        """StateManager.list_workflows returns the same rows with and without the catalog."""
+        _make_workflow(temp_dir, 'EA_A')
+        _make_workflow(temp_dir, 'EA_B')
+
+        monkeypatch.setattr(settings, 'WORKFLOW_CATALOG', False, raising=False)
+        legacy = StateManager.list_workflows(str(temp_dir))
+        monkeypatch.setattr(settings, 'WORKFLOW_CATALOG', True, raising=False)
+        indexed = StateManager.list_workflows(str(temp_dir))
+
+        assert indexed == legacy
+
+
+class TestBoards:
+    """Tests for generate_boards on top of the catalog."""
+
+    def test_boards_match_legacy_scan(self, temp_dir, monkeypatch):
+        """Catalog-backed boards produce the same rows as the JSON scan."""
+        from reports.boards import generate_boards
+
+        _make_workflow(temp_dir, 'EA_A', status='completed')
+        _make_workflow(temp_dir, 'EA_B', symbol='GBPUSD', status='completed')
+        _make_workflow(temp_dir, 'EA_C', status='failed')
+
+        monkeypatch.setattr(settings, 'WORKFLOW_CATALOG', False, raising=False)
+        generate_boards(str(temp_dir), output_dir=str(Path(temp_dir) / 'legacy'))
+        monkeypatch.setattr(settings, 'WORKFLOW_CATALOG', True, raising=False)
+        generate_boards(str(temp_dir), output_dir=str(Path(temp_dir) / 'indexed'))
+
+        legacy = json.loads((Path(temp_dir) / 'legacy' / 'data.json').read_text())
+        indexed = json.loads((Path(temp_dir) / 'indexed' / 'data.json').read_text())
+
+        assert indexed['workflows'] == legacy['workflows']
+        assert indexed['scenarios'] == legacy['scenarios']
+        assert indexed['counts'] == legacy['counts'] == {
+            'workflows': 2, 'scenarios': 0, 'unique_eas': 2, 'unique_symbols': 2,
+        }
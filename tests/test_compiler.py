@@ -0,0 +1,192 @@
+"""
+Tests for the EA Compiler
+
+Tests the compile cache against a stand-in MetaEditor64 (a small script that
+records each invocation and writes an .ex5 / log like the real compiler).
+"""
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+from modules.compiler import IncludeIndex, compile_ea
+
+
+FAKE_METAEDITOR = '''#!{python}
+import sys
+from pathlib import Path
+
+here = Path(__file__).parent
+with open(here / 'calls.log', 'a') as f:
+    f.write(' '.join(sys.argv[1:]) + '\\n')
+
+if '/version' in sys.argv:
+    print((here / 'version.txt').read_text().strip())
+    sys.exit(0)
+
+src = Path(next(a for a in sys.argv if a.startswith('/compile:'))[len('/compile:'):])
+text = src.read_text(encoding='utf-8')
+if 'SYNTAX_ERROR' in text:
+    log = src.name + '(1,1) : error 100: unexpected token\\nResult: 1 errors, 0 warnings'
+else:
+    src.with_suffix('.ex5').write_bytes(b'EX5' + text.encode('utf-8'))
+    log = src.name + '(3,5) : warning 43: possible loss of data\\nResult: 0 errors, 1 warnings'
+src.with_suffix('.log').write_text(log, encoding='utf-16-le')
+'''
+
+
+def _bump(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def toolchain(temp_dir, monkeypatch):
+    """Fake terminal dir with MetaEditor64 stand-in, MQL5/Include tree and an EA."""
+    monkeypatch.setattr(settings, 'RUNS_DIR', str(temp_dir / 'runs'), raising=False)
+    monkeypatch.setattr(settings, 'COMPILE_CACHE', True, raising=False)
+
+    install = temp_dir / 'terminal'
+    install.mkdir()
+    metaeditor = install / 'MetaEditor64.exe'
+    metaeditor.write_text(FAKE_METAEDITOR.replace('{python}', sys.executable))
+    metaeditor.chmod(metaeditor.stat().st_mode | stat.S_IEXEC)
+    (install / 'version.txt').write_text('5.00 build 4620')
+
+    data = temp_dir / 'data'
+    include = data / 'MQL5' / 'Include' / 'Lib'
+    include.mkdir(parents=True)
+    (include / 'Util.mqh').write_text('#include "Helpers.mqh"\nint Util() { return Helper(); }\n')
+    (include / 'Helpers.mqh').write_text('int Helper() { return 1; }\n')
+
+    experts = data / 'MQL5' / 'Experts'
+    experts.mkdir(parents=True)
+    (experts / 'Local.mqh').write_text('#include <Lib/Util.mqh>\n')
+    ea = experts / 'TestEA.mq5'
+    ea.write_text('#include <Lib/Util.mqh>\n#include "Local.mqh"\nvoid OnTick() {}\n')
+
+    terminal = {'path': str(install / 'terminal64.exe'), 'data_path': str(data)}
+    return {'terminal': terminal, 'ea': ea, 'install': install, 'include': include}
+
+
+def _compile_calls(toolchain):
+    log = toolchain['install'] / 'calls.log'
+    if not log.exists():
+        return 0
+    return sum(1 for line in log.read_text().splitlines() if line.startswith('/compile:'))
+
+
+class TestIncludeIndex:
+    """Tests for #include closure resolution."""
+
+    def test_closure_resolves_both_include_forms(self, toolchain):
+        """<...> resolves in the Include tree, "..." next to the including file first."""
+        index = IncludeIndex()
+        include_dir = toolchain['include'].parent
+        labels = dict(index.closure(toolchain['ea'], include_dir))
+
+        assert labels['<source>']
+        assert labels['<source>><Lib/Util.mqh']
+        assert labels['<source>><Lib/Util.mqh>"Helpers.mqh']
+        assert labels['<source>>"Local.mqh']
+        assert len(labels) == 4  # Util.mqh reached again via Local.mqh is not repeated
+
+    def test_missing_include_recorded(self, toolchain):
+        toolchain['ea'].write_text('#include <Missing/Thing.mqh>\n')
+        closure = IncludeIndex().closure(toolchain['ea'], toolchain['include'].parent)
+        assert closure[1] == ('<source>><Missing/Thing.mqh', '')
+
+    def test_index_reuses_unchanged_files(self, toolchain, temp_dir):
+        """File hashes are recomputed only when mtime/size change."""
+        path = temp_dir / 'index.json'
+        index = IncludeIndex(path)
+        index.closure(toolchain['ea'], toolchain['include'].parent)
+        index.save()
+
+        reloaded = IncludeIndex(path)
+        reloaded.closure(toolchain['ea'], toolchain['include'].parent)
+        assert not reloaded.dirty
+
+        _bump(toolchain['include'] / 'Helpers.mqh')
+        reloaded.closure(toolchain['ea'], toolchain['include'].parent)
+        assert reloaded.dirty
+
+
+class TestCompileCache:
+    """Tests for compile_ea caching."""
+
+    def test_hit_restores_ex5_and_log(self, toolchain):
+        """An unchanged EA is restored without launching MetaEditor."""
+        first = compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])
+        assert first['success'] and not first['cached']
+        assert len(first['warnings']) == 1
+        assert _compile_calls(toolchain) == 1
+
+        ex5 = toolchain['ea'].with_suffix('.ex5')
+        content = ex5.read_bytes()
+        ex5.unlink()
+        toolchain['ea'].with_suffix('.log').unlink()
+
+        second = compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])
+        assert second['success'] and second['cached']
+        assert second['exe_path'] == first['exe_path']
+        assert second['warnings'] == first['warnings']
+        assert ex5.read_bytes() == content
+        assert 'warning 43' in toolchain['ea'].with_suffix('.log').read_text(encoding='utf-16-le')
+        assert _compile_calls(toolchain) == 1
+
+    def test_transitive_include_change_recompiles(self, toolchain):
+        compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])
+        helpers = toolchain['include'] / 'Helpers.mqh'
+        helpers.write_text('int Helper() { return 2; }\n')
+        _bump(helpers)
+
+        result = compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])
+        assert not result['cached']
+        assert _compile_calls(toolchain) == 2
+
+    def test_compiler_version_change_recompiles(self, toolchain):
+        compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])
+        (toolchain['install'] / 'version.txt').write_text('5.00 build 4700')
+        _bump(toolchain['install'] / 'MetaEditor64.exe')
+
+        assert not compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])['cached']
+        assert _compile_calls(toolchain) == 2
+
+    def test_copied_ea_hits(self, toolchain):
+        """The key is content based, so an identical copy elsewhere (e.g. a child workflow) reuses it."""
+        compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])
+        copy_dir = toolchain['ea'].parent / 'child'
+        copy_dir.mkdir()
+        copy = copy_dir / toolchain['ea'].name
+        copy.write_text(toolchain['ea'].read_text())
+        (copy_dir / 'Local.mqh').write_text((toolchain['ea'].parent / 'Local.mqh').read_text())
+
+        result = compile_ea(str(copy), terminal=toolchain['terminal'])
+        assert result['cached']
+        assert copy.with_suffix('.ex5').exists()
+
+    def test_failures_and_disabled_cache_not_reused(self, toolchain, monkeypatch):
+        toolchain['ea'].write_text('SYNTAX_ERROR\n')
+        assert not compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])['success']
+        assert not compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])['success']
+        assert _compile_calls(toolchain) == 2
+
+        toolchain['ea'].write_text('void OnTick() {}\n')
+        monkeypatch.setattr(settings, 'COMPILE_CACHE', False, raising=False)
+        compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])
+        compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])
+        assert _compile_calls(toolchain) == 4
+
+    def test_version_queried_once(self, toolchain):
+        compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])
+        compile_ea(str(toolchain['ea']), terminal=toolchain['terminal'])
+        calls = (toolchain['install'] / 'calls.log').read_text().splitlines()
+        assert calls.count('/version') == 1
+        index = json.loads((Path(settings.RUNS_DIR) / 'compile_cache' / 'index.json').read_text())
+        assert list(index['compilers'].values())[0]['version'] == '5.00 build 4620'
@@ -0,0 +1,88 @@
+"""
+Tests for the Dashboard Template Renderer
+
+Tests compiled mustache-like templates in reports/dashboard.py.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import reports.dashboard as dashboard_mod
+from reports.dashboard import TEMPLATES_DIR, compile_template, render_template, render_template_file
+
+
+class TestRenderTemplate:
+    """Tests for render_template."""
+
+    def test_variables_and_nested_access(self):
+        """Plain and dotted variables; missing keys render empty."""
+        html = render_template('{{name}}|{{metrics.profit}}|{{missing}}|{{metrics.nope}}', {
+            'name': 'EA', 'metrics': {'profit': 1200},
+        })
+        assert html == 'EA|1200||'
+
+    def test_list_section_scopes(self):
+        """Item keys shadow outer keys; outer keys stay visible."""
+        html = render_template('{{#rows}}[{{n}} {{unit}}]{{/rows}}', {
+            'unit': 'GBP', 'rows': [{'n': 1}, {'n': 2, 'unit': 'USD'}],
+        })
+        assert html == '[1 GBP][2 USD]'
+
+    def test_simple_list_and_dict_section(self):
+        """{{.}} renders list items; dict sections push a scope."""
+        html = render_template('{{#xs}}<{{.}}>{{/xs}}{{#rec.params}}{{a}}{{/rec.params}}', {
+            'xs': [1, 2], 'rec': {'params': {'a': 'ok'}},
+        })
+        assert html == '<1><2>ok'
+
+    def test_conditionals_and_inverted(self):
+        """Truthy sections render once; inverted sections render when empty."""
+        template = '{{#flag}}yes{{/flag}}{{^flag}}no{{/flag}}{{^items}}empty{{/items}}'
+        assert render_template(template, {'flag': True, 'items': []}) == 'yesempty'
+        assert render_template(template, {'flag': False, 'items': [1]}) == 'no'
+        assert render_template('A{{#x}}[yes]{{/x}}{{^x}}[no]{{/x}}', {'x': {}}) == 'A[no]'
+
+    def test_nested_sections(self):
+        """Sections nest to any depth."""
+        html = render_template('{{#eas}}{{name}}:{{#passes}}{{p}},{{/passes}};{{/eas}}', {
+            'eas': [{'name': 'A', 'passes': [{'p': 1}, {'p': 2}]}, {'name': 'B', 'passes': []}],
+        })
+        assert html == 'A:1,2,;B:;'
+
+    def test_unbalanced_sections_rejected(self):
+        """Malformed templates fail at compile time."""
+        with pytest.raises(ValueError):
+            compile_template('{{#a}}x')
+        with pytest.raises(ValueError):
+            compile_template('{{#a}}x{{/b}}')
+
+
+class TestTemplateFileCache:
+    """Tests for per-file compiled plan caching."""
+
+    def test_recompiles_on_change(self, temp_dir, monkeypatch):
+        """The plan is reused until the file's mtime/size changes."""
+        path = Path(temp_dir) / 't.html'
+        path.write_text('A {{x}}')
+        calls = []
+        original = dashboard_mod.compile_template
+        monkeypatch.setattr(dashboard_mod, 'compile_template', lambda t: calls.append(t) or original(t))
+
+        assert render_template_file(path, {'x': 1}) == 'A 1'
+        assert render_template_file(path, {'x': 2}) == 'A 2'
+        assert len(calls) == 1
+
+        path.write_text('B {{x}}!')
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert render_template_file(path, {'x': 3}) == 'B 3!'
+        assert len(calls) == 2
+
+    @pytest.mark.parametrize('name', ['dashboard.html', 'leaderboard.html'])
+    def test_shipped_templates_compile(self, name):
+        """Bundled templates are well-formed and render without leftover tags."""
+        html = render_template_file(TEMPLATES_DIR / name, {})
+        assert '{{#' not in html and '{{/' not in html
@@ -0,0 +1,99 @@
+"""
+Tests for Downsample Module
+
+Tests LTTB downsampling and the dashboard equity payload reduction.
+"""
+import json
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+from modules.downsample import lttb, lttb_indices
+from reports.workflow_dashboard import _downsample_equity
+
+
+def _curve(n, spike_at=None):
+    values = [10000 + 50 * math.sin(i / 40) + i * 0.5 for i in range(n)]
+    if spike_at is not None:
+        values[spike_at] -= 3000
+    return values
+
+
+class TestLttb:
+    """Tests for Largest-Triangle-Three-Buckets."""
+
+    def test_short_series_unchanged(self):
+        """Series within budget are returned as-is."""
+        values = _curve(100)
+        xs, ys = lttb(values, 500)
+        assert xs == list(range(100))
+        assert ys == values
+
+    def test_threshold_below_three_is_noop(self):
+        """A budget below 3 cannot preserve both endpoints plus shape."""
+        assert lttb_indices(_curve(50), 2) == list(range(50))
+
+    def test_budget_and_endpoints(self):
+        """Output has exactly `threshold` points and keeps first and last."""
+        values = _curve(20000)
+        idx = lttb_indices(values, 1000)
+
+        assert len(idx) == 1000
+        assert idx[0] == 0
+        assert idx[-1] == len(values) - 1
+        assert idx == sorted(set(idx))
+
+    def test_preserves_extremes(self):
+        """A single deep drawdown survives downsampling."""
+        values = _curve(20000, spike_at=12345)
+        xs, ys = lttb(values, 300)
+
+        assert 12345 in xs
+        assert min(ys) == min(values)
+
+    def test_custom_x_values(self):
+        """Explicit x values are carried through."""
+        values = _curve(1000)
+        xs_in = [i * 2.5 for i in range(1000)]
+        xs, ys = lttb(values, 100, xs=xs_in)
+
+        assert len(xs) == 100
+        assert xs[0] == 0.0 and xs[-1] == xs_in[-1]
+        assert all(values[xs_in.index(x)] == y for x, y in zip(xs, ys))
+
+
+class TestDashboardEquity:
+    """Tests for dashboard equity payload reduction."""
+
+    def test_long_curves_downsampled_with_full_copy(self, temp_dir, monkeypatch):
+        """Long curves are reduced and the full series is written alongside."""
+        monkeypatch.setattr(
+            settings, 'DASHBOARD_CHART_POINTS', {'equity_in_sample': 200, 'equity_forward': 50}, raising=False
+        )
+        in_sample = _curve(5000)
+        forward = _curve(40)
+        data = {'passes': {'7': {'equity': {'in_sample': in_sample, 'forward': forward}}}}
+
+        _downsample_equity(data, Path(temp_dir))
+        eq = data['passes']['7']['equity']
+
+        assert len(eq['in_sample']) == 200
+        assert len(eq['in_sample_x']) == 200
+        assert eq['in_sample_points'] == 5000
+        assert eq['forward'] == forward
+        assert 'forward_x' not in eq
+        full = json.loads((Path(temp_dir) / f"{eq['full']}.json").read_text())
+        assert full == {'in_sample': in_sample, 'forward': forward}
+
+    def test_short_curves_untouched(self, temp_dir):
+        """Curves within budget get no full-resolution file."""
+        data = {'passes': {'3': {'equity': {'in_sample': [1.0, 2.0], 'forward': []}}}}
+
+        _downsample_equity(data, Path(temp_dir))
+
+        eq = data['passes']['3']['equity']
+        assert eq['in_sample'] == [1.0, 2.0]
+        assert 'full' not in eq
+        assert not (Path(temp_dir) / 'equity').exists()
@@ -0,0 +1,138 @@
+"""
+Tests for the Fake MT5 Terminal
+
+Runs the real run_backtest / run_optimization paths (INI, subprocess, report
+discovery, parsing) against the terminal64.exe stand-in.
+"""
+import json
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from benchmarks.fake_terminal import CALLS_FILE, install_fake_terminal, read_ini
+from modules.backtest import create_backtest_ini, run_backtest
+from modules.optimizer import run_optimization
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+def _calls(terminal):
+    log = Path(terminal['path']).parent / CALLS_FILE
+    return [json.loads(line) for line in log.read_text().splitlines()] if log.exists() else []
+
+
+@pytest.fixture
+def fake(temp_dir):
+    """Fake terminal with no simulated delay and an EA in place."""
+    terminal = install_fake_terminal(temp_dir / 'terminal', backtest_s=0, optimization_s=0, trades=120, passes=80)
+    ea = Path(terminal['data_path']) / 'MQL5' / 'Experts' / 'TestEA.ex5'
+    ea.write_bytes(b'EX5')
+    return {'terminal': terminal, 'ea': ea}
+
+
+class TestFakeTerminal:
+    """Tests for the terminal64.exe stand-in."""
+
+    def test_backtest_end_to_end(self, fake):
+        result = run_backtest(
+            str(fake['ea']), 'GBPUSD', 'H1', params={'FastPeriod': 12},
+            report_name='TestEA_BT', terminal=fake['terminal'],
+        )
+
+        assert result['success'], result.get('errors')
+        assert Path(result['report_path']).parent == Path(fake['terminal']['data_path'])
+        assert result['total_trades'] >= 120
+        assert result['trade_count'] == result['total_trades']
+        assert len(result['equity_curve']) > 1
+        # Trades span the tested dates, so both sides of the forward split get some
+        assert result['split_trades_in_sample'] > 0 and result['split_trades_forward'] > 0
+
+        call = _calls(fake['terminal'])[0]
+        assert call['report'] == 'TestEA_BT' and not call['optimization']
+
+    def test_reads_ini_sections(self, fake):
+        ini = create_backtest_ini(
+            'TestEA.ex5', 'EURUSD', 'M15', params={'RiskPercent': 1.5}, report_name='R', terminal=fake['terminal'],
+        )
+        tester, inputs = read_ini(Path(ini))
+        assert tester['Expert'] == 'TestEA.ex5' and tester['Period'] == '15'
+        assert inputs == {'RiskPercent': '1.5'}
+
+    def test_reports_are_deterministic(self, fake):
+        def report(name, params):
+            result = run_backtest(
+                str(fake['ea']), 'EURUSD', 'H1', params=params, report_name=name,
+                terminal=fake['terminal'], extract_equity=False,
+            )
+            return Path(result['report_path']).read_bytes()
+
+        first = report('A', {'FastPeriod': 10})
+        assert report('B', {'FastPeriod': 10}) == first
+        assert report('C', {'FastPeriod': 11}) != first
+
+    def test_optimization_end_to_end(self, fake):
+        param_ranges = [
+            {'name': 'FastPeriod', 'start': 5, 'step': 5, 'stop': 50},
+            {'name': 'RiskPercent', 'start': 0.5, 'step': 0.5, 'stop': 2.0},
+            {'name': 'UseFilter', 'fixed': True},
+        ]
+        result = run_optimization(
+            str(fake['ea']), 'EURUSD', 'H1', param_ranges, report_name='TestEA_OPT', terminal=fake['terminal'],
+        )
+
+        assert result['success'], result.get('errors')
+        assert result['passes'] == 40  # 10 x 4 grid caps the 80 configured passes
+        assert result['forward_xml_path'].endswith('TestEA_OPT.forward.xml')
+        best = result['best_result']
+        assert {'FastPeriod', 'RiskPercent'} <= set(best['params'])
+        assert all('forward_profit' in p for p in result['results'])
+
+    def test_concurrent_instances(self, temp_dir):
+        terminals = []
+        for n in range(4):
+            terminal = install_fake_terminal(temp_dir / f't{n}', backtest_s=1.0, trades=50)
+            ea = Path(terminal['data_path']) / 'MQL5' / 'Experts' / 'TestEA.ex5'
+            ea.write_bytes(b'EX5')
+            terminals.append((terminal, ea))
+
+        def run(item):
+            terminal, ea = item
+            return run_backtest(str(ea), 'EURUSD', 'H1', report_name='TestEA_BT', terminal=terminal)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(run, terminals))
+
+        assert all(r['success'] for r in results)
+        calls = [_calls(t)[0] for t, _ in terminals]
+        # All four simulated runs overlapped
+        assert max(c['started'] for c in calls) < min(c['finished'] for c in calls)
+
+    def test_bad_command_line(self, fake):
+        proc = subprocess.run([fake['terminal']['path'], '/portable'], capture_output=True, text=True)
+        assert proc.returncode == 1
+        assert 'config' in proc.stderr
+
+        with pytest.raises(ValueError):
+            install_fake_terminal(fake['ea'].parent / 'x', duration=1)
+
+    def test_install_script_writes_registry(self, temp_dir, monkeypatch):
+        from engine.terminals import TERMINALS_ENV, TerminalRegistry
+
+        proc = subprocess.run(
+            [sys.executable, str(REPO_ROOT / 'scripts' / 'fake_terminals.py'),
+             '--root', str(temp_dir / 'fakes'), '--count', '3', '--ea', 'TestEA'],
+            check=True, capture_output=True, text=True,
+        )
+        out = (temp_dir / 'fakes' / 'terminals.json').resolve()
+        assert f'export {TERMINALS_ENV}={out}' in proc.stdout
+
+        # The default registry follows the environment, whatever the working directory
+        monkeypatch.setenv(TERMINALS_ENV, str(out))
+        registry = TerminalRegistry()
+        assert [t['name'] for t in registry.list_terminals()] == ['Fake_1', 'Fake_2', 'Fake_3']
+        terminal = registry.get_terminal()
+        assert (Path(terminal['data_path']) / 'MQL5' / 'Experts' / 'TestEA.ex5').exists()
@@ -0,0 +1,235 @@
+"""
+Tests for the Batch Job Queue
+
+Tests leases, retries and resume in the SQLite job queue, the batch runner's
+workers and per-job summaries, and the batch watchdog reading the queue.
+"""
+import json
+import subprocess
+import threading
+import time
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from engine.batch import BatchRunner, batch_report, enqueue_profile
+from engine.job_queue import JobQueue
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def queue(temp_dir):
+    q = JobQueue(temp_dir / 'batch' / 'queue.sqlite')
+    yield q
+    q.close()
+
+
+@pytest.fixture
+def profile(temp_dir):
+    path = temp_dir / 'profile.json'
+    path.write_text(json.dumps({
+        'ea_path': 'C:/MT5/MQL5/Experts/RSI.mq5',
+        'wide_validation_params': {'Period': 5},
+        'optimization_ranges': [{'name': 'Period', 'start': 5, 'step': 5, 'stop': 50, 'optimize': True}],
+    }))
+    return path
+
+
+def _jobs(*symbols):
+    return [{'profile': 'p.json', 'symbol': s, 'timeframe': 'h1'} for s in symbols]
+
+
+class TestJobQueue:
+    """Tests for claiming, leases and retries."""
+
+    def test_claim_in_order(self, queue):
+        ids = queue.add_jobs('b1', _jobs('eurusd', 'GBPUSD'))
+        job = queue.claim('w1', 60)
+
+        assert job['id'] == ids[0]
+        assert job['symbol'] == 'EURUSD' and job['timeframe'] == 'H1'
+        assert job['status'] == 'running' and job['attempts'] == 1
+        assert queue.claim('w2', 60)['id'] == ids[1]
+        assert queue.claim('w3', 60) is None
+        assert queue.counts('b1') == {'queued': 0, 'running': 2, 'done': 0, 'failed': 0}
+
+    def test_invalid_job(self, queue):
+        with pytest.raises(ValueError):
+            queue.add_jobs('b1', [{'profile': 'p.json', 'symbol': 'EURUSD'}])
+
+    def test_retry_then_fail(self, queue):
+        (job_id,) = queue.add_jobs('b1', _jobs('EURUSD'), max_attempts=2)
+        queue.claim('w1', 60)
+        assert queue.fail(job_id, 'w1', 'boom') == 'queued'
+        job = queue.claim('w1', 60)
+        assert job['attempts'] == 2 and job['error'] == 'boom'
+        assert queue.fail(job_id, 'w1', 'boom again') == 'failed'
+        assert queue.get(job_id)['status'] == 'failed'
+
+    def test_expired_lease_is_reclaimed(self, queue):
+        """A job whose worker died is handed out again once its lease expires."""
+        (job_id,) = queue.add_jobs('b1', _jobs('EURUSD'))
+        queue.claim('dead', 0.05)
+        assert queue.claim('w2', 60) is None
+        time.sleep(0.1)
+
+        job = queue.claim('w2', 60)
+        assert job['id'] == job_id and job['error'] == 'lease expired'
+        # The dead worker can no longer complete it
+        assert not queue.complete(job_id, 'dead', {})
+        assert not queue.heartbeat(job_id, 'dead', 60)
+        assert queue.complete(job_id, 'w2', {'status': 'completed'})
+
+    def test_requeue_running(self, queue):
+        queue.add_jobs('b1', _jobs('EURUSD'))
+        queue.claim('crashed', 3600)
+        assert queue.requeue_running('b1') == 1
+        assert queue.counts('b1')['queued'] == 1
+
+    def test_enqueue_profile(self, queue, profile):
+        ids = enqueue_profile(queue, 'b2', str(profile), ['EURUSD', 'USDJPY'], 'H4', iterations=2,
+                              options={'stress': True})
+        jobs = queue.jobs('b2')
+        assert len(ids) == 4
+        assert [(j['symbol'], j['options']['iteration']) for j in jobs] == [
+            ('EURUSD', 1), ('USDJPY', 1), ('EURUSD', 2), ('USDJPY', 2),
+        ]
+        assert jobs[0]['options']['stress'] is True
+
+        bad = profile.with_name('bad.json')
+        bad.write_text('{}')
+        with pytest.raises(ValueError):
+            enqueue_profile(queue, 'b3', str(bad), ['EURUSD'], 'H4')
+
+
+class TestBatchRunner:
+    """Tests for running queued jobs."""
+
+    def test_workers_per_terminal_and_summaries(self, queue, temp_dir):
+        queue.add_jobs('b1', _jobs('EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD'))
+        seen = []
+        lock = threading.Lock()
+        active = {'now': 0, 'max': 0}
+        summaries_on_finish = []
+
+        def run_job(job, terminal, on_workflow, on_progress):
+            on_workflow(f"wf_{job['symbol']}")
+            with lock:
+                active['now'] += 1
+                active['max'] = max(active['max'], active['now'])
+                seen.append((job['symbol'], terminal))
+                # Earlier jobs' summaries exist before the batch ends
+                summaries_on_finish.append(len(list((temp_dir / 'batch' / 'b1').glob('job_*.json')))
+                                           if (temp_dir / 'batch' / 'b1').exists() else 0)
+            time.sleep(0.1)
+            with lock:
+                active['now'] -= 1
+            return {'workflow_id': f"wf_{job['symbol']}", 'status': 'completed'}
+
+        counts = BatchRunner(queue, terminals=['T1', 'T2'], workers=4, run_job=run_job, lease_seconds=60,
+                             poll_seconds=0.01).run()
+
+        assert counts == {'queued': 0, 'running': 0, 'done': 4, 'failed': 0}
+        assert active['max'] == 2
+        assert {t for _, t in seen} == {'T1', 'T2'}
+        assert max(summaries_on_finish) >= 2
+        files = sorted((temp_dir / 'batch' / 'b1').glob('job_*.json'))
+        assert len(files) == 4
+        record = json.loads(files[0].read_text())
+        assert record['status'] == 'done' and record['workflow_id'].startswith('wf_')
+        assert queue.jobs('b1')[0]['workflow_id'] == record['workflow_id']
+
+    def test_exception_retried(self, queue):
+        queue.add_jobs('b1', _jobs('EURUSD'), max_attempts=3)
+        attempts = []
+
+        def run_job(job, terminal, on_workflow, on_progress):
+            attempts.append(job['attempts'])
+            if len(attempts) < 3:
+                raise RuntimeError('terminal crashed')
+            return {'status': 'completed'}
+
+        counts = BatchRunner(queue, run_job=run_job, lease_seconds=60, poll_seconds=0.01).run()
+        assert attempts == [1, 2, 3]
+        assert counts['done'] == 1
+
+    def test_heartbeat_keeps_long_job(self, queue):
+        """A job running longer than its lease is not handed to another worker."""
+        queue.add_jobs('b1', _jobs('EURUSD'))
+        runs = []
+
+        def run_job(job, terminal, on_workflow, on_progress):
+            runs.append(terminal)
+            time.sleep(0.5)
+            return {'status': 'completed'}
+
+        counts = BatchRunner(queue, terminals=['T1', 'T2'], run_job=run_job, lease_seconds=0.15,
+                             poll_seconds=0.01).run()
+        assert runs == ['T1'] or runs == ['T2']
+        assert counts['done'] == 1
+
+    def test_resume_after_crash(self, queue):
+        """Done jobs stay done; the job the crashed run left behind runs again."""
+        ids = queue.add_jobs('b1', _jobs('EURUSD', 'GBPUSD', 'USDJPY'))
+        first = queue.claim('old', 60)
+        queue.complete(first['id'], 'old', {'status': 'completed'})
+        queue.claim('old', 60)  # crashed mid-job
+        queue.requeue_running('b1')
+
+        ran = []
+        BatchRunner(queue, run_job=lambda job, *a: ran.append(job['id']) or {'status': 'completed'},
+                    lease_seconds=60, poll_seconds=0.01).run()
+        assert ran == ids[1:]
+        report = batch_report(queue)
+        assert report['batch_id'] == 'b1' and report['counts']['done'] == 3
+
+
+class TestWatchBatch:
+    """Tests for the watchdog reading the queue."""
+
+    def test_status_includes_queue(self, queue, temp_dir):
+        ids = queue.add_jobs('b1', _jobs('EURUSD', 'GBPUSD'), max_attempts=1)
+        job = queue.claim('w1', 3600)
+        queue.fail(job['id'], 'w1', 'boom')
+        queue.claim('dead', -1)  # worker died: lease already expired
+
+        runs_dir = temp_dir / 'batch'
+        subprocess.run(
+            [sys.executable, str(REPO_ROOT / 'scripts' / 'watch_batch.py'), '--runs-dir', str(runs_dir),
+             '--queue', str(queue.db_path)],
+            check=True, cwd=str(temp_dir), capture_output=True,
+        )
+        status = json.loads((runs_dir / 'watchdog_status.json').read_text())
+
+        assert status['queue']['batch_id'] == 'b1'
+        assert status['queue']['counts']['failed'] == 1
+        assert status['queue']['expired_leases'] == [ids[1]]
+        assert status['needs_attention']
+        assert any('failed after all attempts' in r for r in status['reasons'])
+        assert any('lease expired' in r for r in status['reasons'])
+
+    def test_status_reads_journaled_state(self, temp_dir, monkeypatch):
+        """The current workflow includes journal updates not yet compacted."""
+        import settings
+        from engine.state import StateManager, journal_path_for
+
+        monkeypatch.setattr(settings, 'STATE_JOURNAL', True)
+        monkeypatch.setattr(settings, 'STATE_JOURNAL_MIN_SNAPSHOT_BYTES', 0)
+        monkeypatch.setattr(settings, 'STATE_JOURNAL_COMPACT_BYTES', 10 ** 9)
+        state = StateManager('TestEA', '/path', 'Term1', runs_dir=str(temp_dir / 'runs'))
+        state.start_step('2_compile')
+        assert journal_path_for(state.state_file).exists()
+
+        runs_dir = temp_dir / 'runs' / 'batch'
+        subprocess.run(
+            [sys.executable, str(REPO_ROOT / 'scripts' / 'watch_batch.py'), '--runs-dir', str(runs_dir),
+             '--queue', str(temp_dir / 'none.sqlite')],
+            check=True, cwd=str(temp_dir), capture_output=True,
+        )
+        status = json.loads((runs_dir / 'watchdog_status.json').read_text())
+
+        assert status['workflow']['workflow_id'] == state.workflow_id
+        assert status['workflow']['status'] == 'in_progress'
+        assert status['workflow']['current_step'] == state.get_step_index('2_compile')
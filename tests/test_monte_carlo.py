@@ -10,6 +10,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from modules.monte_carlo import (
     run_monte_carlo,
+    run_window_confidence_bands,
     extract_trades_from_results,
     calculate_risk_metrics,
     check_monte_carlo_gates,
@@ -156,6 +157,64 @@ class TestExtractTradesFromResults:
         assert trades == []
 
 
+class TestRunWindowConfidenceBands:
+    """Tests for batched per-window bootstrap bands."""
+
+    def test_bands_aligned_with_windows(self, sample_trades):
+        """One band per window; windows without trades get None."""
+        windows = [
+            {'total_trades': 5, 'profit': 100, 'start_balance': 10000},
+            {'total_trades': 0, 'profit': 0, 'start_balance': 10000},
+            {'total_trades': 20, 'profit': -500, 'start_balance': 10000},
+        ]
+        bands = run_window_confidence_bands(sample_trades, windows, iterations=500, seed=1)
+
+        assert len(bands) == 3
+        assert bands[1] is None
+        assert bands[0]['trade_count'] == 5
+        assert bands[2]['iterations'] == 500
+        for band in (bands[0], bands[2]):
+            assert band['profit']['p5'] <= band['profit']['p50'] <= band['profit']['p95']
+            assert band['max_drawdown_pct']['p5'] <= band['max_drawdown_pct']['p95']
+
+    def test_band_width_grows_with_trade_count(self, sample_trades):
+        """Longer windows have wider profit bands."""
+        windows = [
+            {'total_trades': 5, 'profit': 0, 'start_balance': 10000},
+            {'total_trades': 50, 'profit': 0, 'start_balance': 10000},
+        ]
+        short, long_ = run_window_confidence_bands(sample_trades, windows, iterations=1000, seed=2)
+        width = lambda b: b['profit']['p95'] - b['profit']['p5']
+        assert width(long_) > width(short)
+
+    def test_realized_outside_band(self):
+        """A realized loss far below any bootstrap outcome is flagged."""
+        windows = [{'total_trades': 10, 'profit': -5000, 'start_balance': 10000}]
+        band = run_window_confidence_bands([100, 50, -20], windows, iterations=200, seed=3)[0]
+
+        assert band['within_band'] == False
+        assert band['profit_percentile'] == 0.0
+
+    def test_no_loss_profit_factor(self):
+        """All-winning sample uses the no-loss profit factor."""
+        windows = [{'total_trades': 3, 'profit': 30, 'start_balance': 1000}]
+        band = run_window_confidence_bands([10, 10], windows, iterations=10, seed=4)[0]
+        assert band['profit_factor']['p50'] == 99.0
+        assert band['profit']['p50'] == 30
+
+    def test_seed_reproducible(self, sample_trades):
+        """Same seed gives identical bands."""
+        windows = [{'total_trades': 8, 'profit': 50, 'start_balance': 5000}]
+        a = run_window_confidence_bands(sample_trades, windows, iterations=300, seed=7)
+        b = run_window_confidence_bands(sample_trades, windows, iterations=300, seed=7)
+        assert a == b
+
+    def test_empty_sample(self):
+        """No sample returns no bands."""
+        windows = [{'total_trades': 3, 'profit': 0, 'start_balance': 1000}]
+        assert run_window_confidence_bands([], windows) == [None]
+
+
 class TestCalculateRiskMetrics:
     """Tests for risk-adjusted metric calculations."""
 
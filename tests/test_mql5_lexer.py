@@ -0,0 +1,147 @@
+"""
+Tests for the MQL5 Lexer
+
+Tests tokenization, input declaration parsing and the structural queries
+used by parameter extraction, code injection and the compile cache.
+"""
+import time
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from modules.mql5_lexer import decode_source, lex, tokenize
+from modules.params import extract_params
+from modules.injector import has_ontester, inject_ontester, inject_safety
+
+
+class TestTokenize:
+    """Tests for the tokenizer."""
+
+    def test_token_kinds(self):
+        """Comments, strings and directives are single tokens."""
+        code = '#include <Trade/Trade.mqh>\nstring s = "a // b"; /* x;\ny */ double d = 1.5e3;'
+        kinds = [(t.kind, t.text) for t in tokenize(code)]
+
+        assert kinds[0] == ('directive', '#include <Trade/Trade.mqh>')
+        assert ('string', '"a // b"') in kinds
+        assert ('comment', '/* x;\ny */') in kinds
+        assert ('number', '1.5e3') in kinds
+
+    def test_directive_continuation(self):
+        code = '#define SUM(a, b) \\\n    ((a) + (b))\nint x;'
+        tokens = tokenize(code)
+        assert tokens[0].kind == 'directive'
+        assert tokens[0].text.endswith('((a) + (b))')
+        assert tokens[1].text == 'int'
+
+    def test_lex_cached_by_content(self):
+        code = 'input int A = 1;'
+        assert lex(code) is lex(str(code))
+        assert lex(code) is not lex(code + ' ')
+
+
+class TestInputs:
+    """Tests for input declaration parsing."""
+
+    def test_multiline_and_commented_inputs(self):
+        """Declarations split over lines are found; commented ones are not."""
+        code = '''
+/*
+input int Disabled = 5;
+*/
+// input int AlsoDisabled = 6;
+input double
+    Lots = 0.1;    // Lot size
+sinput string Note = "a; b // c";
+input group "Risk";
+input int Fast = 5, Slow = 20;  // MA periods
+void OnTick() { int input_like = 1; }
+'''
+        inputs = lex(code).inputs()
+
+        assert [p['name'] for p in inputs] == ['Lots', 'Note', 'Fast', 'Slow']
+        lots = inputs[0]
+        assert lots['type'] == 'double' and lots['default'] == '0.1'
+        assert lots['comment'] == 'Lot size'
+        assert lots['line'] == 6
+        assert inputs[1]['keyword'] == 'sinput' and inputs[1]['default'] == '"a; b // c"'
+        assert inputs[1]['comment'] is None
+        assert inputs[3]['type'] == 'int' and inputs[3]['default'] == '20'
+        assert inputs[3]['comment'] == 'MA periods'
+
+    def test_group_without_semicolon(self, temp_dir):
+        """The input after a semicolon-less group header is kept."""
+        path = temp_dir / 'Grouped.mq5'
+        path.write_text('input group "Main"\ninput int FastMA = 10;\ninput group "Risk"\nsinput double Lots = 0.1;\n')
+
+        assert [p['name'] for p in lex(path.read_text()).inputs()] == ['FastMA', 'Lots']
+        assert [p['name'] for p in extract_params(str(path))] == ['FastMA', 'Lots']
+
+    def test_only_global_scope(self):
+        code = 'class C { input int X = 1; };\ninput int Y = 2;'
+        assert [p['name'] for p in lex(code).inputs()] == ['Y']
+
+    def test_results_are_copies(self):
+        code = 'input int Z = 3;'
+        lex(code).inputs()[0]['name'] = 'changed'
+        assert lex(code).inputs()[0]['name'] == 'Z'
+
+    def test_utf16_source(self, temp_dir):
+        """MetaEditor's UTF-16 files are decoded before lexing."""
+        path = temp_dir / 'Wide.mq5'
+        path.write_bytes('﻿input int Period = 14; // Period\n'.encode('utf-16-le'))
+
+        assert decode_source(path.read_bytes()).startswith('input')
+        params = extract_params(str(path))
+        assert params[0]['name'] == 'Period' and params[0]['comment'] == 'Period'
+
+
+class TestStructure:
+    """Tests for the queries behind detection and injection."""
+
+    def test_function_detection_ignores_comments_and_strings(self):
+        assert has_ontester('double OnTester()\n{\n    return 1.0;\n}\n')
+        assert not has_ontester('string s = "double OnTester()";\n/* int OnTester() */\n')
+        assert not has_ontester('void OnTick() { double v = OnTester(); }')
+
+    def test_includes_skip_comments(self):
+        code = '#include <A.mqh>\n// #include <B.mqh>\n#include "C.mqh"\n'
+        assert lex(code).includes() == [('<', 'A.mqh'), ('"', 'C.mqh')]
+
+    def test_ontester_not_injected_inside_conditional(self):
+        """The OnTester block goes after the last directive outside #if blocks."""
+        code = '#property strict\n#ifdef DEBUG\n#define LOG 1\n#endif\nvoid OnTick() {}\n'
+        modified, injected = inject_ontester(code)
+
+        assert injected
+        assert modified.index('double OnTester()') > modified.index('#endif')
+        assert modified.index('double OnTester()') < modified.index('void OnTick()')
+
+    def test_safety_after_header_box(self, sample_ea_code):
+        modified, injected = inject_safety(sample_ea_code)
+
+        assert injected
+        header_close = sample_ea_code.index('#property') - 1
+        assert modified[:header_close] == sample_ea_code[:header_close]
+        assert modified.index('#define STRESS_TEST_MODE') < modified.index('#property')
+        assert modified.index('EAStressSafety_MaxSpreadPips') > modified.index('#define STRESS_TEST_MODE')
+
+    def test_safety_mentioned_in_comment_still_injected(self):
+        code = '// TODO: STRESS_TEST_MODE\nvoid OnTick() {}\n'
+        modified, injected = inject_safety(code)
+        assert injected and '#define STRESS_TEST_MODE true' in modified
+
+    def test_large_source_is_fast(self):
+        """A ~20k line EA lexes and parses well under a second."""
+        body = ''.join(
+            f'input double P{i} = {i}.5; // param {i}\n'
+            f'double F{i}(double x) {{ /* c */ return x * P{i} + "s".Length(); }}\n'
+            for i in range(10000)
+        )
+        start = time.perf_counter()
+        source = lex(body)
+        inputs = source.inputs()
+        elapsed = time.perf_counter() - start
+
+        assert len(inputs) == 10000
+        assert elapsed < 2.0
@@ -0,0 +1,176 @@
+"""
+Tests for Step 14 Multi-Pair Runs
+
+Tests that child workflows reuse the parent's prepared EA (Steps 1-3), run
+concurrently across terminals and publish combined progress.
+"""
+import json
+import threading
+import time
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+from engine.runner import WorkflowRunner
+
+
+@pytest.fixture
+def workspace(temp_dir, monkeypatch):
+    """Two registered terminals and a runs dir under temp_dir."""
+    config = {}
+    for name in ('A', 'B'):
+        data_path = temp_dir / name
+        (data_path / 'MQL5' / 'Experts').mkdir(parents=True)
+        config[name] = {
+            'path': str(temp_dir / name / 'terminal64.exe'),
+            'data_path': str(data_path),
+            'default': name == 'A',
+        }
+    (temp_dir / 'terminals.json').write_text(json.dumps(config))
+    monkeypatch.chdir(temp_dir)
+    monkeypatch.setattr(settings, 'RUNS_DIR', str(temp_dir / 'runs'), raising=False)
+    monkeypatch.setattr(settings, 'WORKFLOW_CATALOG', False, raising=False)
+    monkeypatch.setattr(settings, 'REPORT_SUMMARY_SIDECARS', False, raising=False)
+    return temp_dir
+
+
+@pytest.fixture
+def parent(workspace, sample_ea_code):
+    """A runner on terminal A whose Steps 1-4 have passed."""
+    experts = workspace / 'A' / 'MQL5' / 'Experts'
+    ea = experts / 'TestEA.mq5'
+    ea.write_text(sample_ea_code)
+    modified = experts / 'TestEA_stress_test.mq5'
+    modified.write_text(sample_ea_code)
+    compiled = experts / 'TestEA_stress_test.ex5'
+    compiled.write_bytes(b'EX5' * 100)
+
+    runner = WorkflowRunner(str(ea), terminal_name='A', symbol='GBPUSD')
+    runner.modified_ea_path = str(modified)
+    runner.compiled_ea_path = str(compiled)
+    runner.params = [{'name': 'Period', 'type': 'int', 'default': '14'}]
+    runner.wide_validation_params = {'Period': 5}
+    runner.param_ranges = [{'name': 'Period', 'start': 5, 'step': 5, 'stop': 50, 'optimize': True}]
+    results = {
+        '1_load_ea': {'path': str(ea), 'exists': True},
+        '1b_inject_ontester': {'success': True, 'modified_path': str(modified)},
+        '1c_inject_safety': {'safety_injected': True, 'path': str(modified)},
+        '2_compile': {'success': True, 'exe_path': str(compiled)},
+        '3_extract_params': {'params': runner.params, 'count': 1},
+    }
+    for step_name, result in results.items():
+        runner.state.start_step(step_name)
+        runner.state.complete_step(step_name, True, result)
+    runner.state.update_gates({'compilation': {'passed': True}, 'params_found': {'passed': True}})
+    return runner
+
+
+class TestAdoptPrepared:
+    """Tests for reusing Steps 1-3 in a child workflow."""
+
+    def test_same_terminal_reuses_files(self, parent):
+        child = WorkflowRunner(str(parent.ea_path), terminal_name='A', symbol='EURUSD')
+        summary = child.adopt_prepared(parent)
+
+        assert summary['status'] == 'awaiting_param_analysis'
+        assert child.compiled_ea_path == parent.compiled_ea_path
+        assert child.params == parent.params
+        steps = child.state.get('steps')
+        assert all(steps[s]['status'] == 'passed' for s in ('1_load_ea', '2_compile', '3_extract_params'))
+        assert steps['2_compile']['result']['reused_from'] == parent.state.workflow_id
+        assert child.state.get('gates')['compilation'] == {'passed': True}
+
+    def test_other_terminal_gets_copies(self, parent, workspace):
+        child = WorkflowRunner(str(parent.ea_path), terminal_name='B', symbol='EURUSD')
+        child.adopt_prepared(parent)
+
+        staged = workspace / 'B' / 'MQL5' / 'Experts' / 'TestEA_stress_test.ex5'
+        assert child.compiled_ea_path == str(staged)
+        assert staged.read_bytes() == Path(parent.compiled_ea_path).read_bytes()
+        assert child.state.get_step_result('2_compile')['exe_path'] == str(staged)
+
+        # Restoring a loaded child finds the staged copies
+        loaded = WorkflowRunner.from_workflow_id(child.state.workflow_id)
+        loaded._restore_paths_from_state()
+        assert loaded.compiled_ea_path == str(staged)
+        assert loaded.modified_ea_path.startswith(str(workspace / 'B'))
+
+    def test_requires_prepared_parent(self, parent):
+        parent.state.complete_step('2_compile', False, {'success': False})
+        child = WorkflowRunner(str(parent.ea_path), terminal_name='A', symbol='EURUSD')
+        with pytest.raises(ValueError):
+            child.adopt_prepared(parent)
+
+
+class TestMultiPairFanOut:
+    """Tests for running children concurrently across terminals."""
+
+    @pytest.fixture
+    def fake_children(self, monkeypatch):
+        """Children record where they ran instead of running MT5 steps."""
+        calls = []
+        lock = threading.Lock()
+        active = {'now': 0, 'max': 0}
+
+        def continue_with_params(self, wide_validation_params, optimization_ranges, stop_on_failure=True, force=False):
+            with lock:
+                active['now'] += 1
+                active['max'] = max(active['max'], active['now'])
+                calls.append({
+                    'symbol': self.symbol,
+                    'terminal': self.terminal['name'],
+                    'compiled': self.compiled_ea_path,
+                    'wide': wide_validation_params,
+                })
+            self.state.start_step('5_validate_trades')
+            self._step_done('5_validate_trades', True, {})
+            time.sleep(0.2)
+            with lock:
+                active['now'] -= 1
+            self.state.complete_workflow(True)
+            return {**self.state.get_summary(), 'composite_score': 7.5}
+
+        monkeypatch.setattr(WorkflowRunner, 'continue_with_params', continue_with_params)
+        return calls, active
+
+    def test_children_fan_out_across_terminals(self, parent, fake_children, monkeypatch):
+        calls, active = fake_children
+        monkeypatch.setattr(settings, 'MULTI_PAIR_TERMINALS', ['A', 'B'], raising=False)
+        parent.multi_pair_symbols = ['EURUSD', 'USDJPY', 'GBPUSD', 'AUDUSD']
+        messages = []
+        parent.on_progress = messages.append
+
+        passed, result = parent._step_multi_pair()
+
+        assert passed
+        assert [r['symbol'] for r in result['runs']] == ['EURUSD', 'USDJPY', 'AUDUSD']
+        assert all(r['status'] == 'completed' and r['composite_score'] == 7.5 for r in result['runs'])
+        assert active['max'] == 2
+        assert {c['terminal'] for c in calls} == {'A', 'B'}
+        assert all(c['wide'] == {'Period': 5} for c in calls)
+        for c in calls:
+            assert Path(c['compiled']).parent == Path(settings.RUNS_DIR).parent / c['terminal'] / 'MQL5' / 'Experts'
+
+        # No child re-ran injection/compilation
+        assert not any('Starting step: 2_compile' in m for m in messages)
+        assert any(m.startswith('Multi-pair [3/3 done]') for m in messages)
+        assert any(m.startswith('[USDJPY] ') for m in messages)
+
+        stored = parent.state.get('multi_pair_runs')
+        assert stored['terminals'] == ['A', 'B'] and 'in_progress' not in stored
+
+    def test_single_terminal_runs_one_by_one(self, parent, fake_children):
+        calls, active = fake_children
+        parent.multi_pair_symbols = ['EURUSD', 'USDJPY']
+
+        passed, result = parent._step_multi_pair()
+
+        assert passed and len(result['runs']) == 2
+        assert active['max'] == 1
+        assert {c['terminal'] for c in calls} == {'A'}
+
+    def test_unknown_terminals_ignored(self, parent, monkeypatch):
+        monkeypatch.setattr(settings, 'MULTI_PAIR_TERMINALS', ['Nope', 'B', 'B'], raising=False)
+        assert parent._multi_pair_terminals() == ['B']
@@ -0,0 +1,176 @@
+"""
+Tests for the MQL5 Reference Page Cache
+
+Tests compressed page storage, PDF-hash keying, LRU eviction, prewarming
+and that fully cached lookups never open the PDF. A small stand-in document
+takes the place of the PyMuPDF one.
+"""
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+from reference.mql5_indexer import MQL5Reference
+from reference.page_cache import PageCache, split_pages
+
+
+class FakePage:
+    def __init__(self, doc, number):
+        self.doc = doc
+        self.number = number
+
+    def get_text(self):
+        self.doc.extracted.append(self.number + 1)
+        return f"Page {self.number + 1} text\nCopyRates OrderSend {'x' * 200}\n"
+
+
+class FakeDoc:
+    """Stand-in for a PyMuPDF document."""
+
+    def __init__(self, pages=7040):
+        self.pages = pages
+        self.extracted = []
+
+    def __len__(self):
+        return self.pages
+
+    def __getitem__(self, i):
+        return FakePage(self, i)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pdf(temp_dir):
+    path = temp_dir / 'mql5.pdf'
+    path.write_bytes(b'%PDF-1.7 edition one')
+    return path
+
+
+def _ref(pdf, temp_dir, doc=None):
+    ref = MQL5Reference(pdf_path=str(pdf), cache_dir=str(temp_dir / 'cache'))
+    if doc is not None:
+        ref._doc = doc
+    return ref
+
+
+class TestPageCache:
+    """Tests for the PageCache store."""
+
+    def test_round_trip_compressed(self, temp_dir):
+        cache = PageCache(temp_dir / 'pages.sqlite')
+        text = 'OrderSend ' * 500
+        cache.put_many('pdf1', {5: text, 6: 'six'})
+
+        assert cache.get_many('pdf1', [5, 6, 7]) == {5: text, 6: 'six'}
+        assert cache.get_many('other', [5]) == {}
+        assert cache.stats()['bytes'] < len(text) / 5
+        cache.close()
+
+    def test_lru_eviction(self, temp_dir):
+        """Least recently used pages go first once the byte budget is exceeded."""
+        cache = PageCache(temp_dir / 'pages.sqlite')
+        cache.put_many('pdf1', {1: 'a' * 1000, 2: 'b' * 1000})
+        size = cache.total_bytes() // 2
+        cache.max_bytes = size * 2
+
+        cache.get_many('pdf1', [1])  # page 2 is now the LRU page
+        cache.put_many('pdf1', {3: 'c' * 1000})
+
+        assert set(cache.get_many('pdf1', [1, 2, 3])) == {1, 3}
+        assert cache.total_bytes() <= cache.max_bytes
+        cache.close()
+
+    def test_split_pages(self):
+        text = '=== CopyRates (Pages 10-11) ===\n\n--- Page 10 ---\nfirst\n\n\n--- Page 11 ---\nsecond\n'
+        assert split_pages(text) == {10: 'first\n', 11: 'second\n'}
+
+
+class TestReferencePages:
+    """Tests for MQL5Reference page lookups through the cache."""
+
+    def test_cached_lookup_does_not_open_pdf(self, pdf, temp_dir):
+        doc = FakeDoc()
+        ref = _ref(pdf, temp_dir, doc)
+        first = ref.extract_pages(100, 102)
+        assert doc.extracted == [100, 101, 102]
+        ref.close()
+
+        # No document is available now (PyMuPDF is not needed for cached pages)
+        ref = _ref(pdf, temp_dir)
+        assert ref.extract_pages(100, 102) == first
+        assert ref._doc is None
+        assert split_pages(first)[101].startswith('Page 101 text')
+
+        # Partially cached: only the missing page is extracted
+        doc = FakeDoc()
+        ref._doc = doc
+        ref.extract_pages(101, 103)
+        assert doc.extracted == [103]
+        ref.close()
+
+    def test_new_pdf_edition_misses(self, pdf, temp_dir):
+        doc = FakeDoc()
+        ref = _ref(pdf, temp_dir, doc)
+        ref.extract_pages(1, 2)
+        ref.close()
+
+        pdf.write_bytes(b'%PDF-1.7 edition two, longer')
+        doc = FakeDoc()
+        ref = _ref(pdf, temp_dir, doc)
+        ref.extract_pages(1, 2)
+        assert doc.extracted == [1, 2]
+        ref.close()
+
+    def test_missing_pdf_uses_last_seen(self, pdf, temp_dir):
+        ref = _ref(pdf, temp_dir, FakeDoc())
+        text = ref.extract_pages(7, 8)
+        ref.close()
+
+        ref = _ref(temp_dir / 'moved.pdf', temp_dir)
+        assert ref.extract_pages(7, 8) == text
+        ref.close()
+
+    def test_prewarm_most_used_and_topics(self, pdf, temp_dir):
+        ref = _ref(pdf, temp_dir, FakeDoc())
+        for _ in range(3):
+            ref.extract_pages(500, 501)
+        ref.extract_pages(600, 600)
+        assert ref.page_cache.most_used(1) == [(500, 501)]
+        ref.close()
+
+        doc = FakeDoc()
+        ref = _ref(pdf, temp_dir, doc)
+        result = ref.prewarm(limit=2, topics=['CopyRates'])
+        assert result['pages'] > 3
+        assert result['extracted'] == result['pages'] - 3
+        assert 500 not in doc.extracted
+
+        best = ref.search('CopyRates', 1)[0]
+        start = int(best['pages'].split('-')[0])
+        ref._doc = None
+        assert f'--- Page {start} ---' in ref.get_topic('CopyRates')
+        ref.close()
+
+    def test_import_topic_files(self, pdf, temp_dir):
+        cache_dir = temp_dir / 'cache'
+        cache_dir.mkdir()
+        (cache_dir / 'copyrates.txt').write_text(
+            '=== CopyRates (Pages 20-21) ===\n\n--- Page 20 ---\nalpha\n\n\n--- Page 21 ---\nbeta\n'
+        )
+        ref = _ref(pdf, temp_dir)
+        assert ref.import_topic_files() == 2
+        assert ref.extract_pages(20, 21) == '\n--- Page 20 ---\nalpha\n\n\n--- Page 21 ---\nbeta\n'
+        ref.close()
+
+    def test_disabled(self, pdf, temp_dir, monkeypatch):
+        monkeypatch.setattr(settings, 'REFERENCE_PAGE_CACHE_BYTES', 0, raising=False)
+        doc = FakeDoc()
+        ref = _ref(pdf, temp_dir, doc)
+        ref.extract_pages(1, 1)
+        ref.extract_pages(1, 1)
+        assert doc.extracted == [1, 1]
+        assert not (temp_dir / 'cache' / 'pages.sqlite').exists()
+        ref.close()
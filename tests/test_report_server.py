@@ -0,0 +1,213 @@
+"""
+Tests for the Report Server
+
+Tests the catalog page queries behind the JSON API and the HTTP layer
+(pagination endpoints, gzip, ETag / 304, static file confinement).
+"""
+import gzip
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from engine.state import StateManager
+from reports.catalog import WorkflowCatalog
+from reports.server import make_server
+
+
+def _make_workflow(runs_dir, ea_name, symbol='EURUSD', status='completed', profits=(100, 200, 300)):
+    state = StateManager(
+        ea_name=ea_name,
+        ea_path=f'/path/to/{ea_name}.mq5',
+        terminal='TestBroker',
+        symbol=symbol,
+        runs_dir=str(runs_dir),
+    )
+    state.complete_step('9_backtest_robust', True, {'all_results': [
+        {
+            'pass_num': n,
+            'profit': profit,
+            'profit_factor': 1.5,
+            'max_drawdown_pct': 10.0,
+            'total_trades': 100,
+            'forward_result': profit / 2,
+            'back_result': profit / 2,
+        }
+        for n, profit in enumerate(profits, 1)
+    ]})
+    state.set('stress_scenarios', {'scenarios': [
+        {'id': 'latency', 'label': 'Latency 250ms', 'variant': 'latency', 'result': {'profit': 50}},
+        {'id': 'spread', 'label': 'Wide spread', 'result': {'profit': -20}},
+    ]})
+    state.set_status(status)
+    return state
+
+
+@pytest.fixture
+def runs(temp_dir):
+    runs_dir = Path(temp_dir) / 'runs'
+    _make_workflow(runs_dir, 'EA_Alpha', 'EURUSD', profits=(100, 900))
+    _make_workflow(runs_dir, 'EA_Beta', 'GBPUSD', profits=(400,))
+    _make_workflow(runs_dir, 'EA_Broken', 'USDJPY', status='failed')
+    return runs_dir
+
+
+@pytest.fixture
+def server(runs):
+    srv = make_server(str(runs), host='127.0.0.1', port=0, quiet=True)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    thread.join(timeout=5)
+
+
+def _get(srv, path, headers=None):
+    """(status, headers, body) for a GET; HTTP errors are returned, not raised."""
+    req = urllib.request.Request(srv.url.rstrip('/') + path, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as res:
+            return res.status, res.headers, res.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def _json(srv, path):
+    status, _, body = _get(srv, path)
+    assert status == 200, body
+    return json.loads(body)
+
+
+class TestCatalogPages:
+    """Tests for the paginated catalog queries."""
+
+    @pytest.fixture
+    def catalog(self, runs):
+        cat = WorkflowCatalog(str(runs))
+        cat.sync()
+        yield cat
+        cat.close()
+
+    def test_board_workflows_sorted_and_paged(self, catalog):
+        """Sorting and LIMIT/OFFSET happen in SQL; total ignores the page."""
+        rows, total = catalog.board_page('workflows', exclude_statuses={'failed'}, sort='ea_name', descending=False, limit=1)
+        assert total == 2
+        assert [r['ea_name'] for r in rows] == ['EA_Alpha']
+
+        rows, _ = catalog.board_page('workflows', exclude_statuses={'failed'}, sort='ea_name', descending=False, limit=1, offset=1)
+        assert [r['ea_name'] for r in rows] == ['EA_Beta']
+
+    def test_board_filters_and_search(self, catalog):
+        """Exact filters and case-insensitive search narrow the rows."""
+        rows, total = catalog.board_page('scenarios', filters={'variant': 'base'}, search='alpha')
+        assert total == 1
+        assert rows[0]['scenario_id'] == 'spread' and rows[0]['ea_name'] == 'EA_Alpha'
+
+        _, total = catalog.board_page('workflows', filters={'symbol': 'GBPUSD'})
+        assert total == 1
+
+        _, total = catalog.board_page('workflows', search='100%')
+        assert total == 0
+
+    def test_unknown_sort_or_filter_rejected(self, catalog):
+        """Only whitelisted keys reach the SQL."""
+        with pytest.raises(ValueError):
+            catalog.board_page('workflows', sort='profit_num; DROP TABLE workflows')
+        with pytest.raises(ValueError):
+            catalog.board_page('workflows', filters={'variant': 'base'})
+        with pytest.raises(ValueError):
+            catalog.leaderboard_page(sort='nope')
+
+    def test_leaderboard_rank_is_global(self, catalog):
+        """rank is the position by score, independent of filters and sort."""
+        all_rows, total, workflows = catalog.leaderboard_page(exclude_statuses={'failed'})
+        assert total == 3 and workflows == 2
+        assert [r['rank'] for r in all_rows] == [1, 2, 3]
+        scores = [r['score_num'] for r in all_rows]
+        assert scores == sorted(scores, reverse=True)
+
+        rows, total, _ = catalog.leaderboard_page(exclude_statuses={'failed'}, search='beta')
+        assert total == 1
+        beta = next(r for r in all_rows if r['ea_name'] == 'EA_Beta')
+        assert rows[0]['rank'] == beta['rank']
+
+
+class TestServer:
+    """Tests for the HTTP layer."""
+
+    def test_health_and_unknown_endpoint(self, server):
+        assert _json(server, '/api/health') == {'ok': True, 'api': 1}
+        status, _, _ = _get(server, '/api/nope')
+        assert status == 404
+
+    def test_board_workflows_endpoint(self, server):
+        """Excluded statuses are dropped and pagination metadata is returned."""
+        page = _json(server, '/api/boards/workflows?sort=ea_name&desc=0&page=2&page_size=1')
+        assert page['total'] == 2
+        assert page['pages'] == 2
+        assert [r['ea_name'] for r in page['rows']] == ['EA_Beta']
+
+        facets = _json(server, '/api/boards/facets')
+        assert facets['ea_name'] == ['EA_Alpha', 'EA_Beta']
+        assert facets['variant'] == ['base', 'latency']
+        assert facets['counts']['scenarios'] == 4
+
+    def test_scenarios_and_leaderboard_endpoints(self, server):
+        page = _json(server, '/api/boards/scenarios?variant=latency&sort=profit_num')
+        assert page['total'] == 2
+        assert {r['variant'] for r in page['rows']} == {'latency'}
+
+        board = _json(server, '/api/leaderboard?sort=profit&desc=1')
+        assert board['workflows_processed'] == 2
+        assert [r['profit_num'] for r in board['rows']] == [900, 400, 100]
+
+    def test_bad_parameters_are_400(self, server):
+        assert _get(server, '/api/boards/workflows?sort=bogus')[0] == 400
+        assert _get(server, '/api/leaderboard?page=0')[0] == 400
+        assert _get(server, '/api/leaderboard?page_size=x')[0] == 400
+
+    def test_api_etag_and_gzip(self, server):
+        """Unchanged API responses revalidate with 304; gzip when accepted."""
+        status, headers, body = _get(server, '/api/boards/scenarios', {'Accept-Encoding': 'gzip'})
+        assert status == 200
+        assert headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(body))['total'] == 4
+
+        status, _, body = _get(server, '/api/boards/scenarios', {
+            'Accept-Encoding': 'gzip', 'If-None-Match': headers['ETag'],
+        })
+        assert status == 304 and body == b''
+
+    def test_static_files(self, server, runs):
+        """Report files are served with gzip + ETag; anything else is 404."""
+        boards = runs / 'boards'
+        boards.mkdir()
+        (boards / 'index.html').write_text('<html>' + 'x' * 5000 + '</html>')
+
+        status, headers, body = _get(server, '/boards/', {'Accept-Encoding': 'gzip'})
+        assert status == 200
+        assert headers['Content-Type'].startswith('text/html')
+        assert gzip.decompress(body).startswith(b'<html>')
+
+        status, _, _ = _get(server, '/boards/', {'Accept-Encoding': 'gzip', 'If-None-Match': headers['ETag']})
+        assert status == 304
+
+        status, headers, body = _get(server, '/boards/index.html')
+        assert status == 200 and 'Content-Encoding' not in headers
+        assert len(body) == len('<html></html>') + 5000
+
+        for path in ('/catalog.sqlite', '/boards/../catalog.sqlite', '/boards/%2e%2e/catalog.sqlite', '/boards/missing.html'):
+            assert _get(server, path)[0] == 404, path
+
+    def test_live_sync(self, server, runs):
+        """Workflows written after startup appear once the sync interval passes."""
+        server.sync_seconds = 0
+        assert _json(server, '/api/boards/workflows')['total'] == 2
+        _make_workflow(runs, 'EA_Gamma', 'AUDUSD')
+        assert _json(server, '/api/boards/workflows')['total'] == 3
@@ -0,0 +1,113 @@
+"""
+Tests for Rolling Surface Module
+
+Checks the single-sweep rolling series against per-window engine queries,
+worst-window summaries and float32 storage round-trips.
+"""
+import random
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from modules.window_metrics import WindowMetricsEngine
+from modules.rolling_surface import (
+    compute_rolling_surface,
+    summarize_surface,
+    save_rolling_surfaces,
+    load_rolling_index,
+    load_rolling_series,
+)
+
+
+START = datetime(2022, 1, 1)
+END = datetime(2023, 1, 1)
+
+
+@pytest.fixture
+def engine():
+    rng = random.Random(3)
+    times = sorted(START + timedelta(hours=rng.randint(0, 24 * 360)) for _ in range(300))
+    profits = [round(rng.gauss(4, 30), 2) for _ in times]
+    return WindowMetricsEngine(times, profits, initial_balance=3000)
+
+
+class TestComputeRollingSurface:
+    """Tests for compute_rolling_surface."""
+
+    def test_matches_window_queries(self, engine):
+        """Sweep results equal independent window queries (within float32 precision)."""
+        surface = compute_rolling_surface(engine, START, END, [30, 90], step_days=1)
+        win = surface['windows']['30']
+        series = win['series']
+
+        for k in range(0, win['count'], 17):
+            we = START + timedelta(days=30 + k)
+            want = engine.metrics(we - timedelta(days=30), we)
+            assert series['total_trades'][k] == want['total_trades']
+            assert series['profit'][k] == pytest.approx(want['profit'], rel=1e-5, abs=1e-2)
+            assert series['max_drawdown_pct'][k] == pytest.approx(want['max_drawdown_pct'], rel=1e-5, abs=1e-4)
+            assert series['win_rate'][k] == pytest.approx(want['win_rate'], rel=1e-5)
+
+    def test_window_count(self, engine):
+        """One window per step from the first full window to the end date."""
+        surface = compute_rolling_surface(engine, START, END, [30], step_days=7)
+        expected = ((END - START).days - 30) // 7 + 1
+        assert surface['windows']['30']['count'] == expected
+        assert surface['step_days'] == 7
+
+    def test_invalid_lengths_ignored(self, engine):
+        """Non-positive or non-numeric window lengths are skipped."""
+        surface = compute_rolling_surface(engine, START, END, [0, -5, 'x', 60])
+        assert list(surface['windows'].keys()) == ['60']
+
+
+class TestSummarizeSurface:
+    """Tests for worst-window statistics."""
+
+    def test_worst_values(self):
+        """Worst profit and max drawdown point at the right windows."""
+        times = [datetime(2024, 1, 5), datetime(2024, 2, 5), datetime(2024, 3, 5)]
+        eng = WindowMetricsEngine(times, [100, -300, 50], initial_balance=1000)
+        surface = compute_rolling_surface(eng, datetime(2024, 1, 1), datetime(2024, 4, 1), [10])
+        summary = summarize_surface(surface, min_trades=1)['10']
+
+        assert summary['worst_profit'] == pytest.approx(-300)
+        assert summary['max_drawdown_pct'] == round(300 / 1100 * 100, 2)
+        assert summary['worst_profit_end'] >= '2024.02.05'
+        assert 50.0 < summary['profitable_pct'] < 100.0
+
+    def test_min_trades_filter(self, engine):
+        """PF/win-rate worst values are None when no window meets min_trades."""
+        surface = compute_rolling_surface(engine, START, END, [30])
+        summary = summarize_surface(surface, min_trades=10_000)['30']
+        assert summary['worst_profit_factor'] is None
+        assert summary['worst_win_rate'] is None
+
+
+class TestStorage:
+    """Tests for float32 storage."""
+
+    def test_round_trip(self, engine, temp_dir):
+        """Saved series can be read back individually."""
+        surface = compute_rolling_surface(engine, START, END, [30, 60])
+        summary = summarize_surface(surface)
+        index_path = save_rolling_surfaces(temp_dir, {7: surface}, {7: summary}, [30, 60])
+
+        index = load_rolling_index(index_path)
+        assert index['dtype'] == 'float32'
+        assert index['passes']['7']['worst'] == summary
+
+        loaded = load_rolling_series(index_path, 7, 60, 'profit_factor')
+        assert list(loaded) == list(surface['windows']['60']['series']['profit_factor'])
+        assert (temp_dir / 'rolling_surfaces.bin').stat().st_size == sum(
+            len(w['series'][m]) * 4 for w in surface['windows'].values() for m in w['series']
+        )
+
+    def test_missing_series(self, engine, temp_dir):
+        """Unknown pass/window returns an empty array."""
+        surface = compute_rolling_surface(engine, START, END, [30])
+        index_path = save_rolling_surfaces(temp_dir, {1: surface}, {}, [30])
+        assert len(load_rolling_series(index_path, 2, 30, 'profit')) == 0
+        assert len(load_rolling_series(index_path, 1, 90, 'profit')) == 0
@@ -0,0 +1,203 @@
+"""
+Tests for the Step Scheduler
+
+Tests the dependency graph, concurrent execution of independent steps,
+terminal leases, stop_on_failure skipping and the runner's checkpoints.
+"""
+import threading
+import time
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+from engine.scheduler import Leases, StepScheduler, StepSpec
+from engine.state import StateManager
+
+
+def _step(log, name, passed=True, delay=0.0, error=None):
+    def fn():
+        log.append(('start', name))
+        time.sleep(delay)
+        log.append(('end', name))
+        if error:
+            raise RuntimeError(error)
+        return passed, {'step': name}
+    return fn
+
+
+def _post_steps(log, delays=None, failing=()):
+    """Steps 9-13 shaped like Phase 3b."""
+    delays = delays or {}
+
+    def spec(name, **kw):
+        return StepSpec(name, _step(log, name, name not in failing, delays.get(name, 0.0)), **kw)
+
+    return [
+        spec('9', kind='mt5', produces=('backtest',)),
+        spec('10', requires=('backtest',), produces=('mc',)),
+        spec('11', requires=('backtest', 'mc'), resources=('reports',), always=True),
+        spec('12', kind='mt5', requires=('backtest',), produces=('stress',), always=True),
+        spec('13', requires=('backtest',), produces=('windows',), always=True),
+    ]
+
+
+class TestGraph:
+    """Tests for dependency resolution."""
+
+    def test_dependencies_from_artifacts(self):
+        scheduler = StepScheduler(_post_steps([]))
+        assert scheduler.deps == {'9': [], '10': ['9'], '11': ['9', '10'], '12': ['9'], '13': ['9']}
+
+    def test_invalid_graphs(self):
+        noop = lambda: (True, {})
+        with pytest.raises(ValueError):
+            StepScheduler([StepSpec('a', noop), StepSpec('a', noop)])
+        with pytest.raises(ValueError):
+            StepScheduler([StepSpec('a', noop, produces=('x',)), StepSpec('b', noop, produces=('x',))])
+        with pytest.raises(ValueError):
+            StepScheduler([StepSpec('a', noop, kind='gpu')])
+        with pytest.raises(ValueError, match='cycle'):
+            StepScheduler([
+                StepSpec('a', noop, requires=('y',), produces=('x',)),
+                StepSpec('b', noop, requires=('x',), produces=('y',)),
+            ])
+
+
+class TestExecution:
+    """Tests for running the graph."""
+
+    def test_sequential_keeps_declared_order(self):
+        log = []
+        outcomes = StepScheduler(_post_steps(log), max_workers=1).run()
+        assert [n for kind, n in log if kind == 'start'] == ['9', '10', '11', '12', '13']
+        assert outcomes == {'9': True, '10': True, '11': True, '12': True, '13': True}
+
+    def test_python_steps_run_beside_mt5_step(self):
+        """Forward windows and reports do not wait for the stress scenarios."""
+        log = []
+        steps = _post_steps(log, delays={'12': 0.3})
+        StepScheduler(steps, max_workers=4).run()
+
+        end_12 = log.index(('end', '12'))
+        assert log.index(('end', '13')) < end_12
+        assert log.index(('end', '11')) < end_12
+        assert log.index(('start', '10')) > log.index(('end', '9'))
+
+    def test_mt5_steps_share_terminal_lease(self):
+        log = []
+        steps = [
+            StepSpec('a', _step(log, 'a', delay=0.1), kind='mt5'),
+            StepSpec('b', _step(log, 'b', delay=0.1), kind='mt5'),
+            StepSpec('c', _step(log, 'c', delay=0.1), kind='mt5'),
+        ]
+        StepScheduler(steps, terminal='T1', max_workers=4).run()
+        assert log == [('start', 'a'), ('end', 'a'), ('start', 'b'), ('end', 'b'), ('start', 'c'), ('end', 'c')]
+
+    def test_callbacks_run_on_calling_thread(self):
+        threads = set()
+        done = []
+
+        def on_done(name, passed, result, error):
+            threads.add(threading.get_ident())
+            done.append(name)
+
+        StepScheduler(_post_steps([]), max_workers=4).run(on_start=lambda n: threads.add(threading.get_ident()),
+                                                          on_done=on_done)
+        assert threads == {threading.get_ident()}
+        assert sorted(done) == ['10', '11', '12', '13', '9']
+
+    def test_external_lease_blocks_step(self):
+        """A lease held by the step body (e.g. report output) delays steps declaring it."""
+        leases = Leases()
+        log = []
+        steps = [StepSpec('11', _step(log, '11'), resources=('reports',))]
+        with leases.hold('reports'):
+            t = threading.Thread(target=lambda: StepScheduler(steps, max_workers=2, leases=leases).run())
+            t.start()
+            time.sleep(0.1)
+            assert log == []
+        t.join(5)
+        assert log == [('start', '11'), ('end', '11')]
+
+    def test_scoped_leases_share_only_reports(self):
+        """A child view waits on the owner's 'reports' lease but not on its terminal leases."""
+        leases = Leases()
+        child = leases.scoped('multi_pair:EURUSD')
+        assert leases.try_acquire(['terminal:T1'])
+        assert child.try_acquire(['terminal:T1'])
+        assert not leases.scoped('multi_pair:EURUSD').try_acquire(['terminal:T1'])
+
+        log = []
+        steps = [StepSpec('11', _step(log, '11'), resources=('reports',))]
+        with leases.hold('reports'):
+            t = threading.Thread(target=lambda: StepScheduler(steps, max_workers=2, leases=child).run())
+            t.start()
+            time.sleep(0.1)
+            assert log == []
+        t.join(5)
+        assert log == [('start', '11'), ('end', '11')]
+
+        child.release(['terminal:T1'])
+        assert child.try_acquire(['terminal:T1'])
+
+
+class TestFailures:
+    """Tests for stop_on_failure semantics."""
+
+    def test_failure_skips_gated_steps_but_not_post_steps(self):
+        log = []
+        skipped = []
+        outcomes = StepScheduler(_post_steps(log, failing={'9'}), max_workers=4).run(
+            stop_on_failure=True, on_skip=skipped.append,
+        )
+        assert outcomes == {'9': False, '10': None, '11': True, '12': True, '13': True}
+        assert skipped == ['10']
+
+    def test_no_stop_on_failure_runs_everything(self):
+        outcomes = StepScheduler(_post_steps([], failing={'9'}), max_workers=4).run(stop_on_failure=False)
+        assert outcomes['10'] is True
+
+    def test_exception_reported_as_failure(self):
+        errors = {}
+        steps = [StepSpec('a', _step([], 'a', error='boom'))]
+        outcomes = StepScheduler(steps, max_workers=2).run(
+            on_done=lambda name, passed, result, error: errors.update({name: (result, error)}),
+        )
+        assert outcomes == {'a': False}
+        assert errors['a'] == ({'error': 'boom'}, 'boom')
+
+
+class TestRunnerCheckpoints:
+    """Tests for WorkflowRunner._run_steps state checkpoints."""
+
+    @pytest.fixture
+    def runner(self, temp_dir, monkeypatch):
+        from engine.runner import WorkflowRunner
+
+        monkeypatch.setattr(settings, 'WORKFLOW_CATALOG', False, raising=False)
+        monkeypatch.setattr(settings, 'REPORT_SUMMARY_SIDECARS', False, raising=False)
+        monkeypatch.setattr(settings, 'STEP_WORKERS', 4, raising=False)
+        runner = WorkflowRunner.__new__(WorkflowRunner)
+        runner.state = StateManager('TestEA', '/ea/TestEA.mq5', 'T1', runs_dir=str(temp_dir))
+        runner.terminal = {'name': 'T1'}
+        runner.on_step_complete = None
+        runner.on_progress = None
+        return runner
+
+    def test_steps_checkpointed(self, runner):
+        completed = []
+        runner.on_step_complete = lambda name, passed, result: completed.append((name, passed))
+        steps = _post_steps([], delays={'12': 0.1}, failing={'13'})
+        steps[2] = StepSpec('11', _step([], '11', error='render failed'), requires=('backtest', 'mc'), always=True)
+
+        outcomes = runner._run_steps(steps, stop_on_failure=True)
+
+        assert outcomes == {'9': True, '10': True, '11': False, '12': True, '13': False}
+        assert sorted(completed) == sorted(outcomes.items())
+        reloaded = StateManager.load(runner.state.workflow_id, str(runner.state.runs_dir))
+        steps_state = reloaded.get('steps')
+        assert steps_state['12']['status'] == 'passed'
+        assert steps_state['13']['status'] == 'failed'
+        assert steps_state['11']['error'] == 'render failed'
@@ -0,0 +1,124 @@
+"""
+Tests for the MQL5 Reference Search Index
+
+Tests term analysis, the binary index round trip, BM25 ranking with prefix
+matching and the reference lookup running on the shipped index.
+"""
+import json
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from reference.search_index import (
+    SearchIndex,
+    analyze,
+    build_search_index,
+    open_search_index,
+)
+
+
+ENTRIES = [
+    {'title': 'Trade Functions', 'level': 2, 'start_page': 2250, 'end_page': 2350},
+    {'title': 'OrderSend', 'level': 3, 'start_page': 2264, 'end_page': 2268},
+    {'title': 'OrderSendAsync', 'level': 3, 'start_page': 2269, 'end_page': 2279},
+    {'title': 'CTrade', 'level': 3, 'start_page': 5851, 'end_page': 5923},
+    {'title': 'CopyRates', 'level': 3, 'start_page': 2041, 'end_page': 2044},
+    {'title': 'HistoryOrderSelect', 'level': 3, 'start_page': 2323, 'end_page': 2325},
+    {'title': 'Ümlaut Title', 'level': 4, 'start_page': 1, 'end_page': 1},
+]
+
+
+@pytest.fixture
+def index(temp_dir):
+    path = build_search_index(ENTRIES, temp_dir / 'idx.bin', total_pages=7040, source_size=123)
+    idx = SearchIndex(path)
+    yield idx
+    idx.close()
+
+
+class TestAnalyze:
+    """Tests for term analysis."""
+
+    def test_identifiers_split(self):
+        assert analyze('OrderSend') == ['ordersend', 'order', 'send']
+        assert analyze('CTrade') == ['ctrade', 'c', 'trade']
+        assert analyze('history_orders_get') == ['history_orders_get', 'history', 'orders', 'get']
+        assert analyze('Trade Functions') == ['trade', 'functions']
+
+
+class TestSearchIndex:
+    """Tests for the binary index."""
+
+    def test_round_trip(self, index):
+        assert len(index) == len(ENTRIES)
+        assert index.total_pages == 7040
+        assert index.source_size == 123
+        assert index.entry(1) == {'title': 'OrderSend', 'level': 3, 'start_page': 2264, 'end_page': 2268}
+        assert index.entry(6)['title'] == 'Ümlaut Title'
+        with pytest.raises(IndexError):
+            index.entry(len(ENTRIES))
+
+    def test_exact_identifier_ranks_first(self, index):
+        """The exact title outranks longer identifiers sharing its parts."""
+        results = index.search('OrderSend')
+        assert [r['title'] for r in results[:2]] == ['OrderSend', 'OrderSendAsync']
+        assert results[0]['pages'] == '2264-2268'
+        assert results[0]['score'] > results[1]['score']
+
+        assert index.search('ctrade')[0]['title'] == 'CTrade'
+
+    def test_prefix_matching(self, index):
+        assert index.search('copyrat')[0]['title'] == 'CopyRates'
+        assert index.search('copyrat', prefix=False) == []
+        assert index.search('co') == []  # too short to expand
+
+    def test_no_match(self, index):
+        assert index.search('nothing here') == []
+        assert index.search('') == []
+
+    def test_rejects_other_files(self, temp_dir):
+        path = temp_dir / 'bad.bin'
+        path.write_bytes(b'x' * 100)
+        with pytest.raises(ValueError):
+            SearchIndex(path)
+
+    def test_rebuilt_when_json_changes(self, temp_dir):
+        """open_search_index rebuilds when the JSON index it came from changed."""
+        json_path = temp_dir / 'idx.json'
+        bin_path = temp_dir / 'idx.bin'
+        json_path.write_text(json.dumps({'total_pages': 10, 'entries': ENTRIES[:2]}))
+        idx = open_search_index(bin_path, json_path)
+        assert len(idx) == 2
+        idx.close()
+
+        json_path.write_text(json.dumps({'total_pages': 10, 'entries': ENTRIES}))
+        idx = open_search_index(bin_path, json_path)
+        assert len(idx) == len(ENTRIES)
+        idx.close()
+
+
+class TestReferenceLookup:
+    """Tests for the reference lookup on the shipped index."""
+
+    def test_shipped_index_is_current(self):
+        """reference/mql5_index.bin matches reference/mql5_index.json."""
+        root = Path(__file__).parent.parent / 'reference'
+        idx = SearchIndex(root / 'mql5_index.bin')
+        try:
+            assert idx.source_size == (root / 'mql5_index.json').stat().st_size
+        finally:
+            idx.close()
+
+    def test_search_without_pymupdf(self):
+        """Searching and listing sections never open the PDF."""
+        from reference.mql5_indexer import MQL5Reference
+
+        ref = MQL5Reference()
+        try:
+            assert ref.search('OrderSend', 1)[0]['title'] == 'OrderSend'
+            assert ref.search('CTrade', 1)[0]['title'] == 'CTrade'
+            assert ref.list_sections(1)
+            assert ref._doc is None and ref._index is None
+        finally:
+            ref.close()
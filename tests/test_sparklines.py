@@ -0,0 +1,177 @@
+"""
+Tests for Equity Sparklines
+
+Tests SVG path generation, the per-workflow sparkline cache and the rows
+the summary sidecar attaches sparklines to.
+"""
+import json
+import math
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+import reports.sparklines as spark_mod
+from engine.state import StateManager
+from modules.blob_store import save_results_file
+from modules.stress_scenarios import _apply_cost_overlay
+from reports.sparklines import SPARK_HEIGHT, SPARK_WIDTH, sparkline_path, sparkline_svg, sparklines_path
+from reports.summary import ensure_summary
+
+
+def _coords(d):
+    return [(float(x), float(y)) for x, y in re.findall(r'[ML](-?[\d.]+),(-?[\d.]+)', d)]
+
+
+def _curve(n, start=10000.0, drift=1.0):
+    return [start + i * drift + 30 * math.sin(i / 25) for i in range(n)]
+
+
+@pytest.fixture
+def render_calls(monkeypatch):
+    """Count sparkline renders."""
+    calls = []
+    original = spark_mod.sparkline_svg
+
+    def counting(values, *args, **kwargs):
+        calls.append(len(values))
+        return original(values, *args, **kwargs)
+
+    monkeypatch.setattr(spark_mod, 'sparkline_svg', counting)
+    return calls
+
+
+class TestSparklinePath:
+    """Tests for sparkline_path / sparkline_svg."""
+
+    def test_points_fit_the_box(self):
+        """Long series are reduced and scaled into the viewBox."""
+        coords = _coords(sparkline_path(_curve(5000), points=40))
+
+        assert len(coords) == 40
+        assert coords[0][0] == 0 and coords[-1][0] == SPARK_WIDTH
+        assert all(1 <= y <= SPARK_HEIGHT - 1 for _, y in coords)
+        assert min(y for _, y in coords) == 1 and max(y for _, y in coords) == SPARK_HEIGHT - 1
+
+    def test_degenerate_series(self):
+        """Fewer than two points draw nothing; flat series draw a midline."""
+        assert sparkline_path([]) == ''
+        assert sparkline_path([5.0]) == ''
+        assert sparkline_svg([None, 'x']) == ''
+        assert {y for _, y in _coords(sparkline_path([3.0, 3.0, 3.0]))} == {SPARK_HEIGHT / 2}
+
+    def test_color_follows_direction(self):
+        assert spark_mod.GOOD_COLOR in sparkline_svg([1.0, 2.0])
+        assert spark_mod.BAD_COLOR in sparkline_svg([2.0, 1.0])
+
+
+def _workflow(runs_dir, results_file=False):
+    state = StateManager(
+        ea_name='SparkEA',
+        ea_path='/path/to/SparkEA.mq5',
+        terminal='TestBroker',
+        runs_dir=str(runs_dir),
+    )
+    passes = [
+        {
+            'pass_num': n,
+            'profit': 500 * n,
+            'profit_factor': 1.6,
+            'max_drawdown_pct': 10.0,
+            'total_trades': 120,
+            'equity_curve_in_sample': _curve(3000, drift=0.5 * n),
+            'equity_curve_forward': _curve(800, start=11500, drift=-0.2),
+        }
+        for n in (1, 2)
+    ]
+    if results_file:
+        path = Path(runs_dir) / state.workflow_id / 'backtests.json'
+        save_results_file(path, {'all_results': passes, 'best_result': passes[0]})
+        state.complete_step('9_backtest_robust', True, {'results_file': str(path), 'best_result': {'pass_num': 1}})
+    else:
+        state.complete_step('9_backtest_robust', True, {'all_results': passes, 'best_result': {'pass_num': 1}})
+    state.set('stress_scenarios', {'pass_num': 1, 'scenarios': [
+        {'id': 'overlay_a', 'variant': 'overlay', 'success': True,
+         'result': {'profit': 10, 'equity_points': [3000, 2990, 3050]}},
+        {'id': 'overlay_old', 'variant': 'overlay', 'success': True, 'report_path': '/nowhere.htm', 'result': {}},
+        {'id': 'latency', 'success': True, 'report_path': str(Path(runs_dir) / 'missing.htm'), 'result': {}},
+    ]})
+    state.set('forward_windows', {'windows': [{'id': 'w1', 'label': 'Last 3 months', 'metrics': {'profit': 5}}]})
+    state.set_status('completed')
+    return state
+
+
+class TestAttachSparklines:
+    """Tests for sparklines on summary rows."""
+
+    def test_rows_get_sparklines(self, temp_dir):
+        """Best pass, every leaderboard pass and stress scenarios with curves get an SVG."""
+        state = _workflow(temp_dir)
+        summary = ensure_summary(str(state.state_file))
+
+        assert summary['board']['workflow']['sparkline'].startswith('<svg')
+        assert all(p['sparkline'].startswith('<svg') for p in summary['leaderboard'])
+        best = next(p for p in summary['leaderboard'] if p['pass_num'] == 1)
+        assert summary['board']['workflow']['sparkline'] == best['sparkline']
+
+        by_id = {r['scenario_id']: r['sparkline'] for r in summary['board']['scenarios']}
+        assert spark_mod.BAD_COLOR not in by_id['overlay_a'] and by_id['overlay_a'].startswith('<svg')
+        assert by_id['overlay_old'] == ''
+        assert by_id['latency'] == ''
+        assert by_id['forward::w1'] == ''
+
+    def test_blob_curves_resolved(self, temp_dir, monkeypatch):
+        """Curves stored as blob references are loaded for rendering."""
+        monkeypatch.setattr(settings, 'BLOB_MIN_BYTES', 1024, raising=False)
+        state = _workflow(temp_dir, results_file=True)
+
+        summary = ensure_summary(str(state.state_file))
+
+        assert all(p['sparkline'].startswith('<svg') for p in summary['leaderboard'])
+        cache = json.loads(sparklines_path(state.state_file).read_text())
+        assert any(len(key.split(':')[1]) == 64 for key in cache['entries'])  # sha256 blob digests
+
+    def test_cache_survives_summary_rebuild(self, temp_dir, render_calls):
+        """A summary rebuilt for an unrelated change re-renders nothing."""
+        state = _workflow(temp_dir)
+        first = ensure_summary(str(state.state_file))
+        rendered = len(render_calls)
+        assert rendered >= 3
+
+        second = ensure_summary(str(state.state_file), force=True)
+
+        assert len(render_calls) == rendered
+        assert second['board'] == first['board']
+
+    def test_disabled(self, temp_dir, monkeypatch):
+        monkeypatch.setattr(settings, 'REPORT_SPARKLINES', False, raising=False)
+        state = _workflow(temp_dir)
+
+        summary = ensure_summary(str(state.state_file))
+
+        assert 'sparkline' not in summary['board']['workflow']
+        assert not sparklines_path(state.state_file).exists()
+
+
+class TestOverlayEquityPoints:
+    """Tests for the compact equity recorded by cost overlays."""
+
+    def test_overlay_records_adjusted_equity(self):
+        t0 = datetime(2024, 1, 1)
+        trades = [
+            SimpleNamespace(volume=1.0, net_profit=100.0, close_time=t0 + timedelta(hours=i))
+            for i in range(200)
+        ]
+        res = SimpleNamespace(trades=trades, initial_balance=1000.0)
+
+        out = _apply_cost_overlay(res, pip_value_per_lot=10.0, spread_pips=1.0, slippage_pips=0.0, slippage_sides=2)
+
+        points = out['equity_points']
+        assert len(points) == settings.SPARKLINE_POINTS
+        assert points[0] == 1000.0
+        assert points[-1] == pytest.approx(1000.0 + 200 * 90.0)
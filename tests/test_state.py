@@ -5,11 +5,13 @@ Tests workflow state persistence and management.
 """
 import pytest
 import json
+import threading
 from pathlib import Path
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from engine.state import StateManager
+from engine.state import StateManager, load_state_file, journal_path_for
+import settings
 
 
 class TestStateManagerInit:
@@ -294,3 +296,130 @@ class TestPersistence:
         new_time = state.get('updated_at')
 
         assert new_time != initial_time
+
+
+@pytest.fixture
+def journaled(monkeypatch):
+    """Force the journal backend regardless of snapshot size."""
+    monkeypatch.setattr(settings, 'STATE_JOURNAL', True)
+    monkeypatch.setattr(settings, 'STATE_JOURNAL_MIN_SNAPSHOT_BYTES', 0)
+    monkeypatch.setattr(settings, 'STATE_JOURNAL_COMPACT_BYTES', 10 ** 9)
+
+
+class TestJournal:
+    """Tests for the append-only journal backend."""
+
+    def test_updates_append_deltas(self, temp_dir, journaled):
+        """Updates go to the journal, not the snapshot."""
+        state = StateManager('TestEA', '/path', 'Term1', runs_dir=str(temp_dir))
+        snapshot_before = state.state_file.read_text()
+
+        state.start_step('1_load_ea')
+        state.update_metrics({'profit_factor': 1.8})
+        state.complete_step('1_load_ea', passed=False, error='boom')
+
+        journal = journal_path_for(state.state_file)
+        lines = journal.read_text().splitlines()
+        assert len(lines) == 3
+        assert [json.loads(l)['seq'] for l in lines] == [1, 2, 3]
+        assert state.state_file.read_text() == snapshot_before
+
+    def test_load_replays_journal(self, temp_dir, journaled):
+        """load() rebuilds the in-memory state from snapshot + journal."""
+        state = StateManager('TestEA', '/path', 'Term1', runs_dir=str(temp_dir))
+        state.start_step('2_compile')
+        state.update_gates({'profit_factor': {'passed': True}})
+        state.complete_step('2_compile', passed=False, error='compile error')
+        state.set('custom', {'a': 1})
+
+        loaded = StateManager.load(state.workflow_id, runs_dir=str(temp_dir))
+        assert loaded.to_dict() == state.to_dict()
+        assert load_state_file(state.state_file) == state.to_dict()
+        assert loaded.state['errors'][0]['error'] == 'compile error'
+
+    def test_compaction_writes_snapshot(self, temp_dir, journaled):
+        """Compaction folds the journal into the snapshot readable by plain JSON consumers."""
+        state = StateManager('TestEA', '/path', 'Term1', runs_dir=str(temp_dir))
+        state.update_metrics({'sharpe': 1.2})
+        state.compact(wait=True)
+
+        content = json.loads(state.state_file.read_text())
+        assert content['metrics']['sharpe'] == 1.2
+        assert content['_journal_seq'] == 1
+        assert not journal_path_for(state.state_file).exists()
+
+        state.update_metrics({'sharpe': 1.5})
+        assert StateManager.load(state.workflow_id, runs_dir=str(temp_dir)).state['metrics']['sharpe'] == 1.5
+
+    def test_background_compaction(self, temp_dir, journaled, monkeypatch):
+        """Journal growth past the threshold triggers a background snapshot."""
+        monkeypatch.setattr(settings, 'STATE_JOURNAL_COMPACT_BYTES', 1)
+        state = StateManager('TestEA', '/path', 'Term1', runs_dir=str(temp_dir))
+        for i in range(20):
+            state.update_metrics({f'm{i}': i})
+        state.wait_for_compaction()
+        state.compact(wait=True)
+
+        content = json.loads(state.state_file.read_text())
+        assert content['metrics']['m19'] == 19
+        assert load_state_file(state.state_file) == state.to_dict()
+
+    def test_background_compaction_serializes_outside_lock(self, temp_dir, journaled, monkeypatch):
+        """Mutators are not blocked while a background compaction serializes the snapshot."""
+        import engine.state as state_mod
+
+        state = StateManager('TestEA', '/path', 'Term1', runs_dir=str(temp_dir))
+        state.update_metrics({'sharpe': 1.0})
+        lock_free = []
+        original_dumps = state_mod.json.dumps
+
+        def probe_lock():
+            acquired = state._lock.acquire(timeout=1)
+            if acquired:
+                state._lock.release()
+            lock_free.append(acquired)
+
+        def dumps(value, *args, **kwargs):
+            if kwargs.get('indent'):
+                # Another thread must be able to take the state lock meanwhile
+                probe = threading.Thread(target=probe_lock)
+                probe.start()
+                probe.join()
+                state.update_metrics({'sharpe': 2.0})
+            return original_dumps(value, *args, **kwargs)
+
+        monkeypatch.setattr(state_mod.json, 'dumps', dumps)
+        state.compact(wait=False)
+        state.wait_for_compaction()
+        monkeypatch.setattr(state_mod.json, 'dumps', original_dumps)
+
+        assert lock_free == [True]
+        # The snapshot holds the state as copied; the later update stays in the journal
+        assert json.loads(state.state_file.read_text())['metrics']['sharpe'] == 1.0
+        assert load_state_file(state.state_file)['metrics']['sharpe'] == 2.0
+
+    def test_torn_tail_and_stale_entries_ignored(self, temp_dir, journaled):
+        """Crash leftovers: entries already in the snapshot and a torn last line are skipped."""
+        state = StateManager('TestEA', '/path', 'Term1', runs_dir=str(temp_dir))
+        state.state['errors'].append({'step': 'x', 'error': 'once'})
+        state.complete_step('3_extract_params', passed=False, error='first')  # seq 1 appends an error
+        journal = journal_path_for(state.state_file)
+        seq1 = journal.read_text()
+
+        # Crash after snapshot write but before the journal was trimmed
+        state.compact(wait=True)
+        journal.write_text(seq1 + '{"seq": 2, "ops": [{"op": "set", "path": ["status"], "va')
+
+        loaded = load_state_file(state.state_file)
+        assert [e['error'] for e in loaded['errors']] == ['once', 'first']
+        assert loaded['status'] == 'failed'
+
+    def test_small_state_uses_full_snapshot(self, temp_dir, monkeypatch):
+        """Below the size threshold every update rewrites the snapshot."""
+        monkeypatch.setattr(settings, 'STATE_JOURNAL_MIN_SNAPSHOT_BYTES', 10 ** 9)
+        state = StateManager('TestEA', '/path', 'Term1', runs_dir=str(temp_dir))
+        state.set('key', 'value')
+
+        assert json.loads(state.state_file.read_text())['key'] == 'value'
+        assert not journal_path_for(state.state_file).exists()
+        assert '_journal_seq' not in json.loads(state.state_file.read_text())
@@ -0,0 +1,115 @@
+"""
+Tests for Stress Scenario decisive mode
+
+Checks the stress-gate rule, verdict fixing and scenario skipping with a
+stand-in for the MT5 backtest call.
+"""
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import modules.stress_scenarios as stress_mod
+from modules.stress_scenarios import (
+    run_stress_scenarios,
+    _decisive_rule,
+    _rule_outcome,
+    _decisive_verdict,
+)
+
+
+def _scenario(scenario_id, tags):
+    return {
+        'id': scenario_id,
+        'label': scenario_id,
+        'period': 'custom',
+        'overrides': {'model': 0 if 'tick' in tags else 1, 'from_date': '2024.01.01', 'to_date': '2024.02.01'},
+        'tags': tags,
+    }
+
+
+@pytest.fixture
+def fake_backtest(monkeypatch):
+    """Replace run_backtest; PF per report name is taken from the pf map."""
+    calls = []
+    pf = {}
+
+    def _run_backtest(ea_path, **kwargs):
+        name = kwargs.get('report_name', '')
+        calls.append(name)
+        value = next((v for k, v in pf.items() if k in name), 1.5)
+        return {'success': True, 'profit': 100 if value >= 1 else -100, 'profit_factor': value,
+                'max_drawdown_pct': 5.0, 'total_trades': 10}
+
+    monkeypatch.setattr(stress_mod, 'run_backtest', _run_backtest)
+    monkeypatch.setattr(stress_mod, '_tick_file_coverage', lambda **kw: None)
+    return calls, pf
+
+
+def _run(scenarios, **kwargs):
+    return run_stress_scenarios(
+        compiled_ea_path='C:/EA/Test.ex5', symbol='EURUSD', timeframe='H1', params={},
+        terminal={}, scenarios=scenarios, include_overlays=False, **kwargs,
+    )
+
+
+class TestDecisiveRule:
+    """Tests for rule evaluation helpers."""
+
+    def test_rule_outcome(self):
+        """PF below the threshold fails, too few trades is inconclusive."""
+        rule = _decisive_rule({'min_profit_factor': 1.0, 'min_trades': 5})
+        ok = {'success': True, 'result': {'profit_factor': 1.3, 'total_trades': 10}}
+        bad = {'success': True, 'result': {'profit_factor': 0.8, 'total_trades': 10}}
+        thin = {'success': True, 'result': {'profit_factor': 0.2, 'total_trades': 2}}
+        failed_run = {'success': False, 'result': {}}
+
+        assert _rule_outcome(ok, rule) is True
+        assert _rule_outcome(bad, rule) is False
+        assert _rule_outcome(thin, rule) is None
+        assert _rule_outcome(failed_run, rule) is None
+
+    def test_verdict(self):
+        """Verdict is fixed only when remaining runs cannot change it."""
+        assert _decisive_verdict(failures=2, pending=5, max_failures=2) == 'fail'
+        assert _decisive_verdict(failures=0, pending=1, max_failures=2) == 'pass'
+        assert _decisive_verdict(failures=1, pending=1, max_failures=2) is None
+
+
+class TestDecisiveMode:
+    """Tests for early-abort scheduling in run_stress_scenarios."""
+
+    def test_disabled_runs_everything(self, fake_backtest):
+        """Without decisive mode every scenario runs."""
+        calls, pf = fake_backtest
+        pf['tick_a'] = 0.5
+        scenarios = [_scenario('tick_a', ['tick']), _scenario('tick_b', ['tick']), _scenario('ohlc_a', ['ohlc'])]
+        result = _run(scenarios, decisive=False)
+
+        assert len(calls) == 3
+        assert result['skipped_scenarios'] == []
+        assert 'decisive' not in result
+
+    def test_fail_cancels_queue(self, fake_backtest):
+        """First failing rule scenario fixes FAIL and cancels the rest."""
+        calls, pf = fake_backtest
+        pf['tick_a'] = 0.5
+        scenarios = [_scenario('ohlc_a', ['ohlc']), _scenario('tick_a', ['tick']), _scenario('tick_b', ['tick'])]
+        result = _run(scenarios, decisive=True, decisive_rule={'tags': ['tick'], 'max_failures': 1})
+
+        assert len(calls) == 1  # tick_a runs first, then the verdict is fixed
+        assert result['decisive']['verdict'] == 'fail'
+        assert result['decisive']['decided_after'] == 'tick_a'
+        assert [s['id'] for s in result['skipped_scenarios']] == ['tick_b', 'ohlc_a']
+        assert all('FAIL' in s['reason'] for s in result['skipped_scenarios'])
+
+    def test_pass_keeps_non_rule_scenarios(self, fake_backtest):
+        """A fixed PASS skips remaining rule scenarios only."""
+        calls, pf = fake_backtest
+        scenarios = [_scenario('tick_a', ['tick']), _scenario('tick_b', ['tick']), _scenario('ohlc_a', ['ohlc'])]
+        result = _run(scenarios, decisive=True, decisive_rule={'tags': ['tick'], 'max_failures': 2})
+
+        # PASS is fixed after tick_a (one failure left cannot reach 2), tick_b skipped
+        assert result['decisive']['verdict'] == 'pass'
+        assert [s['id'] for s in result['skipped_scenarios']] == ['tick_b']
+        assert [s['id'] for s in result['scenarios']] == ['tick_a', 'ohlc_a']
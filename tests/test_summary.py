@@ -0,0 +1,169 @@
+"""
+Tests for Workflow Summary Sidecars
+
+Tests sidecar freshness, content hashes and incremental boards / leaderboard
+regeneration.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+import reports.summary as summary_mod
+from engine.state import StateManager
+from reports.boards import generate_boards
+from reports.leaderboard import generate_leaderboard, _score_for_backtest
+from engine.gates import calculate_composite_score
+
+
+def _make_workflow(runs_dir, ea_name='TestEA', status='completed'):
+    state = StateManager(
+        ea_name=ea_name,
+        ea_path=f'/path/to/{ea_name}.mq5',
+        terminal='TestBroker',
+        runs_dir=str(runs_dir),
+    )
+    state.set_status(status)
+    return state
+
+
+def _touch(path):
+    st = Path(path).stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def build_calls(monkeypatch):
+    """Count summary rebuilds."""
+    calls = []
+    original = summary_mod.build_summary
+
+    def counting(state, state_file):
+        calls.append(Path(state_file).name)
+        return original(state, state_file)
+
+    monkeypatch.setattr(summary_mod, 'build_summary', counting)
+    return calls
+
+
+class TestEnsureSummary:
+    """Tests for sidecar caching."""
+
+    def test_sidecar_written_next_to_results(self, temp_dir, build_calls):
+        """Summary lands in runs/<workflow_id>/summary.json."""
+        state = _make_workflow(temp_dir)
+
+        summary = summary_mod.ensure_summary(str(state.state_file))
+
+        path = Path(temp_dir) / state.workflow_id / 'summary.json'
+        assert path.exists()
+        assert summary['workflow']['workflow_id'] == state.workflow_id
+        assert summary['hash'] == summary_mod.summary_hash(summary)
+        assert len(build_calls) == 1
+
+    def test_fresh_sidecar_is_reused(self, temp_dir, build_calls):
+        """Unchanged inputs do not trigger a rebuild."""
+        state = _make_workflow(temp_dir)
+
+        first = summary_mod.ensure_summary(str(state.state_file))
+        second = summary_mod.ensure_summary(str(state.state_file))
+
+        assert first == second
+        assert len(build_calls) == 1
+
+    def test_state_change_rebuilds(self, temp_dir, build_calls):
+        """A state update invalidates the sidecar and changes the hash."""
+        state = _make_workflow(temp_dir)
+        first = summary_mod.ensure_summary(str(state.state_file))
+
+        state.set_status('failed')
+        _touch(state.state_file)
+        second = summary_mod.ensure_summary(str(state.state_file))
+
+        assert len(build_calls) == 2
+        assert second['workflow']['status'] == 'failed'
+        assert second['hash'] != first['hash']
+
+    def test_results_file_is_an_input(self, temp_dir, build_calls):
+        """Results files the leaderboard reads are tracked as inputs."""
+        state = _make_workflow(temp_dir)
+        results = Path(temp_dir) / state.workflow_id / 'backtests.json'
+        results.parent.mkdir(parents=True, exist_ok=True)
+        results.write_text(json.dumps({'all_results': []}))
+        state.complete_step('9_backtest_robust', True, {'results_file': str(results)})
+        summary_mod.ensure_summary(str(state.state_file))
+
+        results.write_text(json.dumps({'all_results': [{'pass_num': 3, 'profit': 500, 'total_trades': 80}]}))
+        _touch(results)
+        summary = summary_mod.ensure_summary(str(state.state_file))
+
+        assert len(build_calls) == 2
+        assert [p['pass_num'] for p in summary['leaderboard']] == [3]
+
+    def test_sidecars_disabled(self, temp_dir, build_calls, monkeypatch):
+        """With REPORT_SUMMARY_SIDECARS off nothing is written or reused."""
+        monkeypatch.setattr(settings, 'REPORT_SUMMARY_SIDECARS', False, raising=False)
+        state = _make_workflow(temp_dir)
+
+        summary_mod.ensure_summary(str(state.state_file))
+        summary_mod.ensure_summary(str(state.state_file))
+
+        assert len(build_calls) == 2
+        assert not (Path(temp_dir) / state.workflow_id / 'summary.json').exists()
+
+
+class TestIncrementalReports:
+    """Tests for manifest-based skipping in boards / leaderboard."""
+
+    @pytest.mark.parametrize('catalog', [True, False])
+    def test_boards_skip_when_unchanged(self, temp_dir, monkeypatch, catalog):
+        """Boards are left untouched until a workflow summary changes."""
+        monkeypatch.setattr(settings, 'WORKFLOW_CATALOG', catalog, raising=False)
+        a = _make_workflow(temp_dir, 'EA_A')
+        _make_workflow(temp_dir, 'EA_B')
+        out = Path(temp_dir) / 'boards'
+
+        generate_boards(str(temp_dir))
+        (out / 'data.json').write_text('sentinel')
+        generate_boards(str(temp_dir))
+        assert (out / 'data.json').read_text() == 'sentinel'
+
+        a.set_status('failed')
+        _touch(a.state_file)
+        generate_boards(str(temp_dir))
+        data = json.loads((out / 'data.json').read_text())
+        assert [w['ea_name'] for w in data['workflows']] == ['EA_B']
+
+    @pytest.mark.parametrize('catalog', [True, False])
+    def test_leaderboard_manifest_tracks_row_limit(self, temp_dir, monkeypatch, catalog):
+        """Changing passes_per_workflow forces a rebuild."""
+        monkeypatch.setattr(settings, 'WORKFLOW_CATALOG', catalog, raising=False)
+        _make_workflow(temp_dir, 'EA_A')
+        out = Path(temp_dir) / 'leaderboard'
+
+        generate_leaderboard(str(temp_dir), passes_per_workflow=10)
+        (out / 'data.json').write_text('sentinel')
+        generate_leaderboard(str(temp_dir), passes_per_workflow=10)
+        assert (out / 'data.json').read_text() == 'sentinel'
+
+        generate_leaderboard(str(temp_dir), passes_per_workflow=5)
+        assert json.loads((out / 'data.json').read_text())['total_passes'] == 0
+
+
+class TestScoreCache:
+    """Tests for memoized pass scoring."""
+
+    def test_cached_score_matches_gate_formula(self):
+        """Memoized score equals calculate_composite_score."""
+        p = {
+            'profit': 1200, 'total_trades': 90, 'profit_factor': 1.7,
+            'max_drawdown_pct': 12.0, 'forward_result': 300, 'back_result': 900,
+        }
+        expected = calculate_composite_score(dict(p))
+
+        assert _score_for_backtest(p) == pytest.approx(expected)
+        assert _score_for_backtest(dict(p)) == pytest.approx(expected)
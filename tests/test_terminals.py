@@ -136,3 +136,17 @@ class TestTerminalRegistry:
 
         assert isinstance(registry, TerminalRegistry)
         assert registry.active == 'TestBroker'
+
+    def test_default_path_from_settings_and_env(self, sample_terminals_json, temp_dir, monkeypatch):
+        """Test that the default registry path honors TERMINALS_FILE and the env override."""
+        import settings
+        from engine.terminals import TERMINALS_ENV
+
+        monkeypatch.delenv(TERMINALS_ENV, raising=False)
+        monkeypatch.setattr(settings, 'TERMINALS_FILE', str(sample_terminals_json))
+        assert TerminalRegistry().config_path == sample_terminals_json
+        assert get_registry().active == 'TestBroker'
+
+        monkeypatch.setenv(TERMINALS_ENV, str(temp_dir / "nonexistent.json"))
+        with pytest.raises(FileNotFoundError):
+            TerminalRegistry()
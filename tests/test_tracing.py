@@ -0,0 +1,257 @@
+"""
+Tests for Workflow Tracing
+
+Tests nested spans, persistence to trace.jsonl, memory peaks, cross-thread
+parents, the runner's step spans, summaries and Chrome trace export.
+"""
+import json
+import subprocess
+import threading
+import time
+import tracemalloc
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+from engine import tracing
+from engine.scheduler import StepSpec
+from engine.state import StateManager
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+class TestSpans:
+    """Tests for recording spans."""
+
+    def test_nested_spans_persisted(self, temp_dir):
+        path = temp_dir / 'wf' / 'trace.jsonl'
+        tracer = tracing.Tracer('wf', path=path, memory=False)
+
+        with tracing.activate(tracer):
+            with tracing.span('step:9_backtest_robust', kind='mt5') as outer:
+                with tracing.span('backtest.mt5', symbol='EURUSD'):
+                    time.sleep(0.05)
+                with tracing.span('backtest.parse_xml'):
+                    sum(i * i for i in range(20000))
+                outer.set(passed=True)
+
+        spans = {s['name']: s for s in tracing.load_spans(path)}
+        assert list(spans) == ['backtest.mt5', 'backtest.parse_xml', 'step:9_backtest_robust']
+        step = spans['step:9_backtest_robust']
+        assert step['parent'] is None and step['depth'] == 0 and step['cat'] == 'step'
+        assert step['attrs'] == {'kind': 'mt5', 'passed': True}
+        assert spans['backtest.mt5']['parent'] == step['id']
+        assert spans['backtest.mt5']['attrs'] == {'symbol': 'EURUSD'}
+        assert spans['backtest.mt5']['wall_s'] >= 0.04
+        # Waiting costs wall time, not CPU time
+        assert spans['backtest.mt5']['cpu_s'] < spans['backtest.mt5']['wall_s']
+        assert step['wall_s'] >= spans['backtest.mt5']['wall_s'] + spans['backtest.parse_xml']['wall_s']
+
+    def test_no_tracer_is_noop(self):
+        calls = []
+
+        @tracing.traced('work')
+        def work(x):
+            calls.append(x)
+            return x * 2
+
+        with tracing.span('orphan') as sp:
+            sp.set(ignored=True)
+        assert work(3) == 6 and calls == [3]
+        assert tracing.current_tracer() is None
+
+    def test_error_recorded_and_reraised(self):
+        tracer = tracing.Tracer('wf', memory=False)
+        with tracing.activate(tracer):
+            with pytest.raises(RuntimeError):
+                with tracing.span('boom'):
+                    raise RuntimeError('terminal crashed')
+        assert tracer.spans[0]['error'] == 'RuntimeError: terminal crashed'
+        assert tracing.current_span() is None
+
+    def test_stage_execute_traced(self, temp_dir):
+        """ea_stress stages record a stage:<name> span with their outcome."""
+        from ea_stress.core.state import WorkflowState
+        from ea_stress.stages import LoadEAStage
+
+        ea = temp_dir / 'TestEA.mq5'
+        ea.write_text('input int X = 1;')
+        state = WorkflowState('wf', 'TestEA', str(ea), 'Term1')
+
+        assert LoadEAStage().execute(state).success
+        tracer = tracing.Tracer('wf', memory=False)
+        with tracing.activate(tracer):
+            assert LoadEAStage().execute(state).success
+        assert [(s['name'], s['cat'], s['attrs']) for s in tracer.spans] == [
+            ('stage:1_load_ea', 'stage', {'success': True}),
+        ]
+
+    def test_memory_peak(self):
+        was_tracing = tracemalloc.is_tracing()
+        tracer = tracing.Tracer('wf', memory=True)
+        try:
+            with tracing.activate(tracer):
+                with tracing.span('outer'):
+                    with tracing.span('alloc'):
+                        data = [bytes(1024) for _ in range(2000)]
+                        del data
+                    with tracing.span('small'):
+                        pass
+        finally:
+            tracer.close()
+
+        spans = {s['name']: s for s in tracer.spans}
+        assert spans['alloc']['mem_peak_kb'] >= 1500
+        assert spans['small']['mem_peak_kb'] < 100
+        # The parent sees its child's peak even though it was reset meanwhile
+        assert spans['outer']['mem_peak_kb'] >= spans['alloc']['mem_peak_kb']
+        assert tracemalloc.is_tracing() == was_tracing
+
+    def test_parent_from_other_thread(self):
+        tracer = tracing.Tracer('wf', memory=False)
+        with tracing.activate(tracer):
+            with tracing.span('step:14_multi_pair') as step:
+                def child(sym):
+                    with tracing.activate(tracer, parent=step):
+                        with tracing.span(f'multi_pair:{sym}'):
+                            time.sleep(0.01)
+                threads = [threading.Thread(target=child, args=(s,)) for s in ('EURUSD', 'USDJPY')]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+
+        spans = {s['name']: s for s in tracer.spans}
+        assert spans['multi_pair:EURUSD']['parent'] == spans['step:14_multi_pair']['id']
+        assert spans['multi_pair:USDJPY']['depth'] == 1
+        assert spans['multi_pair:EURUSD']['tid'] != spans['step:14_multi_pair']['tid']
+
+
+class TestRunnerSpans:
+    """Tests for the runner's per-step spans."""
+
+    def test_steps_traced_on_worker_threads(self, temp_dir, monkeypatch):
+        from engine.runner import WorkflowRunner
+
+        monkeypatch.setattr(settings, 'WORKFLOW_CATALOG', False, raising=False)
+        monkeypatch.setattr(settings, 'REPORT_SUMMARY_SIDECARS', False, raising=False)
+        monkeypatch.setattr(settings, 'STEP_WORKERS', 2, raising=False)
+        runner = WorkflowRunner.__new__(WorkflowRunner)
+        runner.state = StateManager('TestEA', '/ea/TestEA.mq5', 'T1', runs_dir=str(temp_dir))
+        runner.terminal = {'name': 'T1'}
+        runner.on_step_complete = None
+        runner.on_progress = None
+
+        def step(name):
+            def fn():
+                with tracing.span(f'{name}.work'):
+                    time.sleep(0.02)
+                return name != 'b', {}
+            return fn
+
+        runner._run_steps([
+            StepSpec('a', step('a'), produces=('x',), kind='mt5'),
+            StepSpec('b', step('b'), kind='python'),
+        ], stop_on_failure=False)
+
+        spans = {s['name']: s for s in tracing.load_spans(temp_dir / runner.state.workflow_id / 'trace.jsonl')}
+        assert spans['step:a']['attrs'] == {'kind': 'mt5', 'passed': True}
+        assert spans['step:b']['attrs'] == {'kind': 'python', 'passed': False}
+        assert spans['a.work']['parent'] == spans['step:a']['id']
+        assert spans['b.work']['parent'] == spans['step:b']['id']
+
+    def test_tracing_disabled(self, temp_dir, monkeypatch):
+        from engine.runner import WorkflowRunner
+
+        monkeypatch.setattr(settings, 'TRACING', False, raising=False)
+        runner = WorkflowRunner.__new__(WorkflowRunner)
+        runner.state = StateManager('TestEA', '/ea/TestEA.mq5', 'T1', runs_dir=str(temp_dir))
+        assert runner._tracer() is None
+
+
+def _spans():
+    return [
+        {'id': 'r', 'parent': None, 'name': 'step:7', 'ts': 100.0, 'wall_s': 10.0, 'cpu_s': 0.5,
+         'thread': 'MainThread', 'tid': 1, 'depth': 0},
+        {'id': 'm', 'parent': 'r', 'name': 'optimization.mt5', 'ts': 100.5, 'wall_s': 8.0, 'cpu_s': 0.1,
+         'thread': 'MainThread', 'tid': 1, 'depth': 1},
+        {'id': 'p', 'parent': 'r', 'name': 'optimization.parse', 'ts': 108.6, 'wall_s': 1.0, 'cpu_s': 0.9,
+         'thread': 'MainThread', 'tid': 1, 'depth': 1, 'mem_peak_kb': 512.0, 'attrs': {'passes': 300}},
+    ]
+
+
+class TestSummaryAndExport:
+    """Tests for aggregating and exporting traces."""
+
+    def test_summary_ranks_by_self_time(self):
+        report = tracing.summarize({'wf1': _spans(), 'wf2': _spans()})
+
+        assert report['traces'] == 2 and report['span_count'] == 6
+        assert report['wall_s'] == 20.0
+        names = [r['name'] for r in report['rows']]
+        assert names == ['optimization.mt5', 'step:7', 'optimization.parse']
+        step = report['rows'][1]
+        assert step['total_s'] == 20.0 and step['self_s'] == 2.0
+        assert report['rows'][2]['mem_peak_kb'] == 512.0
+        assert len(tracing.summarize({'wf1': _spans()}, top=1)['rows']) == 1
+
+    def test_summary_nests_child_traces(self):
+        """A multi-pair child's steps count against the parent's multi_pair span."""
+        parent = [
+            {'id': 's14', 'parent': None, 'name': 'step:14_multi_pair', 'ts': 0.0, 'wall_s': 10.0},
+            {'id': 'mp', 'parent': 's14', 'name': 'multi_pair:USDJPY', 'ts': 0.0, 'wall_s': 9.0,
+             'attrs': {'workflow_id': 'child'}},
+        ]
+        child = [{'id': 'c7', 'parent': 'mp', 'name': 'step:7', 'ts': 1.0, 'wall_s': 8.0}]
+
+        rows = {r['name']: r for r in tracing.summarize({'wf': parent, 'child': child})['rows']}
+        assert rows['multi_pair:USDJPY']['self_s'] == 1.0
+        assert tracing.summarize({'wf': parent, 'child': child})['wall_s'] == 10.0
+        assert tracing.summarize({'child': child})['wall_s'] == 8.0
+
+    def test_chrome_trace(self):
+        trace = tracing.to_chrome_trace({'wf1': _spans(), 'wf2': _spans()[:1]})
+        events = trace['traceEvents']
+
+        meta = [e for e in events if e['ph'] == 'M']
+        assert {'name': 'process_name', 'pid': 2, 'tid': 0, 'args': {'name': 'wf2'}, 'ph': 'M'} in meta
+        complete = [e for e in events if e['ph'] == 'X' and e['pid'] == 1]
+        parse = next(e for e in complete if e['name'] == 'optimization.parse')
+        assert parse['ts'] == 108_600_000 and parse['dur'] == 1_000_000
+        assert parse['args'] == {'passes': 300, 'cpu_ms': 900.0, 'mem_peak_kb': 512.0}
+        assert parse['cat'] == 'workflow'
+        json.dumps(trace)
+
+    def test_torn_line_skipped(self, temp_dir):
+        path = temp_dir / 'trace.jsonl'
+        path.write_text(json.dumps(_spans()[0]) + '\n{"id": "x", "na')
+        assert [s['id'] for s in tracing.load_spans(path)] == ['r']
+
+    def test_cli_summary_and_export(self, temp_dir):
+        runs = temp_dir / 'runs'
+        for wf in ('wf1', 'wf2'):
+            (runs / wf).mkdir(parents=True)
+            (runs / wf / 'trace.jsonl').write_text(''.join(json.dumps(s) + '\n' for s in _spans()))
+        script = str(REPO_ROOT / 'scripts' / 'trace_report.py')
+
+        out = subprocess.run(
+            [sys.executable, script, '--runs-dir', str(runs), 'summary', '--json'],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        report = json.loads(out)
+        assert report['traces'] == 2 and report['rows'][0]['name'] == 'optimization.mt5'
+
+        text = subprocess.run(
+            [sys.executable, script, '--runs-dir', str(runs), 'summary', 'wf1'],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        assert 'optimization.mt5' in text and '1 workflow(s)' in text
+
+        subprocess.run(
+            [sys.executable, script, '--runs-dir', str(runs), 'export', '--out', str(temp_dir / 'trace.json')],
+            check=True, capture_output=True,
+        )
+        exported = json.loads((temp_dir / 'trace.json').read_text())
+        assert sum(e['ph'] == 'X' for e in exported['traceEvents']) == 6
@@ -0,0 +1,127 @@
+"""
+Tests for Trade Diff Module
+
+Checks hash-join matching, classification and profit-delta attribution
+between two trade lists.
+"""
+import time
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from modules.trade_extractor import Trade, TradeExtractionResult
+from modules.trade_diff import diff_trades, explain_diff, diff_stress_scenarios
+
+
+T0 = datetime(2024, 3, 1, 9, 0, 0)
+
+
+def _trade(ticket, minutes, profit, side='buy', volume=0.1, open_price=1.1000, seconds=0):
+    open_time = T0 + timedelta(minutes=minutes, seconds=seconds)
+    return Trade(
+        ticket=ticket, symbol='EURUSD', trade_type=side, volume=volume,
+        open_time=open_time, close_time=open_time + timedelta(hours=1),
+        open_price=open_price, close_price=open_price, net_profit=profit,
+    )
+
+
+class TestDiffTrades:
+    """Tests for diff_trades."""
+
+    def test_classification(self):
+        """Identical, price-shifted, missing and extra trades are separated."""
+        reference = [
+            _trade(1, 0, 50.0),
+            _trade(2, 120, 30.0, side='sell'),
+            _trade(3, 240, 20.0),
+        ]
+        scenario = [
+            _trade(11, 0, 50.0),                                        # identical
+            _trade(12, 120, 10.0, side='sell', open_price=1.0995),      # shifted: -20
+            _trade(14, 600, -15.0),                                     # extra
+        ]
+        diff = diff_trades(reference, scenario)
+        c = diff['classes']
+
+        assert c['identical']['count'] == 1
+        assert c['price_shifted'] == {'count': 1, 'profit_delta': -20.0}
+        assert c['missing'] == {'count': 1, 'profit_delta': -20.0}
+        assert c['extra'] == {'count': 1, 'profit_delta': -15.0}
+        assert diff['top']['missing'][0]['ticket'] == 3
+
+    def test_attribution_sums_to_delta(self):
+        """Class deltas add up to the headline profit difference."""
+        reference = [_trade(i, i * 30, (i % 7) - 3.0) for i in range(200)]
+        scenario = [_trade(i, i * 30, (i % 5) - 2.5) for i in range(0, 200, 2)]
+        scenario += [_trade(900 + i, 10_000 + i * 30, 1.0) for i in range(10)]
+        diff = diff_trades(reference, scenario)
+
+        total = sum(v['profit_delta'] for v in diff['classes'].values())
+        assert total == pytest.approx(diff['profit_delta'], abs=0.05)
+        assert diff['classes']['missing']['count'] == 100
+        assert diff['classes']['extra']['count'] == 10
+
+    def test_neighbour_bucket_match(self):
+        """Latency that pushes an entry into the next bucket still matches."""
+        reference = [_trade(1, 0, 10.0, seconds=58)]
+        scenario = [_trade(2, 1, 9.0, seconds=3)]  # 5 seconds later, next minute bucket
+        diff = diff_trades(reference, scenario, bucket_seconds=60)
+        assert diff['classes']['price_shifted']['count'] == 1
+        assert diff['classes']['missing']['count'] == 0
+
+    def test_side_and_volume_must_match(self):
+        """Different side or volume never matches."""
+        diff = diff_trades([_trade(1, 0, 10.0)], [_trade(2, 0, 10.0, side='sell'), _trade(3, 0, 10.0, volume=0.2)])
+        assert diff['classes']['missing']['count'] == 1
+        assert diff['classes']['extra']['count'] == 2
+
+    def test_large_lists_fast(self):
+        """10k x 10k trades diff well under a second."""
+        reference = [_trade(i, i * 15, 1.0) for i in range(10_000)]
+        scenario = [_trade(i, i * 15, 0.5) for i in range(10_000)]
+        start = time.perf_counter()
+        diff = diff_trades(reference, scenario)
+        assert time.perf_counter() - start < 2.0
+        assert diff['classes']['price_shifted']['count'] == 10_000
+
+    def test_explain(self):
+        """Explanation lists the contributing classes."""
+        diff = diff_trades([_trade(1, 0, 10.0)], [])
+        assert 'missing 1 trade(s) -10.00' in explain_diff(diff)
+        assert explain_diff(diff_trades([], [])) == 'All trades identical'
+
+
+class TestDiffStressScenarios:
+    """Tests for scenario pairing."""
+
+    def test_tick_rows_diffed_against_same_window_ohlc(self):
+        """Tick and latency rows get a diff vs the OHLC row of the same window."""
+        reports = {
+            'ohlc.html': [_trade(1, 0, 10.0), _trade(2, 60, 5.0)],
+            'tick.html': [_trade(3, 0, 10.0)],
+            'lat.html': [_trade(4, 0, 2.0)],
+        }
+        parsed = []
+
+        def _extract(path):
+            parsed.append(path)
+            return TradeExtractionResult(success=True, trades=reports[path])
+
+        window = {'id': 'last_30d'}
+        scenarios = [
+            {'id': 'ohlc_last_30d', 'tags': ['window', 'ohlc'], 'window': window, 'variant': 'base', 'success': True, 'report_path': 'ohlc.html'},
+            {'id': 'tick_last_30d', 'tags': ['window', 'tick'], 'window': window, 'variant': 'base', 'success': True, 'report_path': 'tick.html'},
+            {'id': 'tick_last_30d_latency_250ms', 'tags': ['window', 'tick', 'latency'], 'window': window, 'variant': 'base', 'success': True, 'report_path': 'lat.html'},
+            {'id': 'tick_last_30d_overlay', 'tags': ['window', 'tick', 'overlay'], 'window': window, 'variant': 'overlay', 'success': True, 'report_path': 'tick.html'},
+        ]
+        info = diff_stress_scenarios(scenarios, extract=_extract)
+
+        assert info['diff_count'] == 2
+        assert sorted(parsed) == ['lat.html', 'ohlc.html', 'tick.html']  # each report parsed once
+        assert scenarios[1]['trade_diff']['reference_id'] == 'ohlc_last_30d'
+        assert scenarios[1]['trade_diff']['classes']['missing']['count'] == 1
+        assert scenarios[2]['trade_diff']['classes']['price_shifted']['profit_delta'] == -8.0
+        assert 'trade_diff' not in scenarios[0]
+        assert 'trade_diff' not in scenarios[3]
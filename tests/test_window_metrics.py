@@ -0,0 +1,134 @@
+"""
+Tests for Window Metrics Engine
+
+Checks prefix-sum/segment-tree window metrics against a direct rescan.
+"""
+import random
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from modules.window_metrics import WindowMetricsEngine, PF_NO_LOSS
+
+
+def _naive_metrics(times, profits, initial_balance, ws, we):
+    """Reference implementation: rescan the trade list (previous Step 13 logic)."""
+    balance = initial_balance
+    for t, p in zip(times, profits):
+        if t < ws:
+            balance += p
+    peak = balance
+    max_dd = 0.0
+    profit = gross_profit = gross_loss = 0.0
+    wins = total = 0
+    for t, p in zip(times, profits):
+        if t < ws or t > we:
+            continue
+        total += 1
+        profit += p
+        if p > 0:
+            wins += 1
+            gross_profit += p
+        elif p < 0:
+            gross_loss += -p
+        balance += p
+        peak = max(peak, balance)
+        if peak > 0:
+            max_dd = max(max_dd, (peak - balance) / peak)
+    if gross_loss <= 1e-9:
+        pf = PF_NO_LOSS if gross_profit > 0 else 0.0
+    else:
+        pf = gross_profit / gross_loss
+    return {
+        'profit': profit,
+        'profit_factor': pf,
+        'max_drawdown_pct': max_dd * 100.0,
+        'total_trades': total,
+        'win_rate': (wins / total * 100.0) if total else 0.0,
+    }
+
+
+@pytest.fixture
+def random_trades():
+    rng = random.Random(42)
+    start = datetime(2022, 1, 1)
+    times = sorted(start + timedelta(hours=rng.randint(0, 24 * 365 * 2)) for _ in range(400))
+    profits = [round(rng.gauss(5, 40), 2) for _ in times]
+    return times, profits
+
+
+class TestWindowMetricsEngine:
+    """Tests for WindowMetricsEngine."""
+
+    def test_matches_rescan(self, random_trades):
+        """Every window matches the O(n) rescan."""
+        times, profits = random_trades
+        engine = WindowMetricsEngine(times, profits, initial_balance=3000)
+        rng = random.Random(7)
+
+        for _ in range(200):
+            ws = datetime(2022, 1, 1) + timedelta(days=rng.randint(0, 700))
+            we = ws + timedelta(days=rng.randint(0, 120))
+            got = engine.metrics(ws, we)
+            want = _naive_metrics(times, profits, 3000, ws, we)
+
+            assert got['total_trades'] == want['total_trades']
+            assert got['profit'] == pytest.approx(want['profit'], abs=1e-6)
+            assert got['profit_factor'] == pytest.approx(want['profit_factor'], rel=1e-9)
+            assert got['max_drawdown_pct'] == pytest.approx(want['max_drawdown_pct'], abs=1e-9)
+            assert got['win_rate'] == pytest.approx(want['win_rate'])
+
+    def test_window_bounds_inclusive(self):
+        """Trades closing exactly on either boundary are included."""
+        times = [datetime(2024, 1, 1), datetime(2024, 1, 2), datetime(2024, 1, 3)]
+        engine = WindowMetricsEngine(times, [10, -5, 20], initial_balance=100)
+
+        assert engine.bounds(datetime(2024, 1, 1), datetime(2024, 1, 2)) == (0, 2)
+        assert engine.metrics(datetime(2024, 1, 2), datetime(2024, 1, 3))['total_trades'] == 2
+
+    def test_drawdown_uses_window_start_balance(self):
+        """Drawdown is measured from the balance at window start."""
+        times = [datetime(2024, 1, d) for d in (1, 2, 3)]
+        engine = WindowMetricsEngine(times, [100, -50, 10], initial_balance=100)
+
+        m = engine.metrics(datetime(2024, 1, 2), datetime(2024, 1, 3))
+        # Start balance 200 -> 150 is a 25% drawdown
+        assert m['max_drawdown_pct'] == pytest.approx(25.0)
+        assert engine.start_balance(datetime(2024, 1, 2)) == pytest.approx(200.0)
+
+    def test_empty_window(self, random_trades):
+        """Window with no trades returns zeros."""
+        times, profits = random_trades
+        engine = WindowMetricsEngine(times, profits, initial_balance=3000)
+        m = engine.metrics(datetime(2030, 1, 1), datetime(2030, 2, 1))
+
+        assert m['total_trades'] == 0
+        assert m['profit'] == 0.0
+        assert m['max_drawdown_pct'] == 0.0
+
+    def test_no_losses_profit_factor(self):
+        """All-winning window reports the capped profit factor."""
+        times = [datetime(2024, 1, d) for d in (1, 2)]
+        engine = WindowMetricsEngine(times, [10, 20], initial_balance=100)
+
+        assert engine.metrics(datetime(2024, 1, 1), datetime(2024, 1, 2))['profit_factor'] == PF_NO_LOSS
+
+    def test_from_trades_dicts_sorted_and_filtered(self):
+        """from_trades accepts dicts, drops missing close times and sorts."""
+        trades = [
+            {'close_time': datetime(2024, 1, 3), 'net_profit': -5},
+            {'close_time': None, 'net_profit': 1000},
+            {'close_time': datetime(2024, 1, 1), 'net_profit': 10},
+        ]
+        engine = WindowMetricsEngine.from_trades(trades, initial_balance=100)
+
+        assert len(engine) == 2
+        assert engine.close_times[0] == datetime(2024, 1, 1)
+        assert engine.metrics(datetime(2024, 1, 1), datetime(2024, 1, 31))['profit'] == pytest.approx(5)
+
+    def test_length_mismatch(self):
+        """Mismatched inputs raise ValueError."""
+        with pytest.raises(ValueError):
+            WindowMetricsEngine([datetime(2024, 1, 1)], [], initial_balance=0)
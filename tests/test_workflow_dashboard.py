@@ -0,0 +1,229 @@
+"""
+Tests for Workflow Dashboard Generation
+
+Tests dashboard data sharding (summary document + per-pass / per-section shards).
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings
+from engine.state import StateManager
+import reports.workflow_dashboard as dashboard_mod
+from reports.workflow_dashboard import (
+    PASS_SHARD_KEYS,
+    _split_shards,
+    generate_all_dashboards,
+    generate_dashboard_from_workflow,
+)
+
+
+def _read_js_shard(path: Path, name: str):
+    """Evaluate the registration line of a .js shard as JSON."""
+    text = path.read_text()
+    prefix = f'window.__DASHBOARD_SHARDS[{json.dumps(name)}] = '
+    line = next(l for l in text.splitlines() if l.startswith(prefix))
+    return json.loads(line[len(prefix):].rstrip(';'))
+
+
+@pytest.fixture
+def workflow_with_backtests(temp_dir):
+    state = StateManager(
+        ea_name='TestEA',
+        ea_path='/path/to/TestEA.mq5',
+        terminal='TestBroker',
+        runs_dir=str(temp_dir),
+    )
+    results = [
+        {
+            'pass_num': n,
+            'profit': 1000 + n,
+            'profit_factor': 1.6,
+            'max_drawdown_pct': 12.0,
+            'total_trades': 120,
+            'charts': {'profit_histogram': {'bins': list(range(20))}},
+            'equity_curve_in_sample': [10000 + i for i in range(50)],
+            'equity_curve_forward': [10050 + i for i in range(10)],
+        }
+        for n in (3, 8)
+    ]
+    state.complete_step('9_backtest_robust', True, {'all_results': results})
+    state.set('stress_scenarios', {'scenarios': [{'id': 's1', 'label': 'Latency'}]})
+    state.set('claude_analysis', 'Looks fine </script><b>x</b>')
+    return state
+
+
+class TestSplitShards:
+    """Tests for _split_shards."""
+
+    def test_pass_detail_and_sections_moved(self, temp_dir):
+        """Detail keys leave the summary and are written as json + js shards."""
+        out = Path(temp_dir)
+        data = {
+            'passes': {'5': {'pass': 5, 'bt': {'net_profit': 1}, 'charts': {'a': [1, 2]}, 'drawdown': {'x': 1}}},
+            'stress_scenarios': {'scenarios': [1, 2]},
+        }
+
+        _split_shards(data, out)
+
+        assert data['passes']['5'] == {'pass': 5, 'bt': {'net_profit': 1}}
+        assert 'stress_scenarios' not in data
+        assert data['shards']['passes'] == {'5': 'data/pass_5'}
+        assert data['shards']['sections'] == {'stress_scenarios': 'data/section_stress_scenarios'}
+
+        detail = json.loads((out / 'data' / 'pass_5.json').read_text())
+        assert detail == {'charts': {'a': [1, 2]}, 'drawdown': {'x': 1}}
+        assert _read_js_shard(out / 'data' / 'pass_5.js', 'data/pass_5') == detail
+
+    def test_stale_shards_removed(self, temp_dir):
+        """Shards from a previous render are cleared."""
+        out = Path(temp_dir)
+        (out / 'data').mkdir()
+        (out / 'data' / 'pass_99.json').write_text('{}')
+
+        _split_shards({'passes': {}}, out)
+
+        assert not (out / 'data' / 'pass_99.json').exists()
+
+
+class TestGenerateDashboard:
+    """End-to-end dashboard generation."""
+
+    def test_sharded_dashboard(self, workflow_with_backtests, temp_dir):
+        """Embedded data is the compact summary; detail lives in shards."""
+        out = Path(temp_dir) / 'dash'
+        generate_dashboard_from_workflow(str(workflow_with_backtests.state_file), output_dir=str(out))
+
+        summary = json.loads((out / 'data.json').read_text())
+        assert sorted(summary['shards']['passes']) == ['3', '8']
+        for p in summary['passes'].values():
+            assert not set(PASS_SHARD_KEYS) & set(p)
+        assert 'stress_scenarios' in summary['shards']['sections']
+
+        detail = json.loads((out / 'data' / 'pass_8.json').read_text())
+        assert detail['equity']['in_sample'][0] == 10000
+        assert detail['charts']['profit_histogram']['bins'][-1] == 19
+
+        html = (out / 'index.html').read_text()
+        assert '</script><b>' not in html
+        assert '<\\/script><b>' in html
+
+    def test_shards_disabled(self, workflow_with_backtests, temp_dir, monkeypatch):
+        """DASHBOARD_SHARDS = False embeds the full document."""
+        monkeypatch.setattr(settings, 'DASHBOARD_SHARDS', False, raising=False)
+        out = Path(temp_dir) / 'dash'
+        generate_dashboard_from_workflow(str(workflow_with_backtests.state_file), output_dir=str(out))
+
+        data = json.loads((out / 'data.json').read_text())
+        assert 'shards' not in data
+        assert data['passes']['3']['charts']
+        assert data['stress_scenarios']['scenarios'][0]['id'] == 's1'
+        assert not (out / 'data').exists()
+
+
+class TestGenerateAllDashboards:
+    """Tests for batch generation (skip unchanged, pool, error isolation)."""
+
+    def _workflows(self, runs_dir, names):
+        return [
+            StateManager(ea_name=n, ea_path=f'/path/to/{n}.mq5', terminal='TestBroker', runs_dir=str(runs_dir))
+            for n in names
+        ]
+
+    def test_unchanged_workflows_skipped(self, temp_dir, capsys):
+        """A second run re-renders only the workflow whose state changed."""
+        runs = Path(temp_dir) / 'runs'
+        dash = Path(temp_dir) / 'dashboards'
+        a, b = self._workflows(runs, ['EA_A', 'EA_B'])
+
+        first = generate_all_dashboards(str(runs), workers=1, dashboards_dir=str(dash))
+        assert len(first) == 2
+        assert '2 rebuilt, 0 skipped' in capsys.readouterr().out
+
+        a.set_status('completed')
+        st = a.state_file.stat()
+        os.utime(a.state_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        second = generate_all_dashboards(str(runs), workers=1, dashboards_dir=str(dash))
+        assert sorted(second) == sorted(first)
+        assert '1 rebuilt, 1 skipped' in capsys.readouterr().out
+
+        generate_all_dashboards(str(runs), workers=1, force=True, dashboards_dir=str(dash))
+        assert '2 rebuilt, 0 skipped' in capsys.readouterr().out
+
+    def test_write_during_render_leaves_record_stale(self, temp_dir, capsys, monkeypatch):
+        """A state write while rendering is picked up by the next run."""
+        runs = Path(temp_dir) / 'runs'
+        dash = Path(temp_dir) / 'dashboards'
+        (a,) = self._workflows(runs, ['EA_A'])
+        original = dashboard_mod.prepare_data_from_optimization
+
+        def concurrent_write(state, state_file=None):
+            a.set_status('completed')
+            st = a.state_file.stat()
+            os.utime(a.state_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            return original(state, state_file)
+
+        monkeypatch.setattr(dashboard_mod, 'prepare_data_from_optimization', concurrent_write)
+        generate_all_dashboards(str(runs), workers=1, dashboards_dir=str(dash))
+        monkeypatch.setattr(dashboard_mod, 'prepare_data_from_optimization', original)
+        capsys.readouterr()
+
+        generate_all_dashboards(str(runs), workers=1, dashboards_dir=str(dash))
+        assert '1 rebuilt, 0 skipped' in capsys.readouterr().out
+
+    def test_render_source_change_rebuilds(self, temp_dir, capsys, monkeypatch):
+        """Editing code the render depends on invalidates existing dashboards."""
+        runs = Path(temp_dir) / 'runs'
+        dash = Path(temp_dir) / 'dashboards'
+        self._workflows(runs, ['EA_A'])
+        generate_all_dashboards(str(runs), workers=1, dashboards_dir=str(dash))
+        capsys.readouterr()
+
+        import reports.summary as summary_mod
+        original = summary_mod.stat_signature
+        monkeypatch.setattr(
+            summary_mod, 'stat_signature',
+            lambda p: 'edited' if str(p).endswith('downsample.py') else original(p),
+        )
+        generate_all_dashboards(str(runs), workers=1, dashboards_dir=str(dash))
+        assert '1 rebuilt, 0 skipped' in capsys.readouterr().out
+
+    def test_failure_is_isolated(self, temp_dir, capsys, monkeypatch):
+        """One failing workflow does not stop the others."""
+        runs = Path(temp_dir) / 'runs'
+        dash = Path(temp_dir) / 'dashboards'
+        a, b = self._workflows(runs, ['EA_A', 'EA_B'])
+        original = dashboard_mod.generate_dashboard_from_workflow
+
+        def flaky(path, **kwargs):
+            if 'EA_A' in Path(path).name:
+                raise RuntimeError('boom')
+            return original(path, **kwargs)
+
+        monkeypatch.setattr(dashboard_mod, 'generate_dashboard_from_workflow', flaky)
+        paths = generate_all_dashboards(str(runs), workers=1, dashboards_dir=str(dash))
+
+        out = capsys.readouterr().out
+        assert len(paths) == 1 and b.workflow_id in paths[0]
+        assert 'boom' in out
+        assert '1 rebuilt, 0 skipped (unchanged), 1 failed' in out
+
+    def test_process_pool(self, temp_dir, capsys, monkeypatch):
+        """Pool mode renders every workflow."""
+        monkeypatch.setattr(dashboard_mod.os, 'cpu_count', lambda: 4)
+        runs = Path(temp_dir) / 'runs'
+        dash = Path(temp_dir) / 'dashboards'
+        self._workflows(runs, ['EA_A', 'EA_B', 'EA_C'])
+
+        paths = generate_all_dashboards(str(runs), workers=2, dashboards_dir=str(dash))
+
+        assert len(paths) == 3
+        assert all(Path(p).exists() for p in paths)
+        out = capsys.readouterr().out
+        assert '3 rebuilt' in out
+        assert '(2 workers)' in out